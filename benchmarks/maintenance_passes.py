@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+for path in (TOOLS_DIR, Path(__file__).resolve().parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import orchestrator  # noqa: E402
+from queue_manager import QueueManager  # noqa: E402
+from schemas import load_yaml_like, validate_work_items  # noqa: E402
+from synthetic_backlog import BacklogShape, SyntheticBacklog, generate_backlog, write_backlog  # noqa: E402
+
+
+BENCHMARK_NAME = "maintenance_passes"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / f"{BENCHMARK_NAME}.json"
+SCENARIOS: dict[str, BacklogShape] = {
+    "small": BacklogShape(items=1_000, depth=12, fan_out=2),
+    "medium": BacklogShape(items=10_000, depth=40, fan_out=2),
+    "deep": BacklogShape(items=10_000, depth=1_000, fan_out=1),
+    "wide": BacklogShape(items=10_000, depth=4, fan_out=8),
+    "blocked_heavy": BacklogShape(items=10_000, depth=40, fan_out=2, completed_ratio=0.4, blocked_ratio=0.3),
+    "large": BacklogShape(items=50_000, depth=100, fan_out=3),
+}
+DEFAULT_SCENARIOS = ("small", "medium", "deep", "wide", "blocked_heavy")
+STATS: dict[str, Any] = {"agents": {}}
+
+# A pass prepares its inputs (untimed) and returns the call to measure.
+PassSetup = Callable[[SyntheticBacklog, Path, dict[str, Any]], Callable[[], Any]]
+
+
+def _queue(backlog: SyntheticBacklog, root: Path) -> QueueManager:
+    copy = backlog.clone()
+    write_backlog(root, copy)
+    queue = QueueManager(root)
+    queue.completed = copy.completed
+    queue.blocked = copy.blocked
+    queue.active = copy.active
+    return queue
+
+
+def _select_next(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    queue = _queue(backlog, root)
+    return lambda: queue.select_next(policies["routing"], STATS)
+
+
+def _normalize_dependencies(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    queue = _queue(backlog, root)
+    return lambda: orchestrator.normalize_queued_item_dependencies(queue, archived_ids=set())
+
+
+def _revisit_blocked(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    queue = _queue(backlog, root)
+    return lambda: orchestrator.revisit_recoverable_blocked_items(queue, policies["retry"], model_policy_fingerprint=None)
+
+
+def _archive_blocked(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    queue = _queue(backlog, root)
+    archive_path = root / "coordination" / "backlog" / "blocked-archived-items.json"
+    archive_path.unlink(missing_ok=True)
+    return lambda: orchestrator.archive_non_actionable_blocked_items(queue, policies["retry"])
+
+
+def _repair_duplicates(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    write_backlog(root, backlog, with_duplicates=True)
+    return lambda: orchestrator.repair_backlog_archive_duplicates(root)
+
+
+def _validate_work_items(backlog: SyntheticBacklog, root: Path, policies: dict[str, Any]) -> Callable[[], Any]:
+    items = backlog.active
+    return lambda: validate_work_items(items)
+
+
+PASSES: dict[str, PassSetup] = {
+    "select_next": _select_next,
+    "normalize_queued_item_dependencies": _normalize_dependencies,
+    "revisit_recoverable_blocked_items": _revisit_blocked,
+    "archive_non_actionable_blocked_items": _archive_blocked,
+    "repair_backlog_archive_duplicates": _repair_duplicates,
+    "validate_work_items": _validate_work_items,
+}
+
+
+def load_policies(root: Path = ROOT) -> dict[str, Any]:
+    """The repo's routing and retry policies, so passes follow the live configuration."""
+    policies_dir = root / "coordination" / "policies"
+    return {
+        "routing": load_yaml_like(policies_dir / "routing-rules.yaml", {}),
+        "retry": load_yaml_like(policies_dir / "retry-policy.yaml", {}),
+    }
+
+
+def measure_pass(setup: PassSetup, backlog: SyntheticBacklog, policies: dict[str, Any], *, repeats: int) -> dict[str, Any]:
+    """Median/min wall time over `repeats` fresh runs, plus peak traced memory of one more run."""
+    timings: list[float] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        archive_path = root / "coordination" / "backlog" / "blocked-archived-items.json"
+        with mock.patch.object(orchestrator, "BLOCKED_ARCHIVED_PATH", archive_path):
+            for _ in range(max(1, repeats)):
+                run = setup(backlog, root, policies)
+                gc.collect()
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+
+            # Memory is measured separately: tracing slows the timed runs several times over.
+            run = setup(backlog, root, policies)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                run()
+                _current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    return {
+        "repeats": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(
+    scenarios: list[str],
+    passes: list[str],
+    *,
+    repeats: int,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    policies = load_policies()
+    results: list[dict[str, Any]] = []
+    for scenario in scenarios:
+        shape = SCENARIOS[scenario] if seed is None else replace(SCENARIOS[scenario], seed=seed)
+        backlog = generate_backlog(shape)
+        for name in passes:
+            row = {"scenario": scenario, "pass": name, "shape": shape.as_dict()}
+            row.update(measure_pass(PASSES[name], backlog, policies, repeats=repeats))
+            results.append(row)
+            print(f"{scenario:>14} {name:<38} {row['median_ms']:>10.3f} ms {row['peak_kib']:>10.1f} KiB", file=sys.stderr)
+    return {
+        "benchmark": BENCHMARK_NAME,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float,
+    min_delta_ms: float,
+    min_delta_kib: float,
+) -> list[dict[str, Any]]:
+    """One row per metric of each (scenario, pass) measured in both runs with the same backlog shape.
+
+    A metric regresses when it grew by more than `threshold` (relative) and by
+    more than the absolute floor, which keeps sub-millisecond noise out.
+    """
+    previous = {(row["scenario"], row["pass"]): row for row in baseline.get("results", [])}
+    rows: list[dict[str, Any]] = []
+    for row in current.get("results", []):
+        before = previous.get((row["scenario"], row["pass"]))
+        if before is None or before.get("shape") != row.get("shape"):
+            continue
+        for metric, floor in (("median_ms", min_delta_ms), ("peak_kib", min_delta_kib)):
+            old, new = float(before[metric]), float(row[metric])
+            ratio = new / old if old > 0 else None
+            rows.append(
+                {
+                    "scenario": row["scenario"],
+                    "pass": row["pass"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": round(ratio, 3) if ratio is not None else None,
+                    "regressed": new - old > floor and (ratio is None or ratio > 1 + threshold),
+                }
+            )
+    return rows
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time scheduler and backlog maintenance passes on synthetic backlogs.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(DEFAULT_SCENARIOS))
+    parser.add_argument("--passes", nargs="+", choices=list(PASSES), default=list(PASSES))
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per pass; the median is reported")
+    parser.add_argument("--seed", type=int, help="override every scenario's generator seed")
+    parser.add_argument("--output", type=Path, help="write the results JSON here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help=f"compare against this results file (stored: {DEFAULT_BASELINE.relative_to(ROOT)})")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to --baseline (or the stored baseline)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative growth that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore time growth below this many ms")
+    parser.add_argument("--min-delta-kib", type=float, default=256.0, help="ignore peak-memory growth below this many KiB")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    current = run_suite(args.scenarios, args.passes, repeats=args.repeats, seed=args.seed)
+    exit_code = 0
+    if args.baseline is not None and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparison = compare_to_baseline(
+            current,
+            baseline,
+            threshold=args.threshold,
+            min_delta_ms=args.min_delta_ms,
+            min_delta_kib=args.min_delta_kib,
+        )
+        regressions = [row for row in comparison if row["regressed"]]
+        current["comparison"] = {"baseline": str(args.baseline), "threshold": args.threshold, "rows": comparison}
+        for row in regressions:
+            print(
+                f"REGRESSION {row['scenario']} {row['pass']} {row['metric']}: "
+                f"{row['baseline']} -> {row['current']} (x{row['ratio']})",
+                file=sys.stderr,
+            )
+        if not comparison:
+            print("No comparable results in baseline (different scenarios or backlog shapes).", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    text = json.dumps(current, indent=2) + "\n"
+    if args.update_baseline:
+        target = args.baseline or DEFAULT_BASELINE
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+    elif not args.update_baseline:
+        print(text, end="")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from queue_manager import QueueManager  # noqa: E402
+
+
+DEFAULT_SIZES = (10_000, 25_000, 50_000, 100_000)
+ROUTING_RULES = {
+    "owner_role_map": {"backend": "backend-agent", "frontend": "frontend-agent", "qa": "qa-agent"},
+    "dependency_unlock_priority": {"enabled": True, "priority_boost_levels": 1, "prefer_immediate_unblocks": True},
+}
+STATS: dict[str, Any] = {"agents": {}}
+
+
+def synthetic_backlog(size: int, *, seed: int, completed_ratio: float = 0.6) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Return (active, completed) with dependencies pointing at nearby earlier items."""
+    rnd = random.Random(seed)
+    roles = list(ROUTING_RULES["owner_role_map"])
+    priorities = ["critical", "high", "normal", "normal", "low"]
+    active: list[dict[str, Any]] = []
+    completed: list[dict[str, Any]] = []
+    completed_cutoff = int(size * completed_ratio)
+    for idx in range(size):
+        deps: list[str] = []
+        if idx:
+            for _ in range(rnd.choice((0, 1, 1, 2, 3))):
+                deps.append(f"RK-SYN-{rnd.randint(max(0, idx - 200), idx - 1):06d}")
+        item = {
+            "id": f"RK-SYN-{idx:06d}",
+            "title": f"Synthetic item {idx}",
+            "owner_role": rnd.choice(roles),
+            "priority": rnd.choice(priorities),
+            "dependencies": sorted(set(deps)),
+            "status": "completed" if idx < completed_cutoff else "queued",
+            "created_at": f"2026-01-01T00:00:00.{idx:06d}+00:00",
+        }
+        (completed if idx < completed_cutoff else active).append(item)
+    return active, completed
+
+
+def measure(size: int, *, seed: int, cycles: int) -> dict[str, Any]:
+    active, completed = synthetic_backlog(size, seed=seed)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = QueueManager(Path(tmpdir))
+        started = time.perf_counter()
+        queue.completed = completed
+        queue.blocked = []
+        queue.active = active
+        index_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        item = queue.select_next(ROUTING_RULES, STATS)
+        cold_seconds = time.perf_counter() - started
+
+        warm: list[float] = []
+        for _ in range(cycles):
+            if item is None:
+                break
+            queue.mark_running(item["id"])
+            queue.mark_completed(item["id"], "synthetic")
+            started = time.perf_counter()
+            item = queue.select_next(ROUTING_RULES, STATS)
+            warm.append(time.perf_counter() - started)
+
+    return {
+        "items": size,
+        "queued": len(active),
+        "index_build_ms": round(index_seconds * 1000, 3),
+        "cold_select_ms": round(cold_seconds * 1000, 3),
+        "warm_cycles": len(warm),
+        "warm_select_p50_ms": round(statistics.median(warm) * 1000, 3) if warm else None,
+        "warm_select_max_ms": round(max(warm) * 1000, 3) if warm else None,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure QueueManager.select_next latency on synthetic backlogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--cycles", type=int, default=50, help="complete-then-select cycles measured per size")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    results = [measure(size, seed=args.seed, cycles=max(0, args.cycles)) for size in args.sizes]
+    print(json.dumps({"benchmark": "select_next_latency", "seed": args.seed, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+
+ROLES = ("backend", "frontend", "design", "content", "qa", "platform", "lead")
+PRIORITIES = ("critical", "high", "normal", "normal", "low")
+# Reasons chosen to hit each branch of the blocked revisit/archive passes
+# under the repo's retry-policy.yaml patterns.
+BLOCKER_REASONS = (
+    "Worker timed out after 1500s",
+    "Model preflight failed: model not supported when using Codex with a ChatGPT account",
+    "No changes were made; the requested content is already present",
+    "Retained for audit only",
+    "Waiting on a design decision for the hero layout",
+    "Repeated failure on validation: retry threshold exceeded",
+)
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class BacklogShape:
+    """Parameters for one synthetic backlog.
+
+    The same shape always gives the same items; only the timestamps of
+    recently blocked items follow the wall clock, so revisit cooldowns apply.
+    """
+
+    items: int = 1_000
+    depth: int = 12
+    fan_out: int = 2
+    completed_ratio: float = 0.6
+    blocked_ratio: float = 0.05
+    # Share of completed/blocked rows written twice by write_backlog(with_duplicates=True).
+    duplicate_ratio: float = 0.01
+    seed: int = 1337
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SyntheticBacklog:
+    shape: BacklogShape
+    active: list[dict[str, Any]] = field(default_factory=list)
+    completed: list[dict[str, Any]] = field(default_factory=list)
+    blocked: list[dict[str, Any]] = field(default_factory=list)
+
+    def clone(self) -> "SyntheticBacklog":
+        # Items are flat apart from their lists, so a per-item copy is enough and far cheaper than deepcopy.
+        def _copy(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            return [{key: list(value) if isinstance(value, list) else value for key, value in item.items()} for item in items]
+
+        return SyntheticBacklog(self.shape, _copy(self.active), _copy(self.completed), _copy(self.blocked))
+
+
+def _ts(offset_minutes: float) -> str:
+    return (BASE_TIME + timedelta(minutes=offset_minutes)).isoformat()
+
+
+def _item(idx: int, *, layer: int, rnd: random.Random, dependencies: list[str]) -> dict[str, Any]:
+    created = _ts(idx)
+    return {
+        "id": f"RK-SYN-{idx:06d}",
+        "title": f"Synthetic item {idx} (layer {layer})",
+        "description": "Generated for scheduler and maintenance benchmarks.",
+        "milestone": f"M{min(layer // 4, 9)}",
+        "type": "feature",
+        "priority": rnd.choice(PRIORITIES),
+        "owner_role": rnd.choice(ROLES),
+        "preferred_agent": None,
+        "dependencies": dependencies,
+        "inputs": [f"docs/synthetic/{idx % 97}.md"],
+        "acceptance_criteria": ["benchmark item completes"],
+        "validation_commands": ["python -m unittest tests.test_synthetic"],
+        "status": "queued",
+        "retry_count": 0,
+        "created_at": created,
+        "updated_at": created,
+        "estimated_effort": "S",
+        "token_budget": 8000,
+        "result_summary": None,
+        "blocker_reason": None,
+        "escalation_target": None,
+    }
+
+
+def generate_backlog(shape: BacklogShape) -> SyntheticBacklog:
+    """Layered dependency DAG: `depth` layers, each item depending on up to `fan_out` items of the layer before.
+
+    Earlier layers complete first, so `completed_ratio` leaves a realistic
+    frontier of dependency-ready items; `blocked_ratio` of the rest is
+    blocked with a mix of revisitable, archivable and other reasons.
+    """
+    rnd = random.Random(shape.seed)
+    depth = max(1, min(shape.depth, shape.items))
+    layers: list[list[str]] = [[] for _ in range(depth)]
+    items: list[dict[str, Any]] = []
+    for idx in range(shape.items):
+        layer = idx * depth // max(1, shape.items)
+        deps: list[str] = []
+        if layer and layers[layer - 1] and shape.fan_out > 0:
+            previous = layers[layer - 1]
+            deps = sorted(rnd.sample(previous, min(len(previous), rnd.randint(1, shape.fan_out))))
+        item = _item(idx, layer=layer, rnd=rnd, dependencies=deps)
+        layers[layer].append(item["id"])
+        items.append(item)
+
+    backlog = SyntheticBacklog(shape)
+    completed_cutoff = int(shape.items * shape.completed_ratio)
+    for idx, item in enumerate(items):
+        if idx < completed_cutoff:
+            item.update(status="completed", result_summary="synthetic", updated_at=_ts(idx + 30))
+            backlog.completed.append(item)
+        elif rnd.random() < shape.blocked_ratio:
+            # Half were blocked long ago (past any revisit cooldown), half just now.
+            blocked_at = _ts(idx + 60) if rnd.random() < 0.5 else datetime.now(timezone.utc).isoformat()
+            item.update(status="blocked", blocker_reason=rnd.choice(BLOCKER_REASONS), updated_at=blocked_at)
+            backlog.blocked.append(item)
+        else:
+            backlog.active.append(item)
+    return backlog
+
+
+def _with_duplicates(items: list[dict[str, Any]], *, ratio: float, rnd: random.Random) -> list[dict[str, Any]]:
+    count = int(len(items) * ratio)
+    if not count:
+        return items
+    later = [dict(original, updated_at=_ts(len(items) + rnd.randint(1, 600))) for original in rnd.sample(items, count)]
+    return items + later
+
+
+def write_backlog(root: Path, backlog: SyntheticBacklog, *, with_duplicates: bool = False) -> None:
+    """Write the backlog snapshot files QueueManager(root) reads.
+
+    `with_duplicates` repeats `duplicate_ratio` of the completed and blocked
+    rows with a later `updated_at`, as left behind by an interrupted archive
+    write, for the duplicate repair pass.
+    """
+    backlog_dir = root / "coordination" / "backlog"
+    backlog_dir.mkdir(parents=True, exist_ok=True)
+    rnd = random.Random(backlog.shape.seed + 1)
+    ratio = backlog.shape.duplicate_ratio if with_duplicates else 0.0
+    for name, items in (
+        ("work-items.json", backlog.active),
+        ("completed-items.json", _with_duplicates(backlog.completed, ratio=ratio, rnd=rnd)),
+        ("blocked-items.json", _with_duplicates(backlog.blocked, ratio=ratio, rnd=rnd)),
+    ):
+        (backlog_dir / name).write_text(json.dumps(items) + "\n", encoding="utf-8")
+    journal = backlog_dir / "backlog-journal.jsonl"
+    if journal.exists():
+        journal.unlink()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+if str(BENCHMARKS_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import maintenance_passes  # noqa: E402
+from schemas import validate_work_items  # noqa: E402
+from synthetic_backlog import BacklogShape, generate_backlog  # noqa: E402
+
+
+class SyntheticBacklogTests(unittest.TestCase):
+    def test_generator_is_seeded_and_follows_the_shape(self) -> None:
+        shape = BacklogShape(items=600, depth=6, fan_out=3, completed_ratio=0.5, blocked_ratio=0.2, seed=7)
+        first = generate_backlog(shape)
+        second = generate_backlog(shape)
+
+        def _ids(backlog) -> list[list[str]]:
+            return [[item["id"] for item in items] for items in (backlog.active, backlog.completed, backlog.blocked)]
+
+        self.assertEqual(_ids(first), _ids(second))
+        self.assertEqual([item["dependencies"] for item in first.active], [item["dependencies"] for item in second.active])
+        self.assertNotEqual(_ids(first), _ids(generate_backlog(BacklogShape(items=600, depth=6, fan_out=3, seed=8))))
+
+        self.assertEqual(len(first.completed), 300)
+        self.assertEqual(len(first.active) + len(first.blocked), 300)
+        self.assertGreater(len(first.blocked), 30)
+        all_items = first.active + first.completed + first.blocked
+        self.assertEqual(validate_work_items(all_items), [])
+        layer_of = {item["id"]: int(item["title"].rsplit(" ", 1)[1].rstrip(")")) for item in all_items}
+        self.assertEqual(max(layer_of.values()), 5)
+        for item in all_items:
+            self.assertLessEqual(len(item["dependencies"]), 3)
+            for dep in item["dependencies"]:
+                self.assertEqual(layer_of[dep], layer_of[item["id"]] - 1)
+
+
+class BaselineComparisonTests(unittest.TestCase):
+    def _run(self, median_ms: float, peak_kib: float, *, items: int = 100) -> dict[str, object]:
+        return {
+            "results": [
+                {
+                    "scenario": "small",
+                    "pass": "select_next",
+                    "shape": {"items": items},
+                    "median_ms": median_ms,
+                    "peak_kib": peak_kib,
+                }
+            ]
+        }
+
+    def _compare(self, current: dict[str, object], baseline: dict[str, object]) -> dict[str, bool]:
+        rows = maintenance_passes.compare_to_baseline(
+            current, baseline, threshold=0.25, min_delta_ms=2.0, min_delta_kib=256.0
+        )
+        return {str(row["metric"]): bool(row["regressed"]) for row in rows}
+
+    def test_regressions_need_relative_and_absolute_growth(self) -> None:
+        baseline = self._run(10.0, 1000.0)
+        self.assertEqual(self._compare(self._run(12.0, 1200.0), baseline), {"median_ms": False, "peak_kib": False})
+        self.assertEqual(self._compare(self._run(20.0, 2000.0), baseline), {"median_ms": True, "peak_kib": True})
+        # 3x slower but only 1 ms in absolute terms: noise, not a regression.
+        self.assertEqual(self._compare(self._run(1.5, 1000.0), self._run(0.5, 1000.0)), {"median_ms": False, "peak_kib": False})
+        # Results for a different backlog shape are not comparable.
+        self.assertEqual(self._compare(self._run(100.0, 9000.0, items=200), baseline), {})
+
+    def test_suite_reports_timing_and_peak_memory_per_pass(self) -> None:
+        tiny = {"tiny": BacklogShape(items=120, depth=4, fan_out=2, blocked_ratio=0.3)}
+        with mock.patch.dict(maintenance_passes.SCENARIOS, tiny), mock.patch("sys.stderr"):
+            report = maintenance_passes.run_suite(["tiny"], list(maintenance_passes.PASSES), repeats=1)
+        self.assertEqual([row["pass"] for row in report["results"]], list(maintenance_passes.PASSES))
+        for row in report["results"]:
+            self.assertEqual(row["repeats"], 1)
+            self.assertGreaterEqual(row["median_ms"], 0)
+            self.assertGreaterEqual(row["peak_kib"], 0)
+            self.assertEqual(row["shape"]["items"], 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
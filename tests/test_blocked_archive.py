@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import sys
 import tempfile
 import unittest
@@ -73,6 +74,8 @@ class BlockedArchiveTests(unittest.TestCase):
                     "escalation_target": "Mara Voss",
                 },
             ]
+            queue.save()
+            self.assertTrue(queue.compact())
 
             with (
                 mock.patch.object(orchestrator, "ROOT", root),
@@ -90,8 +93,11 @@ class BlockedArchiveTests(unittest.TestCase):
                 )
 
                 archived_rows = load_json(backlog_dir / "blocked-archived-items.json", [])
+                journal = [json.loads(line) for line in queue.journal_path.read_text(encoding="utf-8").splitlines()]
 
         self.assertEqual(moved, ["B-ARCHIVE"])
+        # The archive pass journals one removal, not a rewrite of the blocked list.
+        self.assertEqual([(row["collection"], row["op"], row["id"]) for row in journal], [("blocked", "drop", "B-ARCHIVE")])
         self.assertEqual(len(queue.blocked), 1)
         self.assertEqual(queue.blocked[0]["id"], "B-KEEP")
         self.assertEqual(len(archived_rows), 1)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import codex_worker  # noqa: E402
+from codex_worker import StreamingOutput  # noqa: E402
+
+
+def _worker_command(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class StreamingOutputTests(unittest.TestCase):
+    def test_markers_survive_after_scrolling_out_of_bounded_tail(self) -> None:
+        code = (
+            "import sys\n"
+            "prompt = sys.stdin.read()\n"
+            "print('STATUS: BLOCKED waiting on ' + prompt)\n"
+            "for i in range(2000):\n"
+            "    print('filler line %d' % i)\n"
+            "sys.stderr.write('warn\\n')\n"
+            "print('final summary')\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            log_path = root / "coordination" / "runtime" / "agent-logs" / "run.log"
+            output = StreamingOutput(log_path, tail_chars=500)
+            with mock.patch.object(codex_worker, "_parse_and_resolve_codex_command", return_value=(_worker_command(code), None)):
+                result = codex_worker.run_agent(
+                    project_root=root,
+                    agent_id="tomas-grell",
+                    prompt="RK-1",
+                    output=output,
+                )
+
+            self.assertEqual(result.status, "blocked")
+            self.assertEqual(result.summary, "final summary")
+            self.assertLessEqual(len(result.stdout), 500)
+            self.assertNotIn("STATUS: BLOCKED", result.stdout)
+            log_text = log_path.read_text(encoding="utf-8")
+            self.assertTrue(log_text.startswith("STATUS: BLOCKED waiting on RK-1\n"))
+            self.assertIn("[stderr] warn\n", log_text)
+            snapshot = output.snapshot()
+            self.assertEqual(snapshot["output_lines"], 2003)
+            self.assertEqual(snapshot["last_line"], "final summary")
+
+    def test_timeout_keeps_partial_output_tails(self) -> None:
+        code = "import sys, time\nprint('started', flush=True)\ntime.sleep(30)\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            proc, error = codex_worker._execute_codex(
+                command=_worker_command(code),
+                prompt="",
+                project_root=Path(tmpdir),
+                timeout_seconds=1,
+                tokens_in_est=1,
+            )
+
+        self.assertIsNone(proc)
+        assert error is not None
+        self.assertEqual(error.exit_code, 124)
+        self.assertEqual(error.stdout.strip(), "started")
+
+
+    def test_timeout_applies_when_worker_never_reads_a_large_prompt(self) -> None:
+        code = "import time\nprint('ignoring stdin', flush=True)\ntime.sleep(30)\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            started = time.monotonic()
+            proc, error = codex_worker._execute_codex(
+                command=_worker_command(code),
+                prompt="x" * (2 * 1024 * 1024),
+                project_root=Path(tmpdir),
+                timeout_seconds=1,
+                tokens_in_est=1,
+            )
+            elapsed = time.monotonic() - started
+
+        self.assertIsNone(proc)
+        assert error is not None
+        self.assertEqual(error.exit_code, 124)
+        self.assertLess(elapsed, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
 import json
+import random
 import sys
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
+from unittest import mock
 
 
 TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
@@ -12,6 +16,7 @@ if str(TOOLS_DIR) not in sys.path:
     sys.path.insert(0, str(TOOLS_DIR))
 
 import orchestrator  # noqa: E402
+from completion_metrics import CompletionMetricsTracker, sketch_add, sketch_quantile  # noqa: E402
 
 
 class CompletionMetricsTests(unittest.TestCase):
@@ -79,5 +84,109 @@ class CompletionMetricsTests(unittest.TestCase):
         self.assertEqual(by_agent["tomas-grell"]["runtime_total_seconds"], 7.25)
 
 
+class CompletionMetricsStoreTests(unittest.TestCase):
+    def _rows(self, count: int) -> list[dict[str, object]]:
+        rng = random.Random(7)
+        return [
+            {
+                "item_id": f"RK-{index}",
+                "title": f"Task {index}",
+                "resolved_by_agent": rng.choice(["mara-voss", "tomas-grell", None]),
+                "resolved_by_role": rng.choice(["backend", "frontend"]),
+                "model": rng.choice(["gpt-5-mini", None]),
+                "runtime_seconds": None if index % 11 == 0 else round(rng.lognormvariate(4, 1), 2),
+                "finished_at": "2026-03-01T00:00:00+00:00",
+            }
+            for index in range(400)
+        ]
+
+    def test_sketch_quantiles_stay_within_relative_accuracy(self) -> None:
+        values = [float(value) for value in range(1, 1001)]
+        forward: dict[str, int] = {}
+        backward: dict[str, int] = {}
+        for value in values:
+            sketch_add(forward, value)
+        for value in reversed(values):
+            sketch_add(backward, value)
+        self.assertEqual(forward, backward)
+        for quantile, exact in ((0.5, 500.5), (0.9, 900.1), (0.99, 990.01)):
+            estimate = sketch_quantile(forward, quantile)
+            assert estimate is not None
+            self.assertLess(abs(estimate - exact) / exact, 0.03)
+        self.assertIsNone(sketch_quantile({}, 0.5))
+
+    def test_incremental_updates_match_rebuild_and_drift_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracker = CompletionMetricsTracker(Path(tmpdir), top_items=5)
+            rows = self._rows(400)
+            data = tracker.rebuild(rows[:300])
+            for row in reversed(rows[300:]):
+                tracker.record_completion(
+                    data,
+                    item_id=row["item_id"],
+                    title=row["title"],
+                    agent_id=row["resolved_by_agent"],
+                    role=row["resolved_by_role"],
+                    model=row["model"],
+                    runtime_seconds=row["runtime_seconds"],
+                    finished_at=row["finished_at"],
+                )
+            rebuilt = tracker.rebuild(rows)
+            self.assertEqual(tracker.compare(data, rebuilt), [])
+
+            snapshot = tracker.snapshot(data)
+            self.assertEqual(snapshot["completed_items"], 400)
+            self.assertEqual(len(snapshot["longest_items"]), 5)
+            longest = sorted((row["runtime_seconds"] for row in rows if row["runtime_seconds"] is not None), reverse=True)
+            self.assertEqual([row["runtime_seconds"] for row in snapshot["longest_items"]], longest[:5])
+            self.assertEqual({row["model"] for row in snapshot["model_rows"]}, {"gpt-5-mini", "unknown"})
+            self.assertIsNotNone(snapshot["agent_rows"][0]["runtime_p90_seconds"])
+
+            tracker.record_completion(
+                data, item_id="RK-X", title="", agent_id="mara-voss", role="backend", model=None, runtime_seconds=1.0, finished_at=None
+            )
+            drift = tracker.compare(data, rebuilt)
+            self.assertIn("totals completed_items: stored=401 rebuilt=400", drift)
+            self.assertIn("by_agent[mara-voss] runtime sketch differs", drift)
+
+    def test_metrics_reads_store_without_replaying_history(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True)
+            (backlog / "completed-items.json").write_text(
+                json.dumps([{"id": "RK-1", "title": "One", "resolved_by_agent": "mara-voss", "runtime_seconds": 4.0}]) + "\n",
+                encoding="utf-8",
+            )
+
+            def _metrics(**kwargs: object) -> str:
+                out = io.StringIO()
+                with mock.patch.object(orchestrator, "ROOT", root), mock.patch.object(
+                    orchestrator, "ensure_python_runtime_configuration"
+                ), mock.patch.object(orchestrator, "migrate_legacy_runtime_files"), redirect_stdout(out):
+                    self.assertEqual(orchestrator.cmd_metrics(top_agents=5, top_items=5, **kwargs), 0)
+                return out.getvalue()
+
+            self.assertIn("store missing", _metrics())
+            with mock.patch.object(orchestrator, "ROOT", root):
+                orchestrator.record_completion_metrics(
+                    item={"id": "RK-2", "title": "Two"},
+                    agent_id="tomas-grell",
+                    role="frontend",
+                    model="gpt-5-mini",
+                    runtime_seconds=9.0,
+                    finished_at="2026-03-01T00:00:00+00:00",
+                )
+            with mock.patch.object(orchestrator, "completion_item_rows", side_effect=AssertionError("full scan")):
+                text = _metrics()
+            self.assertIn("Completed items: 2", text)
+            self.assertIn("RK-2 | 9.00s | tomas-grell", text)
+            self.assertIn("gpt-5-mini: completed=1", text)
+
+            rebuilt_text = _metrics(rebuild=True)
+            self.assertIn("drifted from history", rebuilt_text)
+            self.assertIn("Completed items: 1", rebuilt_text)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import orchestrator  # noqa: E402
+from codex_worker import WorkerResult  # noqa: E402
+from cycle_profiler import CycleProfiler, profile_span  # noqa: E402
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _item(item_id: str) -> dict[str, object]:
+    ts = "2026-02-25T19:00:00+00:00"
+    return {
+        "id": item_id,
+        "title": f"Profiled item {item_id}",
+        "description": "Cycle profiling test.",
+        "milestone": "M1",
+        "type": "feature",
+        "priority": "high",
+        "owner_role": "frontend",
+        "preferred_agent": None,
+        "dependencies": [],
+        "inputs": [],
+        "acceptance_criteria": ["item completes"],
+        "validation_commands": [],
+        "status": "queued",
+        "retry_count": 0,
+        "created_at": ts,
+        "updated_at": ts,
+        "estimated_effort": "S",
+        "token_budget": 1000,
+        "result_summary": None,
+        "blocker_reason": None,
+        "escalation_target": None,
+    }
+
+
+class CycleProfilerTests(unittest.TestCase):
+    def test_spans_nest_and_are_written_as_collapsed_stacks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_dir = Path(tmpdir) / "profile"
+            profiler = CycleProfiler(out_dir)
+            with profiler.cycle() as summary:
+                with profile_span("prepare"):
+                    with profile_span("health_check"):
+                        _busy(0.01)
+                with profile_span("agent_wait", sampled=False):
+                    time.sleep(0.02)
+
+            self.assertEqual(summary["cycle"], 1)
+            self.assertEqual(set(summary["spans_ms"]), {"prepare", "health_check", "agent_wait"})
+            self.assertGreaterEqual(summary["spans_ms"]["agent_wait"], 15)
+            self.assertGreaterEqual(summary["spans_ms"]["prepare"], summary["spans_ms"]["health_check"])
+            self.assertGreaterEqual(summary["total_ms"], summary["spans_ms"]["agent_wait"])
+
+            folded = {
+                stack: int(count)
+                for stack, count in (line.rsplit(" ", 1) for line in profiler.folded_path.read_text(encoding="utf-8").splitlines())
+            }
+            self.assertIn("cycle;prepare;health_check", folded)
+            self.assertIn("cycle;agent_wait", folded)
+            self.assertGreaterEqual(folded["cycle;prepare;health_check"], 9000)
+
+            pstats_files = sorted(out_dir.glob("*-cycle-0001.pstats"))
+            self.assertEqual(len(pstats_files), 1)
+            self.assertIn(pstats_files[0].name, summary["files"])
+            functions = {func[2] for func in pstats.Stats(str(pstats_files[0])).stats}
+            self.assertIn("_busy", functions)
+            # The agent wait is not sampled.
+            self.assertNotIn("sleep", " ".join(functions))
+
+    def test_spans_are_noops_outside_a_cycle(self) -> None:
+        with profile_span("select"):
+            pass
+
+    def test_memory_mode_dumps_a_tracemalloc_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiler = CycleProfiler(Path(tmpdir), cpu=False, memory=True)
+            with profiler.cycle() as summary:
+                with profile_span("load"):
+                    blob = [bytes(1024) for _ in range(256)]
+                del blob
+            self.assertFalse(tracemalloc.is_tracing())
+            self.assertGreater(summary["peak_kib"], 200)
+            snapshots = list(Path(tmpdir).glob("*.tracemalloc"))
+            self.assertEqual(len(snapshots), 1)
+            self.assertIsInstance(tracemalloc.Snapshot.load(str(snapshots[0])), tracemalloc.Snapshot)
+            self.assertEqual(list(Path(tmpdir).glob("*.pstats")), [])
+
+    def test_process_one_phases_are_reported_in_cycle_profile_event(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True)
+            (backlog / "work-items.json").write_text(json.dumps([_item("RK-PROF-1")]) + "\n", encoding="utf-8")
+            (backlog / "completed-items.json").write_text("[]\n", encoding="utf-8")
+            (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+            events: list[tuple[str, dict[str, object]]] = []
+            agents = {"rowan-hale": {"display_name": "Rowan Hale", "role": "frontend", "model": "gpt-5.3-codex"}}
+            policies = {
+                "routing": {"owner_role_map": {"frontend": "rowan-hale"}, "fallback_agent": "rowan-hale"},
+                "retry": {"max_retries_per_item_per_agent": 2, "worker_timeout_seconds": 5},
+                "model": {},
+                "commit": {"default_validation_commands": [], "commit_enabled": False},
+            }
+            profiler = CycleProfiler(root / "profile", cpu=False)
+            with (
+                mock.patch.object(orchestrator, "ROOT", root),
+                mock.patch.object(orchestrator, "DAEMON_STATE_PATH", root / "coordination" / "runtime" / "daemon-state.json"),
+                mock.patch.object(orchestrator, "validate_environment", return_value=[]),
+                mock.patch.object(
+                    orchestrator,
+                    "repair_backlog_archive_duplicates",
+                    return_value={"completed_removed": 0, "blocked_removed": 0, "completed_duplicate_ids": [], "blocked_duplicate_ids": []},
+                ),
+                mock.patch.object(
+                    orchestrator,
+                    "emit_event",
+                    side_effect=lambda event_type, _message, **fields: events.append((event_type, fields)),
+                ),
+                mock.patch.object(orchestrator, "set_daemon_state", side_effect=lambda **patch: patch),
+                mock.patch.object(orchestrator, "append_jsonl"),
+                mock.patch.object(orchestrator, "revisit_recoverable_blocked_items", return_value=[]),
+                mock.patch.object(orchestrator, "ensure_backlog_refill_item", return_value=None),
+                mock.patch.object(orchestrator, "load_agent_catalog", return_value=agents),
+                mock.patch.object(orchestrator, "load_policies", return_value=policies),
+                mock.patch.object(orchestrator, "codex_model_access_preflight_error", return_value=None),
+                mock.patch.object(orchestrator, "build_prompt", return_value="prompt"),
+                mock.patch.object(
+                    orchestrator,
+                    "run_agent",
+                    return_value=WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0),
+                ),
+                mock.patch.object(orchestrator, "run_validation_for_item", return_value=(True, [])),
+            ):
+                with orchestrator.profiled_cycle(profiler):
+                    rc = orchestrator.process_one(dry_run=False, verbose=False)
+
+            self.assertEqual(rc, 0)
+            profiles = [fields for kind, fields in events if kind == "cycle_profile"]
+            self.assertEqual(len(profiles), 1)
+            spans = profiles[0]["spans_ms"]
+            assert isinstance(spans, dict)
+            for phase in (
+                "prepare",
+                "repair",
+                "health_check",
+                "revisit",
+                "guard",
+                "select",
+                "preflight",
+                "claim",
+                "prompt_build",
+                "agent_wait",
+                "validation",
+                "ingest",
+                "publish",
+            ):
+                self.assertIn(phase, spans)
+            folded = profiler.folded_path.read_text(encoding="utf-8")
+            self.assertIn("cycle;prepare;health_check ", folded)
+            self.assertIn("cycle;finish;validation ", folded)
+            lines = orchestrator._render_event_lines("2026-02-25T19:00:00+00:00", "cycle_profile", "", profiles[0])
+            self.assertIn("Cycle 1 took", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,7 @@ if str(TOOLS_DIR) not in sys.path:
 
 import health_checks  # noqa: E402
 import smoke_daemon_env  # noqa: E402
+from queue_manager import QueueManager  # noqa: E402
 
 
 def _write_smoke_fixture(root: Path, *, omit_state: str | None = None) -> None:
@@ -69,6 +70,22 @@ class HealthCheckRequiredFilesTests(unittest.TestCase):
         self.assertTrue(any("agents.json" in err for err in errors))
         self.assertTrue(any("routing-rules.yaml" in err for err in errors))
 
+    def test_backlog_check_validates_journaled_items(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_smoke_fixture(root)
+            queue = QueueManager(root)
+            queue.load(validate=False)
+            queue.active = [{"id": "RK-1", "status": "queued"}]
+            queue.save()
+            self.assertTrue(queue.journal_path.exists())
+
+            errors: list[str] = []
+            health_checks._check_backlog_files(root, errors)
+
+        self.assertTrue(errors)
+        self.assertTrue(all(err.startswith("work-items.json item[0]") for err in errors))
+
 
 class SmokeDaemonEnvTests(unittest.TestCase):
     def test_smoke_main_passes_for_valid_queue_policy_state_files(self) -> None:
@@ -90,6 +107,26 @@ class SmokeDaemonEnvTests(unittest.TestCase):
         self.assertIn("policies: parsed=5", text)
         self.assertIn("state: parsed=5", text)
 
+    def test_smoke_main_counts_items_still_in_the_journal(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_smoke_fixture(root)
+            queue = QueueManager(root)
+            queue.load(validate=False)
+            queue.completed = [{"id": "RK-1", "status": "completed"}]
+            queue.save()
+            out = io.StringIO()
+            with (
+                mock.patch.object(smoke_daemon_env, "ROOT", root),
+                mock.patch.object(smoke_daemon_env, "validate_environment", return_value=[]),
+                redirect_stdout(out),
+            ):
+                rc = smoke_daemon_env.main()
+
+        self.assertEqual(rc, 1)
+        text = out.getvalue()
+        self.assertIn("completed-items.json item[0]", text)
+
     def test_smoke_main_fails_when_required_state_file_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import argparse
+import json
 import sys
+import tempfile
+import threading
+import types
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -207,5 +213,186 @@ class FrontendVisualSmokeHelperTests(unittest.TestCase):
         )
 
 
+
+class _FakeBrowser:
+    def __init__(self, launches: list["_FakeBrowser"]) -> None:
+        self.closed = False
+        launches.append(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakePlaywright:
+    def __init__(self, launches: list[_FakeBrowser]) -> None:
+        self.chromium = self
+        self._launches = launches
+
+    def launch(self, headless: bool = True) -> _FakeBrowser:
+        return _FakeBrowser(self._launches)
+
+    def __enter__(self) -> "_FakePlaywright":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+class FrontendVisualSmokeConcurrencyTests(unittest.TestCase):
+    DEVICES = ["desktop-1440", "tablet-1024", "mobile-390", "mobile-360"]
+
+    def _run(self, concurrency: int, check) -> tuple[list, list[_FakeBrowser]]:
+        launches: list[_FakeBrowser] = []
+        results = smoke._run_devices(lambda: _FakePlaywright(launches), self.DEVICES, check, concurrency=concurrency)
+        return results, launches
+
+    def test_sequential_run_uses_one_browser(self) -> None:
+        seen: list[object] = []
+
+        def check(browser, device):
+            seen.append(browser)
+            return {"device": device}, None
+
+        results, launches = self._run(1, check)
+        self.assertEqual([result["device"] for result, _ in results], self.DEVICES)
+        self.assertEqual(len(launches), 1)
+        self.assertTrue(all(browser is launches[0] for browser in seen))
+        self.assertTrue(launches[0].closed)
+
+    def test_concurrent_run_overlaps_devices_and_keeps_requested_order(self) -> None:
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def check(browser, device):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            # The slowest device goes first, so completion order differs from request order.
+            time.sleep(0.08 if device == "desktop-1440" else 0.02)
+            with lock:
+                running["now"] -= 1
+            return {"device": device}, 0.1
+
+        results, launches = self._run(3, check)
+        self.assertEqual([result["device"] for result, _ in results], self.DEVICES)
+        self.assertEqual(len(launches), 3)
+        self.assertTrue(all(browser.closed for browser in launches))
+        self.assertGreater(running["peak"], 1)
+
+    def test_concurrent_run_reraises_first_device_error(self) -> None:
+        def check(browser, device):
+            if device == "tablet-1024":
+                raise RuntimeError("context crashed")
+            return {"device": device}, None
+
+        with self.assertRaisesRegex(RuntimeError, "context crashed"):
+            self._run(2, check)
+
+    def test_concurrency_flag_defaults_to_sequential(self) -> None:
+        with mock.patch.object(sys, "argv", ["frontend_visual_smoke.py"]), mock.patch.dict("os.environ", {}, clear=False):
+            smoke.os.environ.pop("REDKEEPERS_FRONTEND_VISUAL_CONCURRENCY", None)
+            self.assertEqual(smoke.parse_args().concurrency, 1)
+        with mock.patch.object(sys, "argv", ["frontend_visual_smoke.py", "--concurrency", "4"]):
+            self.assertEqual(smoke.parse_args().concurrency, 4)
+
+
+
+class FrontendVisualSmokeBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+
+    def _args(self, **overrides: object) -> argparse.Namespace:
+        values: dict[str, object] = {
+            "url": "http://127.0.0.1:4173/index.html",
+            "devices": "desktop-1440,mobile-390",
+            "surfaces": None,
+            "manifest": None,
+            "output_dir": self.root / "current",
+            "baseline_dir": self.root / "baseline",
+            "strict": True,
+            "max_diff_percent": 0.5,
+            "concurrency": 1,
+        }
+        values.update(overrides)
+        return argparse.Namespace(**values)
+
+    def _run(self, args: argparse.Namespace, failing: set[tuple[str, str]] = frozenset()):
+        launches: list[_FakeBrowser] = []
+        calls: list[tuple[str, str]] = []
+
+        def fake_check(browser, _args, device_name, *, url, surface_id, required_selectors, container_selector):
+            calls.append((surface_id, device_name))
+            failed = (surface_id, device_name) in failing
+            return {
+                "device": device_name,
+                "status": "failed" if failed else "ok",
+                "action_feedback_paths_total": 7 if surface_id == "first-slice-shell" else 0,
+                "action_feedback_paths_ok": 7 if surface_id == "first-slice-shell" else 0,
+                "action_feedback_paths_failed": 0,
+            }, (0.7 if failed else 0.1)
+
+        sync_api = types.ModuleType("playwright.sync_api")
+        sync_api.sync_playwright = lambda: _FakePlaywright(launches)
+        with (
+            mock.patch.dict(sys.modules, {"playwright": types.ModuleType("playwright"), "playwright.sync_api": sync_api}),
+            mock.patch.object(smoke, "_check_device", side_effect=fake_check),
+        ):
+            rc, report = smoke.run_visual_smoke(args)
+        return rc, report, launches, calls
+
+    def test_single_url_run_keeps_flat_report(self) -> None:
+        rc, report, launches, _calls = self._run(self._args())
+        self.assertEqual(rc, 0)
+        self.assertEqual(report["surface"], "first-slice-shell")
+        self.assertNotIn("surfaces", report)
+        self.assertEqual([device["device"] for device in report["devices"]], ["desktop-1440", "mobile-390"])
+        self.assertEqual(len(launches), 1)
+
+    def test_surfaces_share_one_browser_and_get_their_own_sections(self) -> None:
+        args = self._args(surfaces="index.html,hero-wireframes.html")
+        rc, report, launches, calls = self._run(args, failing={("hero-wireframes", "mobile-390")})
+
+        self.assertEqual(len(launches), 1)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(rc, 1)
+        self.assertEqual(report["mode"], "batch")
+        self.assertEqual(report["status"], "failed")
+        shell, hero = report["surfaces"]
+        self.assertEqual((shell["surface"], shell["status"]), ("first-slice-shell", "ok"))
+        self.assertEqual(hero["url"], "http://127.0.0.1:4173/hero-wireframes.html")
+        self.assertEqual(hero["status"], "failed")
+        self.assertEqual(hero["summary"]["devices_diff_exceeded"], 1)
+        summary = report["summary"]
+        self.assertEqual((summary["surfaces_ok"], summary["surfaces_failed"]), (1, 1))
+        self.assertEqual((summary["devices_total"], summary["devices_ok"], summary["devices_failed"]), (4, 3, 1))
+        self.assertEqual(summary["action_feedback_paths_total"], 14)
+        self.assertEqual(summary["max_diff_seen"], 0.7)
+
+    def test_manifest_entries_can_override_devices(self) -> None:
+        manifest = self.root / "surfaces.json"
+        manifest.write_text(
+            json.dumps({"surfaces": ["index.html", {"url": "hero-wireframes.html", "devices": ["tablet-1024"]}]}),
+            encoding="utf-8",
+        )
+        surfaces = smoke._requested_surfaces(self._args(manifest=manifest))
+        self.assertEqual(
+            surfaces,
+            [
+                {"url": "http://127.0.0.1:4173/index.html", "devices": ["desktop-1440", "mobile-390"]},
+                {"url": "http://127.0.0.1:4173/hero-wireframes.html", "devices": ["tablet-1024"]},
+            ],
+        )
+
+    def test_unknown_device_in_manifest_is_an_error(self) -> None:
+        manifest = self.root / "surfaces.json"
+        manifest.write_text(json.dumps([{"url": "index.html", "devices": "watch-200"}]), encoding="utf-8")
+        rc, report, launches, _calls = self._run(self._args(manifest=manifest))
+        self.assertEqual(rc, 2)
+        self.assertEqual(report["status"], "error")
+        self.assertEqual(launches, [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from fs_wakeup import WakeupWatcher, daemon_watch_targets  # noqa: E402
+
+
+class WakeupWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for rel in ["coordination/backlog", "coordination/policies", "coordination/state", "Human", "agents/mara-voss"]:
+            (self.root / rel).mkdir(parents=True)
+        (self.root / "coordination" / "backlog" / "work-items.json").write_text("[]\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write_later(self, path: Path, delay: float = 0.05) -> threading.Thread:
+        def _write() -> None:
+            time.sleep(delay)
+            path.write_text("new\n", encoding="utf-8")
+
+        thread = threading.Thread(target=_write)
+        thread.start()
+        return thread
+
+    def _check_backend(self, backend: str) -> None:
+        watcher = WakeupWatcher(
+            daemon_watch_targets(self.root), backend=backend, debounce_seconds=0.05, poll_seconds=0.02
+        )
+        try:
+            self.assertEqual(watcher.backend_name, backend)
+            started = time.monotonic()
+            self.assertEqual(watcher.wait(0.1), [])
+            self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+            inbox_file = self.root / "Human" / "request.md"
+            writer = self._write_later(inbox_file)
+            started = time.monotonic()
+            changed = watcher.wait(5.0)
+            writer.join()
+            self.assertEqual(changed, [inbox_file])
+            self.assertLess(time.monotonic() - started, 2.0)
+
+            # Files outside the watched patterns do not wake the daemon.
+            (self.root / "agents" / "mara-voss" / "working-notes.md").write_text("x\n", encoding="utf-8")
+            (self.root / "coordination" / "backlog" / "work-items.json.tmp").write_text("x\n", encoding="utf-8")
+            self.assertEqual(watcher.wait(0.1), [])
+
+            # A burst of writes is one debounced wakeup.
+            outbox = self.root / "agents" / "mara-voss" / "outbox.json"
+            backlog = self.root / "coordination" / "backlog" / "work-items.json"
+            outbox.write_text("[]\n", encoding="utf-8")
+            backlog.write_text('[{"id": "RK-1"}]\n', encoding="utf-8")
+            self.assertEqual(watcher.wait(1.0), sorted([outbox, backlog]))
+
+            # pending() reports changes since the last wait without blocking.
+            catalog = self.root / "coordination" / "state" / "agents.json"
+            catalog.write_text("{}\n", encoding="utf-8")
+            self.assertEqual(watcher.pending(), [catalog])
+            self.assertEqual(watcher.pending(), [])
+        finally:
+            watcher.close()
+
+    def _check_rearm(self, backend: str) -> None:
+        (self.root / "Human").rmdir()
+        watcher = WakeupWatcher(
+            daemon_watch_targets(self.root),
+            backend=backend,
+            debounce_seconds=0.05,
+            poll_seconds=0.02,
+            refresh=lambda: daemon_watch_targets(self.root),
+        )
+        try:
+            # Creating a missing inbox or a new agent directory wakes the daemon...
+            (self.root / "Human").mkdir()
+            self.assertEqual(watcher.wait(1.0), [self.root / "Human"])
+            agent_dir = self.root / "agents" / "new-agent"
+            agent_dir.mkdir()
+            self.assertEqual(watcher.wait(1.0), [agent_dir])
+
+            # ...and the next wait() watches inside them.
+            inbox_file = self.root / "Human" / "request.md"
+            writer = self._write_later(inbox_file)
+            self.assertEqual(watcher.wait(5.0), [inbox_file])
+            writer.join()
+            outbox = agent_dir / "outbox.json"
+            writer = self._write_later(outbox)
+            self.assertEqual(watcher.wait(5.0), [outbox])
+            writer.join()
+        finally:
+            watcher.close()
+
+    def test_polling_backend_rearms_missing_and_new_directories(self) -> None:
+        self._check_rearm("poll")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_backend_rearms_missing_and_new_directories(self) -> None:
+        self._check_rearm("inotify")
+
+    def test_polling_backend_detects_changes_in_watched_inputs(self) -> None:
+        self._check_backend("poll")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_backend_detects_changes_in_watched_inputs(self) -> None:
+        self._check_backend("inotify")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import os
+import subprocess
 import sys
+import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -11,6 +15,10 @@ if str(TOOLS_DIR) not in sys.path:
     sys.path.insert(0, str(TOOLS_DIR))
 
 import git_guard  # noqa: E402
+import orchestrator  # noqa: E402
+from queue_manager import QueueManager  # noqa: E402
+from schemas import load_yaml_like  # noqa: E402
+from validation_cache import ValidationCache  # noqa: E402
 
 
 class GitGuardValidationCommandTests(unittest.TestCase):
@@ -38,5 +46,207 @@ class GitGuardValidationCommandTests(unittest.TestCase):
         self.assertIn("tests/test_m0_0014_progression_smoke.py", cmd)
 
 
+
+class ParallelValidationRunnerTests(unittest.TestCase):
+    @staticmethod
+    def _py(code: str) -> str:
+        # Quoted interpreter path so the runner does not swap in the configured launcher.
+        return f'"{sys.executable}" -c "{code}"'
+
+    def test_same_script_commands_share_a_lane(self) -> None:
+        self.assertEqual(
+            git_guard.validation_lane_key("python tools/web_vertical_slice_packaging.py package --clean"),
+            git_guard.validation_lane_key("python tools\\web_vertical_slice_packaging.py smoke"),
+        )
+        self.assertNotEqual(
+            git_guard.validation_lane_key("python tools/web_vertical_slice_packaging.py smoke"),
+            git_guard.validation_lane_key("python tools/platform_wrapper_prepare_smoke.py"),
+        )
+
+    def test_independent_commands_run_concurrently_and_keep_listed_order(self) -> None:
+        commands = [self._py("import time; time.sleep(0.4); print('one')"), self._py("import time; time.sleep(0.4); print('two')")]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            started = time.monotonic()
+            ok, results = git_guard.run_validation_commands(
+                Path(tmpdir),
+                commands,
+                workers=2,
+                log_root=Path(tmpdir) / "logs",
+                run_label="RK-1",
+            )
+            elapsed = time.monotonic() - started
+
+            self.assertTrue(ok)
+            self.assertLess(elapsed, 0.75)
+            self.assertEqual([row["command"] for row in results], commands)
+            self.assertEqual(results[0]["stdout_tail"].strip(), "one")
+            log_path = Path(results[1]["stdout_log"])
+            self.assertEqual(log_path.read_text(encoding="utf-8").strip(), "two")
+            self.assertTrue(log_path.parent.name.endswith("-rk-1"))
+
+    def test_failure_reports_rows_up_to_first_failing_command(self) -> None:
+        commands = [
+            self._py("print('ok')"),
+            self._py("import sys; sys.stderr.write('boom'); sys.exit(3)"),
+            self._py("print('never reported')"),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ok, results = git_guard.run_validation_commands(Path(tmpdir), commands, workers=3)
+
+        self.assertFalse(ok)
+        self.assertEqual([row["exit_code"] for row in results], [0, 3])
+        self.assertEqual(results[1]["stderr_tail"], "boom")
+        self.assertNotIn("stdout_log", results[1])
+
+
+    def test_commands_sharing_a_lane_key_run_in_listed_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            marker = Path(tmpdir) / "generated.txt"
+            commands = [
+                self._py(f"import time; time.sleep(0.3); open(r'{marker}', 'w').write('x')"),
+                self._py(f"import os, sys; sys.exit(0 if os.path.exists(r'{marker}') else 5)"),
+            ]
+            ok, results = git_guard.run_validation_commands(
+                Path(tmpdir),
+                commands,
+                workers=2,
+                lane_keys=[git_guard.DECLARED_VALIDATION_LANE, git_guard.DECLARED_VALIDATION_LANE],
+            )
+
+        self.assertTrue(ok)
+        self.assertEqual([row["exit_code"] for row in results], [0, 0])
+
+    def test_item_validation_keeps_declared_commands_in_one_lane(self) -> None:
+        item = {
+            "id": "RK-1",
+            "owner_role": "platform",
+            "inputs": ["tools/web_vertical_slice_packaging.py"],
+            "validation_commands": [
+                "python tools/generate_first_slice_frontend_manifest_snapshot.py",
+                "node --test tests/first_slice_manifest.test.mjs",
+            ],
+        }
+        commit_rules = {
+            "default_validation_commands": [],
+            "fast_cycle_validation": {"enabled": False},
+            "platform_web_packaging_validation": {"enabled": True},
+        }
+        with (
+            mock.patch.dict("os.environ", {}, clear=False),
+            mock.patch.object(orchestrator, "run_validation_commands", return_value=(True, [])) as run,
+        ):
+            for name in (
+                "REDKEEPERS_ENABLE_PLATFORM_WEB_PACKAGING_VALIDATION",
+                "REDKEEPERS_ENABLE_FRONTEND_VISUAL_QA",
+                "REDKEEPERS_ENABLE_PLATFORM_WRAPPER_PREPARE_VALIDATION",
+            ):
+                os.environ.pop(name, None)
+            orchestrator.run_validation_for_item(Path.cwd(), item, commit_rules)
+
+        commands = run.call_args.args[1]
+        lane_keys = run.call_args.kwargs["lane_keys"]
+        self.assertEqual(len(commands), 4)
+        self.assertEqual(lane_keys[:2], [git_guard.DECLARED_VALIDATION_LANE] * 2)
+        packaging_lane = git_guard.validation_lane_key("python tools/web_vertical_slice_packaging.py smoke")
+        self.assertEqual(lane_keys[2:], [packaging_lane, packaging_lane])
+
+
+class ValidationCacheTests(unittest.TestCase):
+    def _init_repo(self, root: Path) -> None:
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        (root / "src.txt").write_text("v1\n", encoding="utf-8")
+
+    def _counting_command(self, counter: Path, *, exit_code: int = 0) -> str:
+        code = f"import sys; open(r'{counter}', 'a').write('x'); sys.exit({exit_code})"
+        return f'"{sys.executable}" -c "{code}"'
+
+    def test_unchanged_tree_reuses_passing_result_until_inputs_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as scratch:
+            root = Path(tmpdir)
+            self._init_repo(root)
+            counter = Path(scratch) / "runs.txt"
+            command = self._counting_command(counter)
+            cache = ValidationCache(root / "coordination" / "runtime" / "validation-cache.json")
+
+            ok_first, first = git_guard.run_validation_commands(root, [command], cache=cache)
+            ok_second, second = git_guard.run_validation_commands(root, [command], cache=cache)
+            self.assertTrue(ok_first and ok_second)
+            self.assertNotIn("cached", first[0])
+            self.assertTrue(second[0]["cached"])
+            self.assertEqual(counter.read_text(encoding="utf-8"), "x")
+
+            (root / "src.txt").write_text("v2\n", encoding="utf-8")
+            _ok, third = git_guard.run_validation_commands(root, [command], cache=cache)
+            self.assertNotIn("cached", third[0])
+            self.assertEqual(counter.read_text(encoding="utf-8"), "xx")
+
+    def test_declared_inputs_ignore_unrelated_changes_and_failures_are_not_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as scratch:
+            root = Path(tmpdir)
+            self._init_repo(root)
+            counter = Path(scratch) / "runs.txt"
+            passing = self._counting_command(counter)
+            failing = self._counting_command(counter, exit_code=1)
+            cache = ValidationCache(root / "cache.json", command_inputs={"runs.txt": ["src.txt"]})
+
+            git_guard.run_validation_commands(root, [passing], cache=cache)
+            (root / "notes.md").write_text("unrelated\n", encoding="utf-8")
+            _ok, rows = git_guard.run_validation_commands(root, [passing], cache=cache)
+            self.assertTrue(rows[0]["cached"])
+
+            git_guard.run_validation_commands(root, [failing], cache=cache)
+            ok, rows = git_guard.run_validation_commands(root, [failing], cache=cache)
+            self.assertFalse(ok)
+            self.assertNotIn("cached", rows[0])
+            self.assertEqual(counter.read_text(encoding="utf-8"), "xxx")
+
+    def test_item_retry_hits_cache_after_queue_save(self) -> None:
+        policy = load_yaml_like(TOOLS_DIR.parent / "coordination" / "policies" / "commit-guard-rules.yaml", {})
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as scratch:
+            root = Path(tmpdir)
+            self._init_repo(root)
+            counter = Path(scratch) / "runs.txt"
+            commit_rules = {
+                "default_validation_commands": [self._counting_command(counter)],
+                "validation_cache": {**policy["validation_cache"], "enabled": True},
+            }
+            queue = QueueManager(root)
+            queue.active = [{"id": "RK-1", "status": "queued"}]
+            queue.save()
+            queue.compact()
+
+            results = []
+            with mock.patch.dict("os.environ", {"REDKEEPERS_VALIDATION_CACHE": "1"}, clear=False):
+                for _attempt in range(2):
+                    queue.mark_running("RK-1")
+                    queue.mark_validating("RK-1")
+                    queue.save()
+                    results.append(orchestrator.run_validation_for_item(root, queue.get_active_item("RK-1"), commit_rules))
+            runs = counter.read_text(encoding="utf-8")
+
+        self.assertTrue(all(ok for ok, _rows in results))
+        self.assertNotIn("cached", results[0][1][0])
+        self.assertTrue(results[1][1][0]["cached"])
+        self.assertEqual(runs, "x")
+
+    def test_eviction_drops_expired_then_least_recently_used_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ValidationCache(Path(tmpdir) / "cache.json", max_entries=2, max_age_seconds=60)
+            for key in ["a", "b", "c"]:
+                cache.store(key, {"command": key, "exit_code": 0})
+            cache._entries["a"]["stored_epoch"] -= 120
+            cache._entries["b"]["last_used_epoch"] -= 10
+            cache.lookup("c")
+            cache.store("d", {"command": "d", "exit_code": 0})
+
+            self.assertEqual(cache.evict(), 2)
+            self.assertEqual(sorted(cache._entries), ["c", "d"])
+
+    def test_env_override_bypasses_enabled_policy(self) -> None:
+        rules = {"validation_cache": {"enabled": True}}
+        self.assertIsNotNone(ValidationCache.from_rules(Path("."), rules))
+        with mock.patch.dict("os.environ", {"REDKEEPERS_VALIDATION_CACHE": "0"}, clear=False):
+            self.assertIsNone(ValidationCache.from_rules(Path("."), rules))
+
 if __name__ == "__main__":
     unittest.main()
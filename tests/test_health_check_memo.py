@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import health_checks  # noqa: E402
+import orchestrator  # noqa: E402
+
+
+def _write_json(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+
+
+def _seed_root(root: Path) -> None:
+    for name in ["work-items.json", "completed-items.json", "blocked-items.json"]:
+        _write_json(root / "coordination" / "backlog" / name, [])
+    _write_json(root / "coordination" / "state" / "agents.json", {})
+    for name in health_checks.POLICY_FILES:
+        _write_json(root / "coordination" / "policies" / name, {})
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class HealthCheckMemoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        _seed_root(self.root)
+        self._patches = [
+            mock.patch.dict(os.environ, {"REDKEEPERS_WORKER_MODE": "mock"}),
+            mock.patch.object(health_checks, "_validate_model_profile_access", return_value=None),
+        ]
+        for patcher in self._patches:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self._patches):
+            patcher.stop()
+        self._tmp.cleanup()
+
+    def _validate(self, memo: health_checks.HealthCheckMemo, **kwargs: object) -> tuple[list[str], dict[str, bool]]:
+        profile: list[dict[str, object]] = []
+        errors = health_checks.validate_environment(self.root, memo=memo, profile=profile, **kwargs)
+        self.assertEqual([row["check"] for row in profile], [check.name for check in health_checks.HEALTH_CHECKS])
+        return errors, {str(row["check"]): bool(row["cached"]) for row in profile}
+
+    def test_unchanged_inputs_reuse_results_and_only_affected_checks_rerun(self) -> None:
+        memo = health_checks.HealthCheckMemo()
+        errors, cached = self._validate(memo)
+        self.assertEqual(errors, [])
+        self.assertFalse(any(cached.values()))
+
+        errors, cached = self._validate(memo)
+        self.assertEqual(errors, [])
+        self.assertTrue(all(cached.values()))
+
+        # Touching a file without changing its bytes keeps the content fingerprint.
+        work_items = self.root / "coordination" / "backlog" / "work-items.json"
+        _bump_mtime(work_items)
+        _, cached = self._validate(memo)
+        self.assertTrue(cached["backlog_files"])
+
+        work_items.write_text("{}\n", encoding="utf-8")
+        _bump_mtime(work_items)
+        errors, cached = self._validate(memo)
+        self.assertEqual(errors, ["work-items.json must contain a list"])
+        self.assertFalse(cached["backlog_files"])
+        self.assertTrue(cached["policy_files"])
+        self.assertTrue(cached["hostile_runtime_contract"])
+
+        # The cached error is replayed in the same position.
+        self.assertEqual(self._validate(memo)[0], ["work-items.json must contain a list"])
+
+    def test_env_changes_and_force_bypass_the_memo(self) -> None:
+        memo = health_checks.HealthCheckMemo()
+        self._validate(memo)
+        with mock.patch.object(health_checks, "codex_command_preflight_error", return_value="codex missing") as preflight:
+            errors, cached = self._validate(memo)
+            self.assertEqual(errors, [])
+            preflight.assert_not_called()
+
+            with mock.patch.dict(os.environ, {"REDKEEPERS_WORKER_MODE": ""}):
+                errors, cached = self._validate(memo)
+            self.assertEqual(errors, ["codex missing"])
+            self.assertFalse(cached["codex_command"])
+            self.assertTrue(cached["runtime_python"])
+
+            errors, cached = self._validate(memo, force=True)
+            self.assertFalse(any(cached.values()))
+            self.assertEqual(preflight.call_count, 2)
+
+    def test_results_expire_after_max_age(self) -> None:
+        memo = health_checks.HealthCheckMemo(max_age_seconds=0)
+        self._validate(memo)
+        _, cached = self._validate(memo)
+        self.assertFalse(any(cached.values()))
+
+    def test_status_health_profile_prints_per_check_table(self) -> None:
+        profile = [
+            {"check": "backlog_files", "seconds": 0.0125, "cached": False, "error_count": 1},
+            {"check": "codex_command", "seconds": 0.00002, "cached": True, "error_count": 0},
+        ]
+        lines = orchestrator.format_health_profile_lines(profile)
+        self.assertIn("backlog_files", lines[1])
+        self.assertIn("12.50", lines[1])
+        self.assertIn("ran", lines[1])
+        self.assertIn("cached", lines[2])
+        self.assertTrue(lines[-1].strip().startswith("total"))
+
+        args = orchestrator.build_parser().parse_args(["status", "--health-profile", "--force"])
+        self.assertTrue(args.health_profile)
+        self.assertTrue(args.force)
+        self.assertTrue(orchestrator.build_parser().parse_args(["run", "--force"]).force)
+
+
+if __name__ == "__main__":
+    unittest.main()
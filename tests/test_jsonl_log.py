@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import jsonl_log  # noqa: E402
+import orchestrator  # noqa: E402
+from jsonl_log import SegmentedJsonlLog  # noqa: E402
+from runtime_state import RuntimeStateWriter  # noqa: E402
+from schemas import append_jsonl  # noqa: E402
+
+
+def _run(index: int, item_id: str, result: str = "completed") -> dict[str, object]:
+    return {
+        "ts": f"2026-03-01T{index // 60:02d}:{index % 60:02d}:00+00:00",
+        "item_id": item_id,
+        "agent_id": "mara-voss",
+        "result": result,
+        "runtime_seconds": float(index),
+    }
+
+
+class SegmentedJsonlLogTests(unittest.TestCase):
+    def _write_rotating(self, log: SegmentedJsonlLog, rows: list[dict[str, object]], *, every: int) -> None:
+        for position, row in enumerate(rows, start=1):
+            append_jsonl(log.path, row)
+            if position % every == 0:
+                log.rotate()
+
+    def test_queries_span_compressed_segments_and_only_open_needed_ones(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "run-history.jsonl"
+            log = SegmentedJsonlLog(path, kind_field="result", compress=True)
+            rows = [_run(i, f"RK-{i % 4}", "blocked" if i % 5 == 0 else "completed") for i in range(1, 31)]
+            self._write_rotating(log, rows, every=10)
+            append_jsonl(path, _run(31, "RK-9"))
+
+            self.assertEqual(
+                sorted(p.name for p in Path(tmpdir).iterdir()),
+                [
+                    "run-history.000001.jsonl.gz",
+                    "run-history.000002.jsonl.gz",
+                    "run-history.000003.jsonl.gz",
+                    "run-history.index.json",
+                    "run-history.jsonl",
+                ],
+            )
+            self.assertEqual(path.read_text(encoding="utf-8").count("\n"), 1)
+
+            self.assertEqual([row["runtime_seconds"] for row in log.tail(3)], [29.0, 30.0, 31.0])
+            self.assertEqual([row["runtime_seconds"] for row in log.tail(2, kinds={"blocked"})], [25.0, 30.0])
+
+            item_rows = log.for_item("RK-1")
+            self.assertEqual([row["runtime_seconds"] for row in item_rows], [float(i) for i in range(1, 31) if i % 4 == 1])
+            self.assertEqual(log.for_item("RK-9", kinds={"completed"})[0]["runtime_seconds"], 31.0)
+
+            opened: list[str] = []
+            real_open = log._open_segment
+
+            def _tracking_open(segment):
+                opened.append(segment["file"])
+                return real_open(segment)
+
+            with mock.patch.object(log, "_open_segment", side_effect=_tracking_open):
+                window = list(log.iter_records(since="2026-03-01T00:25:00+00:00"))
+                self.assertEqual([row["runtime_seconds"] for row in window], [25.0, 26.0, 27.0, 28.0, 29.0, 30.0, 31.0])
+                self.assertEqual(opened, ["run-history.000003.jsonl.gz", "run-history.jsonl"])
+
+                opened.clear()
+                log.for_item("RK-9")
+                self.assertEqual(opened, ["run-history.jsonl"])
+
+    def test_rotation_by_size_age_and_retention(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "daemon-events.jsonl"
+            log = SegmentedJsonlLog(path, max_bytes=400, max_age_seconds=3600, compress=False, keep_segments=2)
+            append_jsonl(path, {"ts": "2026-03-01T00:00:00+00:00", "kind": "select", "fields": {"item_id": "RK-1"}})
+            now = jsonl_log._ts_epoch("2026-03-01T00:30:00+00:00")
+            self.assertIsNone(log.rotate_if_due(now=now))
+            self.assertEqual(log.rotate_if_due(now=now + 3600), "daemon-events.000001.jsonl")
+
+            for i in range(20):
+                append_jsonl(path, {"ts": "2026-03-01T02:00:00+00:00", "kind": "heartbeat", "message": "x" * 40})
+                log.rotate_if_due(now=now)
+            segments = sorted(p.name for p in Path(tmpdir).glob("daemon-events.0*.jsonl"))
+            self.assertEqual(len(segments), 2)
+            self.assertNotIn("daemon-events.000001.jsonl", segments)
+            self.assertEqual([seg["file"] for seg in log.index()["segments"]], segments)
+            self.assertEqual(log.for_item("RK-1"), [])
+
+    def test_index_catches_up_with_appends_and_rebuilds_when_lost(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "run-history.jsonl"
+            log = SegmentedJsonlLog(path, kind_field="result")
+            self._write_rotating(log, [_run(i, "RK-1") for i in range(1, 6)], every=5)
+            append_jsonl(path, _run(6, "RK-2"))
+            self.assertEqual(log.index()["active"]["records"], 1)
+
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(_run(7, "RK-2")) + "\n" + '{"ts": "partial')
+            self.assertEqual(len(log.for_item("RK-2")), 2)
+
+            log.index_path.unlink()
+            index = log.index()
+            self.assertEqual([seg["records"] for seg in index["segments"]], [5])
+            self.assertEqual(index["next_seq"], 2)
+            self.assertEqual(len(log.for_item("RK-1")), 5)
+
+    def test_buffered_flush_waits_for_rotation_sharing_its_lock(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "run-history.jsonl"
+            writer = RuntimeStateWriter(flush_interval_seconds=60)
+            log = SegmentedJsonlLog(path, kind_field="result", lock=writer.flush_lock)
+            writer.append(path, _run(1, "RK-1"))
+            writer.flush()
+            writer.append(path, _run(2, "RK-2"))
+
+            flusher = threading.Thread(target=writer.flush)
+            real_copy = jsonl_log.shutil.copyfileobj
+            flush_blocked: list[bool] = []
+
+            def _copy_while_flushing(src, dst) -> None:
+                # The active file has been renamed; a flush now must wait for rotation to finish.
+                flusher.start()
+                flusher.join(0.2)
+                flush_blocked.append(flusher.is_alive())
+                real_copy(src, dst)
+
+            with mock.patch.object(jsonl_log.shutil, "copyfileobj", side_effect=_copy_while_flushing):
+                self.assertEqual(log.rotate(), "run-history.000001.jsonl.gz")
+            flusher.join(5)
+
+            self.assertEqual(flush_blocked, [True])
+            self.assertEqual([row["runtime_seconds"] for row in log.iter_records()], [1.0, 2.0])
+            self.assertEqual(log.index()["active"]["records"], 1)
+
+
+class RunHistoryQueryTests(unittest.TestCase):
+    def test_metrics_and_status_read_run_history_through_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "coordination" / "backlog").mkdir(parents=True)
+            (root / "coordination" / "backlog" / "completed-items.json").write_text(
+                json.dumps([{"id": "RK-1", "title": "One", "status": "completed"}]) + "\n",
+                encoding="utf-8",
+            )
+            log = orchestrator.run_history_log(root)
+            log.path.parent.mkdir(parents=True)
+            append_jsonl(log.path, _run(1, "RK-1", "failed"))
+            append_jsonl(log.path, _run(2, "RK-1"))
+            log.rotate()
+            append_jsonl(log.path, _run(3, "RK-2", "blocked"))
+
+            snapshot = orchestrator.build_completion_metrics_snapshot(root)
+            self.assertEqual(snapshot["longest_items"][0]["runtime_seconds"], 2.0)
+            self.assertEqual(snapshot["agent_rows"][0]["agent_id"], "mara-voss")
+
+            frozen_now = orchestrator.datetime.fromisoformat("2026-03-01T00:04:00+00:00")
+            with mock.patch("orchestrator.datetime") as fake_datetime:
+                fake_datetime.now.return_value = frozen_now
+                window = orchestrator.summarize_recent_runs(root, since_hours=0.04)
+            self.assertEqual(window["by_result"], {"completed": 1, "blocked": 1})
+
+            rendered = orchestrator.render_status(
+                {"daemon": {}, "queue": {}, "agent_stats": {}, "recent_runs": log.tail(orchestrator.STATUS_RECENT_RUNS)}
+            )
+            self.assertIn("Recent Runs:", rendered)
+            self.assertLess(rendered.index("RK-2"), rendered.index("RK-1 completed"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import codex_worker  # noqa: E402
+from model_preflight_cache import ModelPreflightCache  # noqa: E402
+
+
+def _write_policy(root: Path, policy: dict[str, object]) -> None:
+    path = root / "coordination" / "policies" / "model-policy.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(policy) + "\n", encoding="utf-8")
+    # Make sure the rewrite is visible to the (mtime, size) stamp.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class ModelPreflightCacheTests(unittest.TestCase):
+    def _probe(self, cache: ModelPreflightCache, model: str, *, returncode: int = 0, stderr: str = "") -> tuple[str | None, mock.Mock]:
+        completed = subprocess.CompletedProcess(args=["codex"], returncode=returncode, stdout="ok\n", stderr=stderr)
+        with (
+            mock.patch.dict(os.environ, {"REDKEEPERS_WORKER_MODE": "", "REDKEEPERS_MODEL_PREFLIGHT_CACHE": "1"}),
+            mock.patch.dict(codex_worker._MODEL_ACCESS_PRECHECK_CACHE, clear=True),
+            mock.patch.object(codex_worker, "_MODEL_PREFLIGHT_DISK_CACHE", cache),
+            mock.patch.object(codex_worker, "_parse_and_resolve_codex_command", return_value=(["codex", "exec"], None)),
+            mock.patch.object(codex_worker, "_execute_codex", return_value=(completed, None)) as execute,
+        ):
+            return codex_worker.codex_model_access_preflight_error(model), execute
+
+    def test_results_survive_process_restart_until_ttl_or_policy_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_policy(root, {"default_model": "gpt-5-mini", "preflight_cache": {"negative_ttl_hours": 0.5}})
+
+            error, execute = self._probe(ModelPreflightCache(root), "GPT-5-Mini")
+            self.assertIsNone(error)
+            self.assertEqual(execute.call_count, 1)
+
+            # A fresh cache object stands in for a new daemon process.
+            error, execute = self._probe(ModelPreflightCache(root), "gpt-5-mini")
+            self.assertIsNone(error)
+            execute.assert_not_called()
+
+            denied, execute = self._probe(
+                ModelPreflightCache(root), "gpt-old", returncode=1, stderr="error: unknown model gpt-old"
+            )
+            self.assertIn("model", str(denied))
+            self.assertEqual(execute.call_count, 1)
+            cache = ModelPreflightCache(root)
+            self.assertEqual(cache.lookup("gpt-old"), (True, denied))
+            self.assertEqual(cache.lookup("gpt-old", now=time.time() + 1801), (False, None))
+            self.assertEqual(cache.lookup("gpt-5-mini", now=time.time() + 1801), (True, None))
+
+            _write_policy(root, {"default_model": "gpt-5"})
+            self.assertTrue(cache.sync_policy())
+            self.assertEqual(cache.lookup("gpt-5-mini"), (False, None))
+            error, execute = self._probe(cache, "gpt-5-mini")
+            self.assertEqual(execute.call_count, 1)
+
+    def test_timeouts_are_not_persisted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_policy(root, {})
+            timeout = codex_worker.WorkerResult(status="failed", summary="Worker timed out after 20s", stdout="", stderr="", exit_code=124)
+            cache = ModelPreflightCache(root)
+            with (
+                mock.patch.dict(os.environ, {"REDKEEPERS_WORKER_MODE": ""}),
+                mock.patch.dict(codex_worker._MODEL_ACCESS_PRECHECK_CACHE, clear=True),
+                mock.patch.object(codex_worker, "_MODEL_PREFLIGHT_DISK_CACHE", cache),
+                mock.patch.object(codex_worker, "_parse_and_resolve_codex_command", return_value=(["codex", "exec"], None)),
+                mock.patch.object(codex_worker, "_execute_codex", return_value=(None, timeout)),
+            ):
+                self.assertEqual(codex_worker.codex_model_access_preflight_error("gpt-5"), "Worker timed out after 20s")
+            self.assertEqual(cache.lookup("gpt-5"), (False, None))
+
+    def test_independent_models_are_probed_concurrently(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        calls: list[str] = []
+
+        def _slow_probe(model: str) -> str | None:
+            nonlocal active, peak
+            with lock:
+                calls.append(model)
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.1)
+            with lock:
+                active -= 1
+            return "unknown model" if model == "gpt-old" else None
+
+        results = codex_worker.probe_model_access_concurrently(
+            ["gpt-5", "GPT-5", "gpt-5-mini", "gpt-old", None, ""], probe=_slow_probe
+        )
+        self.assertEqual(sorted(calls), ["gpt-5", "gpt-5-mini", "gpt-old"])
+        self.assertEqual(peak, 3)
+        self.assertEqual(results, {"gpt-5": None, "GPT-5": None, "gpt-5-mini": None, "gpt-old": "unknown model"})
+
+
+    def test_concurrent_preflights_share_one_disk_cache(self) -> None:
+        barrier = threading.Barrier(8, timeout=5)
+        seen: list[ModelPreflightCache | None] = []
+
+        def _get() -> None:
+            barrier.wait()
+            seen.append(codex_worker._model_preflight_disk_cache())
+
+        with mock.patch.dict(os.environ, {"REDKEEPERS_MODEL_PREFLIGHT_CACHE": "1"}):
+            threads = [threading.Thread(target=_get) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(seen), 8)
+        self.assertIsNotNone(seen[0])
+        self.assertTrue(all(cache is seen[0] for cache in seen))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import sys
 import tempfile
 import unittest
+from datetime import date
 from pathlib import Path
 
 
@@ -79,6 +81,69 @@ class ModelStatsTrackerTests(unittest.TestCase):
         self.assertEqual(session["ended_at"], "2026-01-01T00:02:00+00:00")
         self.assertIn("session-a", saved["session_order"])
 
+    def test_old_sessions_roll_into_daily_then_weekly_rollups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracker = model_stats.ModelStatsTracker(Path(tmpdir), hot_sessions=2, daily_rollup_days=100_000)
+            data = tracker.load()
+            starts = ["2026-01-01T08:00:00+00:00", "2026-01-01T20:00:00+00:00", "2026-03-02T08:00:00+00:00"]
+            for index, started_at in enumerate(starts):
+                session_id = f"session-{index}"
+                tracker.start_session(data, session_id=session_id, started_at=started_at, pid=index, mode="run")
+                tracker.record_run(
+                    data,
+                    session_id=session_id,
+                    agent_id="rowan-hale",
+                    role="design",
+                    outcome="completed",
+                    requested_model="gpt-5",
+                    used_model="gpt-5",
+                    fallback_used=False,
+                    tokens_in=10,
+                    tokens_out=5,
+                    runtime_seconds=2.0,
+                )
+
+            # Starting the third session rolled the oldest one into its day.
+            self.assertEqual(data["session_order"], ["session-1", "session-2"])
+            self.assertEqual(sorted(data["sessions"]), ["session-1", "session-2"])
+            self.assertEqual(data["rollups"]["daily"]["2026-01-01"]["sessions"], 1)
+
+            tracker.hot_sessions = 1
+            tracker.daily_rollup_days = 7
+            result = tracker.apply_retention(data, today=date(2026, 3, 3))
+            self.assertEqual(result, {"sessions_rolled": 1, "days_folded": 1, "weeks_pruned": 0})
+            self.assertEqual(data["session_order"], ["session-2"])
+
+            weekly = data["rollups"]["weekly"]["2026-W01"]
+            self.assertEqual(data["rollups"]["daily"], {})
+            self.assertEqual(weekly["sessions"], 2)
+            self.assertEqual(weekly["totals"]["runs"], 2)
+            self.assertEqual(weekly["by_model"]["gpt-5"]["agents"]["rowan-hale"]["tokens_in"], 20)
+            self.assertEqual(weekly["first_started_at"], starts[0])
+
+            # Rollups plus hot sessions still add up to the lifetime totals.
+            rolled_runs = weekly["totals"]["runs"]
+            hot_runs = sum(session["totals"]["runs"] for session in data["sessions"].values())
+            self.assertEqual(rolled_runs + hot_runs, data["lifetime"]["totals"]["runs"])
+
+            # Weeks past `weekly_rollup_weeks` are dropped; lifetime totals keep their runs.
+            tracker.weekly_rollup_weeks = 4
+            result = tracker.apply_retention(data, today=date(2026, 3, 3))
+            self.assertEqual(result["weeks_pruned"], 1)
+            self.assertEqual(data["rollups"]["weekly"], {})
+            self.assertEqual(data["lifetime"]["totals"]["runs"], 3)
+
+    def test_saves_the_stats_file_compactly(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracker = model_stats.ModelStatsTracker(Path(tmpdir))
+            data = tracker.load()
+            tracker.start_session(data, session_id="session-0", started_at="2026-03-02T08:00:00+00:00", pid=1, mode="run")
+            tracker.save(data)
+
+            text = tracker.path.read_text(encoding="utf-8")
+            self.assertEqual(text.count("\n"), 1)
+            self.assertEqual(json.loads(text)["session_order"], ["session-0"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import orchestrator  # noqa: E402
+from codex_worker import WorkerResult  # noqa: E402
+from prompt_builder import restamp_prompt  # noqa: E402
+
+
+def _item(item_id: str, *, owner_role: str) -> dict[str, object]:
+    ts = "2026-02-25T19:00:00+00:00"
+    return {
+        "id": item_id,
+        "title": f"Serial item {item_id}",
+        "description": "Speculative preparation test.",
+        "milestone": "M1",
+        "type": "feature",
+        "priority": "high",
+        "owner_role": owner_role,
+        "preferred_agent": None,
+        "dependencies": [],
+        "inputs": [],
+        "acceptance_criteria": ["item completes"],
+        "validation_commands": [],
+        "status": "queued",
+        "retry_count": 0,
+        "created_at": ts,
+        "updated_at": ts,
+        "estimated_effort": "S",
+        "token_budget": 1000,
+        "result_summary": None,
+        "blocker_reason": None,
+        "escalation_target": None,
+    }
+
+
+class NextItemPreparationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        backlog = self.root / "coordination" / "backlog"
+        backlog.mkdir(parents=True)
+        items = [_item("RK-SER-1", owner_role="frontend"), _item("RK-SER-2", owner_role="qa")]
+        (backlog / "work-items.json").write_text(json.dumps(items) + "\n", encoding="utf-8")
+        (backlog / "completed-items.json").write_text("[]\n", encoding="utf-8")
+        (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+        self.events: list[tuple[str, dict[str, object]]] = []
+        self.prompts: dict[str, str] = {}
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run_cycles(self, preparer: orchestrator.NextItemPreparer, *, between=None) -> mock.Mock:
+        agents = {
+            "rowan-hale": {"display_name": "Rowan Hale", "role": "frontend", "model": "gpt-5.3-codex", "reasoning": "medium"},
+            "tomas-grell": {"display_name": "Tomas Grell", "role": "qa", "model": "gpt-5.3-codex", "reasoning": "medium"},
+            "mara-voss": {"display_name": "Mara Voss", "role": "lead", "model": "gpt-5.3-codex", "reasoning": "high"},
+        }
+        policies = {
+            "routing": {"owner_role_map": {"frontend": "rowan-hale", "qa": "tomas-grell"}, "fallback_agent": "mara-voss"},
+            "retry": {"max_retries_per_item_per_agent": 2, "worker_timeout_seconds": 5},
+            "model": {},
+            "commit": {"default_validation_commands": [], "commit_enabled": False},
+        }
+
+        def fake_build_prompt(_root: Path, *, agent_id: str, work_item: dict[str, object], **_kwargs: object) -> str:
+            return f"Timestamp (UTC): built\nprompt for {work_item['id']} by {agent_id}"
+
+        def fake_run_agent(**kwargs: object) -> WorkerResult:
+            self.prompts[str(kwargs["agent_id"])] = str(kwargs["prompt"])
+            return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+        daemon_state_path = self.root / "coordination" / "runtime" / "daemon-state.json"
+        with (
+            mock.patch.object(orchestrator, "ROOT", self.root),
+            mock.patch.object(orchestrator, "DAEMON_STATE_PATH", daemon_state_path),
+            mock.patch.object(orchestrator, "validate_environment", return_value=[]),
+            mock.patch.object(
+                orchestrator,
+                "repair_backlog_archive_duplicates",
+                return_value={"completed_removed": 0, "blocked_removed": 0, "completed_duplicate_ids": [], "blocked_duplicate_ids": []},
+            ),
+            mock.patch.object(
+                orchestrator,
+                "emit_event",
+                side_effect=lambda event_type, _message, **fields: self.events.append((event_type, fields)),
+            ),
+            mock.patch.object(orchestrator, "set_daemon_state", side_effect=lambda **patch: patch),
+            mock.patch.object(orchestrator, "append_jsonl"),
+            mock.patch.object(orchestrator, "revisit_recoverable_blocked_items", return_value=[]),
+            mock.patch.object(orchestrator, "ensure_backlog_refill_item", return_value=None),
+            mock.patch.object(orchestrator, "load_agent_catalog", return_value=agents),
+            mock.patch.object(orchestrator, "load_policies", return_value=policies),
+            mock.patch.object(orchestrator, "codex_model_access_preflight_error", return_value=None),
+            mock.patch.object(orchestrator, "build_prompt", side_effect=fake_build_prompt) as build_prompt,
+            mock.patch.object(orchestrator, "run_agent", side_effect=fake_run_agent),
+            mock.patch.object(orchestrator, "run_validation_for_item", return_value=(True, [])),
+        ):
+            self.assertEqual(orchestrator.process_one(dry_run=False, verbose=False, preparer=preparer), 0)
+            if between is not None:
+                between()
+            self.assertEqual(orchestrator.process_one(dry_run=False, verbose=False, preparer=preparer), 0)
+        return build_prompt
+
+    def _select_outcomes(self) -> list[object]:
+        return [fields.get("prepared") for kind, fields in self.events if kind == "select"]
+
+    def test_next_item_prompt_is_prepared_during_current_run(self) -> None:
+        preparer = orchestrator.NextItemPreparer()
+        build_prompt = self._run_cycles(preparer)
+
+        self.assertEqual(self._select_outcomes(), ["none", "hit"])
+        self.assertEqual(preparer.hits, 1)
+        # RK-SER-2's prompt was built while RK-SER-1 ran and not rebuilt afterwards.
+        self.assertEqual(build_prompt.call_count, 2)
+        self.assertIn("prompt for RK-SER-2 by tomas-grell", self.prompts["tomas-grell"])
+        self.assertNotIn("Timestamp (UTC): built", self.prompts["tomas-grell"])
+        starts = [fields for kind, fields in self.events if kind == "agent_start"]
+        self.assertTrue(starts[1].get("prompt_prepared"))
+
+    def test_preparation_is_discarded_when_the_item_changes(self) -> None:
+        preparer = orchestrator.NextItemPreparer()
+
+        def edit_next_item() -> None:
+            path = self.root / "coordination" / "backlog" / "work-items.json"
+            items = json.loads(path.read_text(encoding="utf-8"))
+            for entry in items:
+                if entry["id"] == "RK-SER-2":
+                    entry["description"] = "Edited by a human while RK-SER-1 ran."
+            path.write_text(json.dumps(items) + "\n", encoding="utf-8")
+
+        build_prompt = self._run_cycles(preparer, between=edit_next_item)
+
+        self.assertEqual(self._select_outcomes(), ["none", "miss"])
+        self.assertEqual(build_prompt.call_count, 3)
+        self.assertEqual(preparer.misses, 1)
+
+    def test_restamp_prompt_only_replaces_header_timestamp(self) -> None:
+        prompt = "# Task\n\nTimestamp (UTC): old\nAgent: x\n\nTimestamp (UTC): quoted in an input\n"
+        self.assertEqual(
+            restamp_prompt(prompt, "new"),
+            "# Task\n\nTimestamp (UTC): new\nAgent: x\n\nTimestamp (UTC): quoted in an input\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,7 @@ class EventFormatTests(unittest.TestCase):
         out = io.StringIO()
         with (
             mock.patch.object(orchestrator, "utc_now_iso", return_value="2026-02-26T08:28:43.239364+00:00"),
-            mock.patch.object(orchestrator, "append_jsonl"),
+            mock.patch.object(orchestrator, "RUNTIME_STATE"),
             mock.patch.object(orchestrator, "COLOR_ENABLED", False),
             redirect_stdout(out),
         ):
@@ -44,7 +44,7 @@ class EventFormatTests(unittest.TestCase):
         out = io.StringIO()
         with (
             mock.patch.object(orchestrator, "utc_now_iso", return_value="2026-02-26T08:34:10.000000+00:00"),
-            mock.patch.object(orchestrator, "append_jsonl"),
+            mock.patch.object(orchestrator, "RUNTIME_STATE"),
             mock.patch.object(orchestrator, "COLOR_ENABLED", False),
             redirect_stdout(out),
         ):
@@ -65,7 +65,7 @@ class EventFormatTests(unittest.TestCase):
         out = io.StringIO()
         with (
             mock.patch.object(orchestrator, "utc_now_iso", return_value="2026-02-26T08:35:22.900000+00:00"),
-            mock.patch.object(orchestrator, "append_jsonl"),
+            mock.patch.object(orchestrator, "RUNTIME_STATE"),
             mock.patch.object(orchestrator, "COLOR_ENABLED", False),
             redirect_stdout(out),
         ):
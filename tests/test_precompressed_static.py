@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.request import Request, urlopen
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import precompressed_static as precompressed  # noqa: E402
+
+
+class _QuietHandler(precompressed.PrecompressedRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+class AcceptEncodingTests(unittest.TestCase):
+    def test_quality_zero_refuses_and_wildcard_expands(self) -> None:
+        self.assertEqual(precompressed.accepted_encodings("gzip, deflate, br;q=0"), {"gzip", "deflate"})
+        self.assertEqual(precompressed.accepted_encodings("*;q=0.5, gzip;q=0"), {"*", "br"})
+        self.assertEqual(precompressed.accepted_encodings(None), set())
+
+
+class ResolveEncodingsTests(unittest.TestCase):
+    def test_requested_encodings_follow_preference_order_and_are_validated(self) -> None:
+        with mock.patch.object(precompressed, "_brotli_module", return_value=object()):
+            self.assertEqual(precompressed.resolve_encodings(["gzip", " BR ", ""]), ["br", "gzip"])
+        with mock.patch.object(precompressed, "_brotli_module", return_value=None):
+            self.assertEqual(precompressed.resolve_encodings(precompressed.DEFAULT_ENCODINGS), ["gzip"])
+            with self.assertRaises(ValueError):
+                precompressed.resolve_encodings(["br"])
+        with self.assertRaises(ValueError):
+            precompressed.resolve_encodings(["zstd"])
+
+
+class CompressFileTests(unittest.TestCase):
+    def test_gzip_variant_is_deterministic_and_round_trips(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "app.js"
+            source.write_bytes(b"console.log('redkeepers');\n" * 200)
+            first = precompressed.compress_file("gzip", source, root / "a.gz")
+            second = precompressed.compress_file("gzip", source, root / "b.gz")
+            self.assertEqual(first, second)
+            self.assertEqual((root / "a.gz").read_bytes(), (root / "b.gz").read_bytes())
+            self.assertEqual(first[0], (root / "a.gz").stat().st_size)
+            self.assertEqual(gzip.decompress((root / "a.gz").read_bytes()), source.read_bytes())
+
+
+class PrecompressedHandlerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.body = b"body { color: #c33; }\n" * 100
+        (self.root / "styles.css").write_bytes(self.body)
+        (self.root / "styles.css.gz").write_bytes(gzip.compress(self.body, mtime=0))
+        (self.root / "plain.txt").write_bytes(b"no variants here\n")
+
+        handler = partial(_QuietHandler, directory=str(self.root))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 2)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _get(self, path: str, accept: str | None = None) -> tuple[dict[str, str], bytes]:
+        headers = {"Accept-Encoding": accept} if accept is not None else {}
+        with urlopen(Request(f"{self.base_url}{path}", headers=headers), timeout=5) as response:
+            return {key.lower(): value for key, value in response.headers.items()}, response.read()
+
+    def test_serves_gzip_variant_when_accepted(self) -> None:
+        headers, body = self._get("/styles.css", "br, gzip")
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertTrue(headers["content-type"].startswith("text/css"))
+        self.assertEqual(headers["vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), self.body)
+
+    def test_serves_identity_when_not_accepted(self) -> None:
+        headers, body = self._get("/styles.css")
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(headers["vary"], "Accept-Encoding")
+        self.assertEqual(body, self.body)
+
+    def test_stale_variant_is_ignored(self) -> None:
+        original = (self.root / "styles.css").stat().st_mtime_ns
+        os.utime(self.root / "styles.css.gz", ns=(original - 10**9, original - 10**9))
+        headers, body = self._get("/styles.css", "gzip")
+        self.assertNotIn("content-encoding", headers)
+        self.assertNotIn("vary", headers)
+        self.assertEqual(body, self.body)
+
+    def test_files_without_variants_are_unchanged(self) -> None:
+        headers, body = self._get("/plain.txt", "gzip")
+        self.assertNotIn("content-encoding", headers)
+        self.assertNotIn("vary", headers)
+        self.assertEqual(body, b"no variants here\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
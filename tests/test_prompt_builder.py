@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from prompt_builder import SourceCache, build_prompt, estimate_tokens  # noqa: E402
+
+
+AGENT_CFG = {"display_name": "Tomas Grell", "role": "backend"}
+
+
+def _item(**overrides: object) -> dict[str, object]:
+    item: dict[str, object] = {
+        "id": "RK-1",
+        "title": "Wire the thing",
+        "milestone": "M1",
+        "type": "feature",
+        "priority": "high",
+        "description": "Do it.",
+        "acceptance_criteria": ["works"],
+        "validation_commands": ["python -m unittest"],
+        "inputs": [],
+        "token_budget": 8000,
+    }
+    item.update(overrides)
+    return item
+
+
+class PromptBuilderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        agent_dir = self.root / "agents" / "tomas-grell"
+        agent_dir.mkdir(parents=True)
+        (agent_dir / "AGENT.md").write_text("Backend lane only.\n", encoding="utf-8")
+        (agent_dir / "context.md").write_text("context line\n" * 40, encoding="utf-8")
+        (agent_dir / "working-notes.md").write_text("note line\n" * 400, encoding="utf-8")
+        (self.root / "big.md").write_text("big input line\n" * 2000, encoding="utf-8")
+        (self.root / "small.md").write_text("small input\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_sections_are_packed_into_item_token_budget_by_priority(self) -> None:
+        stats: dict[str, object] = {}
+        prompt = build_prompt(
+            self.root,
+            agent_id="tomas-grell",
+            agent_cfg=AGENT_CFG,
+            work_item=_item(inputs=["big.md", "small.md", "missing.md"], token_budget=3000),
+            stats=stats,
+            cache=SourceCache(),
+        )
+
+        self.assertLessEqual(estimate_tokens(prompt), 3000)
+        self.assertEqual(stats["prompt_tokens"], estimate_tokens(prompt))
+        self.assertEqual(stats["prompt_token_budget"], 3000)
+        sections = stats["prompt_sections"]
+        assert isinstance(sections, dict)
+        self.assertGreater(sections["inputs"], 1500)
+        self.assertEqual(sections["working_notes"], 0)
+        self.assertEqual(stats["prompt_trimmed"], ["current_context", "working_notes", "input:big.md"])
+        self.assertIn("Backend lane only.", prompt)
+        self.assertIn("## small.md\n\nsmall input", prompt)
+        self.assertIn("## missing.md\n\n[missing or non-file]", prompt)
+        self.assertIn("[truncated to fit token budget]", prompt)
+        self.assertIn("## Working Notes (recent summary)\n[omitted: over token budget]", prompt)
+        self.assertIn("STATUS: COMPLETED", prompt)
+
+    def test_roomy_budget_keeps_sources_whole(self) -> None:
+        stats: dict[str, object] = {}
+        prompt = build_prompt(
+            self.root,
+            agent_id="tomas-grell",
+            agent_cfg=AGENT_CFG,
+            work_item=_item(inputs=["big.md"], token_budget=20000),
+            stats=stats,
+            cache=SourceCache(),
+        )
+        self.assertEqual(stats["prompt_trimmed"], [])
+        self.assertIn("big input line\n" * 2000, prompt)
+        self.assertIn("## Agent Skill\n[No agent-specific skill file]", prompt)
+
+    def test_source_cache_rereads_only_changed_files(self) -> None:
+        cache = SourceCache()
+        kwargs = {"agent_id": "tomas-grell", "agent_cfg": AGENT_CFG, "work_item": _item(inputs=["small.md"]), "cache": cache}
+        build_prompt(self.root, **kwargs)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+        build_prompt(self.root, **kwargs)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+        small = self.root / "small.md"
+        small.write_text("small input, edited\n", encoding="utf-8")
+        stat = small.stat()
+        os.utime(small, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        prompt = build_prompt(self.root, **kwargs)
+        self.assertEqual((cache.hits, cache.misses), (7, 5))
+        self.assertIn("small input, edited", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
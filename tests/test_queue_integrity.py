@@ -88,6 +88,32 @@ class QueueIntegrityTests(unittest.TestCase):
         self.assertEqual(len(deduped), 1)
         self.assertEqual(deduped[0]["commit_sha"], "newsha")
 
+    def test_archive_duplicate_repair_folds_the_journal_in_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True, exist_ok=True)
+            completed = [
+                {"id": "RK-X", "status": "completed", "updated_at": "2026-02-25T10:00:00+00:00"},
+                {"id": "RK-X", "status": "completed", "updated_at": "2026-02-25T11:00:00+00:00"},
+            ]
+            (backlog / "completed-items.json").write_text(json.dumps(completed), encoding="utf-8")
+            (backlog / "work-items.json").write_text(json.dumps([{"id": "RK-B", "status": "queued"}]), encoding="utf-8")
+            (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+            queue = QueueManager(root)
+            queue.load(validate=False)
+            queue.mark_blocked("RK-B", "waiting on art")
+            queue.save()
+            self.assertTrue(queue.journal_path.exists())
+
+            repaired = orchestrator.repair_backlog_archive_duplicates(root)
+
+            self.assertEqual(repaired["completed_removed"], 1)
+            self.assertFalse(queue.journal_path.exists())
+            self.assertEqual(len(json.loads((backlog / "completed-items.json").read_text(encoding="utf-8"))), 1)
+            self.assertTrue(queue.refresh(validate=False))
+            self.assertEqual([item["id"] for item in queue.blocked], ["RK-B"])
+
     def test_recover_stale_in_progress_skips_archived_ids(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -398,6 +424,172 @@ class QueueIntegrityTests(unittest.TestCase):
         self.assertIsNotNone(blocker_reason)
         self.assertIn("RK-M1-0004-F01-F01-F01-ESC-F01-F01-ESC-F03", blocker_reason)
 
+    def test_status_index_and_completed_ids_follow_transitions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            queue = QueueManager(Path(tmpdir))
+            queue.active = [
+                {"id": "RK-1", "status": "queued", "dependencies": []},
+                {"id": "RK-2", "status": "queued", "dependencies": ["RK-1"]},
+            ]
+            queue.completed = []
+            queue.blocked = [{"id": "RK-3", "status": "blocked", "blocker_reason": "flaky"}]
+            completed_ids = queue.completed_ids()
+
+            queue.mark_assigned("RK-1", "mara-voss")
+            queue.mark_running("RK-1")
+            self.assertEqual([item["id"] for item in queue.items_with_status("queued")], ["RK-2"])
+            self.assertEqual([item["id"] for item in queue.items_with_status("running")], ["RK-1"])
+
+            queue.mark_completed("RK-1", "done")
+            self.assertIn("RK-1", completed_ids)
+            self.assertIsNone(queue.get_active_item("RK-1"))
+            self.assertEqual(queue.items_with_status("running"), [])
+
+            self.assertTrue(queue.requeue_blocked("RK-3", reason="retry"))
+            self.assertEqual([item["id"] for item in queue.items_with_status("queued")], ["RK-2", "RK-3"])
+            self.assertEqual([item["id"] for item in queue.active], ["RK-2", "RK-3"])
+            self.assertEqual(queue.blocked, [])
+            self.assertTrue(queue.has_item("RK-1"))
+            self.assertFalse(queue.has_item("RK-4"))
+
+    def test_indexed_store_round_trips_backlog_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True, exist_ok=True)
+            completed = [{"id": f"RK-{idx}", "status": "completed"} for idx in (3, 1, 2)]
+            (backlog / "work-items.json").write_text("[]\n", encoding="utf-8")
+            (backlog / "completed-items.json").write_text(json.dumps(completed), encoding="utf-8")
+            (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+
+            queue = QueueManager(root)
+            queue.load()
+            queue.save()
+
+            saved = json.loads((backlog / "completed-items.json").read_text(encoding="utf-8"))
+            self.assertEqual([item["id"] for item in saved], ["RK-3", "RK-1", "RK-2"])
+
+    def test_save_journals_transitions_and_load_replays_them(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True, exist_ok=True)
+            active = [
+                {"id": "RK-1", "status": "queued", "updated_at": "2026-02-25T10:00:00+00:00"},
+                {"id": "RK-2", "status": "queued", "updated_at": "2026-02-25T10:00:00+00:00"},
+            ]
+            completed_text = json.dumps([{"id": "RK-0", "status": "completed"}])
+            (backlog / "work-items.json").write_text(json.dumps(active), encoding="utf-8")
+            (backlog / "completed-items.json").write_text(completed_text, encoding="utf-8")
+            (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+
+            queue = QueueManager(root)
+            queue.load(validate=False)
+            queue.mark_running("RK-1")
+            queue.mark_completed("RK-1", "done")
+            queue.save()
+
+            # The completed archive waits for compaction; the journal carries the change.
+            self.assertEqual((backlog / "completed-items.json").read_text(encoding="utf-8"), completed_text)
+            self.assertTrue(queue.journal_path.exists())
+            saved_active = json.loads((backlog / "work-items.json").read_text(encoding="utf-8"))
+            self.assertEqual([item["id"] for item in saved_active], ["RK-2"])
+
+            reloaded = QueueManager(root)
+            reloaded.load(validate=False)
+            self.assertEqual([item["id"] for item in reloaded.completed], ["RK-0", "RK-1"])
+            self.assertIn("RK-1", reloaded.completed_ids())
+
+            self.assertTrue(reloaded.compact())
+            self.assertFalse(reloaded.journal_path.exists())
+            saved_completed = json.loads((backlog / "completed-items.json").read_text(encoding="utf-8"))
+            self.assertEqual([item["id"] for item in saved_completed], ["RK-0", "RK-1"])
+            self.assertEqual(saved_completed[1]["result_summary"], "done")
+
+    def test_compaction_skips_when_journal_has_unreplayed_records(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            first = QueueManager(root)
+            first.active = [{"id": "RK-1", "status": "queued"}]
+            first.save()
+            second = QueueManager(root)
+            second.load(validate=False)
+
+            first.mark_running("RK-1")
+            first.save()
+
+            self.assertFalse(second.compact())
+            reloaded = QueueManager(root)
+            reloaded.load(validate=False)
+            self.assertEqual(reloaded.active[0]["status"], "running")
+
+    def test_refresh_reloads_only_after_another_writer_changes_the_backlog(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            backlog = root / "coordination" / "backlog"
+            backlog.mkdir(parents=True, exist_ok=True)
+            active = [{"id": "RK-1", "status": "queued"}, {"id": "RK-2", "status": "queued"}]
+            (backlog / "work-items.json").write_text(json.dumps(active), encoding="utf-8")
+            queue = QueueManager(root)
+            queue.load(validate=False)
+
+            queue.mark_running("RK-1")
+            queue.save()
+            self.assertFalse(queue.refresh(validate=False))
+
+            other = QueueManager(root)
+            other.load(validate=False)
+            other.mark_running("RK-2")
+            other.save()
+            self.assertTrue(queue.refresh(validate=False))
+            self.assertEqual([item["status"] for item in queue.active], ["running", "running"])
+            self.assertFalse(queue.refresh(validate=False))
+
+            # An agent rewriting the snapshot directly is picked up as well.
+            edited = [*json.loads((backlog / "work-items.json").read_text(encoding="utf-8")), {"id": "RK-3", "status": "queued"}]
+            (backlog / "work-items.json").write_text(json.dumps(edited), encoding="utf-8")
+            self.assertTrue(queue.refresh(validate=False))
+            self.assertEqual([item["id"] for item in queue.items_with_status("queued")], ["RK-3"])
+
+    def test_save_journals_in_place_edits_without_touch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            queue = QueueManager(root)
+            queue.active = [{"id": "RK-1", "status": "queued"}, {"id": "RK-2", "status": "queued"}]
+            queue.blocked = [{"id": "RK-3", "status": "blocked"}]
+            queue.save()
+            queue.compact()
+
+            queue.get_active_item("RK-1")["status"] = "running"
+            queue.blocked[0]["blocker_reason"] = "waiting on art"
+            queue.save()
+
+            self.assertEqual([item["id"] for item in queue.items_with_status("running")], ["RK-1"])
+            reloaded = QueueManager(root)
+            reloaded.load(validate=False)
+            self.assertEqual([item["status"] for item in reloaded.active], ["running", "queued"])
+            self.assertEqual(reloaded.blocked[0]["blocker_reason"], "waiting on art")
+
+    def test_deferred_save_coalesces_saves_into_one_journal_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            queue = QueueManager(root)
+            queue.active = [{"id": "RK-1", "status": "queued"}, {"id": "RK-2", "status": "queued"}]
+            queue.save()
+
+            with mock.patch.object(queue, "_flush_journal", wraps=queue._flush_journal) as flush:
+                with queue.deferred_save():
+                    queue.mark_running("RK-1")
+                    queue.save()
+                    queue.mark_running("RK-2")
+                    queue.save()
+                    self.assertEqual(flush.call_count, 0)
+                self.assertEqual(flush.call_count, 1)
+
+            reloaded = QueueManager(root)
+            reloaded.load(validate=False)
+            self.assertEqual([item["status"] for item in reloaded.active], ["running", "running"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -280,6 +280,51 @@ class QueueSchedulerPriorityTests(unittest.TestCase):
         assert selected is not None
         self.assertEqual(selected["id"], "ROOT-A")
 
+    def test_dependency_graph_tracks_readiness_and_diamond_fanout_incrementally(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            queue = QueueManager(Path(tmpdir))
+            queue.completed = []
+            queue.blocked = []
+
+            def item(item_id: str, deps: list[str], second: int) -> dict[str, object]:
+                return {
+                    "id": item_id,
+                    "owner_role": "design",
+                    "priority": "normal",
+                    "status": "queued",
+                    "dependencies": deps,
+                    "created_at": f"2026-02-25T00:00:{second:02d}+00:00",
+                }
+
+            queue.active = [
+                item("TOP", [], 1),
+                item("LEFT", ["TOP"], 2),
+                item("RIGHT", ["TOP"], 3),
+                item("BOTTOM", ["LEFT", "RIGHT"], 4),
+            ]
+            routing = {"owner_role_map": {"design": "rowan-hale"}}
+
+            ranked = queue.ranked_candidates(routing, _base_stats())
+            self.assertEqual([row["id"] for row in ranked], ["TOP"])
+            metrics = queue._dependency_unlock_metrics(candidate_ids={"TOP"}, completed_ids=queue.completed_ids())
+            # The shared descendant is counted once, not once per path.
+            self.assertEqual(metrics["TOP"]["transitive_total"], 3)
+
+            queue.mark_completed("TOP", "done", agent_id="rowan-hale")
+            ranked = queue.ranked_candidates(routing, _base_stats())
+            self.assertEqual([row["id"] for row in ranked], ["LEFT", "RIGHT"])
+
+            queue.append_item(item("LATE", ["BOTTOM"], 5))
+            metrics = queue._dependency_unlock_metrics(
+                candidate_ids={"LEFT", "RIGHT"},
+                completed_ids=queue.completed_ids(),
+            )
+            self.assertEqual(metrics["LEFT"]["transitive_total"], 2)
+            self.assertEqual(metrics["RIGHT"]["transitive_total"], 2)
+
+            queue.mark_completed("LEFT", "done", agent_id="rowan-hale")
+            self.assertEqual([row["id"] for row in queue.ranked_candidates(routing, _base_stats())], ["RIGHT"])
+
     def test_fast_cycle_role_bias_deprioritizes_noncritical_qa(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             queue = QueueManager(Path(tmpdir))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import orchestrator  # noqa: E402
+import runtime_state  # noqa: E402
+from runtime_state import RuntimeStateWriter  # noqa: E402
+from stats_tracker import StatsTracker  # noqa: E402
+
+
+class RuntimeStateWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_saves_are_coalesced_and_readable_before_flush(self) -> None:
+        writer = RuntimeStateWriter(flush_interval_seconds=60)
+        path = self.root / "runtime" / "daemon-state.json"
+        log_path = self.root / "runtime" / "daemon-events.jsonl"
+        for step in range(3):
+            writer.save(path, {"step": step})
+            writer.append(log_path, {"kind": "tick", "step": step})
+
+        self.assertFalse(path.exists())
+        self.assertEqual(writer.load(path, {}), {"step": 2})
+        self.assertEqual(writer.pending(), 4)
+
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual((writer.file_writes, writer.coalesced_writes), (2, 2))
+        self.assertEqual(json.loads(path.read_text(encoding="utf-8")), {"step": 2})
+        lines = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([row["step"] for row in lines], [0, 1, 2])
+        self.assertEqual(writer.flush(), 0)
+
+    def test_durable_writes_flush_everything_and_fsync(self) -> None:
+        writer = RuntimeStateWriter(flush_interval_seconds=60)
+        stats_path = self.root / "agent-stats.json"
+        state_path = self.root / "daemon-state.json"
+        writer.save(stats_path, {"runs": 1})
+        with mock.patch.object(runtime_state.os, "fsync") as fsync:
+            writer.save(state_path, {"lock_held": True}, durable=True)
+        self.assertTrue(stats_path.exists())
+        self.assertTrue(state_path.exists())
+        self.assertGreaterEqual(fsync.call_count, 2)
+        self.assertEqual(writer.durable_flushes, 1)
+
+    def test_background_timer_flushes_after_interval(self) -> None:
+        writer = RuntimeStateWriter(flush_interval_seconds=0.05)
+        path = self.root / "progress-summary.json"
+        writer.save(path, {"daemon_state": "idle"})
+        deadline = time.monotonic() + 2.0
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(json.loads(path.read_text(encoding="utf-8")), {"daemon_state": "idle"})
+        self.assertEqual(writer.pending(), 0)
+
+    def test_trackers_read_their_own_pending_writes(self) -> None:
+        writer = RuntimeStateWriter(flush_interval_seconds=60)
+        tracker = StatsTracker(self.root, {"a1": {"display_name": "A", "role": "backend"}}, writer=writer)
+        stats = tracker.load()
+        stats["totals"]["completed_items"] = 7
+        tracker.save(stats)
+        self.assertFalse(tracker.path.exists())
+        self.assertEqual(tracker.load()["totals"]["completed_items"], 7)
+
+    def test_set_daemon_state_fsyncs_only_recovery_transitions(self) -> None:
+        writer = RuntimeStateWriter(flush_interval_seconds=60)
+        state_path = self.root / "daemon-state.json"
+        with (
+            mock.patch.object(orchestrator, "RUNTIME_STATE", writer),
+            mock.patch.object(orchestrator, "DAEMON_STATE_PATH", state_path),
+        ):
+            orchestrator.set_daemon_state(state="idle", last_run_summary="waiting")
+            self.assertFalse(state_path.exists())
+
+            orchestrator.set_daemon_state(state="running", active_item={"id": "RK-1"})
+            self.assertEqual(json.loads(state_path.read_text(encoding="utf-8"))["active_item"], {"id": "RK-1"})
+            self.assertEqual(writer.durable_flushes, 1)
+
+            # Re-stating the same active item is not a transition.
+            orchestrator.set_daemon_state(active_item={"id": "RK-1"}, last_run_summary="still running")
+            self.assertEqual(writer.durable_flushes, 1)
+            self.assertEqual(orchestrator.set_daemon_state()["last_run_summary"], "still running")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import math
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from schedule_sim import (  # noqa: E402
+    BacklogSnapshot,
+    PolicyVariant,
+    RoleModel,
+    ScheduleSimulator,
+    fit_role_models,
+    simulate_variants,
+)
+
+
+AGENTS = {
+    "ilya-fen": {"display_name": "Ilya Fen", "role": "backend"},
+    "sera-kest": {"display_name": "Sera Kest", "role": "frontend"},
+    "mara-voss": {"display_name": "Mara Voss", "role": "lead"},
+}
+ROUTING = {
+    "owner_role_map": {"backend": "ilya-fen", "frontend": "sera-kest", "lead": "mara-voss"},
+    "dependency_unlock_priority": {"enabled": True, "priority_boost_levels": 1},
+    "fallback_agent": "mara-voss",
+}
+RETRY = {
+    "max_retries_per_item_per_agent": 0,
+    "blocked_revisit": {
+        "enabled": True,
+        "max_items_per_cycle": 2,
+        "max_attempts_per_item": 2,
+        "cooldown_seconds": 900,
+        "include_reason_patterns": ["timed out"],
+    },
+}
+ALWAYS_COMPLETES = RoleModel(runtime_mu=math.log(600), runtime_sigma=0.0, outcomes={"completed": 1.0})
+
+
+def _item(item_id: str, role: str, *, deps: list[str] | None = None, status: str = "queued", **extra: object) -> dict[str, object]:
+    ts = "2026-02-25T19:00:00+00:00"
+    item: dict[str, object] = {
+        "id": item_id,
+        "title": item_id,
+        "description": "sim",
+        "milestone": "M1",
+        "type": "feature",
+        "priority": "normal",
+        "owner_role": role,
+        "preferred_agent": None,
+        "dependencies": deps or [],
+        "inputs": [],
+        "acceptance_criteria": ["done"],
+        "validation_commands": [],
+        "status": status,
+        "retry_count": 0,
+        "created_at": ts,
+        "updated_at": ts,
+        "estimated_effort": "S",
+        "token_budget": 1000,
+        "result_summary": None,
+        "blocker_reason": None,
+        "escalation_target": None,
+    }
+    item.update(extra)
+    return item
+
+
+def _snapshot(blocked: list[dict[str, object]] | None = None) -> BacklogSnapshot:
+    active = [
+        _item("RK-A", "backend"),
+        _item("RK-B", "frontend"),
+        _item("RK-C", "backend", deps=["RK-A"]),
+        _item("RK-D", "frontend", deps=["RK-B", "RK-C"]),
+    ]
+    return BacklogSnapshot(active, [], blocked or [], datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+
+class ScheduleSimulatorTests(unittest.TestCase):
+    def _simulator(self, snapshot: BacklogSnapshot, models: dict[str, RoleModel] | None = None) -> ScheduleSimulator:
+        return ScheduleSimulator(
+            snapshot,
+            agents=AGENTS,
+            policies={"routing": ROUTING, "retry": RETRY},
+            models=models or {"*": ALWAYS_COMPLETES},
+        )
+
+    def test_parallel_workers_shorten_makespan_down_to_the_critical_path(self) -> None:
+        simulator = self._simulator(_snapshot())
+        serial = simulator.run(PolicyVariant("serial", cycle_overhead_seconds=0.0), seed=1)
+        pooled = simulator.run(PolicyVariant("pool", workers=2, cycle_overhead_seconds=0.0), seed=1)
+
+        self.assertEqual((serial.completed, pooled.completed), (4, 4))
+        self.assertAlmostEqual(serial.makespan_seconds, 2400.0)
+        # RK-A -> RK-C -> RK-D is the longest chain; two workers reach it.
+        self.assertAlmostEqual(serial.critical_path_seconds, 1800.0)
+        self.assertAlmostEqual(pooled.makespan_seconds, 1800.0)
+        self.assertAlmostEqual(pooled.items_per_hour, 8.0)
+        self.assertAlmostEqual(serial.utilization()["ilya-fen"], 0.5)
+        self.assertEqual(sorted(pooled.utilization()), ["ilya-fen", "sera-kest"])
+
+    def test_blocked_items_are_revisited_on_the_simulated_clock(self) -> None:
+        recent = (datetime(2026, 3, 1, tzinfo=timezone.utc) - timedelta(seconds=60)).isoformat()
+        blocked = [
+            _item("RK-T", "backend", status="blocked", blocker_reason="Worker timed out after 1500s", updated_at=recent),
+            _item("RK-X", "backend", status="blocked", blocker_reason="Needs a design decision", updated_at=recent),
+        ]
+        result = self._simulator(_snapshot(blocked)).run(PolicyVariant("current", cycle_overhead_seconds=0.0), seed=1)
+
+        # RK-T reopens once its cooldown passes in simulated time; RK-X never matches the revisit patterns.
+        self.assertEqual(result.completed, 5)
+        self.assertEqual(result.blocked, 1)
+        self.assertGreaterEqual(result.makespan_seconds, 2400.0 + 600.0)
+
+    def test_draws_are_shared_across_variants_for_the_same_seed(self) -> None:
+        noisy = RoleModel(runtime_mu=math.log(600), runtime_sigma=0.8, outcomes={"completed": 0.7, "blocked": 0.3})
+        simulator = self._simulator(_snapshot(), {"*": noisy})
+        first = simulator.run(PolicyVariant("a"), seed=9)
+        again = simulator.run(PolicyVariant("a"), seed=9)
+        self.assertEqual(first, again)
+        self.assertNotEqual(first.makespan_seconds, simulator.run(PolicyVariant("a"), seed=10).makespan_seconds)
+
+    def test_role_models_are_fitted_from_run_history(self) -> None:
+        history = [
+            {"agent_id": "ilya-fen", "result": "completed", "runtime_seconds": 100.0},
+            {"agent_id": "ilya-fen", "result": "completed", "runtime_seconds": 400.0},
+            {"agent_id": "ilya-fen", "result": "completed", "runtime_seconds": 200.0},
+            {"agent_id": "ilya-fen", "result": "blocked", "runtime_seconds": 200.0, "summary": "Worker timed out"},
+            {"agent_id": "ilya-fen", "result": "failed_infrastructure", "runtime_seconds": 200.0},
+            {"agent_id": "sera-kest", "result": "completed", "runtime_seconds": 50.0},
+            {"agent_id": "unknown", "result": "completed", "runtime_seconds": 1.0},
+        ]
+        models = fit_role_models(history, AGENTS)
+        backend = models["backend"]
+        self.assertEqual(backend.samples, 5)
+        self.assertAlmostEqual(math.exp(backend.runtime_mu), 200.0, delta=1.0)
+        self.assertEqual(backend.outcomes, {"completed": 0.6, "blocked": 0.2, "failed": 0.2})
+        self.assertEqual(backend.blocker_reasons, ("Worker timed out",))
+        # Too few frontend runs to fit: falls back to the fit over all runs.
+        self.assertEqual(models["frontend"], models["*"])
+        self.assertEqual(models["*"].samples, 6)
+
+    def test_report_covers_each_variant_from_a_project_root(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "coordination" / "state").mkdir(parents=True)
+            (root / "coordination" / "state" / "agents.json").write_text(json.dumps(AGENTS), encoding="utf-8")
+            policies = root / "coordination" / "policies"
+            policies.mkdir(parents=True)
+            (policies / "routing-rules.yaml").write_text(json.dumps(ROUTING), encoding="utf-8")
+            (policies / "retry-policy.yaml").write_text(json.dumps(RETRY), encoding="utf-8")
+            _snapshot().write(root)
+
+            report = simulate_variants(
+                root,
+                [PolicyVariant("serial"), PolicyVariant("pool", workers=2)],
+                replications=3,
+                seed=1,
+                max_hours=100,
+            )
+            # The simulation works on a copy; the project backlog is untouched.
+            queued = json.loads((root / "coordination" / "backlog" / "work-items.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(report["snapshot"], {"queued": 4, "completed": 0, "blocked": 0})
+        self.assertEqual([row["variant"] for row in report["variants"]], ["serial", "pool"])
+        self.assertEqual(report["variants"][0]["replications"], 3)
+        self.assertLessEqual(report["variants"][1]["makespan_hours"], report["variants"][0]["makespan_hours"])
+        self.assertEqual({item["status"] for item in queued}, {"queued"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from screenshot_diff import compare_screenshots  # noqa: E402
+
+
+HAS_IMAGING = all(importlib.util.find_spec(name) is not None for name in ("numpy", "PIL"))
+
+
+def _write_png(path: Path, pixels: list[list[tuple[int, int, int, int]]]) -> None:
+    from PIL import Image  # type: ignore
+
+    image = Image.new("RGBA", (len(pixels[0]), len(pixels)))
+    image.putdata([pixel for row in pixels for pixel in row])
+    image.save(path, format="PNG")
+
+
+def _canvas(width: int, height: int, colour: tuple[int, int, int, int] = (20, 20, 20, 255)) -> list[list[tuple[int, int, int, int]]]:
+    return [[colour for _ in range(width)] for _ in range(height)]
+
+
+class ScreenshotDiffTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.baseline = self.root / "baseline.png"
+        self.current = self.root / "current.png"
+        self.heatmap = self.root / "current--diff.png"
+
+    def test_identical_files_short_circuit_on_hash_and_clear_stale_heatmap(self) -> None:
+        self.baseline.write_bytes(b"\x89PNG not really decoded")
+        self.current.write_bytes(b"\x89PNG not really decoded")
+        self.heatmap.write_bytes(b"stale")
+
+        diff = compare_screenshots(self.baseline, self.current, heatmap_path=self.heatmap)
+
+        self.assertEqual(diff.engine, "hash")
+        self.assertEqual(diff.percent, 0.0)
+        self.assertFalse(self.heatmap.exists())
+
+    @unittest.skipUnless(HAS_IMAGING, "needs numpy and Pillow")
+    def test_tiles_localize_change_and_heatmap_is_written(self) -> None:
+        before = _canvas(40, 30)
+        after = _canvas(40, 30)
+        for y in range(22, 26):
+            for x in range(25, 29):
+                after[y][x] = (255, 255, 255, 255)
+        _write_png(self.baseline, before)
+        _write_png(self.current, after)
+
+        diff = compare_screenshots(self.baseline, self.current, tile_size=8, heatmap_path=self.heatmap)
+
+        self.assertEqual(diff.engine, "numpy")
+        self.assertEqual(diff.changed_pixels, 16)
+        expected = 16 * 235 * 3 / (255.0 * 4 * 40 * 30) * 100
+        self.assertAlmostEqual(diff.percent, expected, places=6)
+        # Same pixels in both tiles, but the clipped bottom tile is smaller, so it scores worse.
+        self.assertEqual([(tile.x, tile.y) for tile in diff.tiles], [(24, 24), (24, 16)])
+        self.assertEqual((diff.tiles[0].width, diff.tiles[0].height), (8, 6))
+        self.assertEqual(diff.heatmap_path, self.heatmap)
+        self.assertTrue(self.heatmap.exists())
+
+    @unittest.skipUnless(HAS_IMAGING, "needs numpy and Pillow")
+    def test_pixel_tolerance_ignores_small_channel_noise(self) -> None:
+        before = _canvas(16, 16)
+        after = _canvas(16, 16, (23, 22, 20, 255))
+        _write_png(self.baseline, before)
+        _write_png(self.current, after)
+
+        strict = compare_screenshots(self.baseline, self.current)
+        tolerant = compare_screenshots(self.baseline, self.current, pixel_tolerance=3, heatmap_path=self.heatmap)
+
+        self.assertGreater(strict.percent, 0.0)
+        self.assertEqual(tolerant.percent, 0.0)
+        self.assertEqual(tolerant.ignored_pixels, 256)
+        self.assertEqual(tolerant.tiles, [])
+
+    @unittest.skipUnless(HAS_IMAGING, "needs numpy and Pillow")
+    def test_antialiasing_mode_ignores_one_pixel_edge_shift_but_not_new_content(self) -> None:
+        def _with_edge(column: int) -> list[list[tuple[int, int, int, int]]]:
+            pixels = _canvas(24, 24)
+            for row in pixels:
+                for x in range(column, 24):
+                    row[x] = (230, 230, 230, 255)
+            return pixels
+
+        _write_png(self.baseline, _with_edge(12))
+        _write_png(self.current, _with_edge(13))
+        shifted = compare_screenshots(self.baseline, self.current, ignore_antialiasing=True)
+        self.assertEqual(shifted.percent, 0.0)
+        self.assertEqual(shifted.ignored_pixels, 24)
+
+        blob = _with_edge(12)
+        for y in range(4, 8):
+            for x in range(2, 6):
+                blob[y][x] = (200, 0, 0, 255)
+        _write_png(self.current, blob)
+        changed = compare_screenshots(self.baseline, self.current, ignore_antialiasing=True)
+        self.assertEqual(changed.changed_pixels, 16)
+
+    @unittest.skipUnless(HAS_IMAGING, "needs numpy and Pillow")
+    def test_size_mismatch_is_full_difference(self) -> None:
+        _write_png(self.baseline, _canvas(10, 10))
+        _write_png(self.current, _canvas(10, 12))
+
+        diff = compare_screenshots(self.baseline, self.current)
+
+        self.assertEqual(diff.percent, 100.0)
+        self.assertEqual(diff.size, (10, 12))
+
+
+if __name__ == "__main__":
+    unittest.main()
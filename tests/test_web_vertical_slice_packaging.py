@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import web_vertical_slice_packaging as packaging  # noqa: E402
+
+
+class IncrementalStagingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.client = root / "client-web"
+        runtime = root / "runtime"
+        artifacts = runtime / "artifacts"
+        for name, value in {
+            "CLIENT_WEB_ROOT": self.client,
+            "RUNTIME_ROOT": runtime,
+            "STAGING_ROOT": runtime / "staging",
+            "ARTIFACTS_ROOT": artifacts,
+            "SMOKE_ROOT": runtime / "smoke-run",
+            "ARTIFACT_PATH": artifacts / packaging.ARTIFACT_NAME,
+            "ARTIFACT_SHA_PATH": artifacts / f"{packaging.ARTIFACT_NAME}.sha256",
+            "STAGE_CACHE_PATH": runtime / "staging-cache.json",
+        }.items():
+            patcher = mock.patch.object(packaging, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self._write("index.html", "<html>shell</html>\n")
+        self._write("styles.css", "body { color: red; }\n")
+        self._write("assets/placeholder.txt", "placeholder\n")
+        self._write(
+            "release-metadata.placeholder.json",
+            json.dumps({"art_status": "placeholder-only", "placeholder_assets": [{"path": "assets/placeholder.txt"}]}),
+        )
+
+    def _write(self, relative: str, text: str) -> None:
+        path = self.client / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        # Older than the racy-mtime window, as files are between real package runs.
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+
+    def _package(self, *, expect_rc: int = 0, encodings: str = "gzip", **flags: bool) -> str:
+        args = argparse.Namespace(
+            clean=flags.get("clean", False),
+            rebuild=flags.get("rebuild", False),
+            encodings=encodings,
+        )
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(packaging._package(args), expect_rc)
+        return out.getvalue()
+
+    def test_second_run_reuses_staged_files_and_artifact(self) -> None:
+        first = self._package(clean=True)
+        artifact = packaging.ARTIFACT_PATH.read_bytes()
+        self.assertIn("copied: 4, unchanged: 0", first)
+
+        with mock.patch.object(packaging, "_copy_and_hash", side_effect=AssertionError("recopied")), mock.patch.object(
+            packaging, "_build_deterministic_zip", side_effect=AssertionError("rezipped")
+        ):
+            second = self._package(clean=True)
+
+        self.assertIn("copied: 0, unchanged: 4", second)
+        self.assertIn("Artifact rebuilt: no", second)
+        self.assertEqual(packaging.ARTIFACT_PATH.read_bytes(), artifact)
+
+    def test_changed_file_is_recopied_and_matches_a_full_rebuild(self) -> None:
+        self._package()
+        self._write("styles.css", "body { color: blue; }\n")
+        incremental = self._package()
+        self.assertIn("copied: 1, unchanged: 3", incremental)
+        self.assertIn("Artifact rebuilt: yes", incremental)
+        artifact = packaging.ARTIFACT_PATH.read_bytes()
+
+        manifest = json.loads((packaging.STAGING_ROOT / packaging.MANIFEST_REL_PATH).read_text(encoding="utf-8"))
+        styles = next(entry for entry in manifest["files"] if entry["path"] == "styles.css")
+        self.assertEqual(styles["sha256"], packaging._sha256_file(self.client / "styles.css"))
+
+        self.assertIn("copied: 4, unchanged: 0", self._package(rebuild=True))
+        self.assertEqual(packaging.ARTIFACT_PATH.read_bytes(), artifact)
+
+    def test_removed_source_file_leaves_staging_and_artifact(self) -> None:
+        self._package()
+        (self.client / "styles.css").unlink()
+        self._package()
+        self.assertFalse((packaging.STAGING_ROOT / "styles.css").exists())
+        with zipfile.ZipFile(packaging.ARTIFACT_PATH) as archive:
+            self.assertNotIn("styles.css", archive.namelist())
+
+    def test_edited_staged_copy_is_not_trusted(self) -> None:
+        self._package()
+        staged = packaging.STAGING_ROOT / "index.html"
+        staged.write_text("tampered\n", encoding="utf-8")
+        self.assertIn("copied: 1, unchanged: 3", self._package())
+        self.assertEqual(staged.read_text(encoding="utf-8"), "<html>shell</html>\n")
+
+    def test_text_assets_get_gzip_variants_listed_in_manifest_and_stored_in_zip(self) -> None:
+        app = "console.log('redkeepers');\n" * 100
+        self._write("app.js", app)
+        self._package()
+
+        manifest = json.loads((packaging.STAGING_ROOT / packaging.MANIFEST_REL_PATH).read_text(encoding="utf-8"))
+        self.assertIn("gzip", manifest["deterministic_packaging"]["precompressed_encodings"])
+        by_path = {entry["path"]: entry for entry in manifest["files"]}
+        self.assertNotIn("app.js.gz", by_path)
+        self.assertNotIn("encodings", by_path["index.html"])  # below the size threshold
+        variant = by_path["app.js"]["encodings"]["gzip"]
+        self.assertEqual(variant["path"], "app.js.gz")
+        self.assertEqual(variant["sha256"], packaging._sha256_file(packaging.STAGING_ROOT / "app.js.gz"))
+
+        with zipfile.ZipFile(packaging.ARTIFACT_PATH) as archive:
+            names = archive.namelist()
+            info = archive.getinfo("app.js.gz")
+            self.assertEqual(archive.getinfo("app.js").compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(gzip.decompress(archive.read("app.js.gz")).decode("utf-8"), app)
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(info.date_time, packaging.ZIP_TIMESTAMP)
+        self.assertEqual(info.external_attr >> 16, 0o100000 | packaging.ZIP_FILE_MODE)
+
+        with mock.patch.object(packaging, "compress_file", side_effect=AssertionError("recompressed")):
+            self._package()
+
+    def test_encodings_are_explicit_and_br_without_brotli_blocks(self) -> None:
+        self._write("app.js", "console.log('redkeepers');\n" * 100)
+        self._package(encodings="")
+        manifest = json.loads((packaging.STAGING_ROOT / packaging.MANIFEST_REL_PATH).read_text(encoding="utf-8"))
+        self.assertEqual(manifest["deterministic_packaging"]["precompressed_encodings"], [])
+        self.assertFalse((packaging.STAGING_ROOT / "app.js.gz").exists())
+
+        with mock.patch("precompressed_static._brotli_module", return_value=None):
+            out = self._package(expect_rc=1, encodings="gzip,br")
+        self.assertIn("STATUS: BLOCKED", out)
+        self.assertIn("brotli package is not installed", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import orchestrator  # noqa: E402
+from codex_worker import WorkerResult  # noqa: E402
+from queue_manager import QueueManager  # noqa: E402
+from worker_pool import find_scope_conflict, item_write_scope, normalize_scope_path  # noqa: E402
+
+
+class WriteScopeTests(unittest.TestCase):
+    def test_directory_inputs_are_normalized_to_prefix_scopes(self) -> None:
+        self.assertEqual(normalize_scope_path("./client-web"), "client-web/")
+        self.assertEqual(normalize_scope_path("tools\\queue_manager.py"), "tools/queue_manager.py")
+        self.assertEqual(normalize_scope_path("../outside"), "")
+
+    def test_disjoint_inputs_do_not_conflict(self) -> None:
+        left = item_write_scope({"inputs": ["client-web/"]}, "rowan-hale")
+        right = item_write_scope({"inputs": ["tools/render_status.py"]}, "tomas-grell")
+        self.assertFalse(left.exclusive)
+        self.assertIsNone(find_scope_conflict(right, [left]))
+
+    def test_overlapping_inputs_and_same_agent_conflict(self) -> None:
+        left = item_write_scope({"inputs": ["client-web/"]}, "rowan-hale")
+        nested = item_write_scope({"inputs": ["client-web/index.html"]}, "tomas-grell")
+        same_agent = item_write_scope({"inputs": ["docs/"]}, "rowan-hale")
+        self.assertIs(find_scope_conflict(nested, [left]), left)
+        self.assertIs(find_scope_conflict(same_agent, [left]), left)
+
+    def test_shared_state_or_missing_inputs_are_exclusive(self) -> None:
+        self.assertTrue(item_write_scope({"inputs": []}, "mara-voss").exclusive)
+        self.assertTrue(item_write_scope({"inputs": ["coordination/backlog/work-items.json"]}, "mara-voss").exclusive)
+
+
+class WorkerPoolDispatchTests(unittest.TestCase):
+    def test_disjoint_items_run_concurrently_and_complete(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(
+                root,
+                [
+                    self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"]),
+                    self._base_item("RK-POOL-2", owner_role="qa", inputs=["tests/"]),
+                ],
+            )
+            barrier = threading.Barrier(2, timeout=5)
+
+            def fake_run_agent(**kwargs: object) -> WorkerResult:
+                # Both workers must be in flight at the same time to pass the barrier.
+                barrier.wait()
+                workdir = Path(str(kwargs["project_root"]))
+                agent_id = str(kwargs["agent_id"])
+                (workdir / f"{agent_id}-in-scope.txt").write_text("declared\n", encoding="utf-8")
+                # Writes outside the declared inputs must still be committed with their own item.
+                (workdir / "notes").mkdir(exist_ok=True)
+                (workdir / "notes" / f"{agent_id}.md").write_text("undeclared\n", encoding="utf-8")
+                return WorkerResult(status="completed", summary=f"done by {agent_id}", stdout="", stderr="", exit_code=0)
+
+            rc, run_history, commit_calls = self._run_pool(root, workers=2, run_agent=fake_run_agent)
+
+            self.assertEqual(rc, 0)
+            queue = QueueManager(root)
+            queue.load()
+            self.assertEqual(sorted(item["id"] for item in queue.completed), ["RK-POOL-1", "RK-POOL-2"])
+            self.assertEqual([row["result"] for row in run_history], ["completed", "completed"])
+            committed = {
+                item_id: sorted(path for path in files if not path.startswith("coordination/"))
+                for item_id, files in commit_calls
+            }
+            self.assertEqual(
+                committed,
+                {
+                    "RK-POOL-1": ["notes/rowan-hale.md", "rowan-hale-in-scope.txt"],
+                    "RK-POOL-2": ["notes/tomas-grell.md", "tomas-grell-in-scope.txt"],
+                },
+            )
+            self.assertEqual(self._git(root, "worktree", "list").count("\n"), 1)
+
+    def test_crashed_worker_blocks_only_its_item(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(
+                root,
+                [
+                    self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"]),
+                    self._base_item("RK-POOL-2", owner_role="qa", inputs=["tests/"]),
+                ],
+            )
+
+            def fake_run_agent(**kwargs: object) -> WorkerResult:
+                if kwargs["agent_id"] == "rowan-hale":
+                    raise OSError("wrapper exploded")
+                time.sleep(0.2)
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            rc, run_history, _commit_calls = self._run_pool(root, workers=2, run_agent=fake_run_agent)
+
+            self.assertEqual(rc, 0)
+            self.assertEqual(
+                sorted((row["item_id"], row["result"]) for row in run_history),
+                [("RK-POOL-1", "blocked"), ("RK-POOL-2", "completed")],
+            )
+            queue = QueueManager(root)
+            queue.load()
+            self.assertEqual([item["id"] for item in queue.blocked], ["RK-POOL-1"])
+            self.assertIn("wrapper exploded", queue.blocked[0]["blocker_reason"])
+            self.assertEqual([item["id"] for item in queue.completed], ["RK-POOL-2"])
+
+    def test_failed_validation_reverts_worktree_changes_from_shared_checkout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(root, [self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"])])
+
+            def fake_run_agent(**kwargs: object) -> WorkerResult:
+                workdir = Path(str(kwargs["project_root"]))
+                self.assertNotEqual(workdir, root)
+                (workdir / "client-web").mkdir()
+                (workdir / "client-web" / "index.html").write_text("broken\n", encoding="utf-8")
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            def failing_validation(validation_root: Path, _item: dict[str, object], _rules: dict[str, object]):
+                # Validation sees the agent's change in the shared checkout.
+                self.assertTrue((validation_root / "client-web" / "index.html").exists())
+                return False, [{"command": "python -m unittest tests.test_client", "exit_code": 1, "stdout_tail": "", "stderr_tail": "boom"}]
+
+            rc, run_history, commit_calls = self._run_pool(
+                root, workers=2, run_agent=fake_run_agent, validation=failing_validation
+            )
+
+            self.assertEqual(rc, 0)
+            # Each retry starts from a clean checkout, so the same new file applies again every time.
+            attempts = [row["result"] for row in run_history if row["item_id"] == "RK-POOL-1"]
+            self.assertEqual(attempts, ["failed_validation"] * 3)
+            self.assertEqual([item_id for item_id, _files in commit_calls if item_id == "RK-POOL-1"], [])
+            self.assertFalse((root / "client-web").exists())
+
+    def test_busy_pool_ingests_human_inbox_before_draining(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(root, [self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"])])
+            events: list[tuple[str, dict[str, object]]] = []
+            picked_up_while_busy = threading.Event()
+
+            def fake_run_agent(**kwargs: object) -> WorkerResult:
+                if kwargs["agent_id"] == "rowan-hale":
+                    (root / "Human").mkdir(exist_ok=True)
+                    (root / "Human" / "request.md").write_text("please add a map\n", encoding="utf-8")
+                    deadline = time.monotonic() + 5
+                    while time.monotonic() < deadline:
+                        if any(event_type == "human_inbox" for event_type, _fields in list(events)):
+                            picked_up_while_busy.set()
+                            break
+                        time.sleep(0.02)
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            with (
+                mock.patch.object(orchestrator, "HUMAN_DIR", root / "Human"),
+                mock.patch.object(orchestrator, "POOL_MAINTENANCE_SECONDS", 0),
+                mock.patch.object(orchestrator, "poll_agent_runs", side_effect=lambda runs: runs[0].thread.join(0.05)),
+            ):
+                rc, run_history, _commit_calls = self._run_pool(
+                    root, workers=2, run_agent=fake_run_agent, events=events
+                )
+
+            self.assertEqual(rc, 0)
+            self.assertTrue(picked_up_while_busy.is_set())
+            queue = QueueManager(root)
+            queue.load()
+            completed = {item["id"]: item for item in queue.completed}
+            self.assertIn("RK-POOL-1", completed)
+            self.assertTrue(
+                any(item.get("human_instruction_file") == "Human/request.md" for item in completed.values())
+            )
+            self.assertEqual(len(run_history), 2)
+
+    def test_conflicting_items_run_one_at_a_time(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(
+                root,
+                [
+                    self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"]),
+                    self._base_item("RK-POOL-2", owner_role="qa", inputs=["client-web/index.html"]),
+                ],
+            )
+            in_flight: list[int] = []
+            lock = threading.Lock()
+            running = [0]
+
+            def fake_run_agent(**kwargs: object) -> WorkerResult:
+                with lock:
+                    running[0] += 1
+                    in_flight.append(running[0])
+                time.sleep(0.2)
+                with lock:
+                    running[0] -= 1
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            rc, run_history, _commit_calls = self._run_pool(root, workers=2, run_agent=fake_run_agent)
+
+            self.assertEqual(rc, 0)
+            # The overlapping item is dispatched only after the first one finishes.
+            self.assertEqual(in_flight, [1, 1])
+            self.assertEqual([row["item_id"] for row in run_history], ["RK-POOL-1", "RK-POOL-2"])
+            queue = QueueManager(root)
+            queue.load()
+            self.assertEqual(len(queue.completed), 2)
+
+    def test_cycle_loads_backlog_once_and_reports_phase_timings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(root, [self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"])])
+            events: list[tuple[str, dict[str, object]]] = []
+
+            def fake_run_agent(**_kwargs: object) -> WorkerResult:
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            with mock.patch.object(QueueManager, "load", autospec=True, side_effect=QueueManager.load) as load:
+                rc, _run_history, _commit_calls = self._run_pool(root, workers=2, run_agent=fake_run_agent, events=events)
+
+            self.assertEqual(rc, 0)
+            # Only preparing the cycle reads the backlog; finishing the run and publishing
+            # status reuse it because nothing else changed the files.
+            self.assertEqual(load.call_count, 1)
+            select = [fields for event_type, fields in events if event_type == "select"]
+            self.assertEqual(len(select), 1)
+            phases = select[0]["cycle_phase_ms"]
+            self.assertEqual(
+                list(phases),
+                ["archive_repair", "environment", "load", "intake", "blocked_review", "queue_health", "persist", "select"],
+            )
+            self.assertAlmostEqual(select[0]["cycle_overhead_ms"], sum(phases.values()), places=2)
+
+    def test_skipped_journal_compaction_before_commit_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_queue_files(root, [self._base_item("RK-POOL-1", owner_role="frontend", inputs=["client-web/"])])
+            events: list[tuple[str, dict[str, object]]] = []
+
+            def fake_run_agent(**_kwargs: object) -> WorkerResult:
+                return WorkerResult(status="completed", summary="done", stdout="", stderr="", exit_code=0)
+
+            with mock.patch.object(QueueManager, "compact", return_value=False):
+                rc, _run_history, commit_calls = self._run_pool(root, workers=2, run_agent=fake_run_agent, events=events)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(len(commit_calls), 1)
+        errors = [fields for event_type, fields in events if event_type == "error"]
+        self.assertEqual([fields["item_id"] for fields in errors], ["RK-POOL-1"])
+
+    def test_cycle_inputs_reload_only_after_watched_changes(self) -> None:
+        root = Path("/daemon-root")
+        watcher = mock.Mock()
+        watcher.pending.return_value = []
+        with (
+            mock.patch.object(orchestrator, "ROOT", root),
+            mock.patch.object(orchestrator, "load_agent_catalog", return_value={}) as load_agents,
+            mock.patch.object(orchestrator, "load_policies", return_value={"model": {}}) as load_policies,
+            mock.patch.object(orchestrator, "StatsTracker"),
+        ):
+            inputs = orchestrator.CycleInputs(watcher=watcher)
+            inputs.ensure_loaded()
+            inputs.note_changes([root / "Human" / "request.md", root / "coordination" / "backlog" / "work-items.json"])
+            inputs.ensure_loaded()
+            self.assertEqual((load_agents.call_count, load_policies.call_count), (1, 1))
+
+            watcher.pending.return_value = [root / "coordination" / "policies" / "routing-rules.yaml"]
+            inputs.ensure_loaded()
+            watcher.pending.return_value = []
+            inputs.note_changes([root / "coordination" / "state" / "agents.json"])
+            inputs.ensure_loaded()
+            self.assertEqual((load_agents.call_count, load_policies.call_count), (3, 3))
+
+            # Without a watcher there is nothing to tell a change apart, so every cycle reloads.
+            unwatched = orchestrator.CycleInputs()
+            unwatched.ensure_loaded()
+            unwatched.ensure_loaded()
+            self.assertEqual(load_policies.call_count, 5)
+
+    @staticmethod
+    def _base_item(item_id: str, *, owner_role: str, inputs: list[str]) -> dict[str, object]:
+        ts = "2026-02-25T19:00:00+00:00"
+        return {
+            "id": item_id,
+            "title": f"Worker pool item {item_id}",
+            "description": "Worker pool dispatch test.",
+            "milestone": "M1",
+            "type": "feature",
+            "priority": "high",
+            "owner_role": owner_role,
+            "preferred_agent": None,
+            "dependencies": [],
+            "inputs": inputs,
+            "acceptance_criteria": ["item completes"],
+            "validation_commands": [],
+            "status": "queued",
+            "retry_count": 0,
+            "created_at": ts,
+            "updated_at": ts,
+            "estimated_effort": "S",
+            "token_budget": 1000,
+            "result_summary": None,
+            "blocker_reason": None,
+            "escalation_target": None,
+        }
+
+    @staticmethod
+    def _write_queue_files(root: Path, active: list[dict[str, object]]) -> None:
+        backlog = root / "coordination" / "backlog"
+        backlog.mkdir(parents=True, exist_ok=True)
+        (backlog / "work-items.json").write_text(json.dumps(active) + "\n", encoding="utf-8")
+        (backlog / "completed-items.json").write_text("[]\n", encoding="utf-8")
+        (backlog / "blocked-items.json").write_text("[]\n", encoding="utf-8")
+        WorkerPoolDispatchTests._git(root, "init", "-q", "-b", "main")
+        WorkerPoolDispatchTests._git(root, "add", "-A")
+        WorkerPoolDispatchTests._git(root, "commit", "-q", "-m", "seed backlog")
+
+    @staticmethod
+    def _git(root: Path, *args: str) -> str:
+        proc = subprocess.run(
+            ["git", "-c", "user.name=RK Test", "-c", "user.email=rk@example.invalid", *args],
+            cwd=root,
+            text=True,
+            capture_output=True,
+            check=True,
+        )
+        return proc.stdout
+
+    def _run_pool(
+        self,
+        root: Path,
+        *,
+        workers: int,
+        run_agent,
+        events: list[tuple[str, dict[str, object]]] | None = None,
+        validation=None,
+    ) -> tuple[int, list[dict[str, object]], list[tuple[str, list[str]]]]:
+        run_history: list[dict[str, object]] = []
+        captured_events = events if events is not None else []
+        commit_calls: list[tuple[str, list[str]]] = []
+        daemon_state_path = root / "coordination" / "runtime" / "daemon-state.json"
+        daemon_state_path.parent.mkdir(parents=True, exist_ok=True)
+        daemon_state_path.write_text("{}\n", encoding="utf-8")
+
+        agents = {
+            "rowan-hale": {"display_name": "Rowan Hale", "role": "frontend", "model": "gpt-5.3-codex", "reasoning": "medium"},
+            "tomas-grell": {"display_name": "Tomas Grell", "role": "qa", "model": "gpt-5.3-codex", "reasoning": "medium"},
+            "mara-voss": {"display_name": "Mara Voss", "role": "lead", "model": "gpt-5.3-codex", "reasoning": "high"},
+        }
+        policies = {
+            "routing": {
+                "owner_role_map": {"frontend": "rowan-hale", "qa": "tomas-grell"},
+                "fallback_agent": "mara-voss",
+            },
+            "retry": {"max_retries_per_item_per_agent": 2, "worker_timeout_seconds": 5},
+            "model": {},
+            "commit": {"default_validation_commands": [], "commit_enabled": True},
+        }
+
+        def fake_commit(commit_root: Path, message: str) -> tuple[bool, str]:
+            self._git(commit_root, "add", "-A")
+            staged = self._git(commit_root, "diff", "--cached", "--name-only").split()
+            self._git(commit_root, "commit", "-q", "--allow-empty", "-m", message)
+            commit_calls.append((message.split("[Item:", 1)[1].split("]", 1)[0], staged))
+            return True, self._git(commit_root, "rev-parse", "HEAD").strip()
+
+        with (
+            mock.patch.object(orchestrator, "ROOT", root),
+            mock.patch.object(orchestrator, "DAEMON_STATE_PATH", daemon_state_path),
+            mock.patch.object(orchestrator, "validate_environment", return_value=[]),
+            mock.patch.object(
+                orchestrator,
+                "repair_backlog_archive_duplicates",
+                return_value={
+                    "completed_removed": 0,
+                    "blocked_removed": 0,
+                    "completed_duplicate_ids": [],
+                    "blocked_duplicate_ids": [],
+                },
+            ),
+            mock.patch.object(
+                orchestrator,
+                "emit_event",
+                side_effect=lambda event_type, _message, **fields: captured_events.append((event_type, fields)),
+            ),
+            mock.patch.object(orchestrator, "set_daemon_state", side_effect=lambda **patch: patch),
+            mock.patch.object(
+                orchestrator,
+                "append_jsonl",
+                side_effect=lambda _path, record: run_history.append(record),
+            ),
+            mock.patch.object(orchestrator, "revisit_recoverable_blocked_items", return_value=[]),
+            mock.patch.object(orchestrator, "ensure_backlog_refill_item", return_value=None),
+            mock.patch.object(orchestrator, "load_agent_catalog", return_value=agents),
+            mock.patch.object(orchestrator, "load_policies", return_value=policies),
+            mock.patch.object(orchestrator, "codex_model_access_preflight_error", return_value=None),
+            mock.patch.object(orchestrator, "build_prompt", return_value="prompt"),
+            mock.patch.object(orchestrator, "run_agent", side_effect=run_agent),
+            mock.patch.object(
+                orchestrator,
+                "run_validation_for_item",
+                side_effect=validation or (lambda *_args: (True, [])),
+            ),
+            mock.patch.object(orchestrator, "is_git_repo", return_value=True),
+            mock.patch.object(orchestrator, "current_branch", return_value="main"),
+            mock.patch.object(orchestrator, "commit_changes", side_effect=fake_commit),
+        ):
+            rc = orchestrator.process_worker_pool(workers=workers, verbose=False)
+        return rc, run_history, commit_calls
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,54 @@
 from __future__ import annotations
 
+import codecs
 import os
 import re
 import shlex
 import shutil
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable, Iterable
 
+from model_preflight_cache import ModelPreflightCache, model_preflight_cache_enabled
 from python_runtime import enforce_python_environment
 
 DEFAULT_CODEX_COMMAND = "codex exec"
 _MODEL_ACCESS_PRECHECK_TIMEOUT_SECONDS = 20
 _MODEL_ACCESS_PRECHECK_CACHE: dict[str, str | None] = {}
+_MODEL_ACCESS_PRECHECK_WORKERS = 4
+# Created eagerly (the constructor does no I/O) so concurrent preflights share one instance and lock.
+_MODEL_PREFLIGHT_DISK_CACHE = ModelPreflightCache(Path(__file__).resolve().parents[1])
+# Characters of stdout/stderr kept in memory per stream; the full output goes to the run log.
+OUTPUT_TAIL_CHARS = 64_000
+_STREAM_READ_CHUNK = 64 * 1024
+_BLOCKED_MARKER_PREFIXES = (
+    "status: blocked",
+    "result: blocked",
+    "blocked:",
+    "blocker:",
+    "blockers:",
+    "[blocked]",
+)
+_NOOP_COMPLETION_PHRASES = (
+    "no changes were made",
+    "no changes made",
+    "no additional changes",
+    "no additional edits",
+    "required no additional edits",
+    "nothing to change",
+    "already implemented",
+    "already documented",
+    "already present",
+    "already covered",
+    "already satisfies",
+    "already satisfied",
+    "no code changes were necessary",
+    "no file changes were necessary",
+)
 
 
 @dataclass
@@ -42,38 +77,128 @@ def _detect_blocked_output(stdout: str, stderr: str) -> bool:
     lines = [line.strip().lower() for line in text.splitlines() if line.strip()]
     if not lines:
         return False
-
-    explicit_prefixes = (
-        "status: blocked",
-        "result: blocked",
-        "blocked:",
-        "blocker:",
-        "blockers:",
-        "[blocked]",
-    )
-    return any(any(line.startswith(prefix) for prefix in explicit_prefixes) for line in lines)
+    return any(line.startswith(_BLOCKED_MARKER_PREFIXES) for line in lines)
 
 
 def _detect_noop_completion_output(stdout: str, stderr: str) -> bool:
     """Detect successful 'nothing to change' outcomes and treat them as completed."""
     text = f"{stdout}\n{stderr}".lower()
-    phrases = (
-        "no changes were made",
-        "no changes made",
-        "no additional changes",
-        "no additional edits",
-        "required no additional edits",
-        "nothing to change",
-        "already implemented",
-        "already documented",
-        "already present",
-        "already covered",
-        "already satisfies",
-        "already satisfied",
-        "no code changes were necessary",
-        "no file changes were necessary",
-    )
-    return any(phrase in text for phrase in phrases)
+    return any(phrase in text for phrase in _NOOP_COMPLETION_PHRASES)
+
+
+class _StreamTail:
+    """Bounded tail plus counters for one output stream."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.chunks: deque[str] = deque()
+        self.chars = 0
+        self.total_bytes = 0
+        self.total_chars = 0
+        self.lines = 0
+        self.last_line = ""
+
+    def append(self, text: str, raw_bytes: int) -> None:
+        self.total_bytes += raw_bytes
+        self.total_chars += len(text)
+        self.lines += text.count("\n")
+        self.chunks.append(text)
+        self.chars += len(text)
+        while self.chars - len(self.chunks[0]) >= self.max_chars:
+            self.chars -= len(self.chunks.popleft())
+
+    def text(self) -> str:
+        return "".join(self.chunks)[-self.max_chars :]
+
+
+class StreamingOutput:
+    """Tee a worker's stdout/stderr to a log file while keeping bounded tails.
+
+    Blocked markers, no-op completion phrases and the last non-empty line are
+    detected line by line as output arrives, so they survive even when the
+    matching text has scrolled out of the in-memory tail. Counters can be read
+    from other threads via snapshot() while the worker runs.
+    """
+
+    def __init__(self, log_path: Path | None = None, *, tail_chars: int = OUTPUT_TAIL_CHARS):
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._streams = {"stdout": _StreamTail(tail_chars), "stderr": _StreamTail(tail_chars)}
+        self._log: IO[str] | None = None
+        self.blocked_marker_seen = False
+        self.noop_completion_seen = False
+
+    def open(self) -> None:
+        if self.log_path is not None and self._log is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = self.log_path.open("w", encoding="utf-8", newline="\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def feed(self, stream: str, text: str, raw_bytes: int) -> None:
+        lines = [line.strip() for line in text.splitlines()]
+        with self._lock:
+            tail = self._streams[stream]
+            tail.append(text, raw_bytes)
+            for line in lines:
+                if not line:
+                    continue
+                tail.last_line = line
+                lowered = line.lower()
+                if lowered.startswith(_BLOCKED_MARKER_PREFIXES):
+                    self.blocked_marker_seen = True
+                if any(phrase in lowered for phrase in _NOOP_COMPLETION_PHRASES):
+                    self.noop_completion_seen = True
+            if self._log is not None:
+                if stream == "stderr":
+                    self._log.write("".join(f"[stderr] {line}\n" for line in text.splitlines()))
+                else:
+                    self._log.write(text)
+                self._log.flush()
+
+    def pump(self, stream: str, pipe: IO[bytes]) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                # Line-sized reads keep marker detection line-accurate without
+                # letting a single unterminated line grow unbounded.
+                chunk = pipe.readline(_STREAM_READ_CHUNK)
+                if not chunk:
+                    break
+                self.feed(stream, decoder.decode(chunk), len(chunk))
+            rest = decoder.decode(b"", final=True)
+            if rest:
+                self.feed(stream, rest, 0)
+        finally:
+            pipe.close()
+
+    def tail(self, stream: str) -> str:
+        with self._lock:
+            return self._streams[stream].text()
+
+    def last_line(self, stream: str) -> str:
+        with self._lock:
+            return self._streams[stream].last_line
+
+    def total_chars(self, stream: str) -> int:
+        with self._lock:
+            return self._streams[stream].total_chars
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stdout = self._streams["stdout"]
+            stderr = self._streams["stderr"]
+            return {
+                "output_bytes": stdout.total_bytes + stderr.total_bytes,
+                "output_lines": stdout.lines + stderr.lines,
+                "stdout_bytes": stdout.total_bytes,
+                "stderr_bytes": stderr.total_bytes,
+                "last_line": stdout.last_line or stderr.last_line,
+            }
 
 
 def _codex_override_hint() -> str:
@@ -195,10 +320,26 @@ def _extract_model_access_error(stdout: str, stderr: str) -> str | None:
     return None
 
 
+def _model_preflight_disk_cache() -> ModelPreflightCache | None:
+    if not model_preflight_cache_enabled():
+        return None
+    return _MODEL_PREFLIGHT_DISK_CACHE
+
+
 def codex_model_access_preflight_error(model: str) -> str | None:
+    """Probe whether `model` is usable; None when accessible, else the reason.
+
+    Results are memoized per process and, for definitive probe outcomes, in
+    the on-disk ModelPreflightCache so new daemon processes skip the probe.
+    Timeouts and spawn failures are only remembered for this process.
+    """
     normalized_model = _normalize_model_name(model)
     if not normalized_model:
         return None
+    disk_cache = _model_preflight_disk_cache()
+    if disk_cache is not None and disk_cache.sync_policy():
+        # model-policy.yaml changed under a running daemon: earlier answers no longer apply.
+        _MODEL_ACCESS_PRECHECK_CACHE.clear()
     if normalized_model in _MODEL_ACCESS_PRECHECK_CACHE:
         return _MODEL_ACCESS_PRECHECK_CACHE[normalized_model]
 
@@ -213,6 +354,12 @@ def codex_model_access_preflight_error(model: str) -> str | None:
         _MODEL_ACCESS_PRECHECK_CACHE[normalized_model] = command_error
         return command_error
 
+    if disk_cache is not None:
+        hit, cached_error = disk_cache.lookup(normalized_model)
+        if hit:
+            _MODEL_ACCESS_PRECHECK_CACHE[normalized_model] = cached_error
+            return cached_error
+
     env_for_worker, _python_command, _python_executable = enforce_python_environment(
         root=Path(__file__).resolve().parents[1]
     )
@@ -239,12 +386,42 @@ def codex_model_access_preflight_error(model: str) -> str | None:
         if reason is None:
             reason = f"Model '{normalized_model}' is not accessible with the current Codex account."
         _MODEL_ACCESS_PRECHECK_CACHE[normalized_model] = reason
+        if disk_cache is not None:
+            disk_cache.store(normalized_model, reason)
         return reason
 
     _MODEL_ACCESS_PRECHECK_CACHE[normalized_model] = None
+    if disk_cache is not None:
+        disk_cache.store(normalized_model, None)
     return None
 
 
+def probe_model_access_concurrently(
+    models: Iterable[str | None],
+    *,
+    probe: Callable[[str], str | None] | None = None,
+    max_workers: int = _MODEL_ACCESS_PRECHECK_WORKERS,
+) -> dict[str, str | None]:
+    """Run `probe` (default codex_model_access_preflight_error) for distinct models in parallel.
+
+    Returns {model: error}. Each probe is a separate `codex exec` process, so
+    independent models no longer wait on each other's 20s timeout.
+    """
+    probe = codex_model_access_preflight_error if probe is None else probe
+    requested = [text for text in (str(model or "").strip() for model in models) if text]
+    distinct: dict[str, str] = {}
+    for text in requested:
+        distinct.setdefault(text.lower(), text)
+    names = list(distinct.values())
+    if len(names) <= 1 or max_workers <= 1:
+        results = [probe(name) for name in names]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            results = list(pool.map(probe, names))
+    by_key = dict(zip(distinct, results))
+    return {text: by_key[text.lower()] for text in requested}
+
+
 def _looks_like_model_access_error(stdout: str, stderr: str) -> bool:
     text = f"{stdout}\n{stderr}".lower()
     if "model" not in text:
@@ -283,18 +460,21 @@ def _execute_codex(
     timeout_seconds: int,
     tokens_in_est: int,
     env: dict[str, str] | None = None,
+    output: StreamingOutput | None = None,
 ) -> tuple[subprocess.CompletedProcess[str] | None, WorkerResult | None]:
+    """Run the worker, streaming its output through `output`.
+
+    The returned CompletedProcess carries only the bounded tails; full output
+    is in `output.log_path` when one is set.
+    """
+    capture = output if output is not None else StreamingOutput()
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             command,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            capture_output=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             cwd=project_root,
-            timeout=timeout_seconds,
-            check=False,
             env=env,
         )
     except FileNotFoundError as exc:
@@ -307,17 +487,59 @@ def _execute_codex(
             tokens_in_est=tokens_in_est,
             blocker_reason=f"Codex CLI not installed or REDKEEPERS_CODEX_COMMAND is invalid. {_codex_override_hint()}",
         )
-    except subprocess.TimeoutExpired as exc:
-        return None, WorkerResult(
-            status="failed",
-            summary=f"Worker timed out after {timeout_seconds}s",
-            stdout=exc.stdout or "",
-            stderr=exc.stderr or "",
-            exit_code=124,
-            tokens_in_est=tokens_in_est,
-            blocker_reason=f"Agent execution timeout ({timeout_seconds}s)",
-        )
-    return proc, None
+
+    def _feed_stdin(pipe: Any, data: bytes) -> None:
+        # A worker that exits (or is killed) before reading its prompt breaks the
+        # pipe; its output explains why, so write/close errors are ignored.
+        try:
+            pipe.write(data)
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+        try:
+            pipe.close()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+
+    capture.open()
+    assert proc.stdin is not None
+    # The prompt is written from its own thread: a worker that never reads stdin
+    # would otherwise block us on a full pipe before the timeout starts counting.
+    pumps = [
+        threading.Thread(
+            target=_feed_stdin,
+            args=(proc.stdin, prompt.encode("utf-8", errors="replace")),
+            name="codex-stdin",
+            daemon=True,
+        ),
+        *(
+            threading.Thread(target=capture.pump, args=(name, pipe), name=f"codex-{name}", daemon=True)
+            for name, pipe in (("stdout", proc.stdout), ("stderr", proc.stderr))
+        ),
+    ]
+    for pump in pumps:
+        pump.start()
+    try:
+        try:
+            returncode = proc.wait(timeout=timeout_seconds)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            for pump in pumps:
+                pump.join()
+            return None, WorkerResult(
+                status="failed",
+                summary=f"Worker timed out after {timeout_seconds}s",
+                stdout=capture.tail("stdout"),
+                stderr=capture.tail("stderr"),
+                exit_code=124,
+                tokens_in_est=tokens_in_est,
+                blocker_reason=f"Agent execution timeout ({timeout_seconds}s)",
+            )
+        for pump in pumps:
+            pump.join()
+    finally:
+        capture.close()
+    return subprocess.CompletedProcess(command, returncode, capture.tail("stdout"), capture.tail("stderr")), None
 
 
 def codex_command_preflight_error() -> str | None:
@@ -349,6 +571,7 @@ def run_agent(
     model: str | None = None,
     timeout_seconds: int = 900,
     dry_run: bool = False,
+    output: StreamingOutput | None = None,
 ) -> WorkerResult:
     requested_model = (model or "").strip() or None
     selected_model = _normalize_model_name(requested_model)
@@ -404,6 +627,7 @@ def run_agent(
     env_for_worker, _python_command, _python_executable = enforce_python_environment(root=project_root)
 
     effective_command = _with_model_arg(command, selected_model)
+    capture = output if output is not None else StreamingOutput()
     proc, immediate_error = _execute_codex(
         command=effective_command,
         prompt=prompt,
@@ -411,6 +635,7 @@ def run_agent(
         timeout_seconds=timeout_seconds,
         tokens_in_est=tokens_in_est,
         env=env_for_worker,
+        output=capture,
     )
     if immediate_error is not None:
         immediate_error.requested_model = requested_model
@@ -421,13 +646,19 @@ def run_agent(
     stdout = (proc.stdout or "").strip()
     stderr = (proc.stderr or "").strip()
 
-    summary = stdout.splitlines()[-1] if stdout else (stderr.splitlines()[-1] if stderr else "No output")
+    summary = (
+        capture.last_line("stdout")
+        or (stdout.splitlines()[-1] if stdout else "")
+        or capture.last_line("stderr")
+        or (stderr.splitlines()[-1] if stderr else "No output")
+    )
     if force_default_model:
         summary = f"{summary} (default model forced by REDKEEPERS_USE_DEFAULT_MODEL)"
     status = "completed" if proc.returncode == 0 else "failed"
-    if _detect_blocked_output(stdout, stderr):
+    # Markers are tracked while streaming; the tail check covers injected results.
+    if capture.blocked_marker_seen or _detect_blocked_output(stdout, stderr):
         status = "blocked"
-        if proc.returncode == 0 and _detect_noop_completion_output(stdout, stderr):
+        if proc.returncode == 0 and (capture.noop_completion_seen or _detect_noop_completion_output(stdout, stderr)):
             status = "completed"
     return WorkerResult(
         status=status,
@@ -436,7 +667,7 @@ def run_agent(
         stderr=stderr,
         exit_code=proc.returncode,
         tokens_in_est=_estimate_tokens(prompt),
-        tokens_out_est=_estimate_tokens(stdout),
+        tokens_out_est=max(1, (capture.total_chars("stdout") or len(stdout)) // 4),
         blocker_reason=summary[:500] if status == "blocked" else None,
         requested_model=requested_model,
         used_model=used_model,
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any, Iterable
+
+from schemas import load_json, save_json_atomic, utc_now_iso
+
+
+SKETCH_RELATIVE_ACCURACY = 0.02
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+SKETCH_MIN_VALUE = 0.01
+TOP_ITEMS_KEPT = 25
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+GROUPS = ("by_agent", "by_role", "by_model")
+
+
+def _default_bucket() -> dict[str, Any]:
+    return {
+        "completed_items": 0,
+        "runtime_total_seconds": 0.0,
+        "runtime_count": 0,
+        "sketch": {},
+    }
+
+
+def sketch_add(sketch: dict[str, int], value: float) -> None:
+    """Add `value` to a log-bucketed sketch (relative error <= SKETCH_RELATIVE_ACCURACY).
+
+    Bucket counts only ever add up, so the sketch is independent of insertion
+    order and its size is bounded by the runtime range, not the number of runs.
+    """
+    if value < SKETCH_MIN_VALUE:
+        key = "0"
+    else:
+        key = str(math.ceil(math.log(value, SKETCH_GAMMA)))
+    sketch[key] = int(sketch.get(key, 0)) + 1
+
+
+def sketch_quantile(sketch: dict[str, int], quantile: float) -> float | None:
+    total = sum(int(count) for count in sketch.values())
+    if total <= 0:
+        return None
+    rank = quantile * (total - 1)
+    seen = 0
+    for key in sorted(sketch, key=int):
+        seen += int(sketch[key])
+        if seen > rank:
+            if key == "0":
+                return 0.0
+            return round(2 * SKETCH_GAMMA ** int(key) / (SKETCH_GAMMA + 1), 2)
+    return None
+
+
+class CompletionMetricsTracker:
+    """Persisted completion aggregates, updated as each item completes.
+
+    Holds running sums/counts, the longest items and runtime sketches per
+    agent, role and model, so `orchestrator.py metrics` reads one small file
+    instead of replaying completed-items.json and run-history.
+    """
+
+    def __init__(self, root: Path, *, top_items: int = TOP_ITEMS_KEPT):
+        self.root = root
+        self.path = root / "coordination" / "runtime" / "completion-metrics.json"
+        self.top_items = top_items
+
+    def default_payload(self) -> dict[str, Any]:
+        return {
+            "generated_at": utc_now_iso(),
+            "totals": {**_default_bucket(), "with_resolver": 0},
+            "by_agent": {},
+            "by_role": {},
+            "by_model": {},
+            "longest_items": [],
+        }
+
+    def load(self) -> dict[str, Any] | None:
+        data = load_json(self.path, None)
+        if not isinstance(data, dict) or not isinstance(data.get("totals"), dict):
+            return None
+        for group in GROUPS:
+            data.setdefault(group, {})
+        data.setdefault("longest_items", [])
+        return data
+
+    def save(self, data: dict[str, Any]) -> None:
+        data["generated_at"] = utc_now_iso()
+        save_json_atomic(self.path, data)
+
+    def record_completion(
+        self,
+        data: dict[str, Any],
+        *,
+        item_id: str,
+        title: str | None,
+        agent_id: str | None,
+        role: str | None,
+        model: str | None,
+        runtime_seconds: float | None,
+        finished_at: str | None,
+    ) -> None:
+        keys = {
+            "by_agent": agent_id or "unassigned",
+            "by_role": role or "unknown",
+            "by_model": model or "unknown",
+        }
+        buckets = [data["totals"]] + [data[group].setdefault(key, _default_bucket()) for group, key in keys.items()]
+        for bucket in buckets:
+            bucket["completed_items"] = int(bucket.get("completed_items", 0)) + 1
+            if runtime_seconds is not None:
+                bucket["runtime_total_seconds"] = float(bucket.get("runtime_total_seconds", 0.0)) + runtime_seconds
+                bucket["runtime_count"] = int(bucket.get("runtime_count", 0)) + 1
+                sketch_add(bucket.setdefault("sketch", {}), runtime_seconds)
+        if agent_id:
+            data["totals"]["with_resolver"] = int(data["totals"].get("with_resolver", 0)) + 1
+        if runtime_seconds is None:
+            return
+        longest = data["longest_items"]
+        longest.append(
+            {
+                "item_id": item_id,
+                "title": title or "",
+                "resolved_by_agent": agent_id,
+                "resolved_by_role": role,
+                "model": model,
+                "runtime_seconds": runtime_seconds,
+                "finished_at": finished_at,
+            }
+        )
+        longest.sort(key=lambda row: (-float(row.get("runtime_seconds") or 0.0), str(row.get("item_id", ""))))
+        del longest[self.top_items :]
+
+    def rebuild(self, item_rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        """Fresh aggregates from full per-item rows (the slow path used to verify the store)."""
+        data = self.default_payload()
+        for row in item_rows:
+            self.record_completion(
+                data,
+                item_id=str(row.get("item_id", "")),
+                title=row.get("title"),
+                agent_id=row.get("resolved_by_agent"),
+                role=row.get("resolved_by_role"),
+                model=row.get("model"),
+                runtime_seconds=row.get("runtime_seconds"),
+                finished_at=row.get("finished_at"),
+            )
+        return data
+
+    @staticmethod
+    def group_rows(data: dict[str, Any], group: str, key_name: str) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for key, bucket in data.get(group, {}).items():
+            runtime_count = int(bucket.get("runtime_count", 0))
+            total_runtime = float(bucket.get("runtime_total_seconds", 0.0))
+            row = {
+                key_name: key,
+                "completed_items": int(bucket.get("completed_items", 0)),
+                "runtime_total_seconds": round(total_runtime, 2),
+                "runtime_count": runtime_count,
+                "runtime_avg_seconds": round(total_runtime / runtime_count, 2) if runtime_count > 0 else None,
+            }
+            for label, quantile in QUANTILES.items():
+                row[f"runtime_{label}_seconds"] = sketch_quantile(bucket.get("sketch", {}), quantile)
+            rows.append(row)
+        rows.sort(
+            key=lambda row: (
+                -int(row.get("completed_items", 0)),
+                -(float(row.get("runtime_total_seconds", 0.0))),
+                str(row.get(key_name, "")),
+            )
+        )
+        return rows
+
+    def snapshot(self, data: dict[str, Any]) -> dict[str, Any]:
+        totals = data.get("totals", {})
+        return {
+            "completed_items": int(totals.get("completed_items", 0)),
+            "with_resolver": int(totals.get("with_resolver", 0)),
+            "with_runtime": int(totals.get("runtime_count", 0)),
+            "runtime_quantiles": {
+                label: sketch_quantile(totals.get("sketch", {}), quantile) for label, quantile in QUANTILES.items()
+            },
+            "agent_rows": self.group_rows(data, "by_agent", "agent_id"),
+            "role_rows": self.group_rows(data, "by_role", "role"),
+            "model_rows": self.group_rows(data, "by_model", "model"),
+            "longest_items": list(data.get("longest_items", [])),
+        }
+
+    @staticmethod
+    def compare(stored: dict[str, Any], rebuilt: dict[str, Any]) -> list[str]:
+        """Differences between the incremental store and a rebuild, as readable lines."""
+        drift: list[str] = []
+
+        def _bucket_drift(label: str, left: dict[str, Any], right: dict[str, Any]) -> None:
+            for field in ("completed_items", "runtime_count", "with_resolver"):
+                if int(left.get(field, 0)) != int(right.get(field, 0)):
+                    drift.append(f"{label} {field}: stored={left.get(field, 0)} rebuilt={right.get(field, 0)}")
+            left_total = float(left.get("runtime_total_seconds", 0.0))
+            right_total = float(right.get("runtime_total_seconds", 0.0))
+            if abs(left_total - right_total) > 0.01:
+                drift.append(f"{label} runtime_total_seconds: stored={left_total:.2f} rebuilt={right_total:.2f}")
+            if left.get("sketch", {}) != right.get("sketch", {}):
+                drift.append(f"{label} runtime sketch differs")
+
+        _bucket_drift("totals", stored.get("totals", {}), rebuilt.get("totals", {}))
+        for group in GROUPS:
+            left_group = stored.get(group, {})
+            right_group = rebuilt.get(group, {})
+            for key in sorted(set(left_group) | set(right_group)):
+                _bucket_drift(f"{group}[{key}]", left_group.get(key, {}), right_group.get(key, {}))
+        left_ids = [row.get("item_id") for row in stored.get("longest_items", [])]
+        right_ids = [row.get("item_id") for row in rebuilt.get("longest_items", [])]
+        if left_ids != right_ids:
+            drift.append("longest_items differ")
+        return drift
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator
+
+
+TRACEMALLOC_FRAMES = 10
+
+_ACTIVE: "CycleProfiler | None" = None
+
+
+class _Span:
+    __slots__ = ("path", "started", "child_seconds", "sampled")
+
+    def __init__(self, path: tuple[str, ...], sampled: bool):
+        self.path = path
+        self.started = time.perf_counter()
+        self.child_seconds = 0.0
+        self.sampled = sampled
+
+
+class CycleProfiler:
+    """Opt-in profiler for daemon scheduling cycles (`run/once --profile DIR`).
+
+    Each cycle records nested wall-clock spans opened with `span()`. With
+    `cpu=True` the cycle thread also runs under cProfile, written to
+    `<run>-cycle-NNNN.pstats`; spans opened with `sampled=False` (waiting on
+    the agent subprocess) pause it, so the profile shows daemon overhead only.
+    With `memory=True` tracemalloc runs during the cycle and its snapshot is
+    dumped to `<run>-cycle-NNNN.tracemalloc`. Exclusive span time of all
+    cycles so far is kept in `<run>.folded`, one `a;b;c <microseconds>` line
+    per stack, which flamegraph.pl and speedscope read directly.
+    """
+
+    def __init__(self, out_dir: Path, *, cpu: bool = True, memory: bool = False):
+        self.out_dir = out_dir
+        self.cpu = cpu
+        self.memory = memory
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-p{os.getpid()}"
+        self.cycles = 0
+        self.folded: Counter[str] = Counter()
+        self._thread: int | None = None
+        self._stack: list[_Span] = []
+        self._cycle_spans: Counter[str] = Counter()
+        self._profile: cProfile.Profile | None = None
+        self._paused = 0
+        self._owns_tracemalloc = False
+
+    @property
+    def folded_path(self) -> Path:
+        return self.out_dir / f"{self.run_id}.folded"
+
+    @contextmanager
+    def cycle(self, label: str = "cycle") -> Iterator[dict[str, Any]]:
+        """Profile one cycle; the yielded dict is filled with its summary on exit."""
+        global _ACTIVE
+        summary: dict[str, Any] = {}
+        self.cycles += 1
+        self._thread = threading.get_ident()
+        self._cycle_spans = Counter()
+        self._paused = 0
+        if self.memory:
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+        if self.cpu:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        _ACTIVE = self
+        started = time.perf_counter()
+        self._stack = [_Span((label,), sampled=True)]
+        try:
+            yield summary
+        finally:
+            self._close_span(self._stack.pop())
+            self._stack = []
+            _ACTIVE = None
+            summary.update(self._finish_cycle(round((time.perf_counter() - started) * 1000, 3)))
+
+    @contextmanager
+    def span(self, name: str, *, sampled: bool = True) -> Iterator[None]:
+        if not self._stack or threading.get_ident() != self._thread:
+            # Outside a cycle or on a helper thread: spans only nest on the cycle thread.
+            yield
+            return
+        span = _Span(self._stack[-1].path + (name,), sampled=sampled)
+        if not sampled:
+            self._pause()
+        self._stack.append(span)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            if not sampled:
+                self._resume()
+            self._close_span(span)
+
+    def _pause(self) -> None:
+        self._paused += 1
+        if self._paused == 1 and self._profile is not None:
+            self._profile.disable()
+
+    def _resume(self) -> None:
+        self._paused -= 1
+        if self._paused == 0 and self._profile is not None:
+            self._profile.enable()
+
+    def _close_span(self, span: _Span) -> None:
+        elapsed = time.perf_counter() - span.started
+        if self._stack:
+            self._stack[-1].child_seconds += elapsed
+        self.folded[";".join(span.path)] += round(max(0.0, elapsed - span.child_seconds) * 1_000_000)
+        if len(span.path) > 1:
+            self._cycle_spans[span.path[-1]] += elapsed
+
+    def _finish_cycle(self, total_ms: float) -> dict[str, Any]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.run_id}-cycle-{self.cycles:04d}"
+        files: list[str] = []
+        summary: dict[str, Any] = {
+            "cycle": self.cycles,
+            "total_ms": total_ms,
+            "spans_ms": {name: round(seconds * 1000, 3) for name, seconds in self._cycle_spans.most_common()},
+        }
+        if self._profile is not None:
+            self._profile.disable()
+            pstats_path = self.out_dir / f"{stem}.pstats"
+            self._profile.dump_stats(str(pstats_path))
+            files.append(pstats_path.name)
+            self._profile = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot_path = self.out_dir / f"{stem}.tracemalloc"
+            tracemalloc.take_snapshot().dump(str(snapshot_path))
+            files.append(snapshot_path.name)
+            summary["traced_kib"] = round(current / 1024, 1)
+            summary["peak_kib"] = round(peak / 1024, 1)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        tmp = self.folded_path.with_suffix(".folded.tmp")
+        tmp.write_text("".join(f"{stack} {count}\n" for stack, count in sorted(self.folded.items()) if count > 0), encoding="utf-8")
+        os.replace(tmp, self.folded_path)
+        files.append(self.folded_path.name)
+        summary["profile_dir"] = str(self.out_dir)
+        summary["files"] = files
+        return summary
+
+
+def profile_span(name: str, *, sampled: bool = True) -> Any:
+    """A span in the active profiled cycle, or a no-op when profiling is off."""
+    profiler = _ACTIVE
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, sampled=sampled)
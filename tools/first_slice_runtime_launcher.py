@@ -9,11 +9,13 @@ import threading
 import time
 import webbrowser
 from dataclasses import dataclass
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from precompressed_static import PrecompressedRequestHandler
+
 
 ROOT = Path(__file__).resolve().parents[1]
 CLIENT_WEB_DIR = ROOT / "client-web"
@@ -37,7 +39,7 @@ class RuntimeDefaults:
     world_id: str
 
 
-class _FirstSliceWebShellProxyHandler(SimpleHTTPRequestHandler):
+class _FirstSliceWebShellProxyHandler(PrecompressedRequestHandler):
     def __init__(
         self,
         *args: object,
@@ -311,6 +313,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--backend-port", type=int, default=DEFAULT_BACKEND_PORT)
     parser.add_argument("--web-host", default=DEFAULT_WEB_HOST)
     parser.add_argument("--web-port", type=int, default=DEFAULT_WEB_PORT)
+    parser.add_argument(
+        "--web-root",
+        type=Path,
+        default=CLIENT_WEB_DIR,
+        help=(
+            "Directory served as the web shell (default client-web/). Point it at the packaged staging root to "
+            "serve its precompressed .br/.gz variants to clients that accept them."
+        ),
+    )
     parser.add_argument(
         "--startup-timeout-seconds",
         type=int,
@@ -328,11 +339,12 @@ def parse_args() -> argparse.Namespace:
 def main() -> int:
     args = parse_args()
 
-    if not CLIENT_WEB_DIR.is_dir():
-        print(f"STATUS: BLOCKED\nMissing client-web directory: {CLIENT_WEB_DIR}")
+    web_root = Path(args.web_root)
+    if not web_root.is_dir():
+        print(f"STATUS: BLOCKED\nMissing client-web directory: {web_root}")
         return 1
-    if not (CLIENT_WEB_DIR / "index.html").is_file():
-        print(f"STATUS: BLOCKED\nMissing client shell entrypoint: {CLIENT_WEB_DIR / 'index.html'}")
+    if not (web_root / "index.html").is_file():
+        print(f"STATUS: BLOCKED\nMissing client shell entrypoint: {web_root / 'index.html'}")
         return 1
     if not MANIFEST_SNAPSHOT_TOOL.is_file():
         print(f"STATUS: BLOCKED\nMissing manifest snapshot tool: {MANIFEST_SNAPSHOT_TOOL}")
@@ -417,7 +429,7 @@ def main() -> int:
     web_shell_server = _WebShellProxyServer(
         host=str(args.web_host),
         port=web_port,
-        directory=CLIENT_WEB_DIR,
+        directory=web_root,
         backend_base_url=backend_base_url,
     )
     try:
@@ -8,8 +8,10 @@ import threading
 from datetime import datetime, timezone
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path, PurePosixPath
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, Callable
+from urllib.parse import urljoin, urlparse
+
+from screenshot_diff import compare_screenshots
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -17,6 +19,8 @@ DEFAULT_SERVE_ROOT = ROOT / "client-web"
 DEFAULT_OUTPUT_DIR = ROOT / "coordination" / "runtime" / "frontend-visual" / "current"
 DEFAULT_BASELINE_DIR = ROOT / "coordination" / "runtime" / "frontend-visual" / "baseline"
 DEFAULT_REPORT_PATH = ROOT / "coordination" / "runtime" / "frontend-visual" / "report.json"
+# Worst tiles kept per device in the report; the heatmap shows the rest.
+REPORTED_DIFF_TILES = 5
 
 
 DEVICE_PROFILES: dict[str, dict[str, Any]] = {
@@ -96,36 +100,19 @@ def _bool_env(name: str) -> bool:
     return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, "").strip()))
+    except ValueError:
+        return default
+
+
 def _required_action_feedback_paths(surface_id: str) -> list[dict[str, str]]:
     if surface_id != "first-slice-shell":
         return []
     return [dict(path) for path in FIRST_SLICE_ACTION_FEEDBACK_PATHS]
 
 
-def _compare_png_images_percent(left: Path, right: Path) -> float:
-    try:
-        from PIL import Image, ImageChops  # type: ignore
-    except Exception:
-        return 0.0 if left.read_bytes() == right.read_bytes() else 100.0
-
-    with Image.open(left) as lhs, Image.open(right) as rhs:
-        lhs_rgba = lhs.convert("RGBA")
-        rhs_rgba = rhs.convert("RGBA")
-        if lhs_rgba.size != rhs_rgba.size:
-            return 100.0
-        diff = ImageChops.difference(lhs_rgba, rhs_rgba)
-        histogram = diff.histogram()
-        if not histogram:
-            return 0.0
-        total_channels = 4
-        pixel_count = lhs_rgba.size[0] * lhs_rgba.size[1] * total_channels
-        diff_sum = 0
-        for i, value in enumerate(histogram):
-            diff_sum += value * (i % 256)
-        percent = (diff_sum / (255.0 * pixel_count)) * 100.0
-        return max(0.0, min(percent, 100.0))
-
-
 class _StaticServer:
     def __init__(self, *, host: str, port: int, directory: Path):
         self.host = host
@@ -201,6 +188,10 @@ def _screenshot_path_for_device(output_dir: Path, url: str, device_name: str) ->
     return output_dir / f"{device_name}.png"
 
 
+def _heatmap_path_for_screenshot(screenshot_path: Path) -> Path:
+    return screenshot_path.with_name(f"{screenshot_path.stem}--diff.png")
+
+
 def _baseline_path_for_device(baseline_dir: Path, url: str, device_name: str) -> Path:
     prefix = _surface_baseline_prefix(url)
     if prefix:
@@ -884,38 +875,233 @@ def _collect_first_slice_action_feedback_issues(page: Any) -> tuple[list[str], l
     return issues, checks
 
 
-def run_visual_smoke(args: argparse.Namespace) -> tuple[int, dict[str, Any]]:
-    requested_devices = [name.strip() for name in args.devices.split(",") if name.strip()]
-    unknown = [name for name in requested_devices if name not in DEVICE_PROFILES]
-    if unknown:
-        return 2, {"status": "error", "error": f"unknown device profiles: {unknown}"}
+def _check_device(
+    browser: Any,
+    args: argparse.Namespace,
+    device_name: str,
+    *,
+    url: str,
+    surface_id: str,
+    required_selectors: list[str],
+    container_selector: str | None,
+) -> tuple[dict[str, Any], float | None]:
+    """Run every check for one device in its own browser context.
+
+    Returns the device's report entry and the unrounded baseline diff (None
+    when nothing was compared). Touches no shared state, so devices can run
+    on separate browsers in parallel.
+    """
+    profile = DEVICE_PROFILES[device_name]
+    device_result: dict[str, Any] = {
+        "device": device_name,
+        "viewport": profile.get("viewport"),
+        "status": "ok",
+        "issues": [],
+        "screenshot_path": None,
+        "baseline_path": None,
+        "diff_percent": None,
+        "diff_heatmap_path": None,
+        "diff_tiles": [],
+        "document_overflow_px": None,
+        "shell_overflow_px": None,
+        "action_feedback_checks": [],
+        "action_feedback_paths_total": 0,
+        "action_feedback_paths_ok": 0,
+        "action_feedback_paths_failed": 0,
+    }
+    diff_percent: float | None = None
+    context = browser.new_context(
+        viewport=profile.get("viewport"),
+        device_scale_factor=profile.get("device_scale_factor", 1),
+        is_mobile=profile.get("is_mobile", False),
+        has_touch=profile.get("has_touch", False),
+        reduced_motion="reduce",
+        color_scheme="dark",
+    )
+    page = context.new_page()
+    try:
+        page.goto(url, wait_until="networkidle", timeout=30000)
+        missing = _selector_presence_issues(page, required_selectors)
+        overflow = _overflow_value(page)
+        shell_overflow = _container_overflow_value(page, container_selector) if container_selector else None
+        device_result["document_overflow_px"] = overflow
+        device_result["shell_overflow_px"] = shell_overflow
+        if missing:
+            device_result["issues"].extend(missing)
+        if overflow > args.max_overflow_px:
+            device_result["issues"].append(f"horizontal overflow {overflow}px > {args.max_overflow_px}px")
+        if container_selector and shell_overflow is None:
+            device_result["issues"].append(f"missing container {container_selector}")
+        elif container_selector and shell_overflow > args.max_overflow_px:
+            device_result["issues"].append(f"shell overflow {shell_overflow}px > {args.max_overflow_px}px")
+
+        shot_path = _screenshot_path_for_device(args.output_dir, url, device_name)
+        page.screenshot(path=str(shot_path), full_page=True)
+        device_result["screenshot_path"] = str(shot_path)
+
+        baseline_path = _baseline_path_for_device(args.baseline_dir, url, device_name)
+        device_result["baseline_path"] = str(baseline_path)
+        heatmap_path = _heatmap_path_for_screenshot(shot_path)
+        if args.update_baseline:
+            shutil.copyfile(shot_path, baseline_path)
+            heatmap_path.unlink(missing_ok=True)
+        elif baseline_path.exists():
+            diff = compare_screenshots(
+                baseline_path,
+                shot_path,
+                tile_size=getattr(args, "diff_tile_size", 64),
+                pixel_tolerance=getattr(args, "pixel_tolerance", 0),
+                ignore_antialiasing=getattr(args, "ignore_antialiasing", False),
+                heatmap_path=heatmap_path,
+            )
+            diff_percent = diff.percent
+            device_result["diff_percent"] = round(diff_percent, 4)
+            device_result["diff_heatmap_path"] = str(diff.heatmap_path) if diff.heatmap_path else None
+            device_result["diff_tiles"] = [tile.as_dict() for tile in diff.tiles[:REPORTED_DIFF_TILES]]
+            if diff_percent > float(args.max_diff_percent):
+                issue = f"visual diff {diff_percent:.3f}% > threshold {float(args.max_diff_percent):.3f}%"
+                worst = diff.worst_tile
+                if worst is not None:
+                    issue += f" (worst tile {worst.width}x{worst.height} at {worst.x},{worst.y}: {worst.percent:.1f}%)"
+                device_result["issues"].append(issue)
+        else:
+            device_result["issues"].append("baseline screenshot missing")
+
+        if surface_id == "first-slice-shell":
+            device_result["issues"].extend(_collect_accessibility_issues(page))
+            action_paths = _required_action_feedback_paths(surface_id)
+            action_issues, action_checks = _collect_first_slice_action_feedback_issues(page)
+            action_ok = sum(1 for check in action_checks if check.get("status") == "ok")
+            device_result["action_feedback_checks"] = action_checks
+            device_result["action_feedback_paths_total"] = len(action_paths)
+            device_result["action_feedback_paths_ok"] = action_ok
+            device_result["action_feedback_paths_failed"] = len(action_checks) - action_ok
+            device_result["issues"].extend(action_issues)
+        else:
+            device_result["issues"].extend(_collect_basic_accessibility_issues(page))
+    finally:
+        context.close()
+
+    if device_result["issues"]:
+        device_result["status"] = "failed"
+    return device_result, diff_percent
+
+
+def _run_devices(
+    sync_playwright: Any,
+    jobs: list[Any],
+    check: Callable[[Any, Any], tuple[dict[str, Any], float | None]],
+    *,
+    concurrency: int = 1,
+) -> list[tuple[dict[str, Any], float | None]]:
+    """`check(browser, job)` for every job (a device, or a surface/device pair), results in `jobs` order.
+
+    With `concurrency` > 1, that many worker threads each start their own
+    Playwright driver and Chromium (the sync API must not be shared across
+    threads) and take the next pending job until none are left. The first
+    error stops the remaining jobs and is re-raised here.
+    """
+    workers = max(1, min(int(concurrency), len(jobs)))
+    if workers == 1:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                return [check(browser, job) for job in jobs]
+            finally:
+                browser.close()
+
+    results: list[tuple[dict[str, Any], float | None] | None] = [None] * len(jobs)
+    errors: list[BaseException] = []
+    lock = threading.Lock()
+    pending = iter(enumerate(jobs))
+
+    def _next_job() -> tuple[int, Any] | None:
+        with lock:
+            if errors:
+                return None
+            return next(pending, None)
+
+    def _worker() -> None:
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                try:
+                    while (pending_job := _next_job()) is not None:
+                        index, job = pending_job
+                        results[index] = check(browser, job)
+                finally:
+                    browser.close()
+        except BaseException as exc:  # noqa: BLE001 - surfaced to the caller below
+            with lock:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=_worker, name=f"visual-smoke-{n}", daemon=True) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return [result for result in results if result is not None]
+
+
+def _split_devices(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(",") if name.strip()]
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return []
 
-    url = args.url
-    parsed = urlparse(url)
-    if not parsed.scheme:
-        return 2, {"status": "error", "error": f"invalid --url: {url!r}"}
 
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-    except Exception as exc:
-        reason = f"playwright import failed: {exc}"
-        return (1 if args.strict else 0), {"status": "blocked", "error": reason}
+def _requested_surfaces(args: argparse.Namespace) -> list[dict[str, Any]] | None:
+    """Surfaces for batch mode (`--surfaces` and/or `--manifest`), or None for a single `--url` run.
+
+    Entries without a scheme are resolved against `--url`, so `hero-wireframes.html`
+    is served by the same static server. A manifest is JSON: a list of entries,
+    or `{"surfaces": [...]}`, where an entry is a URL string or an object with
+    `url` and optional `devices` (list or comma string; default `--devices`).
+    """
+    entries: list[Any] = []
+    surfaces_arg = getattr(args, "surfaces", None)
+    if surfaces_arg:
+        entries.extend(entry.strip() for entry in surfaces_arg.split(",") if entry.strip())
+    manifest_path = getattr(args, "manifest", None)
+    if manifest_path is not None:
+        manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+        if isinstance(manifest, dict):
+            manifest = manifest.get("surfaces", [])
+        if not isinstance(manifest, list):
+            raise ValueError(f"manifest {manifest_path} must be a list of surfaces or {{\"surfaces\": [...]}}")
+        entries.extend(manifest)
+    if not surfaces_arg and manifest_path is None:
+        return None
 
-    args.output_dir.mkdir(parents=True, exist_ok=True)
-    args.baseline_dir.mkdir(parents=True, exist_ok=True)
-    surface_id = _surface_id_from_url(args.url)
-    required_selectors = _surface_required_selectors(surface_id)
-    container_selector = _surface_container_selector(surface_id)
-    run_ts = utc_now_iso()
-    report: dict[str, Any] = {
-        "generated_at": run_ts,
-        "url": args.url,
-        "surface": surface_id,
+    default_devices = _split_devices(args.devices)
+    surfaces: list[dict[str, Any]] = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            target = str(entry.get("url", "")).strip()
+            devices = _split_devices(entry.get("devices")) or default_devices
+        else:
+            target = str(entry).strip()
+            devices = default_devices
+        if not target:
+            raise ValueError(f"surface entry without url: {entry!r}")
+        url = target if urlparse(target).scheme else urljoin(args.url, target)
+        surfaces.append({"url": url, "devices": devices})
+    return surfaces
+
+
+def _surface_report(url: str, devices: list[str], args: argparse.Namespace, generated_at: str) -> dict[str, Any]:
+    return {
+        "generated_at": generated_at,
+        "url": url,
+        "surface": _surface_id_from_url(url),
         "strict": bool(args.strict),
         "max_diff_percent": float(args.max_diff_percent),
         "devices": [],
         "summary": {
-            "devices_total": len(requested_devices),
+            "devices_total": len(devices),
             "devices_ok": 0,
             "devices_failed": 0,
             "devices_diff_exceeded": 0,
@@ -926,113 +1112,113 @@ def run_visual_smoke(args: argparse.Namespace) -> tuple[int, dict[str, Any]]:
         },
     }
 
+
+def _add_device_run(report: dict[str, Any], device_result: dict[str, Any], diff_percent: float | None, args: argparse.Namespace) -> None:
+    summary = report["summary"]
+    if diff_percent is not None:
+        summary["max_diff_seen"] = max(float(summary["max_diff_seen"]), diff_percent)
+        if diff_percent > float(args.max_diff_percent):
+            summary["devices_diff_exceeded"] = int(summary["devices_diff_exceeded"]) + 1
+    for key in ("action_feedback_paths_total", "action_feedback_paths_ok", "action_feedback_paths_failed"):
+        summary[key] = int(summary[key]) + int(device_result[key])
+    if device_result["status"] == "failed":
+        summary["devices_failed"] = int(summary["devices_failed"]) + 1
+    else:
+        summary["devices_ok"] = int(summary["devices_ok"]) + 1
+    report["devices"].append(device_result)
+
+
+def _batch_report(surface_reports: list[dict[str, Any]], args: argparse.Namespace, generated_at: str) -> dict[str, Any]:
+    """Combined report: one section per surface plus device totals in the shape of a single-surface summary."""
+    summary: dict[str, Any] = {
+        "surfaces_total": len(surface_reports),
+        "surfaces_ok": sum(1 for report in surface_reports if report["status"] == "ok"),
+        "surfaces_failed": sum(1 for report in surface_reports if report["status"] != "ok"),
+    }
+    for key in (
+        "devices_total",
+        "devices_ok",
+        "devices_failed",
+        "devices_diff_exceeded",
+        "action_feedback_paths_total",
+        "action_feedback_paths_ok",
+        "action_feedback_paths_failed",
+    ):
+        summary[key] = sum(int(report["summary"][key]) for report in surface_reports)
+    summary["max_diff_seen"] = max((float(report["summary"]["max_diff_seen"]) for report in surface_reports), default=0.0)
+    return {
+        "generated_at": generated_at,
+        "mode": "batch",
+        "strict": bool(args.strict),
+        "max_diff_percent": float(args.max_diff_percent),
+        "surfaces": surface_reports,
+        "summary": summary,
+        "status": "failed" if summary["surfaces_failed"] else "ok",
+    }
+
+
+def run_visual_smoke(args: argparse.Namespace) -> tuple[int, dict[str, Any]]:
+    try:
+        batch = _requested_surfaces(args)
+    except (OSError, ValueError) as exc:
+        return 2, {"status": "error", "error": f"invalid surfaces: {exc}"}
+    surfaces = batch if batch is not None else [{"url": args.url, "devices": _split_devices(args.devices)}]
+    if not surfaces:
+        return 2, {"status": "error", "error": "no surfaces requested"}
+
+    for surface in surfaces:
+        unknown = [name for name in surface["devices"] if name not in DEVICE_PROFILES]
+        if unknown:
+            return 2, {"status": "error", "error": f"unknown device profiles: {unknown}"}
+        url = surface["url"]
+        parsed = urlparse(url)
+        if not parsed.scheme:
+            return 2, {"status": "error", "error": f"invalid --url: {url!r}"}
+
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            for device_name in requested_devices:
-                profile = DEVICE_PROFILES[device_name]
-                device_result: dict[str, Any] = {
-                    "device": device_name,
-                    "viewport": profile.get("viewport"),
-                    "status": "ok",
-                    "issues": [],
-                    "screenshot_path": None,
-                    "baseline_path": None,
-                    "diff_percent": None,
-                    "document_overflow_px": None,
-                    "shell_overflow_px": None,
-                    "action_feedback_checks": [],
-                    "action_feedback_paths_total": 0,
-                    "action_feedback_paths_ok": 0,
-                    "action_feedback_paths_failed": 0,
-                }
-                context = browser.new_context(
-                    viewport=profile.get("viewport"),
-                    device_scale_factor=profile.get("device_scale_factor", 1),
-                    is_mobile=profile.get("is_mobile", False),
-                    has_touch=profile.get("has_touch", False),
-                    reduced_motion="reduce",
-                    color_scheme="dark",
-                )
-                page = context.new_page()
-                try:
-                    page.goto(args.url, wait_until="networkidle", timeout=30000)
-                    missing = _selector_presence_issues(page, required_selectors)
-                    overflow = _overflow_value(page)
-                    shell_overflow = _container_overflow_value(page, container_selector) if container_selector else None
-                    device_result["document_overflow_px"] = overflow
-                    device_result["shell_overflow_px"] = shell_overflow
-                    if missing:
-                        device_result["issues"].extend(missing)
-                    if overflow > args.max_overflow_px:
-                        device_result["issues"].append(f"horizontal overflow {overflow}px > {args.max_overflow_px}px")
-                    if container_selector and shell_overflow is None:
-                        device_result["issues"].append(f"missing container {container_selector}")
-                    elif container_selector and shell_overflow > args.max_overflow_px:
-                        device_result["issues"].append(
-                            f"shell overflow {shell_overflow}px > {args.max_overflow_px}px"
-                        )
-
-                    shot_path = _screenshot_path_for_device(args.output_dir, args.url, device_name)
-                    page.screenshot(path=str(shot_path), full_page=True)
-                    device_result["screenshot_path"] = str(shot_path)
-
-                    baseline_path = _baseline_path_for_device(args.baseline_dir, args.url, device_name)
-                    device_result["baseline_path"] = str(baseline_path)
-                    if args.update_baseline:
-                        shutil.copyfile(shot_path, baseline_path)
-                    elif baseline_path.exists():
-                        diff_percent = _compare_png_images_percent(baseline_path, shot_path)
-                        device_result["diff_percent"] = round(diff_percent, 4)
-                        report["summary"]["max_diff_seen"] = max(float(report["summary"]["max_diff_seen"]), diff_percent)
-                        if diff_percent > float(args.max_diff_percent):
-                            device_result["issues"].append(
-                                f"visual diff {diff_percent:.3f}% > threshold {float(args.max_diff_percent):.3f}%"
-                            )
-                            report["summary"]["devices_diff_exceeded"] = int(
-                                report["summary"]["devices_diff_exceeded"]
-                            ) + 1
-                    else:
-                        device_result["issues"].append("baseline screenshot missing")
-
-                    if surface_id == "first-slice-shell":
-                        device_result["issues"].extend(_collect_accessibility_issues(page))
-                        action_paths = _required_action_feedback_paths(surface_id)
-                        action_issues, action_checks = _collect_first_slice_action_feedback_issues(page)
-                        action_ok = sum(1 for check in action_checks if check.get("status") == "ok")
-                        action_failed = len(action_checks) - action_ok
-                        device_result["action_feedback_checks"] = action_checks
-                        device_result["action_feedback_paths_total"] = len(action_paths)
-                        device_result["action_feedback_paths_ok"] = action_ok
-                        device_result["action_feedback_paths_failed"] = action_failed
-                        report["summary"]["action_feedback_paths_total"] = int(
-                            report["summary"]["action_feedback_paths_total"]
-                        ) + len(action_paths)
-                        report["summary"]["action_feedback_paths_ok"] = int(
-                            report["summary"]["action_feedback_paths_ok"]
-                        ) + action_ok
-                        report["summary"]["action_feedback_paths_failed"] = int(
-                            report["summary"]["action_feedback_paths_failed"]
-                        ) + action_failed
-                        device_result["issues"].extend(action_issues)
-                    else:
-                        device_result["issues"].extend(_collect_basic_accessibility_issues(page))
-                finally:
-                    context.close()
-
-                if device_result["issues"]:
-                    device_result["status"] = "failed"
-                    report["summary"]["devices_failed"] = int(report["summary"]["devices_failed"]) + 1
-                else:
-                    report["summary"]["devices_ok"] = int(report["summary"]["devices_ok"]) + 1
-                report["devices"].append(device_result)
-            browser.close()
+        from playwright.sync_api import sync_playwright  # type: ignore
+    except Exception as exc:
+        reason = f"playwright import failed: {exc}"
+        return (1 if args.strict else 0), {"status": "blocked", "error": reason}
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    args.baseline_dir.mkdir(parents=True, exist_ok=True)
+    run_ts = utc_now_iso()
+    reports = [_surface_report(surface["url"], surface["devices"], args, run_ts) for surface in surfaces]
+    checks = [
+        {
+            "url": report["url"],
+            "surface_id": report["surface"],
+            "required_selectors": _surface_required_selectors(report["surface"]),
+            "container_selector": _surface_container_selector(report["surface"]),
+        }
+        for report in reports
+    ]
+    # Every surface's devices share one browser (or one per --concurrency worker).
+    jobs = [(index, device_name) for index, surface in enumerate(surfaces) for device_name in surface["devices"]]
+
+    def _check(browser: Any, job: tuple[int, str]) -> tuple[dict[str, Any], float | None]:
+        index, device_name = job
+        return _check_device(browser, args, device_name, **checks[index])
+
+    try:
+        device_runs = _run_devices(
+            sync_playwright,
+            jobs,
+            _check,
+            concurrency=getattr(args, "concurrency", 1),
+        )
     except Exception as exc:
         return (1 if args.strict else 0), {"status": "blocked", "error": f"browser launch/run failed: {exc}"}
 
-    has_failures = int(report["summary"]["devices_failed"]) > 0
+    for (index, _device_name), (device_result, diff_percent) in zip(jobs, device_runs):
+        _add_device_run(reports[index], device_result, diff_percent, args)
+    for report in reports:
+        report["status"] = "failed" if int(report["summary"]["devices_failed"]) > 0 else "ok"
+
+    report = reports[0] if batch is None else _batch_report(reports, args, run_ts)
+    has_failures = report["status"] != "ok"
     rc = 1 if (args.strict and has_failures) else 0
-    report["status"] = "failed" if has_failures else "ok"
     return rc, report
 
 
@@ -1044,6 +1230,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--port", type=int, default=4173)
     parser.add_argument("--no-serve", action="store_true", help="Do not start local static HTTP server.")
     parser.add_argument("--devices", default="desktop-1440,tablet-1024,mobile-390,mobile-360")
+    parser.add_argument(
+        "--surfaces",
+        help="Comma-separated pages (relative to --url or absolute) checked in one run with one browser.",
+    )
+    parser.add_argument("--manifest", type=Path, help="JSON list of surfaces (url, optional devices) for batch mode.")
     parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("--baseline-dir", type=Path, default=DEFAULT_BASELINE_DIR)
     parser.add_argument("--report", type=Path, default=DEFAULT_REPORT_PATH)
@@ -1051,6 +1242,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--strict", action="store_true", help="Exit non-zero on failures/missing baseline/dependency.")
     parser.add_argument("--max-overflow-px", type=int, default=0)
     parser.add_argument("--max-diff-percent", type=float, default=0.5)
+    parser.add_argument("--diff-tile-size", type=int, default=64, help="Tile edge in screenshot pixels for diff scores.")
+    parser.add_argument(
+        "--pixel-tolerance",
+        type=int,
+        default=0,
+        help="Ignore pixels whose largest channel difference is at most this (0-255).",
+    )
+    parser.add_argument(
+        "--ignore-antialiasing",
+        action="store_true",
+        help="Ignore pixels that only moved by one pixel (anti-aliased edges).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=_int_env("REDKEEPERS_FRONTEND_VISUAL_CONCURRENCY", 1),
+        help="Devices checked in parallel, each on its own Chromium (default 1, sequential).",
+    )
     return parser.parse_args()
 
 
@@ -1078,9 +1287,14 @@ def main() -> int:
     status = report.get("status", "unknown")
     if status == "ok":
         summary = report.get("summary", {})
+        surfaces = (
+            f"surfaces={summary.get('surfaces_ok', 0)}/{summary.get('surfaces_total', 0)} "
+            if report.get("mode") == "batch"
+            else ""
+        )
         print(
             "STATUS: COMPLETED\n"
-            f"Frontend visual smoke passed: ok={summary.get('devices_ok', 0)}/{summary.get('devices_total', 0)} "
+            f"Frontend visual smoke passed: {surfaces}ok={summary.get('devices_ok', 0)}/{summary.get('devices_total', 0)} "
             f"max_diff={summary.get('max_diff_seen', 0)}% "
             f"action_paths={summary.get('action_feedback_paths_ok', 0)}/"
             f"{summary.get('action_feedback_paths_total', 0)} report={args.report}"
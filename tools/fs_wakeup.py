@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+
+DEFAULT_DEBOUNCE_SECONDS = 0.15
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_MAX_WAIT_SECONDS = 300.0
+# A steady stream of writes must not postpone the wakeup forever.
+MAX_DEBOUNCE_ROUNDS = 20
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CLOSE_WRITE = 0x00000008
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class WatchTarget:
+    """A directory (not recursive) and the file-name patterns that matter in it."""
+
+    directory: Path
+    patterns: tuple[str, ...] = ("*",)
+
+    def matches(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+
+
+def daemon_watch_targets(root: Path) -> list[WatchTarget]:
+    """Inputs that can make queued work appear: backlog, human inbox, policies, agent catalog and outboxes.
+
+    The root and agents/ are watched for the inbox and agent directories
+    appearing; the watcher re-reads this list on every wait() to pick them up.
+    """
+    agents_dir = root / "agents"
+    targets = [
+        WatchTarget(root / "coordination" / "backlog", ("*.json", "*.jsonl")),
+        WatchTarget(root / "Human"),
+        WatchTarget(root / "coordination" / "policies"),
+        WatchTarget(root / "coordination" / "state", ("agents.json",)),
+        WatchTarget(root, ("Human", "agents")),
+        WatchTarget(agents_dir),
+    ]
+    if agents_dir.is_dir():
+        for agent_dir in sorted(path for path in agents_dir.iterdir() if path.is_dir()):
+            targets.append(WatchTarget(agent_dir, ("outbox.json",)))
+    return targets
+
+
+class _PollingBackend:
+    name = "poll"
+
+    def __init__(self, targets: list[WatchTarget], *, poll_seconds: float):
+        self.targets = targets
+        self.poll_seconds = max(0.01, poll_seconds)
+        self._snapshot = self._scan()
+
+    def rearm(self, targets: list[WatchTarget]) -> None:
+        # Directories that did not exist are simply rescanned; files already in a
+        # newly listed directory show up as changes on the next scan.
+        self.targets = targets
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for target in self.targets:
+            try:
+                entries = list(os.scandir(target.directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not target.matches(entry.name):
+                    continue
+                try:
+                    # Only the appearance of a directory matters, not writes inside it.
+                    if entry.is_dir():
+                        snapshot[Path(entry.path)] = (0, 0)
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            current = self._scan()
+            changed = {
+                path
+                for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.poll_seconds, remaining))
+
+    def close(self) -> None:
+        return None
+
+
+class _InotifyBackend:
+    name = "inotify"
+
+    def __init__(self, targets: list[WatchTarget]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._watches: dict[int, WatchTarget] = {}
+        for target in targets:
+            error = self._watch(target)
+            if error not in {None, errno.ENOENT, errno.ENOTDIR}:
+                os.close(fd)
+                raise OSError(error, f"inotify_add_watch failed for {target.directory}")
+
+    def _watch(self, target: WatchTarget) -> int | None:
+        """Add a watch for target; the errno on failure, else None."""
+        wd = self._add_watch(self._fd, os.fsencode(target.directory), _WATCH_MASK)
+        if wd < 0:
+            return ctypes.get_errno()
+        self._watches[wd] = target
+        return None
+
+    def rearm(self, targets: list[WatchTarget]) -> None:
+        # Retry targets that were missing (or whose directory was removed); a
+        # failure here is tried again on the next rearm.
+        watched = set(self._watches.values())
+        for target in targets:
+            if target not in watched:
+                self._watch(target)
+
+    def changes(self, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not readable:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                raw_name = buffer[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + length]
+                offset += _EVENT_HEADER.size + length
+                target = self._watches.get(wd)
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                if mask & _IN_IGNORED:
+                    # The kernel dropped the watch (directory deleted); rearm re-adds it.
+                    self._watches.pop(wd, None)
+                elif mask & _IN_Q_OVERFLOW:
+                    changed.update(target.directory for target in self._watches.values())
+                elif target is not None and (not name or target.matches(name)):
+                    changed.add(target.directory / name if name else target.directory)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class WakeupWatcher:
+    """Blocks the idle daemon until one of its input files changes.
+
+    Uses inotify on Linux (the thread sleeps in select, no polling) and falls
+    back to comparing (mtime_ns, size) of matching files every `poll_seconds`.
+    After the first change it keeps collecting until the inputs have been
+    quiet for `debounce_seconds`, so a burst of writes is one wakeup.
+    With `refresh`, the target list is re-read on every wait() so directories
+    that appear later (the human inbox, new agents) are watched too.
+    """
+
+    def __init__(
+        self,
+        targets: list[WatchTarget],
+        *,
+        backend: str = "auto",
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        refresh: Callable[[], list[WatchTarget]] | None = None,
+    ):
+        self.debounce_seconds = max(0.0, debounce_seconds)
+        self._targets = targets
+        self._refresh = refresh
+        self._backend: _InotifyBackend | _PollingBackend | None = None
+        if backend in {"auto", "inotify"} and sys.platform.startswith("linux"):
+            try:
+                self._backend = _InotifyBackend(targets)
+            except (OSError, AttributeError):
+                if backend == "inotify":
+                    raise
+        if self._backend is None:
+            self._backend = _PollingBackend(targets, poll_seconds=poll_seconds)
+
+    @classmethod
+    def from_policy(cls, root: Path, cfg: dict[str, Any]) -> "WakeupWatcher":
+        def _seconds(key: str, default: float) -> float:
+            try:
+                return max(0.0, float(cfg.get(key, default)))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            daemon_watch_targets(root),
+            backend=str(cfg.get("backend", "auto")).strip().lower() or "auto",
+            debounce_seconds=_seconds("debounce_ms", DEFAULT_DEBOUNCE_SECONDS * 1000) / 1000,
+            poll_seconds=_seconds("poll_seconds", DEFAULT_POLL_SECONDS),
+            refresh=lambda: daemon_watch_targets(root),
+        )
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name if self._backend is not None else "closed"
+
+    def wait(self, timeout: float) -> list[Path]:
+        """Changed paths (sorted), or [] when `timeout` seconds pass without a change."""
+        assert self._backend is not None, "watcher is closed"
+        self._backend.rearm(self._refresh() if self._refresh is not None else self._targets)
+        changed = self._backend.changes(timeout)
+        rounds = 0
+        while changed and self.debounce_seconds > 0 and rounds < MAX_DEBOUNCE_ROUNDS:
+            more = self._backend.changes(self.debounce_seconds)
+            if not more:
+                break
+            changed |= more
+            rounds += 1
+        return sorted(changed)
+
+    def pending(self) -> list[Path]:
+        """Paths changed since the last wait()/pending(), without blocking or debouncing."""
+        assert self._backend is not None, "watcher is closed"
+        self._backend.rearm(self._refresh() if self._refresh is not None else self._targets)
+        return sorted(self._backend.changes(0))
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
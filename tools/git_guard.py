@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import os
 import re
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from python_runtime import preferred_python_command
+from validation_cache import ValidationCache
 
 def _run(command: str, cwd: Path) -> subprocess.CompletedProcess[str]:
     return subprocess.run(
@@ -66,27 +74,319 @@ def changed_files(root: Path) -> list[str]:
     return files
 
 
-def run_validation_commands(root: Path, commands: list[str]) -> tuple[bool, list[dict[str, Any]]]:
-    results: list[dict[str, Any]] = []
-    for command in commands:
-        effective_command = _normalize_validation_command(command)
-        proc = _run(effective_command, root)
-        results.append(
-            {
+VALIDATION_TAIL_CHARS = 1000
+_SCRIPT_TOKEN = re.compile(r"[\w./\\-]+\.(?:py|ps1|sh|js|mjs)\b", re.IGNORECASE)
+# Lane for commands declared by the policy or the item: they may depend on
+# each other across scripts, so they always run one after another.
+DECLARED_VALIDATION_LANE = "<declared>"
+
+
+def validation_lane_key(command: str) -> str:
+    """Lane of a tool stage: commands that drive the same script run in listed order.
+
+    This keeps stages such as `packaging.py package` -> `packaging.py smoke`
+    sequential while unrelated tools run side by side. Declared commands are
+    put in DECLARED_VALIDATION_LANE by the caller instead.
+    """
+    match = _SCRIPT_TOKEN.search(command)
+    if match is None:
+        return command.strip()
+    return match.group(0).replace("\\", "/").lower()
+
+
+def _log_slug(command: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", command).strip("-").lower()
+    return slug[:60] or "command"
+
+
+def _read_tail(path: Path, max_chars: int = VALIDATION_TAIL_CHARS) -> str:
+    try:
+        with path.open("rb") as fh:
+            fh.seek(0, 2)
+            size = fh.tell()
+            # UTF-8 needs at most 4 bytes per char.
+            fh.seek(max(0, size - max_chars * 4))
+            data = fh.read()
+    except OSError:
+        return ""
+    return data.decode("utf-8", errors="replace")[-max_chars:]
+
+
+def _run_logged(command: str, cwd: Path, stdout_path: Path, stderr_path: Path) -> int:
+    with stdout_path.open("wb") as out, stderr_path.open("wb") as err:
+        proc = subprocess.run(command, cwd=cwd, stdout=out, stderr=err, shell=True, check=False)
+    return proc.returncode
+
+
+def _run_validation_lanes(
+    root: Path,
+    commands: list[str],
+    *,
+    workers: int,
+    log_dir: Path,
+    lane_keys: list[str] | None = None,
+    cache: ValidationCache | None = None,
+) -> tuple[bool, list[dict[str, Any]]]:
+    if lane_keys is None or len(lane_keys) != len(commands):
+        lane_keys = [validation_lane_key(command) for command in commands]
+    lanes: dict[str, list[int]] = {}
+    for index, lane in enumerate(lane_keys):
+        lanes.setdefault(lane, []).append(index)
+
+    rows: dict[int, dict[str, Any]] = {}
+    lock = threading.Lock()
+    # Index of the earliest failing command; later commands are not started and
+    # their rows are dropped, matching the old stop-at-first-failure output.
+    cutoff = [len(commands)]
+    # Keys hash the tree as it was before any command ran, so outputs written by
+    # the commands themselves do not change the key of the next identical run.
+    tree = worktree_tree_hash(root, exclude_paths=cache.exclude_paths) if cache is not None else None
+    tree_entries: dict[str, str] | None = None
+
+    def cache_key(effective_command: str) -> str | None:
+        nonlocal tree_entries
+        if cache is None or tree is None or not cache.is_cacheable(effective_command):
+            return None
+        inputs = cache.inputs_for(effective_command)
+        if inputs is None:
+            return cache.key(effective_command, tree)
+        with lock:
+            if tree_entries is None:
+                tree_entries = tree_blob_entries(root, tree)
+        return cache.key(effective_command, cache.fingerprint_entries(tree_entries, inputs))
+
+    def run_lane(indexes: list[int]) -> None:
+        for index in indexes:
+            with lock:
+                if index > cutoff[0]:
+                    return
+            command = commands[index]
+            effective_command = _normalize_validation_command(command)
+            key = cache_key(effective_command)
+            cached = cache.lookup(key) if cache is not None and key is not None else None
+            if cached is not None:
+                with lock:
+                    rows[index] = {**cached, "command": command, "effective_command": effective_command, "cached": True}
+                continue
+            stem = f"{index + 1:02d}-{_log_slug(command)}"
+            stdout_path = log_dir / f"{stem}.stdout.log"
+            stderr_path = log_dir / f"{stem}.stderr.log"
+            started = time.monotonic()
+            exit_code = _run_logged(effective_command, root, stdout_path, stderr_path)
+            row = {
                 "command": command,
                 "effective_command": effective_command,
-                "exit_code": proc.returncode,
-                "stdout_tail": (proc.stdout or "")[-1000:],
-                "stderr_tail": (proc.stderr or "")[-1000:],
+                "exit_code": exit_code,
+                "stdout_tail": _read_tail(stdout_path),
+                "stderr_tail": _read_tail(stderr_path),
+                "stdout_log": stdout_path.as_posix(),
+                "stderr_log": stderr_path.as_posix(),
+                "duration_seconds": round(time.monotonic() - started, 3),
             }
+            if cache is not None and key is not None:
+                cache.store(key, row)
+            with lock:
+                rows[index] = row
+                if exit_code != 0:
+                    cutoff[0] = min(cutoff[0], index)
+                    return
+
+    lane_list = list(lanes.values())
+    if workers <= 1 or len(lane_list) <= 1:
+        for indexes in lane_list:
+            run_lane(indexes)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(lane_list)), thread_name_prefix="validation") as pool:
+            for future in [pool.submit(run_lane, indexes) for indexes in lane_list]:
+                future.result()
+
+    results = [rows[index] for index in sorted(rows) if index <= cutoff[0]]
+    return cutoff[0] == len(commands), results
+
+
+def _prune_validation_logs(log_root: Path, keep_runs: int) -> None:
+    try:
+        runs = sorted((path for path in log_root.iterdir() if path.is_dir()), key=lambda path: path.name)
+    except OSError:
+        return
+    for stale in runs[: max(0, len(runs) - keep_runs)]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def worktree_tree_hash(root: Path, *, exclude_paths: list[str] | None = None) -> str | None:
+    """Tree id of the working tree (tracked + untracked, honouring .gitignore).
+
+    Uses a scratch copy of the index so the real staging area is untouched; the
+    copied stat cache keeps `git add` from rehashing unchanged files.
+    """
+    index_proc = _run("git rev-parse --git-path index", root)
+    if index_proc.returncode != 0:
+        return None
+    real_index = Path(index_proc.stdout.strip())
+    if not real_index.is_absolute():
+        real_index = root / real_index
+    with tempfile.TemporaryDirectory(prefix="rk-tree-") as tmpdir:
+        scratch_index = Path(tmpdir) / "index"
+        if real_index.exists():
+            shutil.copyfile(real_index, scratch_index)
+        env = {**os.environ, "GIT_INDEX_FILE": str(scratch_index)}
+        add_proc = subprocess.run(
+            f"git add -A{_exclude_pathspec_args(exclude_paths)}",
+            cwd=root,
+            env=env,
+            text=True,
+            capture_output=True,
+            shell=True,
+            check=False,
         )
-        if proc.returncode != 0:
-            return False, results
-    return True, results
+        if add_proc.returncode != 0:
+            return None
+        tree_proc = subprocess.run(
+            ["git", "write-tree"],
+            cwd=root,
+            env=env,
+            text=True,
+            capture_output=True,
+            check=False,
+        )
+    if tree_proc.returncode != 0:
+        return None
+    return tree_proc.stdout.strip() or None
+
+
+def tree_blob_entries(root: Path, tree: str) -> dict[str, str]:
+    """Map of path -> blob id for every file in `tree`."""
+    proc = subprocess.run(
+        ["git", "ls-tree", "-r", "--full-tree", "-z", tree],
+        cwd=root,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        return {}
+    entries: dict[str, str] = {}
+    for record in proc.stdout.split("\0"):
+        meta, _, path = record.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and path:
+            entries[path] = parts[2]
+    return entries
+
+
+def run_validation_commands(
+    root: Path,
+    commands: list[str],
+    *,
+    workers: int = 1,
+    log_root: Path | None = None,
+    run_label: str | None = None,
+    keep_runs: int = 20,
+    lane_keys: list[str] | None = None,
+    cache: ValidationCache | None = None,
+) -> tuple[bool, list[dict[str, Any]]]:
+    """Run validation commands, stopping at the first failure in listed order.
+
+    Commands in different lanes run concurrently on up to `workers` threads;
+    `lane_keys` gives the lane of each command (default: validation_lane_key),
+    and commands sharing a lane run in listed order. Output streams to per-command log files under
+    `log_root/<run>/`; without a log_root the logs are temporary and only the
+    tails survive in the result rows. With a `cache`, passing commands whose
+    key matches a stored result are skipped and reported with `cached: True`.
+    """
+    if not commands:
+        return True, []
+    if log_root is None:
+        with tempfile.TemporaryDirectory(prefix="rk-validation-") as tmpdir:
+            ok, results = _run_validation_lanes(
+                root, commands, workers=workers, log_dir=Path(tmpdir), lane_keys=lane_keys, cache=cache
+            )
+        if cache is not None:
+            cache.save()
+        for row in results:
+            row.pop("stdout_log", None)
+            row.pop("stderr_log", None)
+        return ok, results
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    label = _log_slug(run_label) if run_label else "validation"
+    log_dir = log_root / f"{stamp}-{label}"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    ok, results = _run_validation_lanes(
+        root, commands, workers=workers, log_dir=log_dir, lane_keys=lane_keys, cache=cache
+    )
+    if cache is not None:
+        cache.save()
+    _prune_validation_logs(log_root, keep_runs)
+    return ok, results
+
+
+def _exclude_pathspec_args(exclude_paths: list[str] | None) -> str:
+    if not exclude_paths:
+        return ""
+    specs: list[str] = []
+    for raw in exclude_paths:
+        path = str(raw).strip().replace("\\", "/")
+        if not path or '"' in path:
+            continue
+        specs.append(f'":(exclude){path}"')
+    if not specs:
+        return ""
+    return " -- . " + " ".join(specs)
+
+
+def _git_bytes(args: list[str], cwd: Path, *, stdin: bytes | None = None) -> subprocess.CompletedProcess[bytes]:
+    return subprocess.run(["git", *args], cwd=cwd, input=stdin, capture_output=True, check=False)
+
+
+def _proc_error(proc: subprocess.CompletedProcess[bytes], fallback: str) -> str:
+    text = (proc.stderr or proc.stdout or b"").decode("utf-8", errors="replace").strip()
+    return text or fallback
+
+
+def add_worktree(root: Path, path: Path) -> tuple[bool, str]:
+    """Check out HEAD of `root` into a new detached worktree at `path`."""
+    proc = _git_bytes(["worktree", "add", "--detach", str(path), "HEAD"], root)
+    if proc.returncode != 0:
+        return False, _proc_error(proc, "git worktree add failed")
+    return True, str(path)
+
+
+def remove_worktree(root: Path, path: Path) -> None:
+    _git_bytes(["worktree", "remove", "--force", str(path)], root)
+    shutil.rmtree(path, ignore_errors=True)
+    _git_bytes(["worktree", "prune"], root)
+
+
+def worktree_patch(worktree: Path) -> tuple[bool, bytes | str]:
+    """Binary diff of everything changed in `worktree` against its HEAD, new and deleted files included.
+
+    Stages into the worktree's own index, which nothing else uses.
+    """
+    add_proc = _git_bytes(["add", "-A"], worktree)
+    if add_proc.returncode != 0:
+        return False, _proc_error(add_proc, "git add failed")
+    diff_proc = _git_bytes(["diff", "--cached", "--binary", "--no-color", "--no-ext-diff", "HEAD"], worktree)
+    if diff_proc.returncode != 0:
+        return False, _proc_error(diff_proc, "git diff failed")
+    return True, diff_proc.stdout
+
+
+def apply_patch(root: Path, patch: bytes, *, reverse: bool = False) -> tuple[bool, str]:
+    """Apply (or with `reverse`, undo) a worktree_patch() diff to the working tree of `root`."""
+    if not patch.strip():
+        return True, "NO_CHANGES"
+    args = ["apply", "--binary", "--whitespace=nowarn"]
+    if reverse:
+        args.append("--reverse")
+    proc = _git_bytes([*args, "-"], root, stdin=patch)
+    if proc.returncode != 0:
+        return False, _proc_error(proc, "git apply failed")
+    return True, "APPLIED"
 
 
-def commit_changes(root: Path, message: str) -> tuple[bool, str]:
-    add_proc = _run("git add -A", root)
+def commit_changes(root: Path, message: str, *, exclude_paths: list[str] | None = None) -> tuple[bool, str]:
+    add_proc = _run(f"git add -A{_exclude_pathspec_args(exclude_paths)}", root)
     if add_proc.returncode != 0:
         return False, (add_proc.stderr or add_proc.stdout or "git add failed").strip()
 
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import subprocess
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from codex_worker import (
     codex_command_preflight_error,
     codex_model_access_preflight_error,
+    probe_model_access_concurrently,
 )
 from git_guard import _normalize_validation_command
 from python_runtime import resolve_python_executable
+from queue_manager import replay_backlog_journal
 from schemas import load_json, load_yaml_like, validate_work_items
 
 HOSTILE_RUNTIME_TOKEN_CONTRACT_PATH = Path(
@@ -120,23 +126,38 @@ def _validate_model_profile_access(*, errors: list[str], model_policy: Any) -> N
             checks.append((light_model, light_fallback))
 
     seen: set[tuple[str, str | None]] = set()
+    unique_checks: list[tuple[str, str | None]] = []
     for requested_model, fallback_model in checks:
         key = (
             requested_model.lower(),
             fallback_model.lower() if fallback_model else None,
         )
-        if key in seen:
-            continue
-        seen.add(key)
-
-        requested_error = codex_model_access_preflight_error(requested_model)
+        if key not in seen:
+            seen.add(key)
+            unique_checks.append((requested_model, fallback_model))
+
+    # Probe independent models side by side; fallbacks only for models that failed.
+    requested_errors = probe_model_access_concurrently(
+        [requested_model for requested_model, _fallback in unique_checks],
+        probe=codex_model_access_preflight_error,
+    )
+    fallback_errors = probe_model_access_concurrently(
+        [
+            fallback_model
+            for requested_model, fallback_model in unique_checks
+            if fallback_model and _is_definitive_model_access_error(requested_errors.get(requested_model))
+        ],
+        probe=codex_model_access_preflight_error,
+    )
+    for requested_model, fallback_model in unique_checks:
+        requested_error = requested_errors.get(requested_model)
         if not requested_error:
             continue
         if not _is_definitive_model_access_error(requested_error):
             # Timeouts/transient transport failures should not hard-fail daemon startup.
             continue
         if fallback_model:
-            fallback_error = codex_model_access_preflight_error(fallback_model)
+            fallback_error = fallback_errors.get(fallback_model)
             if not _is_definitive_model_access_error(fallback_error):
                 # A usable fallback path exists for this profile.
                 continue
@@ -208,7 +229,7 @@ def _frontend_visual_python_command(command: str) -> str:
 
 
 def _frontend_visual_remediation_commands() -> tuple[str, str]:
-    install_command = _frontend_visual_python_command("python -m pip install playwright pillow")
+    install_command = _frontend_visual_python_command("python -m pip install playwright pillow numpy")
     chromium_command = _frontend_visual_python_command("python -m playwright install chromium")
     return install_command, chromium_command
 
@@ -947,100 +968,291 @@ def _validate_first_slice_hostile_runtime_token_contract_drift(*, errors: list[s
         )
 
 
-def validate_environment(root: Path) -> list[str]:
-    errors: list[str] = []
-    runtime_dir = root / "coordination" / "runtime"
-    commit_guard_rules: Any = {}
-    runtime_policy_rules: Any = {}
+BACKLOG_FILES = (
+    "work-items.json",
+    "completed-items.json",
+    "blocked-items.json",
+    "blocked-archived-items.json",
+)
+# Snapshots the daemon journals into; they are checked with the journal replayed.
+JOURNALED_BACKLOG_FILES = {
+    "active": "work-items.json",
+    "completed": "completed-items.json",
+    "blocked": "blocked-items.json",
+}
+BACKLOG_JOURNAL_FILE = "backlog-journal.jsonl"
+STATE_FILES = ("daemon-state.json", "agents.json")
+RUNTIME_STATE_FILES = ("daemon-state.json", "agent-stats.json", "model-stats.json", "progress-summary.json", "locks.json")
+POLICY_FILES = (
+    "routing-rules.yaml",
+    "retry-policy.yaml",
+    "model-policy.yaml",
+    "commit-guard-rules.yaml",
+    "runtime-policy.yaml",
+)
+CODEX_ENV = ("REDKEEPERS_WORKER_MODE", "REDKEEPERS_CODEX_COMMAND", "PATH")
+PYTHON_ENV = ("REDKEEPERS_PYTHON_CMD", "PATH")
+# Every memoized result is re-checked at least this often, so a tool that
+# disappears from PATH without any input file changing is still noticed.
+HEALTH_CHECK_MEMO_MAX_AGE_SECONDS = 600.0
+
+
+def _policy_path(root: Path, name: str) -> Path:
+    return root / "coordination" / "policies" / name
+
 
-    required_paths = [
+def _required_paths(root: Path) -> list[Path]:
+    return [
         root / "coordination" / "backlog" / "work-items.json",
         root / "coordination" / "backlog" / "completed-items.json",
         root / "coordination" / "backlog" / "blocked-items.json",
         root / "coordination" / "state" / "agents.json",
-        root / "coordination" / "policies" / "routing-rules.yaml",
-        root / "coordination" / "policies" / "retry-policy.yaml",
-        root / "coordination" / "policies" / "model-policy.yaml",
-        root / "coordination" / "policies" / "commit-guard-rules.yaml",
-        root / "coordination" / "policies" / "runtime-policy.yaml",
+        *(_policy_path(root, name) for name in POLICY_FILES),
     ]
-    for path in required_paths:
+
+
+def _check_required_files(root: Path, errors: list[str]) -> None:
+    for path in _required_paths(root):
         if not path.exists():
             errors.append(f"missing required file: {path}")
 
-    _validate_json_list(
-        errors=errors,
-        path=root / "coordination" / "backlog" / "work-items.json",
-        label="work-items.json",
-        validate_items=True,
-    )
-    _validate_json_list(
-        errors=errors,
-        path=root / "coordination" / "backlog" / "completed-items.json",
-        label="completed-items.json",
-        validate_items=True,
-    )
-    _validate_json_list(
-        errors=errors,
-        path=root / "coordination" / "backlog" / "blocked-items.json",
-        label="blocked-items.json",
-        validate_items=True,
-    )
-    _validate_json_list(
-        errors=errors,
-        path=root / "coordination" / "backlog" / "blocked-archived-items.json",
-        label="blocked-archived-items.json",
-        validate_items=True,
-    )
-    _validate_json_object(
-        errors=errors,
-        path=root / "coordination" / "state" / "daemon-state.json",
-        label="daemon-state.json",
-    )
-    _validate_json_object(
-        errors=errors,
-        path=root / "coordination" / "state" / "agents.json",
-        label="agents.json",
-    )
+
+def _check_backlog_files(root: Path, errors: list[str]) -> None:
+    backlog_dir = root / "coordination" / "backlog"
+    journaled = set(JOURNALED_BACKLOG_FILES.values())
+    error_count = len(errors)
+    for name in BACKLOG_FILES:
+        _validate_json_list(
+            errors=errors,
+            path=backlog_dir / name,
+            label=name,
+            validate_items=name not in journaled,
+        )
+    if len(errors) > error_count:
+        return
+    snapshots = {
+        collection: load_json(backlog_dir / name, []) for collection, name in JOURNALED_BACKLOG_FILES.items()
+    }
+    try:
+        replayed = replay_backlog_journal(backlog_dir / BACKLOG_JOURNAL_FILE, **snapshots)
+    except OSError as exc:
+        errors.append(f"failed reading {BACKLOG_JOURNAL_FILE}: {exc}")
+        return
+    for name, items in zip(JOURNALED_BACKLOG_FILES.values(), replayed):
+        errors.extend(f"{name} {err}" for err in validate_work_items(items))
+
+
+def _check_state_files(root: Path, errors: list[str]) -> None:
+    for name in STATE_FILES:
+        _validate_json_object(errors=errors, path=root / "coordination" / "state" / name, label=name)
+
+
+def _check_model_access(root: Path, errors: list[str]) -> None:
     _validate_model_profile_access(
         errors=errors,
-        model_policy=load_yaml_like(root / "coordination" / "policies" / "model-policy.yaml", {}),
+        model_policy=load_yaml_like(_policy_path(root, "model-policy.yaml"), {}),
     )
 
+
+def _check_runtime_state_files(root: Path, errors: list[str]) -> None:
     # Runtime files are generated on demand; validate them only if they already exist.
-    for state_name in ["daemon-state.json", "agent-stats.json", "model-stats.json", "progress-summary.json", "locks.json"]:
-        _validate_json_object(
-            errors=errors,
-            path=runtime_dir / state_name,
-            label=state_name,
-        )
-    for policy_name in [
-        "routing-rules.yaml",
-        "retry-policy.yaml",
-        "model-policy.yaml",
-        "commit-guard-rules.yaml",
-        "runtime-policy.yaml",
-    ]:
-        policy_path = root / "coordination" / "policies" / policy_name
+    for name in RUNTIME_STATE_FILES:
+        _validate_json_object(errors=errors, path=root / "coordination" / "runtime" / name, label=name)
+
+
+def _check_policy_files(root: Path, errors: list[str]) -> None:
+    for name in POLICY_FILES:
+        policy_path = _policy_path(root, name)
         if policy_path.exists():
             try:
                 data: Any = load_yaml_like(policy_path, {})
-                if not isinstance(data, dict):
-                    errors.append(f"{policy_name} must parse to an object")
-                    continue
-                if policy_name == "commit-guard-rules.yaml":
-                    commit_guard_rules = data
-                if policy_name == "runtime-policy.yaml":
-                    runtime_policy_rules = data
             except Exception as exc:
-                errors.append(f"failed parsing {policy_name}: {exc}")
+                errors.append(f"failed parsing {name}: {exc}")
+                continue
+            if not isinstance(data, dict):
+                errors.append(f"{name} must parse to an object")
+
+
+def _load_policy_object(root: Path, name: str) -> Any:
+    # Parse failures are reported by the policy_files check; here they just mean "no rules".
+    try:
+        data = load_yaml_like(_policy_path(root, name), {})
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _check_runtime_python(root: Path, errors: list[str]) -> None:
+    _validate_runtime_python_policy(errors=errors, runtime_policy=_load_policy_object(root, "runtime-policy.yaml"))
+
+
+def _check_frontend_visual_qa(root: Path, errors: list[str]) -> None:
+    _validate_frontend_visual_qa_preflight(errors=errors, commit_rules=_load_policy_object(root, "commit-guard-rules.yaml"))
+
 
-    _validate_runtime_python_policy(errors=errors, runtime_policy=runtime_policy_rules)
-    _validate_frontend_visual_qa_preflight(errors=errors, commit_rules=commit_guard_rules)
+def _check_hostile_runtime_contract(root: Path, errors: list[str]) -> None:
     _validate_first_slice_hostile_runtime_token_contract_drift(errors=errors, root=root)
 
+
+def _check_codex_command(root: Path, errors: list[str]) -> None:
     codex_error = codex_command_preflight_error()
     if codex_error:
         errors.append(codex_error)
 
+
+@dataclass(frozen=True)
+class HealthCheck:
+    """One validate_environment check and the inputs its result depends on."""
+
+    name: str
+    run: Callable[[Path, list[str]], None]
+    inputs: Callable[[Path], list[Path]]
+    env: tuple[str, ...] = ()
+
+
+# Order matters: errors are reported in this order, matching the historical output.
+HEALTH_CHECKS: tuple[HealthCheck, ...] = (
+    HealthCheck("required_files", _check_required_files, _required_paths),
+    HealthCheck(
+        "backlog_files",
+        _check_backlog_files,
+        lambda root: [root / "coordination" / "backlog" / name for name in (*BACKLOG_FILES, BACKLOG_JOURNAL_FILE)],
+    ),
+    HealthCheck(
+        "state_files",
+        _check_state_files,
+        lambda root: [root / "coordination" / "state" / name for name in STATE_FILES],
+    ),
+    HealthCheck(
+        "model_access",
+        _check_model_access,
+        lambda root: [_policy_path(root, "model-policy.yaml")],
+        env=CODEX_ENV + ("REDKEEPERS_USE_DEFAULT_MODEL",),
+    ),
+    HealthCheck(
+        "runtime_state_files",
+        _check_runtime_state_files,
+        lambda root: [root / "coordination" / "runtime" / name for name in RUNTIME_STATE_FILES],
+    ),
+    HealthCheck("policy_files", _check_policy_files, lambda root: [_policy_path(root, name) for name in POLICY_FILES]),
+    HealthCheck(
+        "runtime_python",
+        _check_runtime_python,
+        lambda root: [_policy_path(root, "runtime-policy.yaml")],
+        env=PYTHON_ENV,
+    ),
+    HealthCheck(
+        "frontend_visual_qa",
+        _check_frontend_visual_qa,
+        lambda root: [_policy_path(root, "commit-guard-rules.yaml")],
+        env=PYTHON_ENV + ("REDKEEPERS_ENABLE_FRONTEND_VISUAL_QA",),
+    ),
+    HealthCheck(
+        "hostile_runtime_contract",
+        _check_hostile_runtime_contract,
+        lambda root: [
+            root / HOSTILE_RUNTIME_TOKEN_CONTRACT_PATH,
+            root / FIRST_SLICE_CONTENT_KEY_MANIFEST_PATH,
+            root / EVENT_FEED_MESSAGES_PATH,
+        ],
+    ),
+    HealthCheck("codex_command", _check_codex_command, lambda root: [], env=CODEX_ENV),
+)
+
+
+class HealthCheckMemo:
+    """Per-check results keyed by the content fingerprint of the check's inputs.
+
+    A file's fingerprint is its sha256, recomputed only when (size, mtime_ns)
+    moves, so a touched-but-identical file still counts as unchanged. A check
+    is re-run when any input's content, existence or listed env var changes,
+    or when its result is older than `max_age_seconds`.
+    """
+
+    def __init__(self, *, max_age_seconds: float = HEALTH_CHECK_MEMO_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._digests: dict[Path, tuple[int, int, str]] = {}
+        self._results: dict[str, tuple[tuple[Any, ...], float, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _file_digest(self, path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            self._digests.pop(path, None)
+            return None
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        try:
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def fingerprint(self, check: HealthCheck, root: Path) -> tuple[Any, ...]:
+        with self._lock:
+            files = tuple((str(path), self._file_digest(path)) for path in check.inputs(root))
+        env = tuple((key, os.environ.get(key)) for key in check.env)
+        return (str(root), files, env)
+
+    def lookup(self, name: str, fingerprint: tuple[Any, ...], *, now: float) -> list[str] | None:
+        with self._lock:
+            entry = self._results.get(name)
+        if entry is None or entry[0] != fingerprint or now - entry[1] >= self.max_age_seconds:
+            return None
+        return list(entry[2])
+
+    def store(self, name: str, fingerprint: tuple[Any, ...], errors: list[str], *, now: float) -> None:
+        with self._lock:
+            self._results[name] = (fingerprint, now, list(errors))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._digests.clear()
+            self._results.clear()
+
+
+def validate_environment(
+    root: Path,
+    *,
+    memo: HealthCheckMemo | None = None,
+    force: bool = False,
+    profile: list[dict[str, Any]] | None = None,
+) -> list[str]:
+    """Run every HEALTH_CHECKS entry against `root` and return the errors in order.
+
+    With `memo`, checks whose inputs are unchanged since their last run reuse
+    that result; `force` re-runs everything (and refreshes the memo). Pass
+    `profile` to receive one {check, seconds, cached, error_count} row per check.
+    """
+    errors: list[str] = []
+    for check in HEALTH_CHECKS:
+        started = time.perf_counter()
+        check_errors: list[str] | None = None
+        fingerprint: tuple[Any, ...] = ()
+        if memo is not None:
+            fingerprint = memo.fingerprint(check, root)
+            if not force:
+                check_errors = memo.lookup(check.name, fingerprint, now=time.time())
+        cached = check_errors is not None
+        if check_errors is None:
+            check_errors = []
+            check.run(root, check_errors)
+            if memo is not None:
+                memo.store(check.name, fingerprint, check_errors, now=time.time())
+        errors.extend(check_errors)
+        if profile is not None:
+            profile.append(
+                {
+                    "check": check.name,
+                    "seconds": round(time.perf_counter() - started, 6),
+                    "cached": cached,
+                    "error_count": len(check_errors),
+                }
+            )
     return errors
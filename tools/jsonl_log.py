@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from schemas import load_json, save_json_atomic, utc_now_iso
+
+
+INDEX_VERSION = 1
+
+
+def _empty_segment(name: str, *, compressed: bool = False) -> dict[str, Any]:
+    return {
+        "file": name,
+        "compressed": compressed,
+        "records": 0,
+        "bytes": 0,
+        "first_ts": None,
+        "last_ts": None,
+        "kinds": {},
+        "items": {},
+    }
+
+
+def _ts_epoch(ts: Any) -> float | None:
+    try:
+        return datetime.fromisoformat(str(ts)).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_line(raw: bytes) -> dict[str, Any] | None:
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+class SegmentedJsonlLog:
+    """Append-only JSONL log split into rotated segments with a sidecar index.
+
+    Writers keep appending whole lines to the active file (`path`); rotation
+    renames it to `<stem>.<seq>.jsonl[.gz]` once it passes `max_bytes` or its
+    first record is older than `max_age_seconds`, keeping `keep_segments`
+    rotated segments. The index (`<stem>.index.json`) records per segment the
+    record count, ts range, counts by `kind_field` and the byte offsets of
+    each item_id's records, so window and single-item queries only open the
+    segments (and lines) they need. The active file is indexed lazily from
+    the last indexed offset.
+
+    A process that buffers rows for `path` (RuntimeStateWriter) passes its
+    flush lock as `lock`, so a flush can never append to the active file
+    while rotation is moving it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        kind_field: str = "kind",
+        max_bytes: int = 8_000_000,
+        max_age_seconds: int = 7 * 24 * 3600,
+        compress: bool = True,
+        keep_segments: int = 50,
+        lock: threading.Lock | threading.RLock | None = None,
+    ):
+        self.path = path
+        self.kind_field = kind_field
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.compress = compress
+        self.keep_segments = keep_segments
+        self.index_path = path.with_name(f"{path.stem}.index.json")
+        self._segment_re = re.compile(rf"^{re.escape(path.stem)}\.(\d+)\.jsonl(\.gz)?$")
+        self._lock = lock if lock is not None else threading.Lock()
+
+    @classmethod
+    def from_policy(
+        cls,
+        path: Path,
+        cfg: dict[str, Any] | None,
+        *,
+        kind_field: str = "kind",
+        lock: threading.Lock | threading.RLock | None = None,
+    ) -> SegmentedJsonlLog:
+        """Build from a `log_rotation` block (runtime-policy.yaml)."""
+        cfg = cfg if isinstance(cfg, dict) else {}
+
+        def _number(key: str, default: float) -> float:
+            try:
+                return max(0.0, float(cfg.get(key, default)))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            path,
+            kind_field=kind_field,
+            max_bytes=int(_number("max_mb", 8) * 1_000_000),
+            max_age_seconds=int(_number("max_age_hours", 168) * 3600),
+            compress=bool(cfg.get("compress", True)),
+            keep_segments=int(_number("keep_segments", 50)),
+            lock=lock,
+        )
+
+    # -- index -------------------------------------------------------------
+
+    def _item_id(self, record: dict[str, Any]) -> str:
+        item_id = record.get("item_id")
+        if not item_id and isinstance(record.get("fields"), dict):
+            item_id = record["fields"].get("item_id")
+        return str(item_id or "").strip()
+
+    def _index_record(self, segment: dict[str, Any], record: dict[str, Any], offset: int) -> None:
+        segment["records"] += 1
+        ts = record.get("ts")
+        if isinstance(ts, str) and ts:
+            if not segment["first_ts"] or ts < segment["first_ts"]:
+                segment["first_ts"] = ts
+            if not segment["last_ts"] or ts > segment["last_ts"]:
+                segment["last_ts"] = ts
+        kind = str(record.get(self.kind_field, "") or "").strip()
+        if kind:
+            segment["kinds"][kind] = segment["kinds"].get(kind, 0) + 1
+        item_id = self._item_id(record)
+        if item_id:
+            segment["items"].setdefault(item_id, []).append(offset)
+
+    def _index_file(self, path: Path, segment: dict[str, Any], *, compressed: bool) -> None:
+        """Index complete lines of `path` from `segment['bytes']` onward."""
+        opener = gzip.open if compressed else open
+        with opener(path, "rb") as handle:
+            offset = int(segment["bytes"])
+            handle.seek(offset)
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break  # a writer is mid-line; pick it up next time
+                record = _parse_line(raw)
+                if record is not None:
+                    self._index_record(segment, record, offset)
+                offset += len(raw)
+            segment["bytes"] = offset
+
+    def _segment_files(self) -> list[tuple[int, Path]]:
+        found: list[tuple[int, Path]] = []
+        if not self.path.parent.exists():
+            return found
+        for entry in self.path.parent.iterdir():
+            match = self._segment_re.match(entry.name)
+            if match:
+                found.append((int(match.group(1)), entry))
+        found.sort()
+        return found
+
+    def rebuild_index(self) -> dict[str, Any]:
+        """Re-index every segment on disk from scratch and save the index."""
+        with self._lock:
+            index = self._rebuild_locked()
+            self._save(index)
+            return index
+
+    def _rebuild_locked(self) -> dict[str, Any]:
+        segments: list[dict[str, Any]] = []
+        next_seq = 1
+        for seq, path in self._segment_files():
+            compressed = path.suffix == ".gz"
+            segment = _empty_segment(path.name, compressed=compressed)
+            try:
+                self._index_file(path, segment, compressed=compressed)
+            except (OSError, EOFError):
+                continue
+            segments.append(segment)
+            next_seq = seq + 1
+        return {"version": INDEX_VERSION, "next_seq": next_seq, "segments": segments, "active": _empty_segment(self.path.name)}
+
+    def _load(self) -> dict[str, Any]:
+        index = load_json(self.index_path, {})
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            index = self._rebuild_locked()
+        segments = [seg for seg in index.get("segments", []) if (self.path.parent / seg.get("file", "")).exists()]
+        index["segments"] = segments
+        return index
+
+    def _save(self, index: dict[str, Any]) -> None:
+        index["updated_at"] = utc_now_iso()
+        save_json_atomic(self.index_path, index)
+
+    def _refresh_active(self, index: dict[str, Any]) -> bool:
+        """Catch the active segment's index up with the file; True if it changed."""
+        active = index.get("active") or _empty_segment(self.path.name)
+        index["active"] = active
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        if size < int(active["bytes"]):
+            # Truncated or replaced outside the log: index it again from the top.
+            active.update(_empty_segment(self.path.name))
+        if size == int(active["bytes"]):
+            return False
+        before = int(active["bytes"])
+        try:
+            self._index_file(self.path, active, compressed=False)
+        except OSError:
+            return False
+        return int(active["bytes"]) != before
+
+    def index(self) -> dict[str, Any]:
+        """Current index with the active segment caught up (saved if it moved)."""
+        with self._lock:
+            had_index = self.index_path.exists()
+            index = self._load()
+            if self._refresh_active(index) or (not had_index and index["segments"]):
+                self._save(index)
+            return index
+
+    # -- rotation ----------------------------------------------------------
+
+    def rotation_due(self, index: dict[str, Any], *, now: float | None = None) -> bool:
+        active = index.get("active") or {}
+        if not int(active.get("records", 0)):
+            return False
+        if self.max_bytes and int(active.get("bytes", 0)) >= self.max_bytes:
+            return True
+        first_epoch = _ts_epoch(active.get("first_ts"))
+        now = time.time() if now is None else now
+        return bool(self.max_age_seconds and first_epoch is not None and now - first_epoch >= self.max_age_seconds)
+
+    def rotate_if_due(self, *, now: float | None = None) -> str | None:
+        """Rotate the active file when it is over size or age; returns the new segment name."""
+        with self._lock:
+            if not self.path.exists():
+                return None
+            index = self._load()
+            changed = self._refresh_active(index)
+            if not self.rotation_due(index, now=now):
+                if changed:
+                    self._save(index)
+                return None
+            return self._rotate_locked(index)
+
+    def rotate(self) -> str | None:
+        with self._lock:
+            if not self.path.exists():
+                return None
+            index = self._load()
+            self._refresh_active(index)
+            if not int(index["active"]["records"]):
+                return None
+            return self._rotate_locked(index)
+
+    def _rotate_locked(self, index: dict[str, Any]) -> str:
+        seq = int(index.get("next_seq", 1))
+        segment_path = self.path.with_name(f"{self.path.stem}.{seq:06d}.jsonl")
+        os.replace(self.path, segment_path)
+        # Lines appended after the last index refresh moved with the file.
+        segment = index["active"]
+        self._index_file(segment_path, segment, compressed=False)
+        if self.compress:
+            gz_path = segment_path.with_name(segment_path.name + ".gz")
+            tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+            with segment_path.open("rb") as src, gzip.open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, gz_path)
+            segment_path.unlink()
+            segment_path = gz_path
+        segment["file"] = segment_path.name
+        segment["compressed"] = self.compress
+        index["segments"].append(segment)
+        index["next_seq"] = seq + 1
+        index["active"] = _empty_segment(self.path.name)
+        if self.keep_segments and len(index["segments"]) > self.keep_segments:
+            dropped = index["segments"][: -self.keep_segments]
+            index["segments"] = index["segments"][-self.keep_segments :]
+            for old in dropped:
+                try:
+                    (self.path.parent / old["file"]).unlink()
+                except OSError:
+                    pass
+        self._save(index)
+        return segment_path.name
+
+    # -- queries -----------------------------------------------------------
+
+    def _ordered_segments(self, index: dict[str, Any]) -> list[dict[str, Any]]:
+        return [*index.get("segments", []), index["active"]]
+
+    def _open_segment(self, segment: dict[str, Any]):
+        path = self.path.parent / segment["file"]
+        return gzip.open(path, "rb") if segment.get("compressed") else path.open("rb")
+
+    def _read_segment(self, segment: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        limit = int(segment.get("bytes", 0))
+        try:
+            with self._open_segment(segment) as handle:
+                offset = 0
+                for raw in handle:
+                    if offset >= limit:
+                        break
+                    offset += len(raw)
+                    record = _parse_line(raw)
+                    if record is not None:
+                        yield record
+        except (OSError, EOFError):
+            return
+
+    def _keep(self, record: dict[str, Any], kinds: set[str] | None, since: str | None) -> bool:
+        if kinds is not None and str(record.get(self.kind_field, "")).strip() not in kinds:
+            return False
+        return since is None or str(record.get("ts", "")) >= since
+
+    def iter_records(self, *, since: str | None = None, kinds: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+        """Records oldest first, skipping segments outside `since`/`kinds` via the index."""
+        kind_set = set(kinds) if kinds is not None else None
+        for segment in self._ordered_segments(self.index()):
+            if not int(segment.get("records", 0)):
+                continue
+            if since is not None and str(segment.get("last_ts") or "") < since:
+                continue
+            if kind_set is not None and not kind_set.intersection(segment.get("kinds", {})):
+                continue
+            for record in self._read_segment(segment):
+                if self._keep(record, kind_set, since):
+                    yield record
+
+    def tail(self, limit: int, *, kinds: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        """Newest `limit` records (oldest first), reading only the newest segments needed."""
+        if limit <= 0:
+            return []
+        kind_set = set(kinds) if kinds is not None else None
+        needed: list[dict[str, Any]] = []
+        matched = 0
+        for segment in reversed(self._ordered_segments(self.index())):
+            counts = segment.get("kinds", {})
+            available = int(segment.get("records", 0)) if kind_set is None else sum(int(counts.get(kind, 0)) for kind in kind_set)
+            if not available:
+                continue
+            needed.append(segment)
+            matched += available
+            if matched >= limit:
+                break
+        rows: list[dict[str, Any]] = []
+        for position, segment in enumerate(reversed(needed)):
+            if position == len(needed) - 1 and not segment.get("compressed") and kind_set is None:
+                # Only the newest segment's end is needed; read it backwards.
+                records = self._read_segment_tail(segment, limit)
+            else:
+                records = self._read_segment(segment)
+            rows.extend(record for record in records if self._keep(record, kind_set, None))
+        return rows[-limit:]
+
+    def _read_segment_tail(self, segment: dict[str, Any], limit: int, block: int = 65536) -> list[dict[str, Any]]:
+        end = int(segment.get("bytes", 0))
+        data = b""
+        try:
+            with self._open_segment(segment) as handle:
+                position = end
+                while position > 0 and data.count(b"\n") <= limit:
+                    step = min(block, position)
+                    position -= step
+                    handle.seek(position)
+                    data = handle.read(step) + data
+                data = data[: end - position]
+        except OSError:
+            return []
+        lines = data.split(b"\n")
+        if position > 0:
+            lines = lines[1:]  # first piece may be a partial line
+        records = [record for record in (_parse_line(line) for line in lines) if record is not None]
+        return records[-limit:]
+
+    def for_items(self, item_ids: Iterable[str], *, kinds: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Records for each item id (oldest first), read by offset from the index."""
+        wanted = {str(item_id).strip() for item_id in item_ids if str(item_id).strip()}
+        kind_set = set(kinds) if kinds is not None else None
+        found: dict[str, list[dict[str, Any]]] = {item_id: [] for item_id in wanted}
+        for segment in self._ordered_segments(self.index()):
+            items = segment.get("items", {})
+            offsets = sorted(offset for item_id in wanted for offset in items.get(item_id, []))
+            if not offsets:
+                continue
+            try:
+                with self._open_segment(segment) as handle:
+                    for offset in offsets:
+                        handle.seek(offset)
+                        record = _parse_line(handle.readline())
+                        if record is None or not self._keep(record, kind_set, None):
+                            continue
+                        item_id = self._item_id(record)
+                        if item_id in found:
+                            found[item_id].append(record)
+            except (OSError, EOFError):
+                continue
+        return found
+
+    def for_item(self, item_id: str, *, kinds: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        return self.for_items([item_id], kinds=kinds).get(str(item_id).strip(), [])
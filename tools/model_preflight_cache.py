@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from schemas import load_json, load_yaml_like, save_json_atomic, utc_now_iso
+
+
+MODEL_PREFLIGHT_CACHE_ENV = "REDKEEPERS_MODEL_PREFLIGHT_CACHE"
+DEFAULT_POSITIVE_TTL_HOURS = 12.0
+DEFAULT_NEGATIVE_TTL_HOURS = 1.0
+
+
+def model_policy_fingerprint(model_policy: Any) -> str:
+    payload = model_policy if isinstance(model_policy, dict) else {}
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def model_preflight_cache_enabled() -> bool:
+    return os.environ.get(MODEL_PREFLIGHT_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _hours(value: Any, default: float) -> float:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+class ModelPreflightCache:
+    """Model-access probe results shared across daemon processes.
+
+    Stored in coordination/runtime/model-preflight-cache.json together with the
+    model-policy fingerprint they were taken under; a policy change discards
+    every entry. Accessible results live for `positive_ttl_hours`, access
+    errors for `negative_ttl_hours` (model-policy.yaml `preflight_cache`).
+    """
+
+    def __init__(self, root: Path):
+        self.path = root / "coordination" / "runtime" / "model-preflight-cache.json"
+        self.policy_path = root / "coordination" / "policies" / "model-policy.yaml"
+        self._lock = threading.Lock()
+        self._policy_stamp: tuple[int, int] | None = None
+        self._fingerprint: str | None = None
+        self.positive_ttl_seconds = DEFAULT_POSITIVE_TTL_HOURS * 3600
+        self.negative_ttl_seconds = DEFAULT_NEGATIVE_TTL_HOURS * 3600
+
+    def sync_policy(self) -> bool:
+        """Re-read model-policy.yaml if it changed; True when the fingerprint moved."""
+        try:
+            stat = self.policy_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = (0, 0)
+        with self._lock:
+            if stamp == self._policy_stamp:
+                return False
+            policy = load_yaml_like(self.policy_path, {})
+            cfg = policy.get("preflight_cache", {}) if isinstance(policy, dict) else {}
+            cfg = cfg if isinstance(cfg, dict) else {}
+            self.positive_ttl_seconds = _hours(cfg.get("positive_ttl_hours"), DEFAULT_POSITIVE_TTL_HOURS) * 3600
+            self.negative_ttl_seconds = _hours(cfg.get("negative_ttl_hours"), DEFAULT_NEGATIVE_TTL_HOURS) * 3600
+            fingerprint = model_policy_fingerprint(policy)
+            changed = self._fingerprint is not None and fingerprint != self._fingerprint
+            self._policy_stamp = stamp
+            self._fingerprint = fingerprint
+            return changed
+
+    def lookup(self, model: str, *, now: float | None = None) -> tuple[bool, str | None]:
+        """(hit, error) for `model`; error None means the model was accessible."""
+        self.sync_policy()
+        data = load_json(self.path, {})
+        if not isinstance(data, dict) or data.get("policy_fingerprint") != self._fingerprint:
+            return False, None
+        entry = data.get("entries", {}).get(model)
+        if not isinstance(entry, dict):
+            return False, None
+        error = entry.get("error")
+        ttl = self.positive_ttl_seconds if error is None else self.negative_ttl_seconds
+        now = time.time() if now is None else now
+        if now - float(entry.get("checked_epoch", 0)) >= ttl:
+            return False, None
+        return True, error
+
+    def store(self, model: str, error: str | None) -> None:
+        self.sync_policy()
+        with self._lock:
+            data = load_json(self.path, {})
+            if not isinstance(data, dict) or data.get("policy_fingerprint") != self._fingerprint:
+                data = {"policy_fingerprint": self._fingerprint, "entries": {}}
+            data.setdefault("entries", {})[model] = {
+                "error": error,
+                "checked_at": utc_now_iso(),
+                "checked_epoch": time.time(),
+            }
+            save_json_atomic(self.path, data)
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from runtime_state import RuntimeStateWriter
 from schemas import load_json, save_json_atomic, utc_now_iso
 
 
+DEFAULT_HOT_SESSIONS = 20
+DEFAULT_DAILY_ROLLUP_DAYS = 30
+DEFAULT_WEEKLY_ROLLUP_WEEKS = 52
+TOTAL_FIELDS = (
+    "runs",
+    "completed",
+    "blocked",
+    "failed",
+    "fallback_runs",
+    "requested_model_mismatch_runs",
+    "tokens_in",
+    "tokens_out",
+)
+
+
 def _default_totals() -> dict[str, Any]:
     return {
         "runs": 0,
@@ -40,10 +57,114 @@ def _default_session(*, started_at: str, pid: int, mode: str) -> dict[str, Any]:
     }
 
 
+def _default_rollup() -> dict[str, Any]:
+    return {
+        "sessions": 0,
+        "first_started_at": None,
+        "last_started_at": None,
+        "totals": _default_totals(),
+        "by_model": {},
+    }
+
+
+def _merge_totals(target: dict[str, Any], source: dict[str, Any]) -> None:
+    for field in TOTAL_FIELDS:
+        target[field] = int(target.get(field, 0)) + int(source.get(field, 0))
+    target["runtime_seconds"] = float(target.get("runtime_seconds", 0.0)) + float(source.get("runtime_seconds", 0.0))
+
+
+def _merge_by_model(target: dict[str, Any], source: dict[str, Any]) -> None:
+    for model_name, entry in source.items():
+        if not isinstance(entry, dict):
+            continue
+        bucket = target.setdefault(model_name, _default_model_bucket())
+        _merge_totals(bucket, entry)
+        seen = [value for value in (bucket.get("first_seen_at"), entry.get("first_seen_at")) if value]
+        used = [value for value in (bucket.get("last_used_at"), entry.get("last_used_at")) if value]
+        bucket["first_seen_at"] = min(seen) if seen else None
+        bucket["last_used_at"] = max(used) if used else None
+        agents = bucket.setdefault("agents", {})
+        for agent_id, agent_entry in entry.get("agents", {}).items():
+            if not isinstance(agent_entry, dict):
+                continue
+            agent_bucket = agents.setdefault(agent_id, {**_default_totals(), "role": agent_entry.get("role")})
+            _merge_totals(agent_bucket, agent_entry)
+            if not agent_bucket.get("role"):
+                agent_bucket["role"] = agent_entry.get("role")
+
+
+def _merge_rollup(target: dict[str, Any], source: dict[str, Any]) -> None:
+    target["sessions"] = int(target.get("sessions", 0)) + int(source.get("sessions", 0))
+    first = [value for value in (target.get("first_started_at"), source.get("first_started_at")) if value]
+    last = [value for value in (target.get("last_started_at"), source.get("last_started_at")) if value]
+    target["first_started_at"] = min(first) if first else None
+    target["last_started_at"] = max(last) if last else None
+    _merge_totals(target.setdefault("totals", _default_totals()), source.get("totals", {}))
+    _merge_by_model(target.setdefault("by_model", {}), source.get("by_model", {}))
+
+
+def _session_day(session: dict[str, Any]) -> date | None:
+    try:
+        return datetime.fromisoformat(str(session.get("started_at"))).date()
+    except ValueError:
+        return None
+
+
+def _week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _week_start(week_key: str) -> date | None:
+    year, sep, week = week_key.partition("-W")
+    try:
+        return date.fromisocalendar(int(year), int(week), 1) if sep else None
+    except ValueError:
+        return None
+
+
 class ModelStatsTracker:
-    def __init__(self, root: Path):
+    """Lifetime and per-session model usage in coordination/runtime/model-stats.json.
+
+    Only the newest `hot_sessions` sessions are kept individually. Older ones
+    are folded into `rollups.daily` (by session start date) when a session
+    starts, daily rollups older than `daily_rollup_days` into
+    `rollups.weekly` (ISO week), and weekly rollups older than
+    `weekly_rollup_weeks` are dropped (lifetime totals keep their counts), so
+    the file stays a bounded size however often or long the daemon runs.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        writer: RuntimeStateWriter | None = None,
+        hot_sessions: int = DEFAULT_HOT_SESSIONS,
+        daily_rollup_days: int = DEFAULT_DAILY_ROLLUP_DAYS,
+        weekly_rollup_weeks: int = DEFAULT_WEEKLY_ROLLUP_WEEKS,
+    ):
         self.root = root
         self.path = root / "coordination" / "runtime" / "model-stats.json"
+        self.writer = writer
+        self.hot_sessions = max(1, hot_sessions)
+        self.daily_rollup_days = max(0, daily_rollup_days)
+        self.weekly_rollup_weeks = max(1, weekly_rollup_weeks)
+
+    @classmethod
+    def from_policy(cls, root: Path, cfg: dict[str, Any], *, writer: RuntimeStateWriter | None = None) -> "ModelStatsTracker":
+        def _int(key: str, default: int) -> int:
+            try:
+                return int(cfg.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            root,
+            writer=writer,
+            hot_sessions=_int("hot_sessions", DEFAULT_HOT_SESSIONS),
+            daily_rollup_days=_int("daily_rollup_days", DEFAULT_DAILY_ROLLUP_DAYS),
+            weekly_rollup_weeks=_int("weekly_rollup_weeks", DEFAULT_WEEKLY_ROLLUP_WEEKS),
+        )
 
     def default_payload(self) -> dict[str, Any]:
         return {
@@ -54,10 +175,14 @@ class ModelStatsTracker:
             },
             "sessions": {},
             "session_order": [],
+            "rollups": {"daily": {}, "weekly": {}},
         }
 
     def load(self) -> dict[str, Any]:
-        data = load_json(self.path, None)
+        if self.writer is not None:
+            data = self.writer.load(self.path, None)
+        else:
+            data = load_json(self.path, None)
         if not isinstance(data, dict):
             data = self.default_payload()
 
@@ -67,11 +192,17 @@ class ModelStatsTracker:
         data["lifetime"].setdefault("by_model", {})
         data.setdefault("sessions", {})
         data.setdefault("session_order", [])
+        rollups = data.setdefault("rollups", {})
+        rollups.setdefault("daily", {})
+        rollups.setdefault("weekly", {})
         return data
 
     def save(self, data: dict[str, Any]) -> None:
         data["generated_at"] = utc_now_iso()
-        save_json_atomic(self.path, data)
+        if self.writer is not None:
+            self.writer.save(self.path, data, compact=True)
+        else:
+            save_json_atomic(self.path, data, compact=True)
 
     def start_session(
         self,
@@ -93,6 +224,58 @@ class ModelStatsTracker:
             sessions[session_id]["pid"] = pid
             sessions[session_id]["mode"] = mode
             sessions[session_id]["ended_at"] = None
+        self.apply_retention(data)
+
+    def apply_retention(self, data: dict[str, Any], *, today: date | None = None) -> dict[str, int]:
+        """Roll sessions beyond `hot_sessions` into daily rollups, old days into weekly ones, and drop old weeks."""
+        sessions = data.setdefault("sessions", {})
+        order = [session_id for session_id in data.setdefault("session_order", []) if session_id in sessions]
+        order.extend(sorted(session_id for session_id in sessions if session_id not in order))
+        rollups = data.setdefault("rollups", {})
+        daily = rollups.setdefault("daily", {})
+        weekly = rollups.setdefault("weekly", {})
+
+        expired = order[: max(0, len(order) - self.hot_sessions)]
+        for session_id in expired:
+            session = sessions.pop(session_id)
+            if not isinstance(session, dict):
+                continue
+            day = _session_day(session)
+            started_at = session.get("started_at")
+            _merge_rollup(
+                daily.setdefault(day.isoformat() if day else "unknown", _default_rollup()),
+                {
+                    "sessions": 1,
+                    "first_started_at": started_at,
+                    "last_started_at": started_at,
+                    "totals": session.get("totals", {}),
+                    "by_model": session.get("by_model", {}),
+                },
+            )
+        data["session_order"] = order[len(expired) :]
+
+        today = datetime.now(timezone.utc).date() if today is None else today
+        cutoff = today - timedelta(days=self.daily_rollup_days)
+        folded = 0
+        for day_key in sorted(daily):
+            try:
+                day = date.fromisoformat(day_key)
+            except ValueError:
+                continue
+            if day >= cutoff:
+                continue
+            _merge_rollup(weekly.setdefault(_week_key(day), _default_rollup()), daily.pop(day_key))
+            folded += 1
+
+        week_cutoff = today - timedelta(weeks=self.weekly_rollup_weeks)
+        pruned = 0
+        for week_key in sorted(weekly):
+            week_start = _week_start(week_key)
+            if week_start is None or week_start >= week_cutoff:
+                continue
+            del weekly[week_key]
+            pruned += 1
+        return {"sessions_rolled": len(expired), "days_folded": folded, "weeks_pruned": pruned}
 
     def end_session(self, data: dict[str, Any], *, session_id: str, ended_at: str) -> None:
         session = data.setdefault("sessions", {}).get(session_id)
@@ -1,26 +1,52 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import copy
 import hashlib
 import json
 import os
 import re
+import shutil
 import sys
+import tempfile
 import threading
 import time
-from datetime import datetime, timezone
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
-
-from codex_worker import codex_model_access_preflight_error, run_agent
-from git_guard import changed_files, commit_changes, current_branch, is_git_repo, run_validation_commands
-from health_checks import validate_environment
+from typing import Any, Iterable, Iterator
+
+from codex_worker import StreamingOutput, codex_model_access_preflight_error, probe_model_access_concurrently, run_agent
+from completion_metrics import QUANTILES, CompletionMetricsTracker
+from cycle_profiler import CycleProfiler, profile_span
+from fs_wakeup import DEFAULT_MAX_WAIT_SECONDS, WakeupWatcher
+from git_guard import (
+    DECLARED_VALIDATION_LANE,
+    add_worktree,
+    apply_patch,
+    changed_files,
+    commit_changes,
+    current_branch,
+    is_git_repo,
+    remove_worktree,
+    run_validation_commands,
+    validation_lane_key,
+    worktree_patch,
+)
+from health_checks import HealthCheckMemo, validate_environment
+from jsonl_log import SegmentedJsonlLog
+from model_preflight_cache import model_policy_fingerprint
 from model_stats import ModelStatsTracker
 from python_runtime import enforce_python_environment
-from prompt_builder import build_prompt
+from prompt_builder import build_prompt, prompt_source_paths, restamp_prompt, source_stamps
 from queue_manager import QueueManager
+from runtime_state import RuntimeStateWriter
 from schemas import append_jsonl, load_json, load_yaml_like, save_json_atomic, utc_now_iso
 from stats_tracker import StatsTracker
+from validation_cache import ValidationCache
+from worker_pool import WriteScope, find_scope_conflict, item_write_scope
 from render_status import render_status
 
 
@@ -34,10 +60,15 @@ LOCK_META_PATH = RUNTIME_DIR / "locks.json"
 LOCK_FILE = RUNTIME_DIR / "daemon.lock"
 EVENTS_LOG_PATH = RUNTIME_DIR / "daemon-events.jsonl"
 RUN_HISTORY_PATH = RUNTIME_DIR / "run-history.jsonl"
+AGENT_LOG_KEEP = 50
+STATUS_RECENT_RUNS = 5
+# Health-check results reused across cycles while their inputs are unchanged.
+HEALTH_CHECK_MEMO = HealthCheckMemo()
 LOW_QUEUE_WATERMARK = 2
 MODEL_POLICY_DRIFT_BLOCKER_CATEGORY = "model_policy_drift"
 VALIDATION_SCOPE_WAIVER_FIELD = "validation_scope_waiver"
 VALIDATION_SCOPE_PRECHECK_COMMAND = "validation scope preflight"
+WORKTREE_MERGE_COMMAND = "worktree merge"
 FULL_SUITE_DISCOVERY_COMMAND = "python -m unittest discover -s tests"
 SCOPED_VALIDATION_COMMAND_EXPECTATIONS = (
     "python -m unittest tests.<target_module>",
@@ -84,7 +115,18 @@ def _int_env(name: str, default: int, *, min_value: int = 0) -> int:
 
 
 AGENT_HEARTBEAT_SECONDS = _int_env("REDKEEPERS_AGENT_HEARTBEAT_SECONDS", 60, min_value=5)
+AGENT_PROGRESS_SECONDS = _int_env("REDKEEPERS_AGENT_PROGRESS_SECONDS", 15, min_value=1)
+# While pool workers stay busy, maintenance (intake, blocked revisits, health) and
+# the status publish still run at least this often between dispatches.
+POOL_MAINTENANCE_SECONDS = _int_env("REDKEEPERS_POOL_MAINTENANCE_SECONDS", 60, min_value=0)
 STALL_RECOVERY_COOLDOWN_SECONDS = _int_env("REDKEEPERS_STALL_RECOVERY_COOLDOWN_SECONDS", 900, min_value=0)
+RUNTIME_STATE_FLUSH_MS = _int_env("REDKEEPERS_STATE_FLUSH_MS", 1000, min_value=0)
+# daemon-state fields stale-run recovery reads after a crash; changing one is fsynced immediately.
+DURABLE_DAEMON_STATE_FIELDS = ("lock_held", "session_id", "active_item", "active_items", "model_policy_fingerprint")
+DURABLE_EVENT_KINDS = {"daemon_start", "daemon_stop", "error"}
+# Runtime documents and daemon events are coalesced here and flushed in batches.
+RUNTIME_STATE = RuntimeStateWriter(flush_interval_seconds=RUNTIME_STATE_FLUSH_MS / 1000)
+atexit.register(RUNTIME_STATE.close)
 BACKLOG_ID_PATTERN = re.compile(r"^RK-[A-Z0-9]+(?:-[A-Z0-9]+)*$")
 NON_ACTIONABLE_BLOCKER_REASON_PATTERN = re.compile(
     r"^(?:[-*]\s*)?(?:none|n/?a|na|null|nil|unknown|tbd|not provided|not specified|unspecified|no blocker(?: reason)?)(?:[.!])?$",
@@ -114,6 +156,7 @@ KIND_STYLE = {
     "agent_end": "1;32",
     "resolution": "1;36",
     "agent_heartbeat": "2;37",
+    "agent_progress": "2;37",
     "completed": "1;32",
     "blocked": "1;33",
     "failed": "1;31",
@@ -206,6 +249,14 @@ def _render_event_lines(ts: str, kind: str, message: str, fields: dict[str, Any]
             elapsed_text = _normalize_log_text(elapsed, max_chars=32) or "unknown"
         return [f"{prefix} Agent {agent_id or 'unknown'} still running, elapsed seconds: {elapsed_text}."]
 
+    if kind == "agent_progress":
+        last_line = _normalize_log_text(fields.get("last_line"), max_chars=160)
+        head = (
+            f"{prefix} Agent {agent_id or 'unknown'} output: "
+            f"{fields.get('output_lines', 0)} lines, {fields.get('output_bytes', 0)} bytes."
+        )
+        return [head, last_line] if last_line else [head]
+
     if kind == "agent_end":
         elapsed = fields.get("elapsed_seconds")
         if isinstance(elapsed, (int, float)):
@@ -233,9 +284,21 @@ def _render_event_lines(ts: str, kind: str, message: str, fields: dict[str, Any]
             line = f"{line} Reason: {_with_period(reason)}"
         return [line]
 
+    if kind == "wait" and fields.get("wakeup"):
+        return [f"{prefix} {_with_period(message_text)} (up to {fields.get('seconds')}s, wakeup={fields.get('wakeup')})."]
+
     if kind in {"wait", "sleep"} and fields.get("seconds") is not None:
         return [f"{prefix} {_with_period(message_text)} (seconds={fields.get('seconds')})."]
 
+    if kind == "wakeup":
+        changed = ", ".join(str(path) for path in fields.get("changed") or [])
+        return [f"{prefix} {message_text}{': ' + changed if changed else ''} ({fields.get('waited_ms')} ms)."]
+
+    if kind == "cycle_profile":
+        spans = fields.get("spans_ms") or {}
+        top = ", ".join(f"{name} {ms:.0f} ms" for name, ms in list(spans.items())[:4])
+        return [f"{prefix} Cycle {fields.get('cycle')} took {fields.get('total_ms')} ms{' (' + top + ')' if top else ''}."]
+
     if kind == "completed":
         if agent_id:
             return [f"{prefix} Agent {agent_id}: {_with_period(message_text)}"]
@@ -339,7 +402,7 @@ def emit_event(kind: str, message: str, **fields: Any) -> None:
     lines = _render_event_lines(ts, kind, message, fields)
     if lines:
         print("\n".join(lines), flush=True)
-    append_jsonl(
+    RUNTIME_STATE.append(
         EVENTS_LOG_PATH,
         {
             "ts": ts,
@@ -347,14 +410,57 @@ def emit_event(kind: str, message: str, **fields: Any) -> None:
             "message": message,
             "fields": fields,
         },
+        durable=kind in DURABLE_EVENT_KINDS,
+    )
+
+
+def _runtime_policy_section(root: Path, key: str) -> dict[str, Any]:
+    policy = load_yaml_like(root / "coordination" / "policies" / "runtime-policy.yaml", {})
+    cfg = policy.get(key, {}) if isinstance(policy, dict) else {}
+    return cfg if isinstance(cfg, dict) else {}
+
+
+def _log_rotation_policy(root: Path) -> dict[str, Any]:
+    return _runtime_policy_section(root, "log_rotation")
+
+
+def events_log(root: Path | None = None) -> SegmentedJsonlLog:
+    root = ROOT if root is None else root
+    path = root / "coordination" / "runtime" / "daemon-events.jsonl"
+    return SegmentedJsonlLog.from_policy(
+        path, _log_rotation_policy(root), kind_field="kind", lock=RUNTIME_STATE.flush_lock
+    )
+
+
+def run_history_log(root: Path | None = None) -> SegmentedJsonlLog:
+    root = ROOT if root is None else root
+    path = root / "coordination" / "runtime" / "run-history.jsonl"
+    return SegmentedJsonlLog.from_policy(
+        path, _log_rotation_policy(root), kind_field="result", lock=RUNTIME_STATE.flush_lock
     )
 
 
+def rotate_runtime_logs() -> None:
+    """Rotate daemon-events/run-history segments that are over size or age."""
+    RUNTIME_STATE.flush()
+    for log in (events_log(), run_history_log()):
+        try:
+            segment = log.rotate_if_due()
+        except OSError as exc:
+            emit_event("warning", "Runtime log rotation failed", log=log.path.name, error=str(exc))
+            continue
+        if segment:
+            emit_event("log_rotate", "Rotated runtime log segment", log=log.path.name, segment=segment)
+
+
 def set_daemon_state(**patch: Any) -> dict[str, Any]:
-    state = load_json(DAEMON_STATE_PATH, default_daemon_state())
+    state = RUNTIME_STATE.load(DAEMON_STATE_PATH, default_daemon_state())
+    durable = patch.get("state") == "error" or any(
+        field in patch and patch[field] != state.get(field) for field in DURABLE_DAEMON_STATE_FIELDS
+    )
     state.update(patch)
     state["updated_at"] = utc_now_iso()
-    save_json_atomic(DAEMON_STATE_PATH, state)
+    RUNTIME_STATE.save(DAEMON_STATE_PATH, state, durable=durable)
     return state
 
 
@@ -376,14 +482,8 @@ def _is_definitive_model_access_error(text: str | None) -> bool:
     return any(marker in lowered for marker in markers)
 
 
-def model_policy_fingerprint(model_policy: Any) -> str:
-    payload = model_policy if isinstance(model_policy, dict) else {}
-    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True, default=str)
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
-
-
 def load_model_policy_fingerprint() -> str | None:
-    daemon_state = load_json(DAEMON_STATE_PATH, default_daemon_state())
+    daemon_state = RUNTIME_STATE.load(DAEMON_STATE_PATH, default_daemon_state())
     value = str(daemon_state.get("model_policy_fingerprint", "")).strip()
     return value or None
 
@@ -402,13 +502,12 @@ def milestone_progress(queue: QueueManager) -> dict[str, dict[str, int]]:
 
 
 def queue_counts(queue: QueueManager) -> dict[str, int]:
-    running = sum(1 for item in queue.active if item.get("status") in {"assigned", "running", "validating"})
-    queued = sum(1 for item in queue.active if item.get("status") == "queued")
-    completed_ids = {item.get("id") for item in queue.completed}
+    running = sum(len(queue.items_with_status(status)) for status in ("assigned", "running", "validating"))
+    queued_items = queue.items_with_status("queued")
+    queued = len(queued_items)
+    completed_ids = queue.completed_ids()
     dependency_ready = 0
-    for item in queue.active:
-        if item.get("status") != "queued":
-            continue
+    for item in queued_items:
         deps_raw = item.get("dependencies", [])
         if not isinstance(deps_raw, list):
             continue
@@ -687,6 +786,7 @@ def normalize_queued_item_dependencies(
         if normalized != deps_raw:
             item["dependencies"] = normalized
             item["updated_at"] = utc_now_iso()
+            queue.touch(item_id)
             changed = True
 
     if changed:
@@ -695,8 +795,8 @@ def normalize_queued_item_dependencies(
 
 
 def _queued_items_with_unmet_dependencies(queue: QueueManager) -> list[dict[str, Any]]:
-    completed_ids = {item["id"] for item in queue.completed}
-    blocked_ids = {item["id"] for item in queue.blocked}
+    completed_ids = queue.completed_ids()
+    blocked_ids = queue.blocked_ids()
     rows: list[dict[str, Any]] = []
     for item in queue.active:
         if item.get("status") != "queued":
@@ -724,8 +824,8 @@ def is_non_actionable_blocker_reason(reason: Any) -> bool:
 
 
 def find_non_actionable_blocked_items(queue: QueueManager) -> list[dict[str, Any]]:
-    completed_ids = {str(item.get("id", "")).strip() for item in queue.completed}
-    blocked_ids = {str(item.get("id", "")).strip() for item in queue.blocked if str(item.get("id", "")).strip()}
+    completed_ids = queue.completed_ids()
+    blocked_ids = queue.blocked_ids()
 
     dependents_by_blocked: dict[str, set[str]] = {item_id: set() for item_id in blocked_ids}
     for queued in queue.active:
@@ -837,6 +937,7 @@ def audit_queued_model_policy_drift(
     flagged: list[dict[str, Any]] = []
     remediated_ids: list[str] = []
 
+    resolved: list[tuple[str, str, str | None, str | None]] = []
     for item in list(queue.active):
         if item.get("status") != "queued":
             continue
@@ -851,16 +952,32 @@ def audit_queued_model_policy_drift(
             model_policy=model_policy,
             item=item,
         )
-
         model = str(profile.get("model") or "").strip() or None
-        model_error = codex_model_access_preflight_error(model or "")
+        fallback_model = str(profile.get("fallback_model") or "").strip() or None
+        resolved.append((item_id, agent_id, model, fallback_model))
+
+    # Probe each distinct model once, side by side; fallbacks only where the model failed.
+    model_errors = probe_model_access_concurrently(
+        [model for _item_id, _agent_id, model, _fallback in resolved],
+        probe=codex_model_access_preflight_error,
+    )
+    fallback_errors = probe_model_access_concurrently(
+        [
+            fallback_model
+            for _item_id, _agent_id, model, fallback_model in resolved
+            if model and fallback_model and _is_definitive_model_access_error(model_errors.get(model))
+        ],
+        probe=codex_model_access_preflight_error,
+    )
+
+    for item_id, agent_id, model, fallback_model in resolved:
+        model_error = model_errors.get(model) if model else None
         if not _is_definitive_model_access_error(model_error):
             continue
 
-        fallback_model = str(profile.get("fallback_model") or "").strip() or None
         if not fallback_model:
             continue
-        fallback_error = codex_model_access_preflight_error(fallback_model)
+        fallback_error = fallback_errors.get(fallback_model)
         fallback_inaccessible = _is_definitive_model_access_error(fallback_error)
         if not fallback_inaccessible:
             continue
@@ -957,11 +1074,10 @@ def run_queued_model_policy_drift_audit(
 
 
 def _next_auto_blocker_triage_item_id(queue: QueueManager) -> str:
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     i = 1
     while True:
         candidate = f"RK-AUTO-BLOCKER-{i:04d}"
-        if candidate not in existing_ids:
+        if not queue.has_item(candidate):
             return candidate
         i += 1
 
@@ -1100,11 +1216,10 @@ def guard_non_actionable_blocked_items(
 
 
 def _next_auto_stall_item_id(queue: QueueManager) -> str:
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     i = 1
     while True:
         candidate = f"RK-AUTO-STALL-{i:04d}"
-        if candidate not in existing_ids:
+        if not queue.has_item(candidate):
             return candidate
         i += 1
 
@@ -1195,31 +1310,28 @@ def _latest_stall_recovery_timestamp(
 
 
 def _next_auto_refill_item_id(queue: QueueManager) -> str:
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     i = 1
     while True:
         candidate = f"RK-AUTO-BACKLOG-{i:04d}"
-        if candidate not in existing_ids:
+        if not queue.has_item(candidate):
             return candidate
         i += 1
 
 
 def _next_auto_platform_item_id(queue: QueueManager) -> str:
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     i = 1
     while True:
         candidate = f"RK-AUTO-PLATFORM-{i:04d}"
-        if candidate not in existing_ids:
+        if not queue.has_item(candidate):
             return candidate
         i += 1
 
 
 def _next_human_item_id(queue: QueueManager) -> str:
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     i = 1
     while True:
         candidate = f"RK-HUMAN-{i:04d}"
-        if candidate not in existing_ids:
+        if not queue.has_item(candidate):
             return candidate
         i += 1
 
@@ -1542,6 +1654,7 @@ def revisit_recoverable_blocked_items(
     retry_policy: dict[str, Any],
     *,
     model_policy_fingerprint: str | None = None,
+    now: datetime | None = None,
 ) -> list[str]:
     cfg = retry_policy.get("blocked_revisit", {}) if isinstance(retry_policy, dict) else {}
     if not isinstance(cfg, dict):
@@ -1568,7 +1681,7 @@ def revisit_recoverable_blocked_items(
     include_patterns = [str(p).strip().lower() for p in cfg.get("include_reason_patterns", []) if str(p).strip()]
     exclude_patterns = [str(p).strip().lower() for p in cfg.get("exclude_reason_patterns", []) if str(p).strip()]
 
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     completed_ids = queue.completed_ids()
     reopened_ids: list[str] = []
 
@@ -1617,7 +1730,12 @@ def revisit_recoverable_blocked_items(
     return reopened_ids
 
 
-def archive_non_actionable_blocked_items(queue: QueueManager, retry_policy: dict[str, Any]) -> list[str]:
+def archive_non_actionable_blocked_items(
+    queue: QueueManager,
+    retry_policy: dict[str, Any],
+    *,
+    archived_path: Path | None = None,
+) -> list[str]:
     cfg = retry_policy.get("blocked_archive", {}) if isinstance(retry_policy, dict) else {}
     if not isinstance(cfg, dict):
         return []
@@ -1637,29 +1755,25 @@ def archive_non_actionable_blocked_items(queue: QueueManager, retry_policy: dict
     if not include_patterns:
         return []
 
-    archived_rows = load_json(BLOCKED_ARCHIVED_PATH, [])
+    archived_path = archived_path or BLOCKED_ARCHIVED_PATH
+    archived_rows = load_json(archived_path, [])
     if not isinstance(archived_rows, list):
         archived_rows = []
 
     archived_items: list[dict[str, Any]] = []
-    remaining_blocked: list[dict[str, Any]] = []
     moved_ids: list[str] = []
 
     for item in queue.blocked:
         if len(moved_ids) >= max_items_per_cycle:
-            remaining_blocked.append(item)
-            continue
+            break
         reason = str(item.get("blocker_reason", "") or "")
         lowered_reason = reason.lower()
         if not _matches_any_pattern(lowered_reason, include_patterns):
-            remaining_blocked.append(item)
             continue
         if exclude_patterns and _matches_any_pattern(lowered_reason, exclude_patterns):
-            remaining_blocked.append(item)
             continue
         item_id = str(item.get("id", "")).strip()
         if not item_id:
-            remaining_blocked.append(item)
             continue
 
         archived = dict(item)
@@ -1674,9 +1788,11 @@ def archive_non_actionable_blocked_items(queue: QueueManager, retry_policy: dict
     moved_set = {item_id for item_id in moved_ids}
     preserved_archived = [row for row in archived_rows if str(row.get("id", "")).strip() not in moved_set]
     preserved_archived.extend(archived_items)
-    save_json_atomic(BLOCKED_ARCHIVED_PATH, preserved_archived)
+    save_json_atomic(archived_path, preserved_archived)
 
-    queue.blocked = remaining_blocked
+    # One journaled removal per archived item, not a reset of the whole blocked list.
+    for item in archived_items:
+        queue.remove_blocked(item["id"])
     queue.save()
     return moved_ids
 
@@ -1708,7 +1824,21 @@ def _dedupe_by_item_id(items: list[dict[str, Any]]) -> tuple[list[dict[str, Any]
     return deduped, sorted(duplicate_ids)
 
 
+def _has_duplicate_ids(items: Any) -> bool:
+    if not isinstance(items, list):
+        return False
+    ids = [item["id"].strip() for item in items if isinstance(item, dict) and isinstance(item.get("id"), str)]
+    ids = [item_id for item_id in ids if item_id]
+    return len(ids) != len(set(ids))
+
+
 def repair_backlog_archive_duplicates(root: Path) -> dict[str, Any]:
+    """Drop duplicate ids from the completed and blocked archives, keeping the latest entry.
+
+    Duplicates can only live in the snapshot files (journal replay is keyed by
+    id), so they are rewritten there, but only after the journal has been
+    compacted into them so no pending transition is replayed over the repair.
+    """
     completed_path = root / "coordination" / "backlog" / "completed-items.json"
     blocked_path = root / "coordination" / "backlog" / "blocked-items.json"
     result = {
@@ -1717,8 +1847,17 @@ def repair_backlog_archive_duplicates(root: Path) -> dict[str, Any]:
         "completed_duplicate_ids": [],
         "blocked_duplicate_ids": [],
     }
+    archives = [(completed_path, "completed"), (blocked_path, "blocked")]
+    if not any(_has_duplicate_ids(load_json(path, [])) for path, _prefix in archives):
+        return result
+
+    queue = QueueManager(root)
+    queue.load(validate=False)
+    if not queue.compact():
+        # Another writer appended to the journal meanwhile; repair on the next pass.
+        return result
 
-    for path, field_prefix in [(completed_path, "completed"), (blocked_path, "blocked")]:
+    for path, field_prefix in archives:
         data = load_json(path, [])
         if not isinstance(data, list):
             continue
@@ -1818,15 +1957,14 @@ def _normalize_generated_task(source_item: dict[str, Any], agent_id: str, raw: d
     if not title or not owner_role:
         return None
 
-    existing_ids = {item["id"] for item in queue.active} | {item["id"] for item in queue.completed} | {item["id"] for item in queue.blocked}
     explicit_id = str(raw.get("id", "")).strip()
-    item_id = explicit_id if explicit_id and explicit_id not in existing_ids else None
+    item_id = explicit_id if explicit_id and not queue.has_item(explicit_id) else None
     if not item_id:
         base = source_item.get("id", "RK-GEN")
         i = 1
         while True:
             candidate = f"{base}-F{i:02d}"
-            if candidate not in existing_ids:
+            if not queue.has_item(candidate):
                 item_id = candidate
                 break
             i += 1
@@ -1987,10 +2125,13 @@ def build_status_payload(
     stats: dict[str, Any],
     agents: dict[str, dict[str, Any]] | None = None,
     routing_rules: dict[str, Any] | None = None,
+    recent_runs: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     payload: dict[str, Any] = {"daemon": daemon_state, "queue": queue_counts(queue), "agent_stats": stats}
     if agents is not None and routing_rules is not None:
         payload["agent_workload"] = build_agent_workload_payload(queue=queue, agents=agents, routing_rules=routing_rules)
+    if recent_runs is not None:
+        payload["recent_runs"] = recent_runs
     return payload
 
 
@@ -2000,7 +2141,7 @@ def build_agent_workload_payload(
     agents: dict[str, dict[str, Any]],
     routing_rules: dict[str, Any],
 ) -> dict[str, Any]:
-    completed_ids = {str(item.get("id", "")).strip() for item in queue.completed if isinstance(item, dict)}
+    completed_ids = queue.completed_ids()
     counts: dict[str, dict[str, int]] = {}
 
     for agent_id in agents:
@@ -2238,6 +2379,11 @@ def _summarize_validation_results(validation_results: list[dict[str, Any]]) -> l
         }
         if detail:
             summary["detail"] = detail
+        if result.get("cached"):
+            summary["cached"] = True
+        if result.get("stdout_log"):
+            summary["stdout_log"] = result["stdout_log"]
+            summary["stderr_log"] = result.get("stderr_log")
         summaries.append(summary)
     return summaries
 
@@ -2267,7 +2413,7 @@ def _is_test_or_smoke_validation_command(command: str) -> bool:
 
 
 def _classify_validation_or_commit_failure(validation_results: list[dict[str, Any]]) -> dict[str, str]:
-    commit_failure_commands = {"git commit", "branch check"}
+    commit_failure_commands = {"git commit", "branch check", WORKTREE_MERGE_COMMAND}
     phase = "validation"
     detail = ""
     for result in validation_results:
@@ -2339,6 +2485,15 @@ def build_validation_commands(item: dict[str, Any], commit_rules: dict[str, Any]
             f"--max-overflow-px {max_overflow_px}",
             f"--max-diff-percent {max_diff_percent}",
         ]
+        try:
+            concurrency = int(visual_cfg.get("concurrency", 1))
+        except (TypeError, ValueError):
+            concurrency = 1
+        if concurrency > 1:
+            visual_cmd_parts.append(f"--concurrency {concurrency}")
+        surfaces = visual_cfg.get("surfaces")
+        if isinstance(surfaces, list) and any(str(entry).strip() for entry in surfaces):
+            visual_cmd_parts.append("--surfaces " + ",".join(str(entry).strip() for entry in surfaces if str(entry).strip()))
         if strict:
             visual_cmd_parts.append("--strict")
         commands.append(" ".join(visual_cmd_parts))
@@ -2463,7 +2618,34 @@ def run_validation_for_item(root: Path, item: dict[str, Any], commit_rules: dict
     commands = build_validation_commands(item, commit_rules)
     if not commands:
         return True, []
-    return run_validation_commands(root, commands)
+    # Declared commands keep their listed order; only the tool stages the daemon
+    # appends (visual QA, packaging, wrapper prepare) get lanes of their own.
+    declared = set(_configured_validation_commands(item, commit_rules))
+    lane_keys = [
+        DECLARED_VALIDATION_LANE if command in declared else validation_lane_key(command) for command in commands
+    ]
+    runner_cfg = commit_rules.get("validation_runner", {})
+    if not isinstance(runner_cfg, dict):
+        runner_cfg = {}
+    try:
+        workers = max(1, int(runner_cfg.get("workers", 1)))
+    except (TypeError, ValueError):
+        workers = 1
+    try:
+        keep_runs = max(1, int(runner_cfg.get("keep_runs", 20)))
+    except (TypeError, ValueError):
+        keep_runs = 20
+    log_dir = str(runner_cfg.get("log_dir", "") or "").strip()
+    return run_validation_commands(
+        root,
+        commands,
+        workers=workers,
+        log_root=(root / log_dir) if log_dir else None,
+        run_label=str(item.get("id", "")) or None,
+        keep_runs=keep_runs,
+        lane_keys=lane_keys,
+        cache=ValidationCache.from_rules(root, commit_rules),
+    )
 
 
 def _extract_frontend_visual_report_path(text: str) -> str | None:
@@ -2642,16 +2824,143 @@ def is_systemic_worker_bootstrap_error(worker_summary: str, exit_code: int) -> b
     return exit_code == 127 or "command not found" in text or "codex cli command not found" in text
 
 
-def process_one(
+class CyclePhaseTimer:
+    """Wall-clock milliseconds spent in each named phase of a scheduling cycle."""
+
+    def __init__(self) -> None:
+        self.phases_ms: dict[str, float] = {}
+        self._mark = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases_ms[phase] = round(self.phases_ms.get(phase, 0.0) + (now - self._mark) * 1000, 3)
+        self._mark = now
+
+    def total_ms(self) -> float:
+        return round(sum(self.phases_ms.values()), 3)
+
+
+@dataclass
+class SchedulingCycle:
+    agents: dict[str, dict[str, Any]]
+    policies: dict[str, Any]
+    queue: QueueManager
+    stats_tracker: StatsTracker
+    stats: dict[str, Any]
+    model_policy_fingerprint: str
+    timer: CyclePhaseTimer = field(default_factory=CyclePhaseTimer)
+
+
+@dataclass
+class CycleInputs:
+    """Agent catalog, policies and agent stats carried from one scheduling cycle to the next.
+
+    They are re-read only after the wakeup watcher reports a change to the
+    agent catalog or a policy file. Without a watcher every cycle re-reads them.
+    """
+
+    watcher: WakeupWatcher | None = None
+    agents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    policies: dict[str, Any] = field(default_factory=dict)
+    stats_tracker: StatsTracker | None = None
+    stats: dict[str, Any] = field(default_factory=dict)
+    model_policy_fingerprint: str = ""
+    stale: bool = True
+
+    def note_changes(self, paths: Iterable[Path]) -> None:
+        state_dir = ROOT / "coordination" / "state"
+        policy_dir = ROOT / "coordination" / "policies"
+        for path in paths:
+            # A bare directory means the watcher lost track of individual files.
+            if path in {state_dir, state_dir / "agents.json", policy_dir} or path.parent == policy_dir:
+                self.stale = True
+                return
+
+    def ensure_loaded(self) -> None:
+        if self.watcher is None:
+            self.stale = True
+        else:
+            self.note_changes(self.watcher.pending())
+        if not self.stale and self.stats_tracker is not None:
+            return
+        self.agents = load_agent_catalog(ROOT)
+        self.policies = load_policies(ROOT)
+        self.model_policy_fingerprint = model_policy_fingerprint(self.policies.get("model", {}))
+        self.stats_tracker = StatsTracker(ROOT, self.agents, writer=RUNTIME_STATE)
+        self.stats = self.stats_tracker.load()
+        self.stale = False
+
+
+@dataclass
+class AgentRun:
+    item: dict[str, Any]
+    agent_id: str
+    agent_cfg: dict[str, Any]
+    execution_profile: dict[str, str | None]
+    requested_model: str | None
+    selected_model: str | None
+    fallback_selected: bool
+    worker_timeout: int
+    started_at: str
+    started_monotonic: float
+    last_heartbeat: float
+    thread: threading.Thread
+    box: dict[str, Any] = field(default_factory=dict)
+    write_scope: WriteScope | None = None
+    output: StreamingOutput | None = None
+    last_progress: float = 0.0
+    last_progress_bytes: int = 0
+    # Private checkout the agent works in (worker pool only); None means ROOT.
+    worktree: Path | None = None
+
+
+@dataclass
+class PreparedNextItem:
+    """The likely next item, assigned and with its prompt built while the current worker runs."""
+
+    item: dict[str, Any]
+    agent_id: str
+    agent_cfg: dict[str, Any]
+    execution_profile: dict[str, str | None]
+    thread: threading.Thread | None = None
+    prompt: str | None = None
+    prompt_stats: dict[str, Any] = field(default_factory=dict)
+    prompt_sources: tuple[Any, ...] = ()
+    prepare_ms: float = 0.0
+    error: str | None = None
+
+
+def _refresh_and_save_queue_totals(stats_tracker: StatsTracker, stats: dict[str, Any], queue: QueueManager) -> None:
+    stats_tracker.refresh_queue_totals(
+        stats,
+        queued_count=len(queue.items_with_status("queued")),
+        blocked_count=len(queue.blocked),
+        completed_count=len(queue.completed),
+    )
+    stats_tracker.save(stats)
+
+
+def prepare_scheduling_cycle(
     *,
     dry_run: bool,
-    verbose: bool,
-    session_id: str | None = None,
-    model_stats_tracker: ModelStatsTracker | None = None,
-    model_stats: dict[str, Any] | None = None,
-) -> int:
+    queue: QueueManager | None = None,
+    force_health: bool = False,
+    inputs: CycleInputs | None = None,
+) -> SchedulingCycle | None:
+    """Run repair, health checks and backlog maintenance passes ahead of selection.
+
+    The backlog is loaded once; maintenance passes mutate that in-memory queue
+    and their saves are coalesced into a single write at the end of the pass.
+    Pass `queue` to reuse a QueueManager across cycles (it is re-read only if
+    the backlog files changed on disk) and `inputs` to reuse the agent catalog,
+    policies and stats until they are marked stale. Health checks reuse
+    memoized results for unchanged inputs unless `force_health` is set.
+    Returns None when environment validation fails (already reported).
+    """
+    timer = CyclePhaseTimer()
     ensure_python_runtime_configuration()
-    repaired = repair_backlog_archive_duplicates(ROOT)
+    with profile_span("repair"):
+        repaired = repair_backlog_archive_duplicates(ROOT)
     if repaired["completed_removed"] or repaired["blocked_removed"]:
         emit_event(
             "recovery",
@@ -2661,254 +2970,175 @@ def process_one(
             completed_duplicate_ids=repaired["completed_duplicate_ids"],
             blocked_duplicate_ids=repaired["blocked_duplicate_ids"],
         )
+    timer.lap("archive_repair")
 
-    errors = validate_environment(ROOT)
+    with profile_span("health_check"):
+        errors = validate_environment(ROOT, memo=HEALTH_CHECK_MEMO, force=force_health)
+    timer.lap("environment")
     if errors:
         set_daemon_state(state="error", last_error="; ".join(errors[:5]), lock_held=False)
         emit_event("error", "Environment validation failed", error_count=len(errors))
         print("Environment validation failed:")
         for err in errors:
             print(f"- {err}")
-        return 2
+        return None
 
-    agents = load_agent_catalog(ROOT)
-    policies = load_policies(ROOT)
-    current_model_policy_fingerprint = model_policy_fingerprint(policies.get("model", {}))
-    queue = QueueManager(ROOT)
-    queue.load()
-    if not dry_run:
-        archived_blocked_ids = archive_non_actionable_blocked_items(queue, policies.get("retry", {}))
-        if archived_blocked_ids:
+    with profile_span("load"):
+        if inputs is None:
+            inputs = CycleInputs()
+        inputs.ensure_loaded()
+        agents = inputs.agents
+        policies = inputs.policies
+        current_model_policy_fingerprint = inputs.model_policy_fingerprint
+        if queue is None:
+            queue = QueueManager(ROOT)
+        queue.refresh()
+        stats_tracker = inputs.stats_tracker
+        stats = inputs.stats
+    timer.lap("load")
+
+    with queue.deferred_save():
+        if not dry_run:
+            with profile_span("archive"):
+                archived_blocked_ids = archive_non_actionable_blocked_items(queue, policies.get("retry", {}))
+            if archived_blocked_ids:
+                emit_event(
+                    "blocked_archive",
+                    "Archived non-actionable blocked items",
+                    count=len(archived_blocked_ids),
+                    item_ids=archived_blocked_ids,
+                    archive_path=str(BLOCKED_ARCHIVED_PATH.relative_to(ROOT).as_posix()),
+                )
+        with profile_span("intake"):
+            human_inbox_created = ensure_human_instruction_items(queue, agents)
+        if human_inbox_created:
             emit_event(
-                "blocked_archive",
-                "Archived non-actionable blocked items",
-                count=len(archived_blocked_ids),
-                item_ids=archived_blocked_ids,
-                archive_path=str(BLOCKED_ARCHIVED_PATH.relative_to(ROOT).as_posix()),
+                "human_inbox",
+                "Ingested human instruction files into lead triage queue",
+                count=len(human_inbox_created),
+                files=[entry["file"] for entry in human_inbox_created],
+                item_ids=[entry["item_id"] for entry in human_inbox_created],
             )
-            queue.load()
-    human_inbox_created = ensure_human_instruction_items(queue, agents)
-    if human_inbox_created:
-        emit_event(
-            "human_inbox",
-            "Ingested human instruction files into lead triage queue",
-            count=len(human_inbox_created),
-            files=[entry["file"] for entry in human_inbox_created],
-            item_ids=[entry["item_id"] for entry in human_inbox_created],
-        )
-        queue.load()
-    platform_bootstrap = ensure_platform_bootstrap_item(queue, agents)
-    if platform_bootstrap is not None:
-        emit_event(
-            "platform_bootstrap",
-            "Created automatic platform bootstrap task",
-            item_id=platform_bootstrap["id"],
-            title=platform_bootstrap["title"],
-            preferred_agent=platform_bootstrap.get("preferred_agent"),
-        )
-        queue.load()
-    stats_tracker = StatsTracker(ROOT, agents)
-    stats = stats_tracker.load()
-    model_stats_data = model_stats
-    if model_stats_tracker is not None and model_stats_data is None:
-        model_stats_data = model_stats_tracker.load()
-    stats_tracker.refresh_queue_totals(
-        stats,
-        queued_count=sum(1 for item in queue.active if item.get("status") == "queued"),
-        blocked_count=len(queue.blocked),
-        completed_count=len(queue.completed),
-    )
-    stats_tracker.save(stats)
+        with profile_span("intake"):
+            platform_bootstrap = ensure_platform_bootstrap_item(queue, agents)
+        if platform_bootstrap is not None:
+            emit_event(
+                "platform_bootstrap",
+                "Created automatic platform bootstrap task",
+                item_id=platform_bootstrap["id"],
+                title=platform_bootstrap["title"],
+                preferred_agent=platform_bootstrap.get("preferred_agent"),
+            )
+        timer.lap("intake")
+
+        if not dry_run:
+            with profile_span("revisit"):
+                reopened_blocked = revisit_recoverable_blocked_items(
+                    queue,
+                    policies.get("retry", {}),
+                    model_policy_fingerprint=current_model_policy_fingerprint,
+                )
+            if reopened_blocked:
+                emit_event(
+                    "blocked_revisit",
+                    "Requeued recoverable blocked work items",
+                    count=len(reopened_blocked),
+                    item_ids=reopened_blocked,
+                )
 
-    if not dry_run:
-        reopened_blocked = revisit_recoverable_blocked_items(
-            queue,
-            policies.get("retry", {}),
-            model_policy_fingerprint=current_model_policy_fingerprint,
-        )
-        if reopened_blocked:
+        with profile_span("guard"):
+            non_actionable_guard = guard_non_actionable_blocked_items(queue, policies.get("retry", {}), dry_run=dry_run)
+        if non_actionable_guard["flagged"]:
+            emit_event(
+                "queue_health",
+                "Detected blocked items with non-actionable blocker reasons",
+                count=len(non_actionable_guard["flagged"]),
+                item_ids=[str(row.get("item_id", "")) for row in non_actionable_guard["flagged"]],
+                warnings=format_non_actionable_blocked_warning_lines(non_actionable_guard["flagged"], max_lines=5),
+            )
+        if non_actionable_guard["auto_requeued"]:
             emit_event(
-                "blocked_revisit",
-                "Requeued recoverable blocked work items",
-                count=len(reopened_blocked),
-                item_ids=reopened_blocked,
+                "blocked_requeue_non_actionable",
+                "Requeued dependency-ready blocked items with non-actionable blocker reasons",
+                count=len(non_actionable_guard["auto_requeued"]),
+                item_ids=non_actionable_guard["auto_requeued"],
             )
-            queue.load()
-            stats_tracker.refresh_queue_totals(
-                stats,
-                queued_count=sum(1 for queued_item in queue.active if queued_item.get("status") == "queued"),
-                blocked_count=len(queue.blocked),
-                completed_count=len(queue.completed),
+        if non_actionable_guard["triage_item_id"]:
+            emit_event(
+                "blocked_reason_triage",
+                "Created lead triage item for non-actionable blocked reasons",
+                item_id=non_actionable_guard["triage_item_id"],
             )
-            stats_tracker.save(stats)
+        timer.lap("blocked_review")
 
-    non_actionable_guard = guard_non_actionable_blocked_items(queue, policies.get("retry", {}), dry_run=dry_run)
-    if non_actionable_guard["flagged"]:
-        emit_event(
-            "queue_health",
-            "Detected blocked items with non-actionable blocker reasons",
-            count=len(non_actionable_guard["flagged"]),
-            item_ids=[str(row.get("item_id", "")) for row in non_actionable_guard["flagged"]],
-            warnings=format_non_actionable_blocked_warning_lines(non_actionable_guard["flagged"], max_lines=5),
-        )
-    if non_actionable_guard["auto_requeued"]:
-        emit_event(
-            "blocked_requeue_non_actionable",
-            "Requeued dependency-ready blocked items with non-actionable blocker reasons",
-            count=len(non_actionable_guard["auto_requeued"]),
-            item_ids=non_actionable_guard["auto_requeued"],
-        )
-        queue.load()
-        stats_tracker.refresh_queue_totals(
-            stats,
-            queued_count=sum(1 for queued_item in queue.active if queued_item.get("status") == "queued"),
-            blocked_count=len(queue.blocked),
-            completed_count=len(queue.completed),
-        )
-        stats_tracker.save(stats)
-    if non_actionable_guard["triage_item_id"]:
-        emit_event(
-            "blocked_reason_triage",
-            "Created lead triage item for non-actionable blocked reasons",
-            item_id=non_actionable_guard["triage_item_id"],
-        )
-        queue.load()
+        with profile_span("dependencies"):
+            dependency_warnings = normalize_queued_item_dependencies(queue, archived_ids=load_blocked_archived_ids())
+        if dependency_warnings:
+            emit_event(
+                "recovery",
+                "Normalized queued dependencies to known backlog ids",
+                warning_count=len(dependency_warnings),
+                warnings=format_dependency_warning_lines(dependency_warnings, max_lines=5),
+            )
+        with profile_span("queue_health"):
+            validation_scope_mismatches = find_validation_scope_mismatches(queue, policies["commit"])
+        if validation_scope_mismatches:
+            emit_event(
+                "queue_health",
+                "Detected narrow QA items configured with full-suite validation discovery",
+                count=len(validation_scope_mismatches),
+                item_ids=[str(row.get("item_id", "")) for row in validation_scope_mismatches],
+                warnings=format_validation_scope_warning_lines(validation_scope_mismatches, max_lines=5),
+            )
 
-    dependency_warnings = normalize_queued_item_dependencies(queue, archived_ids=load_blocked_archived_ids())
-    if dependency_warnings:
-        emit_event(
-            "recovery",
-            "Normalized queued dependencies to known backlog ids",
-            warning_count=len(dependency_warnings),
-            warnings=format_dependency_warning_lines(dependency_warnings, max_lines=5),
-        )
-    validation_scope_mismatches = find_validation_scope_mismatches(queue, policies["commit"])
-    if validation_scope_mismatches:
-        emit_event(
-            "queue_health",
-            "Detected narrow QA items configured with full-suite validation discovery",
-            count=len(validation_scope_mismatches),
-            item_ids=[str(row.get("item_id", "")) for row in validation_scope_mismatches],
-            warnings=format_validation_scope_warning_lines(validation_scope_mismatches, max_lines=5),
-        )
+        with profile_span("queue_health"):
+            model_policy_drift_audit = run_queued_model_policy_drift_audit(
+                queue=queue,
+                agents=agents,
+                routing_rules=policies["routing"],
+                model_policy=policies.get("model", {}),
+                dry_run=dry_run,
+                require_policy_change=True,
+                persist_fingerprint=not dry_run,
+            )
+        if model_policy_drift_audit["flagged"]:
+            emit_event(
+                "queue_health",
+                "Detected queued items blocked by model-policy drift",
+                count=len(model_policy_drift_audit["flagged"]),
+                item_ids=[str(row.get("item_id", "")) for row in model_policy_drift_audit["flagged"]],
+                warnings=format_model_policy_drift_warning_lines(model_policy_drift_audit["flagged"], max_lines=5),
+            )
+        if model_policy_drift_audit["remediated_ids"]:
+            emit_event(
+                "blocked",
+                "Blocked queued items after model-policy drift audit",
+                count=len(model_policy_drift_audit["remediated_ids"]),
+                item_ids=model_policy_drift_audit["remediated_ids"],
+            )
+        timer.lap("queue_health")
 
-    model_policy_drift_audit = run_queued_model_policy_drift_audit(
-        queue=queue,
+    with profile_span("persist"):
+        _refresh_and_save_queue_totals(stats_tracker, stats, queue)
+    timer.lap("persist")
+
+    return SchedulingCycle(
         agents=agents,
-        routing_rules=policies["routing"],
-        model_policy=policies.get("model", {}),
-        dry_run=dry_run,
-        require_policy_change=True,
-        persist_fingerprint=not dry_run,
+        policies=policies,
+        queue=queue,
+        stats_tracker=stats_tracker,
+        stats=stats,
+        model_policy_fingerprint=current_model_policy_fingerprint,
+        timer=timer,
     )
-    if model_policy_drift_audit["flagged"]:
-        emit_event(
-            "queue_health",
-            "Detected queued items blocked by model-policy drift",
-            count=len(model_policy_drift_audit["flagged"]),
-            item_ids=[str(row.get("item_id", "")) for row in model_policy_drift_audit["flagged"]],
-            warnings=format_model_policy_drift_warning_lines(model_policy_drift_audit["flagged"], max_lines=5),
-        )
-    if model_policy_drift_audit["remediated_ids"]:
-        emit_event(
-            "blocked",
-            "Blocked queued items after model-policy drift audit",
-            count=len(model_policy_drift_audit["remediated_ids"]),
-            item_ids=model_policy_drift_audit["remediated_ids"],
-        )
-        queue.load()
-        stats_tracker.refresh_queue_totals(
-            stats,
-            queued_count=sum(1 for queued_item in queue.active if queued_item.get("status") == "queued"),
-            blocked_count=len(queue.blocked),
-            completed_count=len(queue.completed),
-        )
-        stats_tracker.save(stats)
 
-    item = queue.select_next(policies["routing"], stats)
-    if item is None:
-        emit_event("idle", "No dependency-ready queued work item available")
-        daemon_state = set_daemon_state(
-            state="idle",
-            active_item=None,
-            last_error=None,
-            last_run_summary="No queued dependency-ready work item",
-            lock_held=True,
-        )
-        stats_tracker.write_progress_summary(
-            daemon_state="idle",
-            active_item=None,
-            queue_counts=queue_counts(queue),
-            milestone_progress=milestone_progress(queue),
-        )
-        print(
-            render_status(
-                build_status_payload(
-                    daemon_state=daemon_state,
-                    queue=queue,
-                    stats=stats,
-                    agents=agents,
-                    routing_rules=policies["routing"],
-                )
-            )
-        )
-        return 0
 
-    agent_id, agent_cfg = select_agent_for_item(item, agents, policies["routing"])
-    execution_profile = resolve_execution_profile(
-        agent_id=agent_id,
-        agent_cfg=agent_cfg,
-        model_policy=policies.get("model", {}),
-        item=item,
-    )
-    requested_model = execution_profile.get("model")
-    fallback_model = execution_profile.get("fallback_model")
+def resolve_model_preflight(
+    requested_model: str | None,
+    fallback_model: str | None,
+) -> tuple[str | None, bool, str | None]:
+    """Return (selected_model, fallback_selected, preflight_error) for an item run."""
     selected_model = requested_model
-    emit_event(
-        "select",
-        "Selected work item",
-        item_id=item["id"],
-        title=item["title"],
-        description=item.get("description"),
-        agent_id=agent_id,
-        role=agent_cfg.get("role"),
-        priority=item.get("priority"),
-        milestone=item.get("milestone"),
-        model=requested_model,
-        reasoning=execution_profile.get("reasoning"),
-        model_selection=execution_profile.get("selection_reason"),
-    )
-
-    if dry_run:
-        emit_event(
-            "dry_run",
-            "Dry-run selected item without execution",
-            item_id=item["id"],
-            agent_id=agent_id,
-            role=agent_cfg.get("role"),
-            model=requested_model,
-            model_selection=execution_profile.get("selection_reason"),
-        )
-        daemon_state = set_daemon_state(
-            state="dry_run",
-            active_item={**item, "assigned_agent": agent_id, "assigned_role": agent_cfg.get("role")},
-            last_error=None,
-            last_run_summary=f"Dry run selected {item['id']} for {agent_id}",
-            lock_held=True,
-        )
-        print(
-            render_status(
-                build_status_payload(
-                    daemon_state=daemon_state,
-                    queue=queue,
-                    stats=stats,
-                    agents=agents,
-                    routing_rules=policies["routing"],
-                )
-            )
-        )
-        return 0
-
     preflight_error = codex_model_access_preflight_error(requested_model or "")
     fallback_selected = False
     if preflight_error is not None:
@@ -2923,71 +3153,158 @@ def process_one(
                 selected_model = fallback_candidate
                 preflight_error = None
                 fallback_selected = True
-    if preflight_error is not None:
-        blocker_reason = f"{preflight_error}. Remediation: update model-policy.yaml to an accessible model."
-        emit_event("blocked", "Model preflight blocked execution", item_id=item["id"], agent_id=agent_id, reason=blocker_reason)
-        emit_event(
-            "resolution",
-            "Task blocked before execution",
-            item_id=item["id"],
-            title=item["title"],
+    return selected_model, fallback_selected, preflight_error
+
+
+def block_item_before_execution(
+    *,
+    queue: QueueManager,
+    item: dict[str, Any],
+    agent_id: str,
+    agent_cfg: dict[str, Any],
+    requested_model: str | None,
+    selected_model: str | None,
+    preflight_error: str,
+    stats: dict[str, Any],
+    stats_tracker: StatsTracker,
+    session_id: str | None,
+    model_stats_tracker: ModelStatsTracker | None,
+    model_stats_data: dict[str, Any] | None,
+) -> None:
+    blocker_reason = f"{preflight_error}. Remediation: update model-policy.yaml to an accessible model."
+    emit_event("blocked", "Model preflight blocked execution", item_id=item["id"], agent_id=agent_id, reason=blocker_reason)
+    emit_event(
+        "resolution",
+        "Task blocked before execution",
+        item_id=item["id"],
+        title=item["title"],
+        agent_id=agent_id,
+        role=agent_cfg.get("role"),
+        result="blocked",
+        resolution=blocker_reason,
+    )
+    queue.mark_blocked(item["id"], blocker_reason)
+    queue.save()
+    if model_stats_tracker is not None and model_stats_data is not None:
+        model_stats_tracker.record_run(
+            model_stats_data,
+            session_id=session_id,
             agent_id=agent_id,
             role=agent_cfg.get("role"),
-            result="blocked",
-            resolution=blocker_reason,
+            outcome="blocked",
+            requested_model=requested_model,
+            used_model=selected_model,
+            fallback_used=False,
+            tokens_in=0,
+            tokens_out=0,
+            runtime_seconds=0.0,
         )
-        queue.mark_blocked(item["id"], blocker_reason)
-        queue.save()
-        if model_stats_tracker is not None and model_stats_data is not None:
-            model_stats_tracker.record_run(
-                model_stats_data,
-                session_id=session_id,
-                agent_id=agent_id,
-                role=agent_cfg.get("role"),
-                outcome="blocked",
-                requested_model=requested_model,
-                used_model=selected_model,
-                fallback_used=False,
-                tokens_in=0,
-                tokens_out=0,
-                runtime_seconds=0.0,
-            )
-        stats_tracker.record_result(stats, agent_id=agent_id, outcome="blocked", tokens_in=0, tokens_out=0)
-        set_daemon_state(
-            state="blocked",
-            active_item=None,
-            last_error=None,
-            last_run_summary=f"{item['id']} blocked by {agent_id}: {blocker_reason}",
-            lock_held=True,
-        )
-        append_jsonl(
-            RUN_HISTORY_PATH,
-            {
-                "ts": utc_now_iso(),
-                "item_id": item["id"],
-                "agent_id": agent_id,
-                "result": "blocked",
-                "summary": blocker_reason,
-                "exit_code": 1,
-                "model_requested": requested_model,
-                "model_used": selected_model,
-                "fallback_used": False,
-            },
-        )
-        return 0
-
-    queue.mark_assigned(item["id"], agent_id)
-    queue.mark_running(item["id"])
-    queue.save()
-    daemon_state = set_daemon_state(
-        state="running",
-        active_item={**item, "assigned_agent": agent_id, "assigned_role": agent_cfg.get("role"), "requested_model": requested_model},
+    stats_tracker.record_result(stats, agent_id=agent_id, outcome="blocked", tokens_in=0, tokens_out=0, runtime_seconds=0.0)
+    set_daemon_state(
+        state="blocked",
+        active_item=None,
         last_error=None,
+        last_run_summary=f"{item['id']} blocked by {agent_id}: {blocker_reason}",
         lock_held=True,
     )
-    stats_tracker.begin_run()
+    append_jsonl(
+        RUN_HISTORY_PATH,
+        {
+            "ts": utc_now_iso(),
+            "item_id": item["id"],
+            "agent_id": agent_id,
+            "result": "blocked",
+            "summary": blocker_reason,
+            "exit_code": 1,
+            "model_requested": requested_model,
+            "model_used": selected_model,
+            "fallback_used": False,
+        },
+    )
+
+
+def _agent_log_path(item_id: str, agent_id: str) -> Path:
+    """Per-run worker log path; prunes the oldest logs beyond AGENT_LOG_KEEP."""
+    # Resolved from ROOT at call time so runs against another root log there.
+    log_dir = ROOT / "coordination" / "runtime" / "agent-logs"
+    existing = sorted(log_dir.glob("*.log"), key=lambda path: path.name)
+    for stale in existing[: max(0, len(existing) - AGENT_LOG_KEEP + 1)]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    safe_item = re.sub(r"[^A-Za-z0-9_.-]+", "-", item_id) or "item"
+    return log_dir / f"{stamp}-{safe_item}-{agent_id}.log"
+
+
+def _agent_output_fields(output: StreamingOutput | None) -> dict[str, Any]:
+    if output is None:
+        return {}
+    snapshot = output.snapshot()
+    fields: dict[str, Any] = {
+        "output_bytes": snapshot["output_bytes"],
+        "output_lines": snapshot["output_lines"],
+    }
+    if output.log_path is not None and output.log_path.exists():
+        fields["output_log"] = output.log_path.relative_to(ROOT).as_posix() if output.log_path.is_relative_to(ROOT) else str(output.log_path)
+    return fields
+
+
+def _worktree_base() -> Path:
+    # Outside the repository, so the shared checkout's `git add -A` never sees it.
+    digest = hashlib.sha1(str(ROOT.resolve()).encode("utf-8")).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"redkeepers-worktrees-{digest}"
+
+
+def reset_agent_worktrees() -> None:
+    """Drop worktrees left behind by an earlier daemon process (the daemon lock makes them ours)."""
+    base = _worktree_base()
+    if base.exists():
+        for path in base.iterdir():
+            remove_worktree(ROOT, path)
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def open_agent_worktree(item_id: str, agent_id: str) -> Path | None:
+    """Create a detached worktree at HEAD for one worker-pool run, or None if git can't."""
+    base = _worktree_base()
+    base.mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.mkdtemp(prefix=f"{agent_id}-", dir=base))
+    path.rmdir()
+    ok, detail = add_worktree(ROOT, path)
+    if not ok:
+        shutil.rmtree(path, ignore_errors=True)
+        emit_event("error", "Could not create agent worktree", item_id=item_id, agent_id=agent_id, error=detail)
+        return None
+    return path
+
 
-    prompt = build_prompt(ROOT, agent_id=agent_id, agent_cfg=agent_cfg, work_item=item)
+def start_agent_run(
+    *,
+    item: dict[str, Any],
+    agent_id: str,
+    agent_cfg: dict[str, Any],
+    execution_profile: dict[str, str | None],
+    selected_model: str | None,
+    fallback_selected: bool,
+    policies: dict[str, Any],
+    write_scope: WriteScope | None = None,
+    prebuilt_prompt: tuple[str, dict[str, Any]] | None = None,
+    worktree: Path | None = None,
+) -> AgentRun:
+    """Build the prompt for a claimed item (unless `prebuilt_prompt` is given) and launch its worker thread.
+
+    With a `worktree` the agent runs there instead of in ROOT.
+    """
+    if prebuilt_prompt is not None:
+        prompt, prompt_stats = prebuilt_prompt
+        prompt_stats = {**prompt_stats, "prompt_prepared": True}
+    else:
+        prompt_stats = {}
+        with profile_span("prompt_build"):
+            prompt = build_prompt(ROOT, agent_id=agent_id, agent_cfg=agent_cfg, work_item=item, stats=prompt_stats)
+    requested_model = execution_profile.get("model")
     emit_event(
         "agent_start",
         "Agent execution started",
@@ -3000,59 +3317,170 @@ def process_one(
         requested_model=requested_model,
         reasoning=execution_profile.get("reasoning"),
         model_selection=execution_profile.get("selection_reason"),
+        **prompt_stats,
     )
-    worker_started_at = utc_now_iso()
-    worker_started = time.monotonic()
     worker_timeout = int(policies.get("retry", {}).get("worker_timeout_seconds", 900))
     worker_box: dict[str, Any] = {}
+    output = StreamingOutput(_agent_log_path(item["id"], agent_id))
 
     def _worker_runner() -> None:
         try:
             worker_box["result"] = run_agent(
-                project_root=ROOT,
+                project_root=worktree or ROOT,
                 agent_id=agent_id,
                 prompt=prompt,
                 model=selected_model,
                 timeout_seconds=worker_timeout,
                 dry_run=False,
+                output=output,
             )
         except Exception as exc:  # Defensive guard around worker wrapper.
             worker_box["exception"] = exc
 
-    worker_thread = threading.Thread(target=_worker_runner, name=f"worker-{agent_id}", daemon=True)
-    worker_thread.start()
-    last_heartbeat = worker_started
-    while worker_thread.is_alive():
-        worker_thread.join(timeout=1.0)
-        now = time.monotonic()
-        if worker_thread.is_alive() and now - last_heartbeat >= AGENT_HEARTBEAT_SECONDS:
+    started = time.monotonic()
+    run = AgentRun(
+        item=item,
+        agent_id=agent_id,
+        agent_cfg=agent_cfg,
+        execution_profile=execution_profile,
+        requested_model=requested_model,
+        selected_model=selected_model,
+        fallback_selected=fallback_selected,
+        worker_timeout=worker_timeout,
+        started_at=utc_now_iso(),
+        started_monotonic=started,
+        last_heartbeat=started,
+        thread=threading.Thread(target=_worker_runner, name=f"worker-{agent_id}", daemon=True),
+        box=worker_box,
+        write_scope=write_scope,
+        output=output,
+        last_progress=started,
+        worktree=worktree,
+    )
+    run.thread.start()
+    return run
+
+
+def poll_agent_runs(runs: list[AgentRun], *, poll_seconds: float = 1.0) -> None:
+    """Wait up to poll_seconds for a worker to finish and emit due heartbeats."""
+    alive = [run for run in runs if run.thread.is_alive()]
+    if not alive:
+        return
+    alive[0].thread.join(timeout=poll_seconds)
+    now = time.monotonic()
+    for run in alive:
+        if not run.thread.is_alive():
+            continue
+        progress = run.output.snapshot() if run.output is not None else None
+        if (
+            progress is not None
+            and progress["output_bytes"] > run.last_progress_bytes
+            and now - run.last_progress >= AGENT_PROGRESS_SECONDS
+        ):
+            emit_event(
+                "agent_progress",
+                "Agent output received",
+                item_id=run.item["id"],
+                agent_id=run.agent_id,
+                elapsed_seconds=round(now - run.started_monotonic, 1),
+                **progress,
+            )
+            run.last_progress = now
+            run.last_progress_bytes = progress["output_bytes"]
+        if now - run.last_heartbeat >= AGENT_HEARTBEAT_SECONDS:
+            output_fields = (
+                {"output_bytes": progress["output_bytes"], "output_lines": progress["output_lines"]}
+                if progress is not None
+                else {}
+            )
             emit_event(
                 "agent_heartbeat",
                 "Agent still running",
-                item_id=item["id"],
-                agent_id=agent_id,
-                elapsed_seconds=round(now - worker_started, 1),
-                timeout_seconds=worker_timeout,
+                item_id=run.item["id"],
+                agent_id=run.agent_id,
+                elapsed_seconds=round(now - run.started_monotonic, 1),
+                timeout_seconds=run.worker_timeout,
+                **output_fields,
             )
-            last_heartbeat = now
+            run.last_heartbeat = now
+
+
+def block_crashed_run(
+    run: AgentRun,
+    *,
+    queue: QueueManager,
+    error: BaseException,
+    stage: str = "Worker wrapper",
+    timing_fields: dict[str, Any] | None = None,
+) -> None:
+    """Block one run whose worker wrapper or finish step raised; other runs carry on."""
+    item = run.item
+    reason = f"{stage} crashed for {run.agent_id}: {error}"
+    emit_event("error", "Worker run crashed; item blocked", item_id=item["id"], agent_id=run.agent_id, error=str(error))
+    if queue.get_active_item(item["id"]) is not None:
+        queue.mark_blocked(item["id"], reason)
+        queue.save()
+    set_daemon_state(
+        state="error",
+        active_item=None,
+        last_error=reason,
+        last_run_summary=f"{item['id']} blocked: {stage.lower()} crashed for {run.agent_id}",
+        lock_held=True,
+    )
+    append_jsonl(
+        RUN_HISTORY_PATH,
+        {
+            "ts": utc_now_iso(),
+            "item_id": item["id"],
+            "agent_id": run.agent_id,
+            "result": "blocked",
+            "summary": reason,
+            "model_requested": run.requested_model,
+            **(timing_fields or {}),
+        },
+    )
+
 
-    if "exception" in worker_box:
-        exc = worker_box["exception"]
-        raise RuntimeError(f"Worker wrapper crashed for {agent_id}: {exc}") from exc
-    worker = worker_box["result"]
-    elapsed_seconds = time.monotonic() - worker_started
+def finish_agent_run(
+    run: AgentRun,
+    *,
+    queue: QueueManager,
+    agents: dict[str, dict[str, Any]],
+    policies: dict[str, Any],
+    stats: dict[str, Any],
+    stats_tracker: StatsTracker,
+    verbose: bool,
+    session_id: str | None,
+    model_stats_tracker: ModelStatsTracker | None,
+    model_stats_data: dict[str, Any] | None,
+) -> int:
+    """Validate, commit and record the outcome of a finished worker.
+
+    A run with a worktree has its changes applied to ROOT first; they are
+    reverted again if validation or the commit fails, so they never end up in
+    another item's commit. Returns 3 when the worker hit a systemic bootstrap
+    error that should stop the daemon loop, otherwise 0.
+    """
+    item = run.item
+    agent_id = run.agent_id
+    agent_cfg = run.agent_cfg
+    elapsed_seconds = time.monotonic() - run.started_monotonic
     worker_finished_at = utc_now_iso()
     runtime_seconds = round(elapsed_seconds, 2)
     timing_fields = {
         "runtime_seconds": runtime_seconds,
-        "started_at": worker_started_at,
+        "started_at": run.started_at,
         "finished_at": worker_finished_at,
     }
-    run_requested_model = requested_model
+    if "exception" in run.box:
+        block_crashed_run(run, queue=queue, error=run.box["exception"], timing_fields=timing_fields)
+        return 0
+    worker = run.box["result"]
+    run_requested_model = run.requested_model
     run_used_model = worker.used_model
     if run_used_model is None:
         run_used_model = worker.requested_model
-    run_fallback_used = worker.fallback_used or fallback_selected
+    run_fallback_used = worker.fallback_used or run.fallback_selected
     emit_event(
         "agent_end",
         "Agent execution finished",
@@ -3065,6 +3493,7 @@ def process_one(
         model_requested=run_requested_model,
         model_used=run_used_model,
         fallback_used=run_fallback_used,
+        **_agent_output_fields(run.output),
     )
 
     if verbose and worker.stdout:
@@ -3088,6 +3517,7 @@ def process_one(
             outcome=outcome,
             tokens_in=worker.tokens_in_est,
             tokens_out=worker.tokens_out_est,
+            runtime_seconds=elapsed_seconds,
         )
         if model_stats_tracker is not None and model_stats_data is not None:
             model_stats_tracker.record_run(
@@ -3103,7 +3533,15 @@ def process_one(
                 tokens_out=worker.tokens_out_est,
                 runtime_seconds=elapsed_seconds,
             )
-
+        if outcome == "completed":
+            record_completion_metrics(
+                item=item,
+                agent_id=agent_id,
+                role=agent_cfg.get("role"),
+                model=run_used,
+                runtime_seconds=runtime_seconds,
+                finished_at=worker_finished_at,
+            )
     if worker.status == "blocked":
         emit_event("blocked", "Work item blocked by agent", item_id=item["id"], agent_id=agent_id, reason=worker.summary)
         emit_event(
@@ -3157,7 +3595,27 @@ def process_one(
         )
 
         commit_rules = policies["commit"]
-        validations_ok, validation_results = run_validation_for_item(ROOT, item, commit_rules)
+        applied_patch: bytes | None = None
+        merge_error: str | None = None
+        if run.worktree is not None:
+            with profile_span("merge"):
+                patch_ok, patch = worktree_patch(run.worktree)
+                if patch_ok and isinstance(patch, bytes):
+                    merge_ok, merge_out = apply_patch(ROOT, patch)
+                    if merge_ok:
+                        applied_patch = patch
+                    else:
+                        merge_error = merge_out
+                else:
+                    merge_error = str(patch)
+        if merge_error is not None:
+            validations_ok = False
+            validation_results = [
+                {"command": WORKTREE_MERGE_COMMAND, "exit_code": 1, "stdout_tail": "", "stderr_tail": merge_error}
+            ]
+        else:
+            with profile_span("validation"):
+                validations_ok, validation_results = run_validation_for_item(ROOT, item, commit_rules)
         commit_sha = None
         if validations_ok:
             if is_git_repo(ROOT) and commit_rules.get("commit_enabled", True):
@@ -3173,7 +3631,20 @@ def process_one(
                         }
                     )
                 else:
-                    ok, commit_out = commit_changes(ROOT, commit_message(agent_cfg["display_name"], item["id"], item["title"]))
+                    # The journal is not tracked; fold it into the committed snapshots.
+                    if not queue.compact():
+                        emit_event(
+                            "error",
+                            "Backlog journal compaction skipped before commit; committed snapshots lag the journal",
+                            item_id=item["id"],
+                            agent_id=agent_id,
+                            journal_path=_display_path(queue.journal_path),
+                        )
+                    with profile_span("commit"):
+                        ok, commit_out = commit_changes(
+                            ROOT,
+                            commit_message(agent_cfg["display_name"], item["id"], item["title"]),
+                        )
                     if ok:
                         commit_sha = None if commit_out == "NO_CHANGES" else commit_out
                         emit_event(
@@ -3203,6 +3674,17 @@ def process_one(
                     }
                 )
 
+        if not validations_ok and applied_patch is not None:
+            reverted, revert_out = apply_patch(ROOT, applied_patch, reverse=True)
+            if not reverted:
+                emit_event(
+                    "error",
+                    "Could not revert failed worktree changes from the shared checkout",
+                    item_id=item["id"],
+                    agent_id=agent_id,
+                    error=revert_out,
+                )
+
         if validation_results:
             emit_event(
                 "validation_summary",
@@ -3233,12 +3715,13 @@ def process_one(
                 **timing_fields,
             )
             queue.save()
-            generated_ids, rejected_followups = ingest_agent_follow_up_tasks(
-                queue,
-                agent_id=agent_id,
-                source_item=item,
-                routing_rules=policies["routing"],
-            )
+            with profile_span("ingest"):
+                generated_ids, rejected_followups = ingest_agent_follow_up_tasks(
+                    queue,
+                    agent_id=agent_id,
+                    source_item=item,
+                    routing_rules=policies["routing"],
+                )
             if generated_ids:
                 emit_event(
                     "followups",
@@ -3462,34 +3945,6 @@ def process_one(
                     **timing_fields,
                 },
             )
-            queue.load()
-            stats_tracker.refresh_queue_totals(
-                stats,
-                queued_count=sum(1 for entry in queue.active if entry.get("status") == "queued"),
-                blocked_count=len(queue.blocked),
-                completed_count=len(queue.completed),
-            )
-            stats_tracker.save(stats)
-            if model_stats_tracker is not None and model_stats_data is not None:
-                model_stats_tracker.save(model_stats_data)
-            daemon_state = load_json(DAEMON_STATE_PATH, default_daemon_state())
-            stats_tracker.write_progress_summary(
-                daemon_state=daemon_state.get("state", "unknown"),
-                active_item=daemon_state.get("active_item"),
-                queue_counts=queue_counts(queue),
-                milestone_progress=milestone_progress(queue),
-            )
-            print(
-                render_status(
-                    build_status_payload(
-                        daemon_state=daemon_state,
-                        queue=queue,
-                        stats=stats,
-                        agents=agents,
-                        routing_rules=policies["routing"],
-                    )
-                )
-            )
             return 3
 
         emit_event("failed", "Agent run failed; item will be retried or escalated", item_id=item["id"], agent_id=agent_id, reason=worker.summary)
@@ -3550,60 +4005,611 @@ def process_one(
             },
         )
 
-    queue.load()
-    refill_item = ensure_backlog_refill_item(queue)
-    if refill_item is not None:
-        emit_event("backlog_refill", "Created automatic backlog refill task", item_id=refill_item["id"], title=refill_item["title"])
-        queue.load()
-    stats_tracker.refresh_queue_totals(
-        stats,
-        queued_count=sum(1 for entry in queue.active if entry.get("status") == "queued"),
-        blocked_count=len(queue.blocked),
-        completed_count=len(queue.completed),
-    )
-    stats_tracker.save(stats)
+    return 0
+
+
+def publish_cycle_status(
+    cycle: SchedulingCycle,
+    *,
+    model_stats_tracker: ModelStatsTracker | None,
+    model_stats_data: dict[str, Any] | None,
+    refill: bool = True,
+) -> None:
+    queue = cycle.queue
+    stats_tracker = cycle.stats_tracker
+    if refill:
+        refill_item = ensure_backlog_refill_item(queue)
+        if refill_item is not None:
+            emit_event("backlog_refill", "Created automatic backlog refill task", item_id=refill_item["id"], title=refill_item["title"])
+    _refresh_and_save_queue_totals(stats_tracker, cycle.stats, queue)
     if model_stats_tracker is not None and model_stats_data is not None:
         model_stats_tracker.save(model_stats_data)
-    daemon_state = load_json(DAEMON_STATE_PATH, default_daemon_state())
+    rotate_runtime_logs()
+    daemon_state = RUNTIME_STATE.load(DAEMON_STATE_PATH, default_daemon_state())
     stats_tracker.write_progress_summary(
         daemon_state=daemon_state.get("state", "unknown"),
         active_item=daemon_state.get("active_item"),
         queue_counts=queue_counts(queue),
         milestone_progress=milestone_progress(queue),
     )
+    # End of cycle: everything coalesced since the last flush goes out in one batch.
+    RUNTIME_STATE.flush()
     print(
         render_status(
             build_status_payload(
                 daemon_state=daemon_state,
                 queue=queue,
-                stats=stats,
-                agents=agents,
-                routing_rules=policies["routing"],
+                stats=cycle.stats,
+                agents=cycle.agents,
+                routing_rules=cycle.policies["routing"],
             )
         )
     )
-    return 0
 
 
-def _load_jsonl_records(path: Path) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    records: list[dict[str, Any]] = []
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            for raw in handle:
-                line = raw.strip()
-                if not line:
-                    continue
+def report_idle_cycle(cycle: SchedulingCycle) -> None:
+    emit_event("idle", "No dependency-ready queued work item available")
+    daemon_state = set_daemon_state(
+        state="idle",
+        active_item=None,
+        last_error=None,
+        last_run_summary="No queued dependency-ready work item",
+        lock_held=True,
+    )
+    cycle.stats_tracker.write_progress_summary(
+        daemon_state="idle",
+        active_item=None,
+        queue_counts=queue_counts(cycle.queue),
+        milestone_progress=milestone_progress(cycle.queue),
+    )
+    RUNTIME_STATE.flush()
+    print(
+        render_status(
+            build_status_payload(
+                daemon_state=daemon_state,
+                queue=cycle.queue,
+                stats=cycle.stats,
+                agents=cycle.agents,
+                routing_rules=cycle.policies["routing"],
+            )
+        )
+    )
+
+
+def resolve_item_assignment(
+    item: dict[str, Any],
+    cycle: SchedulingCycle,
+) -> tuple[str, dict[str, Any], dict[str, str | None]]:
+    agent_id, agent_cfg = select_agent_for_item(item, cycle.agents, cycle.policies["routing"])
+    execution_profile = resolve_execution_profile(
+        agent_id=agent_id,
+        agent_cfg=agent_cfg,
+        model_policy=cycle.policies.get("model", {}),
+        item=item,
+    )
+    return agent_id, agent_cfg, execution_profile
+
+
+class NextItemPreparer:
+    """Speculatively prepares the next serial-loop item during the current agent run.
+
+    `prepare` picks the best queued candidate once the running item is claimed
+    and, on a background thread, warms its model-access preflight and builds
+    its prompt. `take` hands the work over only if the next cycle selects the
+    same item with the same assignment; the prompt is reused only while none
+    of its source files changed. Anything else is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._pending: PreparedNextItem | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, cycle: SchedulingCycle) -> PreparedNextItem | None:
+        self.discard()
+        candidates = cycle.queue.ranked_candidates(cycle.policies["routing"], cycle.stats, limit=1)
+        if not candidates:
+            return None
+        # Copies: the queue is mutated when the current run finishes, the speculation must not be.
+        item = copy.deepcopy(candidates[0])
+        agent_id, agent_cfg, execution_profile = resolve_item_assignment(item, cycle)
+        prepared = PreparedNextItem(
+            item=item,
+            agent_id=agent_id,
+            agent_cfg=copy.deepcopy(agent_cfg),
+            execution_profile=dict(execution_profile),
+        )
+
+        def _prepare() -> None:
+            started = time.perf_counter()
+            try:
+                resolve_model_preflight(execution_profile.get("model"), execution_profile.get("fallback_model"))
+                sources = source_stamps(
+                    prompt_source_paths(ROOT, agent_id=agent_id, agent_cfg=prepared.agent_cfg, work_item=item)
+                )
+                prompt_stats: dict[str, Any] = {}
+                prepared.prompt = build_prompt(
+                    ROOT, agent_id=agent_id, agent_cfg=prepared.agent_cfg, work_item=item, stats=prompt_stats
+                )
+                prepared.prompt_stats = prompt_stats
+                prepared.prompt_sources = sources
+            except Exception as exc:  # Speculation must never take the daemon down.
+                prepared.error = str(exc)
+            prepared.prepare_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        prepared.thread = threading.Thread(target=_prepare, name="prepare-next-item", daemon=True)
+        prepared.thread.start()
+        self._pending = prepared
+        return prepared
+
+    def take(
+        self,
+        item: dict[str, Any],
+        agent_id: str,
+        execution_profile: dict[str, str | None],
+    ) -> tuple[PreparedNextItem | None, str]:
+        """(prepared, outcome) for the item the cycle actually selected; outcome is hit/miss/none."""
+        prepared, self._pending = self._pending, None
+        if prepared is None:
+            return None, "none"
+        if prepared.thread is not None:
+            prepared.thread.join()
+        if (
+            prepared.error is not None
+            or prepared.item != item
+            or prepared.agent_id != agent_id
+            or prepared.execution_profile != execution_profile
+        ):
+            self.misses += 1
+            return None, "miss"
+        self.hits += 1
+        return prepared, "hit"
+
+    def is_prepared_for(self, item: dict[str, Any] | None) -> bool:
+        return item is not None and self._pending is not None and self._pending.item.get("id") == item.get("id")
+
+    def discard(self) -> None:
+        self._pending = None
+
+
+def prepared_prompt(prepared: PreparedNextItem | None) -> tuple[str, dict[str, Any]] | None:
+    """The prepared prompt, restamped, if none of its source files changed since it was built."""
+    if prepared is None or prepared.prompt is None:
+        return None
+    paths = prompt_source_paths(ROOT, agent_id=prepared.agent_id, agent_cfg=prepared.agent_cfg, work_item=prepared.item)
+    if source_stamps(paths) != prepared.prompt_sources:
+        return None
+    return restamp_prompt(prepared.prompt), dict(prepared.prompt_stats)
+
+
+def emit_select_event(
+    item: dict[str, Any],
+    agent_id: str,
+    agent_cfg: dict[str, Any],
+    execution_profile: dict[str, str | None],
+    **extra: Any,
+) -> None:
+    emit_event(
+        "select",
+        "Selected work item",
+        item_id=item["id"],
+        title=item["title"],
+        description=item.get("description"),
+        agent_id=agent_id,
+        role=agent_cfg.get("role"),
+        priority=item.get("priority"),
+        milestone=item.get("milestone"),
+        model=execution_profile.get("model"),
+        reasoning=execution_profile.get("reasoning"),
+        model_selection=execution_profile.get("selection_reason"),
+        **extra,
+    )
+
+
+def _running_item_state(item: dict[str, Any], agent_id: str, agent_cfg: dict[str, Any], requested_model: str | None) -> dict[str, Any]:
+    return {**item, "assigned_agent": agent_id, "assigned_role": agent_cfg.get("role"), "requested_model": requested_model}
+
+
+def process_one(
+    *,
+    dry_run: bool,
+    verbose: bool,
+    session_id: str | None = None,
+    model_stats_tracker: ModelStatsTracker | None = None,
+    model_stats: dict[str, Any] | None = None,
+    queue: QueueManager | None = None,
+    force_health: bool = False,
+    preparer: NextItemPreparer | None = None,
+    inputs: CycleInputs | None = None,
+) -> int:
+    with profile_span("prepare"):
+        cycle = prepare_scheduling_cycle(dry_run=dry_run, queue=queue, force_health=force_health, inputs=inputs)
+    if cycle is None:
+        return 2
+    queue = cycle.queue
+    policies = cycle.policies
+    stats = cycle.stats
+    stats_tracker = cycle.stats_tracker
+    model_stats_data = model_stats
+    if model_stats_tracker is not None and model_stats_data is None:
+        model_stats_data = model_stats_tracker.load()
+
+    with profile_span("select"):
+        item = queue.select_next(policies["routing"], stats)
+    cycle.timer.lap("select")
+    if item is None:
+        report_idle_cycle(cycle)
+        return 0
+
+    with profile_span("assign"):
+        agent_id, agent_cfg, execution_profile = resolve_item_assignment(item, cycle)
+    requested_model = execution_profile.get("model")
+    cycle.timer.lap("assign")
+    prepared: PreparedNextItem | None = None
+    speculation: dict[str, Any] = {}
+    if preparer is not None:
+        prepared, outcome = preparer.take(item, agent_id, execution_profile)
+        speculation = {"prepared": outcome}
+    emit_select_event(
+        item,
+        agent_id,
+        agent_cfg,
+        execution_profile,
+        cycle_phase_ms=dict(cycle.timer.phases_ms),
+        cycle_overhead_ms=cycle.timer.total_ms(),
+        **speculation,
+    )
+
+    if dry_run:
+        emit_event(
+            "dry_run",
+            "Dry-run selected item without execution",
+            item_id=item["id"],
+            agent_id=agent_id,
+            role=agent_cfg.get("role"),
+            model=requested_model,
+            model_selection=execution_profile.get("selection_reason"),
+        )
+        daemon_state = set_daemon_state(
+            state="dry_run",
+            active_item={**item, "assigned_agent": agent_id, "assigned_role": agent_cfg.get("role")},
+            last_error=None,
+            last_run_summary=f"Dry run selected {item['id']} for {agent_id}",
+            lock_held=True,
+        )
+        print(
+            render_status(
+                build_status_payload(
+                    daemon_state=daemon_state,
+                    queue=queue,
+                    stats=stats,
+                    agents=cycle.agents,
+                    routing_rules=policies["routing"],
+                )
+            )
+        )
+        return 0
+
+    with profile_span("preflight"):
+        selected_model, fallback_selected, preflight_error = resolve_model_preflight(
+            requested_model,
+            execution_profile.get("fallback_model"),
+        )
+    if preflight_error is not None:
+        block_item_before_execution(
+            queue=queue,
+            item=item,
+            agent_id=agent_id,
+            agent_cfg=agent_cfg,
+            requested_model=requested_model,
+            selected_model=selected_model,
+            preflight_error=preflight_error,
+            stats=stats,
+            stats_tracker=stats_tracker,
+            session_id=session_id,
+            model_stats_tracker=model_stats_tracker,
+            model_stats_data=model_stats_data,
+        )
+        return 0
+
+    with profile_span("claim"):
+        queue.mark_assigned(item["id"], agent_id)
+        queue.mark_running(item["id"])
+        queue.save()
+        set_daemon_state(
+            state="running",
+            active_item=_running_item_state(item, agent_id, agent_cfg, requested_model),
+            last_error=None,
+            lock_held=True,
+        )
+        stats_tracker.begin_run()
+    run = start_agent_run(
+        item=item,
+        agent_id=agent_id,
+        agent_cfg=agent_cfg,
+        execution_profile=execution_profile,
+        selected_model=selected_model,
+        fallback_selected=fallback_selected,
+        policies=policies,
+        prebuilt_prompt=prepared_prompt(prepared),
+    )
+    if preparer is not None:
+        preparer.prepare(cycle)
+    # Time spent waiting on the agent is a span but is kept out of cProfile output.
+    with profile_span("agent_wait", sampled=False):
+        while run.thread.is_alive():
+            poll_agent_runs([run])
+
+    with profile_span("finish"):
+        # Pick up backlog edits the agent made before the outcome is saved over them.
+        queue.refresh()
+        rc = finish_agent_run(
+            run,
+            queue=queue,
+            agents=cycle.agents,
+            policies=policies,
+            stats=stats,
+            stats_tracker=stats_tracker,
+            verbose=verbose,
+            session_id=session_id,
+            model_stats_tracker=model_stats_tracker,
+            model_stats_data=model_stats_data,
+        )
+    with profile_span("publish"):
+        publish_cycle_status(
+            cycle,
+            model_stats_tracker=model_stats_tracker,
+            model_stats_data=model_stats_data,
+            refill=rc == 0,
+        )
+    return rc
+
+
+def _set_worker_pool_daemon_state(runs: list[AgentRun]) -> None:
+    active_items = [
+        _running_item_state(run.item, run.agent_id, run.agent_cfg, run.requested_model)
+        for run in runs
+    ]
+    if not active_items:
+        set_daemon_state(active_items=[])
+        return
+    set_daemon_state(
+        state="running",
+        active_item=active_items[0],
+        active_items=active_items,
+        last_error=None,
+        lock_held=True,
+    )
+
+
+def dispatch_agent_runs(
+    cycle: SchedulingCycle,
+    runs: list[AgentRun],
+    *,
+    workers: int,
+    session_id: str | None,
+    model_stats_tracker: ModelStatsTracker | None,
+    model_stats_data: dict[str, Any] | None,
+) -> int:
+    """Start ranked queued items on free worker slots without overlapping write scopes.
+
+    Items are taken in scheduling order. Candidates whose agent is already busy or
+    whose inputs overlap a running item are skipped; an exclusive item (shared
+    daemon state or no declared inputs) stops dispatch until the pool drains so it
+    is not starved by lower-priority parallel work. Other items run in their own
+    worktree, so the shared checkout only ever holds the changes of the item being
+    validated; if no worktree can be created the item runs alone in ROOT.
+    """
+    if len(runs) >= workers:
+        return 0
+    if any(run.write_scope is not None and run.write_scope.exclusive for run in runs):
+        return 0
+    queue = cycle.queue
+    busy_agents = {run.agent_id for run in runs}
+    running_scopes = [run.write_scope for run in runs if run.write_scope is not None]
+    started = 0
+    select_started = time.perf_counter()
+    candidates = queue.ranked_candidates(cycle.policies["routing"], cycle.stats)
+    phase_ms = {**cycle.timer.phases_ms, "select": round((time.perf_counter() - select_started) * 1000, 3)}
+    for item in candidates:
+        if len(runs) >= workers:
+            break
+        agent_id, agent_cfg, execution_profile = resolve_item_assignment(item, cycle)
+        if agent_id in busy_agents:
+            continue
+        scope = item_write_scope(item, agent_id)
+        if scope.exclusive and runs:
+            break
+        if find_scope_conflict(scope, running_scopes) is not None:
+            continue
+
+        requested_model = execution_profile.get("model")
+        emit_select_event(
+            item,
+            agent_id,
+            agent_cfg,
+            execution_profile,
+            worker_slots=workers,
+            running_workers=len(runs),
+            cycle_phase_ms=phase_ms,
+            cycle_overhead_ms=round(sum(phase_ms.values()), 3),
+        )
+        with profile_span("preflight"):
+            selected_model, fallback_selected, preflight_error = resolve_model_preflight(
+                requested_model,
+                execution_profile.get("fallback_model"),
+            )
+        if preflight_error is not None:
+            block_item_before_execution(
+                queue=queue,
+                item=item,
+                agent_id=agent_id,
+                agent_cfg=agent_cfg,
+                requested_model=requested_model,
+                selected_model=selected_model,
+                preflight_error=preflight_error,
+                stats=cycle.stats,
+                stats_tracker=cycle.stats_tracker,
+                session_id=session_id,
+                model_stats_tracker=model_stats_tracker,
+                model_stats_data=model_stats_data,
+            )
+            continue
+
+        worktree = None
+        if not scope.exclusive:
+            worktree = open_agent_worktree(item["id"], agent_id)
+            if worktree is None:
+                if runs:
+                    break
+                scope = WriteScope(agent_id=agent_id, paths=scope.paths, exclusive=True, reason="no_worktree")
+
+        queue.mark_assigned(item["id"], agent_id)
+        queue.mark_running(item["id"])
+        queue.save()
+        runs.append(
+            start_agent_run(
+                item=item,
+                agent_id=agent_id,
+                agent_cfg=agent_cfg,
+                execution_profile=execution_profile,
+                selected_model=selected_model,
+                fallback_selected=fallback_selected,
+                policies=cycle.policies,
+                write_scope=scope,
+                worktree=worktree,
+            )
+        )
+        busy_agents.add(agent_id)
+        running_scopes.append(scope)
+        started += 1
+        if scope.exclusive:
+            break
+    return started
+
+
+def process_worker_pool(
+    *,
+    workers: int,
+    verbose: bool,
+    session_id: str | None = None,
+    model_stats_tracker: ModelStatsTracker | None = None,
+    model_stats: dict[str, Any] | None = None,
+    queue: QueueManager | None = None,
+    force_health: bool = False,
+    inputs: CycleInputs | None = None,
+) -> int:
+    """Run up to `workers` agents concurrently until no more items can be dispatched.
+
+    Worker threads only execute agents; every backlog mutation (claiming, validation,
+    commit, completion) happens on this thread, so queue writes never race. A run
+    that crashes, or whose finish step raises, blocks only its own item. While runs
+    are in flight, the status publish and the maintenance passes of
+    prepare_scheduling_cycle are repeated every POOL_MAINTENANCE_SECONDS, so a
+    busy pool still ingests new work and revisits blocked items.
+    """
+    if inputs is None:
+        inputs = CycleInputs()
+    with profile_span("prepare"):
+        cycle = prepare_scheduling_cycle(dry_run=False, queue=queue, force_health=force_health, inputs=inputs)
+    if cycle is None:
+        return 2
+    queue = cycle.queue
+    model_stats_data = model_stats
+    if model_stats_tracker is not None and model_stats_data is None:
+        model_stats_data = model_stats_tracker.load()
+
+    reset_agent_worktrees()
+    runs: list[AgentRun] = []
+    exit_code = 0
+    dispatch_needed = True
+    dispatched_any = False
+    last_maintenance = time.monotonic()
+    while True:
+        finished = [run for run in runs if not run.thread.is_alive()]
+        for run in finished:
+            runs.remove(run)
+            rc = 0
+            try:
+                with profile_span("finish"):
+                    queue.refresh()
+                    rc = finish_agent_run(
+                        run,
+                        queue=queue,
+                        agents=cycle.agents,
+                        policies=cycle.policies,
+                        stats=cycle.stats,
+                        stats_tracker=cycle.stats_tracker,
+                        verbose=verbose,
+                        session_id=session_id,
+                        model_stats_tracker=model_stats_tracker,
+                        model_stats_data=model_stats_data,
+                    )
+            except Exception as exc:  # One bad finish must not strand the other runs.
                 try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if isinstance(entry, dict):
-                    records.append(entry)
-    except OSError:
-        return []
-    return records
+                    queue.refresh()
+                    block_crashed_run(run, queue=queue, error=exc, stage="Finishing the run")
+                except Exception as block_exc:
+                    emit_event("error", "Could not block crashed run", item_id=run.item["id"], error=str(block_exc))
+            finally:
+                if run.worktree is not None:
+                    remove_worktree(ROOT, run.worktree)
+            if rc != 0:
+                exit_code = rc
+            dispatch_needed = True
+        if finished:
+            _set_worker_pool_daemon_state(runs)
+
+        if runs and exit_code == 0 and time.monotonic() - last_maintenance >= POOL_MAINTENANCE_SECONDS:
+            with profile_span("maintenance"):
+                publish_cycle_status(
+                    cycle,
+                    model_stats_tracker=model_stats_tracker,
+                    model_stats_data=model_stats_data,
+                )
+                refreshed = prepare_scheduling_cycle(
+                    dry_run=False, queue=queue, force_health=force_health, inputs=inputs
+                )
+            last_maintenance = time.monotonic()
+            if refreshed is None:
+                # Environment validation failed: let the running items finish, start nothing new.
+                exit_code = 2
+            else:
+                cycle = refreshed
+                dispatch_needed = True
+
+        if dispatch_needed and exit_code == 0:
+            # The queue is current here: either freshly prepared or just reloaded
+            # and updated by finish_agent_run above.
+            dispatch_needed = False
+            with profile_span("dispatch"):
+                started = dispatch_agent_runs(
+                    cycle,
+                    runs,
+                    workers=workers,
+                    session_id=session_id,
+                    model_stats_tracker=model_stats_tracker,
+                    model_stats_data=model_stats_data,
+                )
+            if started:
+                dispatched_any = True
+                _set_worker_pool_daemon_state(runs)
+
+        if not runs:
+            break
+        with profile_span("agent_wait", sampled=False):
+            poll_agent_runs(runs)
+
+    if not dispatched_any and exit_code == 0:
+        report_idle_cycle(cycle)
+        return 0
+    publish_cycle_status(
+        cycle,
+        model_stats_tracker=model_stats_tracker,
+        model_stats_data=model_stats_data,
+        refill=exit_code == 0,
+    )
+    return exit_code
 
 
 def _float_or_none(value: Any) -> float | None:
@@ -3616,22 +4622,19 @@ def _float_or_none(value: Any) -> float | None:
     return parsed
 
 
-def build_completion_metrics_snapshot(root: Path) -> dict[str, Any]:
-    completed = load_json(root / "coordination" / "backlog" / "completed-items.json", [])
-    if not isinstance(completed, list):
-        completed = []
-    history = _load_jsonl_records(root / "coordination" / "runtime" / "run-history.jsonl")
+def completion_item_rows(root: Path) -> list[dict[str, Any]]:
+    """One row per completed backlog item, filled in from its latest completed run."""
+    backlog = QueueManager(root)
+    backlog.load(validate=False)
+    completed = backlog.completed
+    # Only the completed items' own rows are read, by offset from the run-history index.
+    completed_ids = [str(item.get("id", "")).strip() for item in completed if isinstance(item, dict)]
+    history_by_item = run_history_log(root).for_items(completed_ids, kinds={"completed"})
 
     latest_completed_run: dict[str, dict[str, Any]] = {}
-    for row in history:
-        if str(row.get("result", "")).strip().lower() != "completed":
-            continue
-        item_id = str(row.get("item_id", "")).strip()
-        if not item_id:
-            continue
-        existing = latest_completed_run.get(item_id)
-        if existing is None or str(row.get("ts", "")) > str(existing.get("ts", "")):
-            latest_completed_run[item_id] = row
+    for item_id, rows in history_by_item.items():
+        if rows:
+            latest_completed_run[item_id] = max(rows, key=lambda row: str(row.get("ts", "")))
 
     item_rows: list[dict[str, Any]] = []
     for item in completed:
@@ -3670,12 +4673,18 @@ def build_completion_metrics_snapshot(root: Path) -> dict[str, Any]:
                 "title": str(item.get("title", "")).strip(),
                 "resolved_by_agent": resolved_by_agent or None,
                 "resolved_by_role": resolved_by_role or None,
+                "model": str(history_row.get("model_used") or history_row.get("model_requested") or "").strip() or None,
                 "runtime_seconds": runtime,
                 "started_at": started_at,
                 "finished_at": finished_at,
             }
         )
+    return item_rows
+
 
+def build_completion_metrics_snapshot(root: Path) -> dict[str, Any]:
+    """Completion metrics recomputed from the backlog and run history (full scan)."""
+    item_rows = completion_item_rows(root)
     by_agent: dict[str, dict[str, Any]] = {}
     for row in item_rows:
         agent_id = row.get("resolved_by_agent") or "unassigned"
@@ -3727,10 +4736,117 @@ def build_completion_metrics_snapshot(root: Path) -> dict[str, Any]:
     }
 
 
-def cmd_metrics(*, top_agents: int, top_items: int) -> int:
+def summarize_recent_runs(root: Path, *, since_hours: float) -> dict[str, Any]:
+    """Run outcome counts over the last `since_hours`, reading only segments in the window."""
+    since = (datetime.now(timezone.utc) - timedelta(hours=since_hours)).isoformat()
+    by_result: dict[str, int] = {}
+    runtime_total = 0.0
+    runs = 0
+    for row in run_history_log(root).iter_records(since=since):
+        result = str(row.get("result", "")).strip() or "unknown"
+        by_result[result] = by_result.get(result, 0) + 1
+        runs += 1
+        runtime_total += _float_or_none(row.get("runtime_seconds")) or 0.0
+    return {"since": since, "runs": runs, "by_result": by_result, "runtime_total_seconds": round(runtime_total, 2)}
+
+
+def format_item_history_lines(rows: list[dict[str, Any]]) -> list[str]:
+    lines: list[str] = []
+    for row in rows:
+        runtime = _float_or_none(row.get("runtime_seconds"))
+        runtime_text = f"{runtime:.2f}s" if runtime is not None else "n/a"
+        summary = " ".join(str(row.get("summary") or row.get("error") or "").split())
+        if len(summary) > 96:
+            summary = summary[:93] + "..."
+        lines.append(
+            "  - "
+            f"{row.get('ts', 'n/a')} | {row.get('result', 'unknown')} | {row.get('agent_id') or 'unassigned'} | "
+            f"{runtime_text} | {summary}"
+        )
+    return lines
+
+
+def _format_runtime_quantiles(row: dict[str, Any]) -> str:
+    parts = []
+    for label in QUANTILES:
+        value = row.get(label, row.get(f"runtime_{label}_seconds"))
+        parts.append(f"{label}={value:.2f}s" if isinstance(value, (int, float)) else f"{label}=n/a")
+    return " ".join(parts)
+
+
+def record_completion_metrics(
+    *,
+    item: dict[str, Any],
+    agent_id: str,
+    role: str | None,
+    model: str | None,
+    runtime_seconds: float,
+    finished_at: str,
+) -> None:
+    """Fold one completion into completion-metrics.json.
+
+    A missing store is left alone: the next `metrics` call builds it from
+    history, which already includes this completion.
+    """
+    tracker = CompletionMetricsTracker(ROOT)
+    try:
+        data = tracker.load()
+        if data is None:
+            return
+        tracker.record_completion(
+            data,
+            item_id=str(item["id"]),
+            title=str(item.get("title", "")).strip(),
+            agent_id=agent_id,
+            role=role,
+            model=model,
+            runtime_seconds=runtime_seconds,
+            finished_at=finished_at,
+        )
+        tracker.save(data)
+    except OSError as exc:
+        emit_event("warning", "Completion metrics update failed", item_id=item["id"], error=str(exc))
+
+
+def cmd_metrics(
+    *,
+    top_agents: int,
+    top_items: int,
+    item_id: str | None = None,
+    since_hours: float | None = None,
+    rebuild: bool = False,
+) -> int:
     ensure_python_runtime_configuration()
     migrate_legacy_runtime_files()
-    snapshot = build_completion_metrics_snapshot(ROOT)
+    if item_id:
+        rows = run_history_log(ROOT).for_item(item_id)
+        print(f"Run history for {item_id}: {len(rows)} run(s)")
+        for line in format_item_history_lines(rows):
+            print(line)
+        return 0
+    if since_hours is not None:
+        window = summarize_recent_runs(ROOT, since_hours=max(0.0, float(since_hours)))
+        print(f"Runs since {window['since']}: {window['runs']} (runtime_total={window['runtime_total_seconds']:.2f}s)")
+        for result, count in sorted(window["by_result"].items(), key=lambda entry: (-entry[1], entry[0])):
+            print(f"  - {result}: {count}")
+        return 0
+    tracker = CompletionMetricsTracker(ROOT)
+    data = tracker.load()
+    if rebuild or data is None:
+        rebuilt = tracker.rebuild(completion_item_rows(ROOT))
+        if data is None:
+            print("Completion metrics store missing; built it from backlog and run history.")
+        else:
+            drift = tracker.compare(data, rebuilt)
+            if drift:
+                print(f"Completion metrics store drifted from history ({len(drift)} difference(s)); replaced:")
+                for line in drift[:20]:
+                    print(f"  - {line}")
+            else:
+                print("Completion metrics store matches a rebuild from history.")
+        tracker.save(rebuilt)
+        data = rebuilt
+    snapshot = tracker.snapshot(data)
 
     top_agents = max(1, int(top_agents))
     top_items = max(1, int(top_items))
@@ -3738,20 +4854,26 @@ def cmd_metrics(*, top_agents: int, top_items: int) -> int:
     print("Completion Metrics")
     print(f"Completed items: {snapshot.get('completed_items', 0)}")
     print(f"With resolver: {snapshot.get('with_resolver', 0)}")
-    print(f"With runtime: {snapshot.get('with_runtime', 0)}")
-
-    agent_rows = snapshot.get("agent_rows", [])
-    if agent_rows:
-        print("By agent:")
-        for row in agent_rows[:top_agents]:
+    print(f"With runtime: {snapshot.get('with_runtime', 0)} ({_format_runtime_quantiles(snapshot.get('runtime_quantiles', {}))})")
+
+    for label, key_name, rows in (
+        ("By agent:", "agent_id", snapshot.get("agent_rows", [])),
+        ("By role:", "role", snapshot.get("role_rows", [])),
+        ("By model:", "model", snapshot.get("model_rows", [])),
+    ):
+        if not rows:
+            continue
+        print(label)
+        for row in rows[:top_agents]:
             avg = row.get("runtime_avg_seconds")
             avg_text = f"{avg:.2f}s" if isinstance(avg, (int, float)) else "n/a"
             print(
                 "  - "
-                f"{row.get('agent_id')}: completed={row.get('completed_items', 0)} "
+                f"{row.get(key_name)}: completed={row.get('completed_items', 0)} "
                 f"runtime_total={float(row.get('runtime_total_seconds', 0.0)):.2f}s "
                 f"runtime_avg={avg_text} "
-                f"runtime_count={row.get('runtime_count', 0)}"
+                f"runtime_count={row.get('runtime_count', 0)} "
+                f"{_format_runtime_quantiles(row)}"
             )
 
     longest = snapshot.get("longest_items", [])
@@ -3767,11 +4889,29 @@ def cmd_metrics(*, top_agents: int, top_items: int) -> int:
     return 0
 
 
-def cmd_status() -> int:
+def format_health_profile_lines(profile: list[dict[str, Any]]) -> list[str]:
+    total = sum(float(row.get("seconds", 0.0)) for row in profile)
+    width = max([len("check")] + [len(str(row.get("check", ""))) for row in profile])
+    lines = [f"  {'check'.ljust(width)}  {'ms':>9}  {'result':<6}  errors"]
+    for row in profile:
+        lines.append(
+            f"  {str(row.get('check', '')).ljust(width)}  {float(row.get('seconds', 0.0)) * 1000:9.2f}  "
+            f"{'cached' if row.get('cached') else 'ran':<6}  {int(row.get('error_count', 0))}"
+        )
+    lines.append(f"  {'total'.ljust(width)}  {total * 1000:9.2f}")
+    return lines
+
+
+def cmd_status(*, force_health: bool = False, health_profile: bool = False) -> int:
     ensure_python_runtime_configuration()
     migrate_legacy_runtime_files()
     repair_backlog_archive_duplicates(ROOT)
-    errors = validate_environment(ROOT)
+    profile: list[dict[str, Any]] | None = [] if health_profile else None
+    errors = validate_environment(ROOT, memo=HEALTH_CHECK_MEMO, force=force_health, profile=profile)
+    if profile is not None:
+        print("Health check profile:")
+        for line in format_health_profile_lines(profile):
+            print(line)
     if errors:
         print("Environment validation failed:")
         for err in errors:
@@ -3795,7 +4935,7 @@ def cmd_status() -> int:
         persist_fingerprint=False,
     )
     stats = StatsTracker(ROOT, agents).load()
-    daemon_state = load_json(DAEMON_STATE_PATH, default_daemon_state())
+    daemon_state = RUNTIME_STATE.load(DAEMON_STATE_PATH, default_daemon_state())
     print(
         render_status(
             build_status_payload(
@@ -3804,6 +4944,7 @@ def cmd_status() -> int:
                 stats=stats,
                 agents=agents,
                 routing_rules=policies["routing"],
+                recent_runs=run_history_log(ROOT).tail(STATUS_RECENT_RUNS),
             )
         )
     )
@@ -3826,7 +4967,65 @@ def cmd_status() -> int:
     return 0
 
 
-def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, keep_alive: bool) -> int:
+def wait_for_input_change(watcher: WakeupWatcher, *, reason: str, max_wait_seconds: float) -> list[Path]:
+    """Block an idle daemon until backlog/inbox/policy/outbox files change or `max_wait_seconds` passes.
+
+    The timeout keeps time-based work (blocked revisits, stall recovery
+    cooldowns) moving when no file changes at all.
+    """
+    emit_event("wait", reason, seconds=max_wait_seconds, wakeup=watcher.backend_name)
+    RUNTIME_STATE.flush()
+    started = time.monotonic()
+    changed = watcher.wait(max_wait_seconds)
+    emit_event(
+        "wakeup",
+        "Input change detected" if changed else "Idle wait timed out",
+        waited_ms=round((time.monotonic() - started) * 1000, 1),
+        changed=[_display_path(path) for path in changed[:5]],
+        changed_count=len(changed),
+    )
+    return changed
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+@contextmanager
+def profiled_cycle(profiler: CycleProfiler | None) -> Iterator[None]:
+    """Profile the enclosed scheduling cycle and report it as a `cycle_profile` event."""
+    if profiler is None:
+        yield
+        return
+    with profiler.cycle() as summary:
+        yield
+    emit_event("cycle_profile", "Profiled scheduling cycle", **summary)
+
+
+def compact_backlog_journal() -> None:
+    queue = QueueManager(ROOT)
+    try:
+        queue.load(validate=False)
+        queue.compact()
+    except (OSError, ValueError) as exc:
+        emit_event("error", "Backlog journal compaction failed", error=str(exc))
+
+
+def cmd_run(
+    *,
+    once: bool,
+    sleep_seconds: int,
+    dry_run: bool,
+    verbose: bool,
+    keep_alive: bool,
+    workers: int = 1,
+    force_health: bool = False,
+    profile_dir: Path | None = None,
+    profile_memory: bool = False,
+) -> int:
     python_command, python_executable = ensure_python_runtime_configuration()
     migrate_legacy_runtime_files()
     lock = DaemonLock(os.getpid())
@@ -3834,6 +5033,8 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
     model_stats: dict[str, Any] | None = None
     session_id: str | None = None
     session_started_at: str | None = None
+    watcher: WakeupWatcher | None = None
+    profiler = CycleProfiler(profile_dir, memory=profile_memory) if profile_dir is not None else None
     try:
         lock.acquire()
     except RuntimeError as exc:
@@ -3841,7 +5042,9 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
         print(str(exc), file=sys.stderr)
         return 1
 
-    model_stats_tracker = ModelStatsTracker(ROOT)
+    model_stats_tracker = ModelStatsTracker.from_policy(
+        ROOT, _runtime_policy_section(ROOT, "model_stats_retention"), writer=RUNTIME_STATE
+    )
     model_stats = model_stats_tracker.load()
     session_started_at = utc_now_iso()
     session_id = build_session_id(pid=os.getpid(), started_at=session_started_at)
@@ -3861,6 +5064,7 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
         mode="once" if once else "run",
         dry_run=dry_run,
         keep_alive=keep_alive,
+        workers=workers,
         session_id=session_id,
         python_command=python_command,
         python_executable=python_executable,
@@ -3870,11 +5074,11 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
         # If a previous daemon run crashed or was interrupted, items may be left in
         # assigned/running/validating. With the lock acquired, no other daemon is active,
         # so these can be safely recovered, except ids already archived from blocked state.
-        recovery_queue = QueueManager(ROOT)
-        recovery_queue.load()
+        queue = QueueManager(ROOT)
+        queue.load()
         archived_ids = load_blocked_archived_ids()
-        recovered_items, archived_dispositions = recover_stale_in_progress_items(recovery_queue, archived_ids=archived_ids)
-        recovery_warnings = normalize_queued_item_dependencies(recovery_queue, archived_ids=archived_ids)
+        recovered_items, archived_dispositions = recover_stale_in_progress_items(queue, archived_ids=archived_ids)
+        recovery_warnings = normalize_queued_item_dependencies(queue, archived_ids=archived_ids)
         if recovered_items:
             emit_event(
                 "recovery",
@@ -3900,32 +5104,66 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
             )
 
         if once:
-            return process_one(
-                dry_run=dry_run,
-                verbose=verbose,
-                session_id=session_id,
-                model_stats_tracker=model_stats_tracker,
-                model_stats=model_stats,
-            )
+            with profiled_cycle(profiler):
+                rc = process_one(
+                    dry_run=dry_run,
+                    verbose=verbose,
+                    session_id=session_id,
+                    model_stats_tracker=model_stats_tracker,
+                    model_stats=model_stats,
+                    queue=queue,
+                    force_health=force_health,
+                )
+            return rc
+        wakeup_cfg = _runtime_policy_section(ROOT, "idle_wakeup")
+        try:
+            max_idle_wait = float(wakeup_cfg.get("max_wait_seconds", DEFAULT_MAX_WAIT_SECONDS))
+        except (TypeError, ValueError):
+            max_idle_wait = DEFAULT_MAX_WAIT_SECONDS
+        max_idle_wait = max(float(sleep_seconds), max_idle_wait)
+        # Watch from before the first cycle so changes made while it runs still wake the next wait.
+        # Until-idle runs use it too, to tell when the agent catalog or policies need re-reading.
+        watcher = WakeupWatcher.from_policy(ROOT, wakeup_cfg)
+        inputs = CycleInputs(watcher=watcher)
+        preparer = NextItemPreparer() if not dry_run else None
         while True:
-            rc = process_one(
-                dry_run=dry_run,
-                verbose=verbose,
-                session_id=session_id,
-                model_stats_tracker=model_stats_tracker,
-                model_stats=model_stats,
-            )
+            with profiled_cycle(profiler):
+                if workers > 1 and not dry_run:
+                    rc = process_worker_pool(
+                        workers=workers,
+                        verbose=verbose,
+                        session_id=session_id,
+                        model_stats_tracker=model_stats_tracker,
+                        model_stats=model_stats,
+                        queue=queue,
+                        force_health=force_health,
+                        inputs=inputs,
+                    )
+                else:
+                    rc = process_one(
+                        dry_run=dry_run,
+                        verbose=verbose,
+                        session_id=session_id,
+                        model_stats_tracker=model_stats_tracker,
+                        model_stats=model_stats,
+                        queue=queue,
+                        force_health=force_health,
+                        preparer=preparer,
+                        inputs=inputs,
+                    )
             if rc != 0 or dry_run:
                 if rc != 0:
                     emit_event("daemon_stop", "Daemon loop exiting with non-zero status", exit_code=rc)
                 return rc
-            queue = QueueManager(ROOT)
-            queue.load()
+            # The between-cycle checks reuse the cycle's queue and inputs; each is
+            # re-read only if its files changed since (this also consumes pending
+            # watcher events, so it must come before the queue refresh).
+            inputs.ensure_loaded()
+            queue.refresh()
             refill_item = ensure_backlog_refill_item(queue)
             if refill_item is not None:
                 emit_event("backlog_refill", "Created automatic backlog refill task", item_id=refill_item["id"], title=refill_item["title"])
-                queue.load()
-            if not any(item.get("status") == "queued" for item in queue.active):
+            if not queue.items_with_status("queued"):
                 if keep_alive:
                     set_daemon_state(
                         state="idle",
@@ -3933,15 +5171,15 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
                         last_run_summary="Queue idle: waiting for new work items",
                         lock_held=True,
                     )
-                    emit_event("wait", "Queue idle; waiting for new work", seconds=sleep_seconds)
-                    time.sleep(sleep_seconds)
+                    inputs.note_changes(
+                        wait_for_input_change(
+                            watcher, reason="Queue idle; waiting for new work", max_wait_seconds=max_idle_wait
+                        )
+                    )
                     continue
                 emit_event("daemon_stop", "Queue idle; daemon run completed")
                 return 0
-            agents = load_agent_catalog(ROOT)
-            policies = load_policies(ROOT)
-            stats = StatsTracker(ROOT, agents).load()
-            next_ready = queue.select_next(policies["routing"], stats)
+            next_ready = queue.select_next(inputs.policies["routing"], inputs.stats)
             if next_ready is None:
                 auto_recovery = ensure_queue_stall_recovery_item(queue)
                 if auto_recovery is not None:
@@ -3959,8 +5197,13 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
                         last_run_summary="Queue stalled: waiting for dependencies to unblock",
                         lock_held=True,
                     )
-                    emit_event("wait", "Queue stalled; waiting for dependencies to unblock", seconds=sleep_seconds)
-                    time.sleep(sleep_seconds)
+                    inputs.note_changes(
+                        wait_for_input_change(
+                            watcher,
+                            reason="Queue stalled; waiting for dependencies to unblock",
+                            max_wait_seconds=max_idle_wait,
+                        )
+                    )
                     continue
                 set_daemon_state(
                     state="idle",
@@ -3970,7 +5213,11 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
                 )
                 emit_event("daemon_stop", "Queue stalled; queued items exist but none are dependency-ready")
                 return 0
+            if preparer is not None and preparer.is_prepared_for(next_ready):
+                # The next item is already prepared; sleeping would only add dead time.
+                continue
             emit_event("sleep", "Sleeping before next scheduling cycle", seconds=sleep_seconds)
+            RUNTIME_STATE.flush()
             time.sleep(sleep_seconds)
     except KeyboardInterrupt:
         set_daemon_state(
@@ -3982,6 +5229,8 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
         emit_event("daemon_interrupt", "KeyboardInterrupt received; stopping daemon")
         return 130
     finally:
+        if watcher is not None:
+            watcher.close()
         if model_stats_tracker is not None and model_stats is not None and session_id is not None:
             model_stats_tracker.end_session(
                 model_stats,
@@ -3989,6 +5238,7 @@ def cmd_run(*, once: bool, sleep_seconds: int, dry_run: bool, verbose: bool, kee
                 ended_at=utc_now_iso(),
             )
             model_stats_tracker.save(model_stats)
+        compact_backlog_journal()
         set_daemon_state(lock_held=False, active_item=None, state="idle", session_id=None)
         lock.release()
         emit_event("daemon_stop", "Daemon stopped and lock released", pid=os.getpid(), session_id=session_id)
@@ -4003,15 +5253,47 @@ def build_parser() -> argparse.ArgumentParser:
     run_p.add_argument("--dry-run", action="store_true")
     run_p.add_argument("--verbose", action="store_true")
     run_p.add_argument("--until-idle", action="store_true", help="Exit when queue becomes idle or stalled (legacy behavior)")
+    run_p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Run up to N agents concurrently on items with non-overlapping write scopes",
+    )
 
     once_p = sub.add_parser("once", help="Process a single work item")
     once_p.add_argument("--dry-run", action="store_true")
     once_p.add_argument("--verbose", action="store_true")
+    for cycle_p in (run_p, once_p):
+        cycle_p.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-run every environment health check each cycle instead of reusing unchanged results",
+        )
+        cycle_p.add_argument(
+            "--profile",
+            metavar="DIR",
+            type=Path,
+            help="Write per-cycle phase spans, cProfile .pstats and a collapsed-stack file to DIR",
+        )
+        cycle_p.add_argument(
+            "--profile-memory",
+            action="store_true",
+            help="With --profile, also trace allocations and dump a tracemalloc snapshot per cycle",
+        )
 
-    sub.add_parser("status", help="Show high-level daemon status")
+    status_p = sub.add_parser("status", help="Show high-level daemon status")
+    status_p.add_argument("--force", action="store_true", help="Re-run every environment health check")
+    status_p.add_argument("--health-profile", action="store_true", help="Print per-check health timing")
     metrics_p = sub.add_parser("metrics", help="Show completed-work metrics")
     metrics_p.add_argument("--top-agents", type=int, default=10)
     metrics_p.add_argument("--top-items", type=int, default=10)
+    metrics_p.add_argument("--item", help="Show run history for one item (index lookup, no full scan)")
+    metrics_p.add_argument("--since-hours", type=float, help="Summarize run outcomes over the last N hours")
+    metrics_p.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the completion metrics store from backlog + run history and report drift",
+    )
     return parser
 
 
@@ -4020,11 +5302,26 @@ def main() -> int:
     args = parser.parse_args()
 
     if args.command == "status":
-        return cmd_status()
+        return cmd_status(force_health=args.force, health_profile=args.health_profile)
     if args.command == "metrics":
-        return cmd_metrics(top_agents=args.top_agents, top_items=args.top_items)
+        return cmd_metrics(
+            top_agents=args.top_agents,
+            top_items=args.top_items,
+            item_id=args.item,
+            since_hours=args.since_hours,
+            rebuild=args.rebuild,
+        )
     if args.command == "once":
-        return cmd_run(once=True, sleep_seconds=0, dry_run=args.dry_run, verbose=args.verbose, keep_alive=False)
+        return cmd_run(
+            once=True,
+            sleep_seconds=0,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            keep_alive=False,
+            force_health=args.force,
+            profile_dir=args.profile,
+            profile_memory=args.profile_memory,
+        )
     if args.command == "run":
         return cmd_run(
             once=False,
@@ -4032,6 +5329,10 @@ def main() -> int:
             dry_run=args.dry_run,
             verbose=args.verbose,
             keep_alive=not args.until_idle,
+            workers=max(1, args.workers),
+            force_health=args.force,
+            profile_dir=args.profile,
+            profile_memory=args.profile_memory,
         )
     parser.print_help()
     return 2
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+from http.server import SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+
+# Text assets worth precompressing; images, fonts and archives are already compressed.
+TEXT_ASSET_SUFFIXES = frozenset({".html", ".css", ".js", ".mjs", ".json", ".svg", ".txt", ".map", ".xml", ".webmanifest"})
+# Content-Encoding token and file suffix, in serving preference order.
+ENCODING_SUFFIXES: tuple[tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+VARIANT_SUFFIXES = frozenset(suffix for _encoding, suffix in ENCODING_SUFFIXES)
+# What packaging produces unless told otherwise; `br` is opt-in so the artifact
+# does not depend on whether the optional brotli package happens to be installed.
+DEFAULT_ENCODINGS: tuple[str, ...] = ("gzip",)
+# Below this the headers cost more than compression saves.
+MIN_PRECOMPRESS_BYTES = 256
+CHUNK_BYTES = 1024 * 1024
+
+
+def _brotli_module() -> Any:
+    try:
+        import brotli  # type: ignore
+    except Exception:
+        return None
+    return brotli
+
+
+def available_encodings() -> list[str]:
+    """Encodings this interpreter can produce, in preference order (`br` needs the optional `brotli` package)."""
+    return [encoding for encoding, _suffix in ENCODING_SUFFIXES if encoding != "br" or _brotli_module() is not None]
+
+
+def resolve_encodings(requested: Iterable[str]) -> list[str]:
+    """Requested encodings in preference order; ValueError if one is unknown or cannot be produced."""
+    wanted = {str(encoding).strip().lower() for encoding in requested if str(encoding).strip()}
+    unknown = sorted(wanted - {encoding for encoding, _suffix in ENCODING_SUFFIXES})
+    if unknown:
+        raise ValueError(f"unsupported precompression encoding(s): {', '.join(unknown)}")
+    if "br" in wanted and _brotli_module() is None:
+        raise ValueError("br precompression requested but the brotli package is not installed")
+    return [encoding for encoding, _suffix in ENCODING_SUFFIXES if encoding in wanted]
+
+
+def variant_suffix(encoding: str) -> str:
+    return dict(ENCODING_SUFFIXES)[encoding]
+
+
+def should_precompress(relative_path: Path, size: int) -> bool:
+    return relative_path.suffix.lower() in TEXT_ASSET_SUFFIXES and size >= MIN_PRECOMPRESS_BYTES
+
+
+class _HashingWriter:
+    def __init__(self, destination: BinaryIO):
+        self._destination = destination
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self._destination.write(data)
+
+    def flush(self) -> None:
+        self._destination.flush()
+
+
+def compress_file(encoding: str, source_path: Path, destination_path: Path) -> tuple[int, str]:
+    """Stream `source_path` into a deterministic `encoding` variant; returns its size and sha256.
+
+    gzip output has no file name and a zero mtime, so equal input gives equal bytes.
+    """
+    with source_path.open("rb") as source, destination_path.open("wb") as raw:
+        writer = _HashingWriter(raw)
+        if encoding == "gzip":
+            with gzip.GzipFile(filename="", mode="wb", fileobj=writer, compresslevel=9, mtime=0) as compressed:  # type: ignore[arg-type]
+                while chunk := source.read(CHUNK_BYTES):
+                    compressed.write(chunk)
+        elif encoding == "br":
+            brotli = _brotli_module()
+            if brotli is None:
+                raise ValueError("brotli encoding requested but the brotli package is not installed")
+            compressor = brotli.Compressor(quality=11)
+            while chunk := source.read(CHUNK_BYTES):
+                writer.write(compressor.process(chunk))
+            writer.write(compressor.finish())
+        else:
+            raise ValueError(f"unsupported encoding: {encoding}")
+    return writer.size, writer.digest.hexdigest()
+
+
+def decompress_bytes(encoding: str, data: bytes) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        brotli = _brotli_module()
+        if brotli is None:
+            raise ValueError("brotli encoding requested but the brotli package is not installed")
+        return brotli.decompress(data)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    """Encodings an Accept-Encoding header allows (q > 0); `*` allows every known one."""
+    accepted: set[str] = set()
+    refused: set[str] = set()
+    for part in (header or "").split(","):
+        token, _sep, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _eq, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        (accepted if quality > 0 else refused).add(token)
+    if "*" in accepted:
+        accepted |= {encoding for encoding, _suffix in ENCODING_SUFFIXES if encoding not in refused}
+    return accepted - refused
+
+
+class PrecompressedRequestHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler that answers with a `.br`/`.gz` sibling when the client accepts it.
+
+    A variant is only used when it is at least as new as the file it encodes,
+    so an edited source is never shadowed by a stale variant. Responses for
+    files that have variants carry `Vary: Accept-Encoding`.
+    """
+
+    _vary_accept_encoding = False
+
+    def send_head(self) -> Any:
+        self._vary_accept_encoding = False
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split("?", 1)[0].split("#", 1)[0].endswith("/"):
+                return super().send_head()
+            path = os.path.join(path, "index.html")
+        try:
+            original = os.stat(path)
+        except OSError:
+            return super().send_head()
+
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding"))
+        for encoding, suffix in ENCODING_SUFFIXES:
+            try:
+                variant = os.stat(path + suffix)
+            except OSError:
+                continue
+            if variant.st_mtime_ns < original.st_mtime_ns:
+                continue
+            self._vary_accept_encoding = True
+            if encoding not in accepted:
+                continue
+            try:
+                handle = open(path + suffix, "rb")
+            except OSError:
+                continue
+            self.send_response(200)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(variant.st_size))
+            self.send_header("Last-Modified", self.date_time_string(int(original.st_mtime)))
+            self.end_headers()
+            return handle
+        return super().send_head()
+
+    def end_headers(self) -> None:
+        if self._vary_accept_encoding:
+            self.send_header("Vary", "Accept-Encoding")
+            self._vary_accept_encoding = False
+        super().end_headers()
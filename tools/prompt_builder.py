@@ -1,18 +1,165 @@
 from __future__ import annotations
 
+import re
+import stat as stat_module
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from schemas import utc_now_iso
 
 
-def _safe_read(path: Path, max_chars: int = 4000) -> str:
-    if not path.exists() or not path.is_file():
-        return ""
-    text = path.read_text(encoding="utf-8", errors="replace")
-    if len(text) > max_chars:
-        return text[:max_chars] + "\n...[truncated]..."
-    return text
+DEFAULT_TOKEN_BUDGET = 8000
+MAX_INPUT_FILES = 8
+MIN_SECTION_TOKENS = 64
+TRUNCATION_MARKER = "\n...[truncated to fit token budget]..."
+SOURCE_CACHE_MAX_ENTRIES = 256
+TIMESTAMP_LINE_PATTERN = re.compile(r"^Timestamp \(UTC\): .*$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    # Same heuristic as the worker's tokens_in_est, so budgets and reports agree.
+    return len(text) // 4
+
+
+def _is_regular_file(stat: Any) -> bool:
+    return stat_module.S_ISREG(stat.st_mode)
+
+
+class SourceCache:
+    """File contents keyed by path, reused while (mtime_ns, size) is unchanged."""
+
+    def __init__(self, max_entries: int = SOURCE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Path, tuple[int, int, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path: Path) -> str:
+        try:
+            stat = path.stat()
+        except OSError:
+            return ""
+        if not _is_regular_file(stat):
+            return ""
+        key = path
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ""
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+SOURCE_CACHE = SourceCache()
+
+
+@dataclass
+class PromptSection:
+    name: str
+    text: str
+    priority: int
+    tokens: int = 0
+    trimmed: bool = False
+
+
+def _truncate_to_tokens(text: str, tokens: int) -> str:
+    limit = max(0, tokens * 4 - len(TRUNCATION_MARKER))
+    cut = text[:limit]
+    newline = cut.rfind("\n")
+    if newline > limit // 2:
+        cut = cut[:newline]
+    return cut + TRUNCATION_MARKER
+
+
+def pack_sections(sections: list[PromptSection], budget: int) -> None:
+    """Fit optional sections into `budget` tokens, highest priority (lowest number) first.
+
+    Sections sharing a priority split what is left evenly, and whatever a small
+    section does not use goes to its larger siblings. A section that would get
+    fewer than MIN_SECTION_TOKENS is dropped rather than cut to a stub.
+    """
+    remaining = max(0, budget)
+    for priority in sorted({section.priority for section in sections}):
+        group = sorted(
+            (section for section in sections if section.priority == priority),
+            key=lambda section: estimate_tokens(section.text),
+        )
+        for position, section in enumerate(group):
+            need = estimate_tokens(section.text)
+            share = remaining // (len(group) - position)
+            if need <= share:
+                section.tokens = need
+            elif share >= MIN_SECTION_TOKENS:
+                section.text = _truncate_to_tokens(section.text, share)
+                section.tokens = estimate_tokens(section.text)
+                section.trimmed = True
+            else:
+                section.text = ""
+                section.tokens = 0
+                section.trimmed = need > 0
+            remaining -= section.tokens
+
+
+def _item_token_budget(work_item: dict[str, Any]) -> int:
+    try:
+        budget = int(work_item.get("token_budget", DEFAULT_TOKEN_BUDGET))
+    except (TypeError, ValueError):
+        return DEFAULT_TOKEN_BUDGET
+    return budget if budget > 0 else DEFAULT_TOKEN_BUDGET
+
+
+def prompt_source_paths(
+    project_root: Path,
+    *,
+    agent_id: str,
+    agent_cfg: dict[str, Any],
+    work_item: dict[str, Any],
+) -> list[Path]:
+    """Every file `build_prompt` reads for this agent and item."""
+    agent_dir = project_root / "agents" / agent_id
+    paths = [agent_dir / name for name in ("AGENT.md", "SKILL.md", "context.md", "working-notes.md")]
+    if str(agent_cfg.get("role", "")).strip().lower() == "frontend":
+        paths.append(project_root / "docs" / "design" / "ui-style-guide.md")
+    paths.extend(project_root / str(ref) for ref in work_item.get("inputs", [])[:MAX_INPUT_FILES])
+    return paths
+
+
+def source_stamps(paths: list[Path]) -> tuple[tuple[str, int, int] | None, ...]:
+    """(path, mtime_ns, size) per path, None for missing files; equal stamps mean an identical prompt."""
+    stamps: list[tuple[str, int, int] | None] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append(None)
+            continue
+        stamps.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+def restamp_prompt(prompt: str, timestamp: str | None = None) -> str:
+    """Refresh the header timestamp of a prompt built earlier (e.g. prepared ahead of time)."""
+    stamp = utc_now_iso() if timestamp is None else timestamp
+    return TIMESTAMP_LINE_PATTERN.sub(lambda _match: f"Timestamp (UTC): {stamp}", prompt, count=1)
 
 
 def build_prompt(
@@ -21,19 +168,38 @@ def build_prompt(
     agent_id: str,
     agent_cfg: dict[str, Any],
     work_item: dict[str, Any],
+    stats: dict[str, Any] | None = None,
+    cache: SourceCache | None = None,
 ) -> str:
-    agent_dir = project_root / "agents" / agent_id
-    agent_md = _safe_read(agent_dir / "AGENT.md", max_chars=5000)
-    agent_skill = _safe_read(agent_dir / "SKILL.md", max_chars=5000)
-    agent_context = _safe_read(agent_dir / "context.md", max_chars=5000)
-    working_notes = _safe_read(agent_dir / "working-notes.md", max_chars=2500)
+    """Assemble the worker prompt within the item's `token_budget`.
 
+    The task header, work item and output requirements are always included;
+    agent files, inputs and the style guide are packed into what is left by
+    priority (see `pack_sections`). Pass `stats` to receive the measured
+    tokens per section, the budget and the sections that were cut.
+    """
+    cache = SOURCE_CACHE if cache is None else cache
+    agent_dir = project_root / "agents" / agent_id
     role = str(agent_cfg.get("role", "")).strip().lower()
-    shared_ui_style = ""
+
+    sections = [
+        PromptSection("role_boundaries", cache.read(agent_dir / "AGENT.md"), priority=0),
+        PromptSection("agent_skill", cache.read(agent_dir / "SKILL.md"), priority=2),
+        PromptSection("current_context", cache.read(agent_dir / "context.md"), priority=3),
+        PromptSection("working_notes", cache.read(agent_dir / "working-notes.md"), priority=4),
+    ]
+    if role == "frontend":
+        sections.append(
+            PromptSection("ui_style_guide", cache.read(project_root / "docs" / "design" / "ui-style-guide.md"), priority=2)
+        )
+    input_refs = [str(ref) for ref in work_item.get("inputs", [])[:MAX_INPUT_FILES]]
+    input_sections = [PromptSection(f"input:{ref}", cache.read(project_root / ref), priority=1) for ref in input_refs]
+    sections.extend(input_sections)
+    by_name = {section.name: section for section in sections}
+
     frontend_scope_rule = ""
     lead_velocity_rule = ""
     if role == "frontend":
-        shared_ui_style = _safe_read(project_root / "docs" / "design" / "ui-style-guide.md", max_chars=5000)
         frontend_scope_rule = (
             "- Keep UI implementation aligned with `docs/design/ui-style-guide.md`; "
             "consistency of shared tokens/components is mandatory.\n"
@@ -46,37 +212,16 @@ def build_prompt(
             "- For non-critical work, prefer lightweight checks (build/status/scoped sanity) over broad test suites.\n"
         )
 
-    input_sections: list[str] = []
-    for ref in work_item.get("inputs", [])[:8]:
-        ref_path = project_root / ref
-        content = _safe_read(ref_path, max_chars=2500)
-        if content:
-            input_sections.append(f"## {ref}\n\n{content}")
-        else:
-            input_sections.append(f"## {ref}\n\n[missing or non-file]")
-
     acceptance = "\n".join(f"- {line}" for line in work_item.get("acceptance_criteria", []))
     validations = "\n".join(f"- {line}" for line in work_item.get("validation_commands", []))
 
-    prompt = f"""# RedKeepers Autonomous Agent Task
+    header = f"""# RedKeepers Autonomous Agent Task
 
 Timestamp (UTC): {utc_now_iso()}
 Agent: {agent_cfg['display_name']} ({agent_cfg['role']})
 Agent ID: {agent_id}
-
-## Role Boundaries
-{agent_md}
-
-## Agent Skill
-{agent_skill or "[No agent-specific skill file]"}
-
-## Current Context
-{agent_context}
-
-## Working Notes (recent summary)
-{working_notes}
-
-## Work Item
+"""
+    work_item_text = f"""## Work Item
 ID: {work_item['id']}
 Title: {work_item['title']}
 Milestone: {work_item['milestone']}
@@ -91,14 +236,8 @@ Acceptance Criteria:
 
 Validation Commands:
 {validations or '- None'}
-
-## Relevant Inputs
-{chr(10).join(input_sections) if input_sections else '[No input files listed]'}
-
-## Shared UI Style Guide
-{shared_ui_style or '[Not applicable for this role]'}
-
-## Output Requirements
+"""
+    requirements = f"""## Output Requirements
 - Start your final response with one explicit status line: `STATUS: COMPLETED` or `STATUS: BLOCKED`.
 - Respect the first vertical slice scope (`docs/design/first-vertical-slice.md`). If you identify useful but out-of-scope work, defer it into `proposed_work_items` rather than implementing it now.
 - Keep outputs concise and implementation-focused.
@@ -110,4 +249,67 @@ Validation Commands:
 - Summarize changed files and results at the end.
 - Do not print long chain-of-thought; provide concise action/results.
 """
+
+    budget = _item_token_budget(work_item)
+    fixed_tokens = {
+        "header": estimate_tokens(header),
+        "work_item": estimate_tokens(work_item_text),
+        "output_requirements": estimate_tokens(requirements),
+    }
+    # Headings and placeholders around the packed sections cost a little too.
+    pack_sections(sections, budget - sum(fixed_tokens.values()) - 64 - 8 * len(input_sections))
+
+    input_blocks = []
+    for ref, section in zip(input_refs, input_sections):
+        if section.text:
+            input_blocks.append(f"## {ref}\n\n{section.text}")
+        elif section.trimmed:
+            input_blocks.append(f"## {ref}\n\n[omitted: over token budget]")
+        else:
+            input_blocks.append(f"## {ref}\n\n[missing or non-file]")
+
+    def _body(name: str, placeholder: str) -> str:
+        section = by_name.get(name)
+        if section is None:
+            return placeholder
+        if section.text:
+            return section.text
+        return "[omitted: over token budget]" if section.trimmed else placeholder
+
+    prompt = f"""{header}
+## Role Boundaries
+{_body("role_boundaries", "")}
+
+## Agent Skill
+{_body("agent_skill", "[No agent-specific skill file]")}
+
+## Current Context
+{_body("current_context", "")}
+
+## Working Notes (recent summary)
+{_body("working_notes", "")}
+
+{work_item_text}
+## Relevant Inputs
+{chr(10).join(input_blocks) if input_blocks else '[No input files listed]'}
+
+## Shared UI Style Guide
+{_body("ui_style_guide", "[Not applicable for this role]")}
+
+{requirements}"""
+
+    if stats is not None:
+        section_tokens = dict(fixed_tokens)
+        for section in sections:
+            if not section.name.startswith("input:"):
+                section_tokens[section.name] = section.tokens
+        section_tokens["inputs"] = sum(section.tokens for section in input_sections)
+        stats.update(
+            {
+                "prompt_tokens": estimate_tokens(prompt),
+                "prompt_token_budget": budget,
+                "prompt_sections": section_tokens,
+                "prompt_trimmed": [section.name for section in sections if section.trimmed],
+            }
+        )
     return prompt
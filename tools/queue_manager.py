@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import heapq
+import json
+import os
+from collections.abc import Iterable, Iterator, Set
+from contextlib import contextmanager
 from copy import deepcopy
 from pathlib import Path
 from typing import Any
@@ -11,6 +16,415 @@ PRIORITY_RANK = {"critical": 0, "high": 1, "normal": 2, "low": 3}
 PRIORITY_UNLOCK_WEIGHT = {"critical": 8, "high": 4, "normal": 2, "low": 1}
 
 
+# Journal records since the last compaction before snapshots are rewritten.
+JOURNAL_COMPACT_RECORDS = 64
+# Small snapshots read by agents and tooling are rewritten on every save; the
+# completed archive only catches up on compaction (replay covers the gap).
+EAGER_SNAPSHOT_COLLECTIONS = ("active", "blocked")
+# Collections whose items save() checks for unrecorded in-place edits. The
+# completed archive is large and only changed through QueueManager methods,
+# so re-serializing it on every save is not worth it; use touch() there.
+EDIT_TRACKED_COLLECTIONS = ("active", "blocked")
+
+
+class _ItemCollection:
+    """Insertion-ordered id -> item store backing one backlog file.
+
+    Re-adding an id moves it to the end, matching the old remove-then-append
+    list semantics. Entries without a string id are kept (after keyed items)
+    so malformed archives still round-trip through save(). Mutations made
+    with record=True are queued as journal operations and mark the snapshot
+    stale. With track_edits, the serialized form of each item as last
+    persisted is kept, so edits made to an item in place can be found and
+    journaled too.
+    """
+
+    def __init__(self, name: str, pending: list[dict[str, Any]], *, track_edits: bool = False) -> None:
+        self.name = name
+        self.track_edits = track_edits
+        self.stale = False
+        self._pending = pending
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._unkeyed: list[Any] = []
+        self._view: list[Any] | None = None
+        self._persisted: dict[str, str] = {}
+
+    @staticmethod
+    def _key(item: Any) -> str | None:
+        if not isinstance(item, dict):
+            return None
+        item_id = item.get("id")
+        if isinstance(item_id, str) and item_id:
+            return item_id
+        return None
+
+    def _record(self, op: str, item_id: str | None = None, payload: Any = None) -> None:
+        self._pending.append({"collection": self.name, "op": op, "id": item_id, "item": payload})
+        self.stale = True
+
+    def reset(self, items: Iterable[Any], *, record: bool = True) -> None:
+        items = list(items)
+        self._by_id = {}
+        self._unkeyed = []
+        self._view = None
+        for item in items:
+            self.add(item, record=False)
+        if record:
+            self._record("reset", payload=items)
+
+    def add(self, item: Any, *, record: bool = True) -> None:
+        key = self._key(item)
+        if key is None:
+            self._unkeyed.append(item)
+        else:
+            existed = self._by_id.pop(key, None) is not None
+            self._by_id[key] = item
+            if record and existed:
+                self._record("drop", key)
+        if record:
+            self._record("put", key, item)
+        self._view = None
+
+    def put(self, item: Any) -> None:
+        """Replay helper: replace an existing id in place, else append."""
+        key = self._key(item)
+        if key is not None and key in self._by_id:
+            self._by_id[key] = item
+            self._view = None
+            return
+        self.add(item, record=False)
+
+    def touch(self, item_id: str) -> bool:
+        item = self._by_id.get(item_id)
+        if item is None:
+            return False
+        self._record("put", item_id, item)
+        return True
+
+    def pop(self, item_id: str, *, record: bool = True) -> dict[str, Any] | None:
+        item = self._by_id.pop(item_id, None)
+        if item is not None:
+            self._view = None
+            if record:
+                self._record("drop", item_id)
+        return item
+
+    def get(self, item_id: str) -> dict[str, Any] | None:
+        return self._by_id.get(item_id)
+
+    def ids(self) -> Set[str]:
+        return self._by_id.keys()
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._by_id
+
+    def as_list(self) -> list[Any]:
+        if self._view is None:
+            self._view = [*self._by_id.values(), *self._unkeyed]
+        return self._view
+
+    def mark_persisted(self, item_ids: Iterable[str] | None = None) -> None:
+        """Remember the current form of item_ids (default: every item) as persisted."""
+        if not self.track_edits:
+            return
+        if item_ids is None:
+            self._persisted = {key: _item_text(item) for key, item in self._by_id.items()}
+            return
+        for key in item_ids:
+            item = self._by_id.get(key)
+            if item is None:
+                self._persisted.pop(key, None)
+            else:
+                self._persisted[key] = _item_text(item)
+
+    def modified_ids(self) -> list[str]:
+        """Ids whose item differs from its persisted form and has no queued put."""
+        if not self.track_edits:
+            return []
+        queued = {op["id"] for op in self._pending if op["collection"] == self.name and op["op"] == "put"}
+        return [
+            key
+            for key, item in self._by_id.items()
+            if key not in queued and self._persisted.get(key) != _item_text(item)
+        ]
+
+
+def _item_text(item: Any) -> str:
+    return json.dumps(item, ensure_ascii=True)
+
+
+def _read_journal(path: Path) -> tuple[list[dict[str, Any]], int, bool]:
+    """Return (records, size_bytes, ends_with_newline); torn or invalid lines are skipped."""
+    if not path.exists():
+        return [], 0, True
+    raw = path.read_bytes()
+    records: list[dict[str, Any]] = []
+    for line in raw.decode("utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records, len(raw), raw.endswith(b"\n") or not raw
+
+
+def _file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _apply_journal(records: list[dict[str, Any]], collections: dict[str, _ItemCollection]) -> None:
+    for record in records:
+        collection = collections.get(str(record.get("collection", "")))
+        if collection is None:
+            continue
+        op = record.get("op")
+        if op == "put":
+            collection.put(record.get("item"))
+        elif op == "drop":
+            collection.pop(str(record.get("id", "")), record=False)
+        elif op == "reset":
+            items = record.get("item")
+            collection.reset(items if isinstance(items, list) else [], record=False)
+        else:
+            continue
+        collection.stale = True
+
+
+def replay_backlog_journal(
+    journal_path: Path,
+    *,
+    active: list[Any],
+    completed: list[Any],
+    blocked: list[Any],
+) -> tuple[list[Any], list[Any], list[Any]]:
+    """Apply un-compacted journal records to snapshot lists read outside QueueManager."""
+    records, _size, _terminated = _read_journal(journal_path)
+    if not records:
+        return active, completed, blocked
+    pending: list[dict[str, Any]] = []
+    collections = {name: _ItemCollection(name, pending) for name in ("active", "completed", "blocked")}
+    for name, items in (("active", active), ("completed", completed), ("blocked", blocked)):
+        collections[name].reset(items if isinstance(items, list) else [], record=False)
+    _apply_journal(records, collections)
+    return (
+        collections["active"].as_list(),
+        collections["completed"].as_list(),
+        collections["blocked"].as_list(),
+    )
+
+
+def _priority_weight(item: dict[str, Any]) -> int:
+    priority = str(item.get("priority", "normal")).strip().lower()
+    return PRIORITY_UNLOCK_WEIGHT.get(priority, PRIORITY_UNLOCK_WEIGHT["normal"])
+
+
+class _DependencyGraph:
+    """Reverse dependency edges among queued items, maintained incrementally.
+
+    Nodes are the queued active items. Each node keeps a count of dependencies
+    that are not completed yet, so the dependency-ready set never needs a full
+    scan. Transitive fan-out (distinct queued descendants and their weights) is
+    memoized per node. Any edge or weight change drops the memo of every node
+    that can reach the changed one.
+    """
+
+    def __init__(self) -> None:
+        self._deps: dict[str, tuple[str, ...]] = {}
+        self._weights: dict[str, int] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._unmet: dict[str, int] = {}
+        self._ready: set[str] = set()
+        self._fanout: dict[str, tuple[int, int]] = {}
+
+    def clear(self) -> None:
+        self._deps.clear()
+        self._weights.clear()
+        self._dependents.clear()
+        self._unmet.clear()
+        self._ready.clear()
+        self._fanout.clear()
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._deps
+
+    def add(self, item: dict[str, Any], completed_ids: Set[str]) -> None:
+        item_id = item["id"]
+        if item_id in self._deps:
+            self.remove(item_id)
+        deps_raw = item.get("dependencies", [])
+        deps = tuple(dict.fromkeys(str(dep) for dep in deps_raw)) if isinstance(deps_raw, list) else ()
+        self._deps[item_id] = deps
+        self._weights[item_id] = _priority_weight(item)
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(item_id)
+        unmet = sum(1 for dep in deps if dep not in completed_ids)
+        self._unmet[item_id] = unmet
+        if unmet == 0:
+            self._ready.add(item_id)
+        self._invalidate_ancestors(item_id)
+
+    def remove(self, item_id: str) -> None:
+        deps = self._deps.get(item_id)
+        if deps is None:
+            return
+        self._invalidate_ancestors(item_id)
+        self._fanout.pop(item_id, None)
+        for dep in deps:
+            dependents = self._dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(item_id)
+                if not dependents:
+                    del self._dependents[dep]
+        del self._deps[item_id]
+        del self._weights[item_id]
+        del self._unmet[item_id]
+        self._ready.discard(item_id)
+
+    def dependency_completed(self, dep_id: str) -> None:
+        for dependent in self._dependents.get(dep_id, ()):
+            self._unmet[dependent] -= 1
+            if self._unmet[dependent] == 0:
+                self._ready.add(dependent)
+
+    def dependency_reopened(self, dep_id: str) -> None:
+        for dependent in self._dependents.get(dep_id, ()):
+            self._unmet[dependent] += 1
+            self._ready.discard(dependent)
+
+    def ready_ids(self) -> set[str]:
+        return self._ready
+
+    def direct_metrics(self, item_id: str, completed_ids: Set[str]) -> dict[str, int]:
+        total = immediate = weighted_total = weighted_immediate = 0
+        for dependent in self._dependents.get(item_id, ()):
+            if dependent == item_id:
+                continue
+            weight = self._weights[dependent]
+            total += 1
+            weighted_total += weight
+            if all(other in completed_ids for other in self._deps[dependent] if other != item_id):
+                immediate += 1
+                weighted_immediate += weight
+        return {
+            "total": total,
+            "immediate": immediate,
+            "weighted_total": weighted_total,
+            "weighted_immediate": weighted_immediate,
+        }
+
+    def transitive_metrics(self, item_id: str) -> tuple[int, int]:
+        """Return (distinct queued descendants, their summed priority weight)."""
+        cached = self._fanout.get(item_id)
+        if cached is not None:
+            return cached
+        if item_id not in self._deps:
+            return self._walk_descendants(item_id)
+        self._compute_fanout([item_id])
+        return self._fanout[item_id]
+
+    def prime(self, item_ids: Iterable[str]) -> None:
+        """Fill the fan-out memo for item_ids (and everything beneath them) in one pass."""
+        missing = [item_id for item_id in item_ids if item_id in self._deps and item_id not in self._fanout]
+        if missing:
+            self._compute_fanout(missing)
+
+    def _walk_descendants(self, item_id: str) -> tuple[int, int]:
+        visited: set[str] = set()
+        weighted = 0
+        stack = list(self._dependents.get(item_id, ()))
+        while stack:
+            current = stack.pop()
+            if current in visited or current == item_id:
+                continue
+            visited.add(current)
+            weighted += self._weights.get(current, PRIORITY_UNLOCK_WEIGHT["normal"])
+            stack.extend(dep for dep in self._dependents.get(current, ()) if dep not in visited)
+        return len(visited), weighted
+
+    def _compute_fanout(self, roots: list[str]) -> None:
+        # Post-order DFS gives every node after all of its dependents, i.e. a
+        # reverse topological order of the region reachable from roots.
+        order: list[str] = []
+        state: dict[str, int] = {}
+        has_cycle = False
+        for root in roots:
+            if root in state:
+                continue
+            state[root] = 1
+            stack: list[tuple[str, Iterator[str]]] = [(root, iter(self._dependents.get(root, ())))]
+            while stack:
+                node, children = stack[-1]
+                advanced = False
+                for child in children:
+                    if child == node:
+                        continue
+                    child_state = state.get(child)
+                    if child_state is None:
+                        state[child] = 1
+                        stack.append((child, iter(self._dependents.get(child, ()))))
+                        advanced = True
+                        break
+                    if child_state == 1:
+                        has_cycle = True
+                if not advanced:
+                    state[node] = 2
+                    order.append(node)
+                    stack.pop()
+
+        if has_cycle:
+            # Dependency cycles have no topological order; fall back to per-node walks.
+            for node in order:
+                self._fanout[node] = self._walk_descendants(node)
+            return
+
+        position = {node: idx for idx, node in enumerate(order)}
+        weight_masks: dict[int, bytearray] = {}
+        for node, idx in position.items():
+            mask = weight_masks.setdefault(self._weights[node], bytearray((len(order) + 7) // 8))
+            mask[idx >> 3] |= 1 << (idx & 7)
+        masks = [(weight, int.from_bytes(mask, "little")) for weight, mask in weight_masks.items()]
+
+        # Descendant bitsets are only kept until every parent inside the region has consumed them.
+        waiting_parents = {
+            node: sum(1 for dep in self._deps[node] if dep in position and dep != node) for node in order
+        }
+        descendants: dict[str, int] = {}
+        for node in order:
+            bits = 0
+            for child in self._dependents.get(node, ()):
+                if child == node:
+                    continue
+                bits |= (1 << position[child]) | descendants[child]
+                waiting_parents[child] -= 1
+                if waiting_parents[child] == 0:
+                    del descendants[child]
+            if waiting_parents[node] > 0:
+                descendants[node] = bits
+            weighted = sum(weight * (bits & mask).bit_count() for weight, mask in masks)
+            self._fanout[node] = (bits.bit_count(), weighted)
+
+    def _invalidate_ancestors(self, item_id: str) -> None:
+        if not self._fanout:
+            return
+        seen: set[str] = set()
+        stack = list(self._deps.get(item_id, ()))
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            self._fanout.pop(current, None)
+            stack.extend(self._deps.get(current, ()))
+
+
 class QueueManager:
     def __init__(self, root: Path):
         self.root = root
@@ -18,29 +432,277 @@ class QueueManager:
         self.active_path = self.backlog_dir / "work-items.json"
         self.completed_path = self.backlog_dir / "completed-items.json"
         self.blocked_path = self.backlog_dir / "blocked-items.json"
-        self.active: list[dict[str, Any]] = []
-        self.completed: list[dict[str, Any]] = []
-        self.blocked: list[dict[str, Any]] = []
-
-    def load(self) -> None:
-        self.active = load_json(self.active_path, [])
-        self.completed = load_json(self.completed_path, [])
-        self.blocked = load_json(self.blocked_path, [])
+        self.journal_path = self.backlog_dir / "backlog-journal.jsonl"
+        self._journal_pending: list[dict[str, Any]] = []
+        self._journal_records = 0
+        self._journal_size = 0
+        self._journal_terminated = True
+        self._active = _ItemCollection("active", self._journal_pending, track_edits="active" in EDIT_TRACKED_COLLECTIONS)
+        self._completed = _ItemCollection(
+            "completed", self._journal_pending, track_edits="completed" in EDIT_TRACKED_COLLECTIONS
+        )
+        self._blocked = _ItemCollection("blocked", self._journal_pending, track_edits="blocked" in EDIT_TRACKED_COLLECTIONS)
+        self._collections = {"active": self._active, "completed": self._completed, "blocked": self._blocked}
+        self._snapshot_paths = {
+            "active": self.active_path,
+            "completed": self.completed_path,
+            "blocked": self.blocked_path,
+        }
+        # status -> {id: item} for active items; kept in step by the mutators below.
+        self._status_index: dict[str, dict[str, dict[str, Any]]] = {}
+        self._graph = _DependencyGraph()
+        self._save_deferred = False
+        self._save_requested = False
+        # (inode, mtime, size) of the backlog files as this instance last read or wrote them.
+        self._disk_signature: tuple[tuple[int, int, int] | None, ...] | None = None
+
+    # `active`/`completed`/`blocked` stay list-valued for callers; the returned
+    # lists are cached snapshots, so mutate through QueueManager methods or by
+    # assigning a new list (which rebuilds the indexes).
+    @property
+    def active(self) -> list[dict[str, Any]]:
+        return self._active.as_list()
+
+    @active.setter
+    def active(self, items: list[dict[str, Any]]) -> None:
+        self._active.reset(items if isinstance(items, list) else [])
+        self._rebuild_status_index()
+
+    @property
+    def completed(self) -> list[dict[str, Any]]:
+        return self._completed.as_list()
+
+    @completed.setter
+    def completed(self, items: list[dict[str, Any]]) -> None:
+        self._completed.reset(items if isinstance(items, list) else [])
+        self._rebuild_status_index()
+
+    @property
+    def blocked(self) -> list[dict[str, Any]]:
+        return self._blocked.as_list()
+
+    @blocked.setter
+    def blocked(self, items: list[dict[str, Any]]) -> None:
+        self._blocked.reset(items if isinstance(items, list) else [])
+
+    def _rebuild_status_index(self) -> None:
+        self._status_index = {}
+        self._graph.clear()
+        for item in self._active.as_list():
+            if isinstance(item, dict) and _ItemCollection._key(item) is not None:
+                self._index_status(item)
+
+    def _index_status(self, item: dict[str, Any]) -> None:
+        status = str(item.get("status", ""))
+        self._status_index.setdefault(status, {})[item["id"]] = item
+        if status == "queued":
+            self._graph.add(item, self._completed.ids())
+
+    def _unindex_status(self, item: dict[str, Any]) -> None:
+        status = str(item.get("status", ""))
+        bucket = self._status_index.get(status)
+        if bucket is not None:
+            bucket.pop(item["id"], None)
+        if status == "queued":
+            self._graph.remove(item["id"])
+
+    def _add_completed(self, item: dict[str, Any]) -> None:
+        item_id = item["id"]
+        was_completed = item_id in self._completed
+        self._completed.add(item)
+        if not was_completed:
+            self._graph.dependency_completed(item_id)
+
+    def _pop_completed(self, item_id: str) -> None:
+        if self._completed.pop(item_id) is not None:
+            self._graph.dependency_reopened(item_id)
+
+    def _set_active_status(self, item: dict[str, Any], status: str) -> None:
+        self._unindex_status(item)
+        item["status"] = status
+        self._index_status(item)
+        self._active.touch(item["id"])
+
+    def _remove_active(self, item_id: str) -> dict[str, Any] | None:
+        item = self._active.pop(item_id)
+        if item is not None:
+            self._unindex_status(item)
+        return item
+
+    def _signature(self) -> tuple[tuple[int, int, int] | None, ...]:
+        return tuple(_file_signature(path) for path in (*self._snapshot_paths.values(), self.journal_path))
+
+    def _record_own_write(self, before: tuple[tuple[int, int, int] | None, ...]) -> None:
+        # If another writer changed the files before this write, keep the old
+        # signature so the next refresh() still picks their change up.
+        if before == self._disk_signature:
+            self._disk_signature = self._signature()
+
+    def load(self, *, validate: bool = True) -> None:
+        self._journal_pending.clear()
+        # Taken before reading: a write racing the read only causes one extra reload.
+        self._disk_signature = self._signature()
+        for name, collection in self._collections.items():
+            data = load_json(self._snapshot_paths[name], [])
+            collection.reset(data if isinstance(data, list) else [], record=False)
+            collection.stale = False
+        records, self._journal_size, self._journal_terminated = _read_journal(self.journal_path)
+        self._journal_records = len(records)
+        _apply_journal(records, self._collections)
+        for collection in self._collections.values():
+            collection.mark_persisted()
+        self._rebuild_status_index()
+        if not validate:
+            return
         errors = validate_work_items(self.active)
         if errors:
             joined = "; ".join(errors[:10])
             raise ValueError(f"work queue validation failed: {joined}")
 
-    def save(self) -> None:
-        save_json_atomic(self.active_path, self.active)
-        save_json_atomic(self.completed_path, self.completed)
-        save_json_atomic(self.blocked_path, self.blocked)
+    def refresh(self, *, validate: bool = True) -> bool:
+        """Reload only if the backlog files changed since this instance last read or wrote them.
 
-    def completed_ids(self) -> set[str]:
-        return {item["id"] for item in self.completed}
+        Lets a long-lived queue be reused across daemon cycles while still
+        picking up edits from other writers (an agent rewriting work-items.json,
+        the archive repair pass). Returns True when it reloaded.
+        """
+        if self._disk_signature is not None and self._signature() == self._disk_signature:
+            return False
+        self.load(validate=validate)
+        return True
 
-    def _dependencies_ready(self, item: dict[str, Any], completed_ids: set[str]) -> bool:
-        return all(dep_id in completed_ids for dep_id in item.get("dependencies", []))
+    @contextmanager
+    def deferred_save(self) -> Iterator[None]:
+        """Coalesce save() calls made inside the block into one save on exit."""
+        if self._save_deferred:
+            yield
+            return
+        self._save_deferred = True
+        self._save_requested = False
+        try:
+            yield
+        finally:
+            self._save_deferred = False
+            if self._save_requested:
+                self._save_requested = False
+                self.save()
+
+    def save(self) -> None:
+        """Persist pending transitions.
+
+        Transitions go to the append-only journal first (fsynced), then stale
+        active/blocked snapshots are rewritten. Everything else waits for
+        compact(), which runs once the journal reaches JOURNAL_COMPACT_RECORDS.
+        Active and blocked items edited in place since the last save are
+        journaled as well, so calling touch() first is not required for them
+        (completed items still need it). Inside deferred_save() this only marks
+        the queue for saving.
+        """
+        if self._save_deferred:
+            self._save_requested = True
+            return
+        before = self._signature()
+        self._flush_journal()
+        for name in EAGER_SNAPSHOT_COLLECTIONS:
+            collection = self._collections[name]
+            if collection.stale:
+                save_json_atomic(self._snapshot_paths[name], collection.as_list())
+                collection.stale = False
+        if self._journal_records >= JOURNAL_COMPACT_RECORDS:
+            self.compact()
+        self._record_own_write(before)
+
+    def compact(self) -> bool:
+        """Fold the journal into the JSON snapshots and truncate it.
+
+        Skips (returning False) when another QueueManager appended records this
+        instance has not replayed, so their transitions are never dropped.
+        """
+        before = self._signature()
+        self._flush_journal()
+        current_size = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        if current_size != self._journal_size:
+            return False
+        for name, collection in self._collections.items():
+            if collection.stale:
+                save_json_atomic(self._snapshot_paths[name], collection.as_list())
+                collection.stale = False
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_records = 0
+        self._journal_size = 0
+        self._journal_terminated = True
+        self._record_own_write(before)
+        return True
+
+    def touch(self, item_id: str) -> bool:
+        """Journal an in-place edit to an item now (save() finds active/blocked edits on its own)."""
+        item = self._active.get(item_id)
+        if item is not None:
+            # Status, dependencies or priority may have changed.
+            for bucket in self._status_index.values():
+                bucket.pop(item_id, None)
+            self._graph.remove(item_id)
+            self._index_status(item)
+        return any(collection.touch(item_id) for collection in self._collections.values())
+
+    def _record_modified_items(self) -> None:
+        for collection in self._collections.values():
+            for item_id in collection.modified_ids():
+                self.touch(item_id)
+
+    def _flush_journal(self) -> None:
+        self._record_modified_items()
+        if not self._journal_pending:
+            return
+        lines: list[str] = []
+        previous: tuple[str, str, Any] | None = None
+        written: dict[str, set[str]] = {}
+        reset: set[str] = set()
+        for op in self._journal_pending:
+            if op["op"] == "reset":
+                reset.add(op["collection"])
+            elif op["id"] is not None:
+                written.setdefault(op["collection"], set()).add(op["id"])
+            # Consecutive puts of the same item carry identical final state.
+            key = (op["collection"], op["op"], op["id"])
+            if op["op"] == "put" and op["id"] is not None and key == previous:
+                continue
+            previous = key
+            lines.append(json.dumps(op, ensure_ascii=True))
+        self._journal_pending.clear()
+        payload = "\n".join(lines) + "\n"
+        if not self._journal_terminated:
+            payload = "\n" + payload
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a", encoding="utf-8", newline="\n") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._journal_records += len(lines)
+        self._journal_size = self.journal_path.stat().st_size
+        self._journal_terminated = True
+        for name, collection in self._collections.items():
+            if name in reset:
+                collection.mark_persisted()
+            elif name in written:
+                collection.mark_persisted(written[name])
+
+    def completed_ids(self) -> Set[str]:
+        """Live read-only view of completed item ids."""
+        return self._completed.ids()
+
+    def blocked_ids(self) -> Set[str]:
+        """Live read-only view of blocked item ids."""
+        return self._blocked.ids()
+
+    def has_item(self, item_id: str) -> bool:
+        return item_id in self._active or item_id in self._completed or item_id in self._blocked
+
+    def items_with_status(self, status: str) -> list[dict[str, Any]]:
+        """Active items currently in `status`, in backlog order."""
+        bucket = self._status_index.get(status, {})
+        return [item for item in bucket.values() if item.get("status") == status]
 
     def _agent_score(self, item: dict[str, Any], routing_rules: dict[str, Any], stats: dict[str, Any]) -> tuple[float, int]:
         preferred_agent = item.get("preferred_agent")
@@ -56,77 +718,16 @@ class QueueManager:
         self,
         *,
         candidate_ids: set[str],
-        completed_ids: set[str],
+        completed_ids: Set[str],
     ) -> dict[str, dict[str, int]]:
-        metrics: dict[str, dict[str, int]] = {
-            item_id: {
-                "total": 0,
-                "immediate": 0,
-                "weighted_total": 0,
-                "weighted_immediate": 0,
-                "transitive_total": 0,
-                "weighted_transitive": 0,
-            }
-            for item_id in candidate_ids
-        }
-        queued_items = [item for item in self.active if item.get("status") == "queued"]
-        by_id: dict[str, dict[str, Any]] = {}
-        dependent_index: dict[str, set[str]] = {}
-        for item in queued_items:
-            item_id = str(item.get("id", ""))
-            if not item_id:
-                continue
-            by_id[item_id] = item
-            deps_raw = item.get("dependencies", [])
-            if not isinstance(deps_raw, list):
-                continue
-            for dep in deps_raw:
-                dep_id = str(dep)
-                if not dep_id:
-                    continue
-                dependent_index.setdefault(dep_id, set()).add(item_id)
-
-        for target in queued_items:
-            target_id = str(target.get("id", ""))
-            deps_raw = target.get("dependencies", [])
-            if not isinstance(deps_raw, list) or not deps_raw:
-                continue
-            deps = [str(dep) for dep in deps_raw]
-            dep_set = set(deps)
-            relevant = dep_set.intersection(candidate_ids)
-            if not relevant:
-                continue
-            for dep in relevant:
-                if dep == target_id:
-                    continue
-                metrics[dep]["total"] += 1
-                priority = str(target.get("priority", "normal")).strip().lower()
-                weight = PRIORITY_UNLOCK_WEIGHT.get(priority, PRIORITY_UNLOCK_WEIGHT["normal"])
-                metrics[dep]["weighted_total"] += weight
-                other_deps = [other for other in deps if other != dep]
-                if all(other in completed_ids for other in other_deps):
-                    metrics[dep]["immediate"] += 1
-                    metrics[dep]["weighted_immediate"] += weight
-
-        # Transitive fan-out: how many queued items are in the dependency chain
-        # beneath a candidate (direct + indirect descendants).
-        for candidate_id in candidate_ids:
-            visited: set[str] = set()
-            stack = list(dependent_index.get(candidate_id, set()))
-            while stack:
-                current = stack.pop()
-                if current in visited or current == candidate_id:
-                    continue
-                visited.add(current)
-                target = by_id.get(current)
-                if target:
-                    priority = str(target.get("priority", "normal")).strip().lower()
-                    weight = PRIORITY_UNLOCK_WEIGHT.get(priority, PRIORITY_UNLOCK_WEIGHT["normal"])
-                else:
-                    weight = PRIORITY_UNLOCK_WEIGHT["normal"]
-                metrics[candidate_id]["transitive_total"] += 1
-                metrics[candidate_id]["weighted_transitive"] += weight
-                stack.extend(dep for dep in dependent_index.get(current, set()) if dep not in visited)
+        metrics: dict[str, dict[str, int]] = {}
+        self._graph.prime(candidate_ids)
+        for item_id in candidate_ids:
+            row = self._graph.direct_metrics(item_id, completed_ids)
+            # Transitive fan-out: how many queued items are in the dependency chain
+            # beneath a candidate (direct + indirect descendants).
+            row["transitive_total"], row["weighted_transitive"] = self._graph.transitive_metrics(item_id)
+            metrics[item_id] = row
         return metrics
 
     @staticmethod
@@ -155,14 +756,25 @@ class QueueManager:
         return parsed
 
     def select_next(self, routing_rules: dict[str, Any], stats: dict[str, Any]) -> dict[str, Any] | None:
+        ranked = self.ranked_candidates(routing_rules, stats, limit=1)
+        return ranked[0] if ranked else None
+
+    def ranked_candidates(
+        self,
+        routing_rules: dict[str, Any],
+        stats: dict[str, Any],
+        *,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return dependency-ready queued items in scheduling order (best first)."""
         completed_ids = self.completed_ids()
-        candidates = [
-            item
-            for item in self.active
-            if item.get("status") == "queued" and self._dependencies_ready(item, completed_ids)
-        ]
+        candidates = []
+        for item_id in self._graph.ready_ids():
+            item = self._active.get(item_id)
+            if item is not None and item.get("status") == "queued":
+                candidates.append(item)
         if not candidates:
-            return None
+            return []
 
         unlock_cfg = routing_rules.get("dependency_unlock_priority", {}) if isinstance(routing_rules, dict) else {}
         if not isinstance(unlock_cfg, dict):
@@ -232,19 +844,20 @@ class QueueManager:
                 item["id"],
             )
 
-        return deepcopy(sorted(candidates, key=sort_key)[0])
+        if limit is None:
+            ranked = sorted(candidates, key=sort_key)
+        else:
+            ranked = heapq.nsmallest(max(0, limit), candidates, key=sort_key)
+        return [deepcopy(item) for item in ranked]
 
     def get_active_item(self, item_id: str) -> dict[str, Any] | None:
-        for item in self.active:
-            if item["id"] == item_id:
-                return item
-        return None
+        return self._active.get(item_id)
 
     def update_item_status(self, item_id: str, status: str, **extra: Any) -> None:
         item = self.get_active_item(item_id)
         if item is None:
             raise KeyError(f"unknown item id: {item_id}")
-        item["status"] = status
+        self._set_active_status(item, status)
         item["updated_at"] = utc_now_iso()
         for key, value in extra.items():
             item[key] = value
@@ -265,7 +878,7 @@ class QueueManager:
         commit_sha: str | None = None,
         **extra: Any,
     ) -> None:
-        item = self.get_active_item(item_id)
+        item = self._remove_active(item_id)
         if item is None:
             raise KeyError(f"unknown item id: {item_id}")
         item["status"] = "completed"
@@ -275,47 +888,45 @@ class QueueManager:
             item["commit_sha"] = commit_sha
         for key, value in extra.items():
             item[key] = value
-        self.completed = [existing for existing in self.completed if existing.get("id") != item_id]
-        self.blocked = [existing for existing in self.blocked if existing.get("id") != item_id]
-        self.completed.append(item)
-        self.active = [candidate for candidate in self.active if candidate["id"] != item_id]
+        self._blocked.pop(item_id)
+        self._add_completed(item)
 
     def mark_blocked(self, item_id: str, blocker_reason: str) -> None:
-        item = self.get_active_item(item_id)
+        item = self._remove_active(item_id)
         if item is None:
             raise KeyError(f"unknown item id: {item_id}")
         item["status"] = "blocked"
         item["updated_at"] = utc_now_iso()
         item["blocker_reason"] = blocker_reason
-        self.blocked = [existing for existing in self.blocked if existing.get("id") != item_id]
-        self.completed = [existing for existing in self.completed if existing.get("id") != item_id]
-        self.blocked.append(item)
-        self.active = [candidate for candidate in self.active if candidate["id"] != item_id]
+        self._pop_completed(item_id)
+        self._blocked.add(item)
 
     def requeue_blocked(self, item_id: str, *, reason: str) -> bool:
-        if any(item.get("id") == item_id for item in self.active):
+        if item_id in self._active or item_id in self._completed:
             return False
-        if any(item.get("id") == item_id for item in self.completed):
-            return False
-        idx = next((i for i, item in enumerate(self.blocked) if item.get("id") == item_id), None)
-        if idx is None:
+        item = self._blocked.pop(item_id)
+        if item is None:
             return False
-        item = self.blocked.pop(idx)
         item["status"] = "queued"
         item["updated_at"] = utc_now_iso()
         item["last_unblocked_reason"] = reason
         item["last_blocker_reason"] = item.get("blocker_reason")
         item["blocker_reason"] = None
         item["blocked_revisit_count"] = int(item.get("blocked_revisit_count", 0)) + 1
-        self.active.append(item)
+        self._active.add(item)
+        self._index_status(item)
         return True
 
+    def remove_blocked(self, item_id: str) -> dict[str, Any] | None:
+        """Drop a blocked item (journaled as a single removal); None if it is not blocked."""
+        return self._blocked.pop(item_id)
+
     def increment_retry(self, item_id: str, reason: str) -> int:
         item = self.get_active_item(item_id)
         if item is None:
             raise KeyError(f"unknown item id: {item_id}")
         item["retry_count"] = int(item.get("retry_count", 0)) + 1
-        item["status"] = "queued"
+        self._set_active_status(item, "queued")
         item["updated_at"] = utc_now_iso()
         item["last_failure_reason"] = reason
         return item["retry_count"]
@@ -323,10 +934,12 @@ class QueueManager:
     def append_item(self, item: dict[str, Any]) -> None:
         item_id = item.get("id")
         if isinstance(item_id, str):
-            self.active = [existing for existing in self.active if existing.get("id") != item_id]
-            self.blocked = [existing for existing in self.blocked if existing.get("id") != item_id]
-            self.completed = [existing for existing in self.completed if existing.get("id") != item_id]
-        self.active.append(item)
+            self._remove_active(item_id)
+            self._blocked.pop(item_id)
+            self._pop_completed(item_id)
+        self._active.add(item)
+        if _ItemCollection._key(item) is not None:
+            self._index_status(item)
 
     def create_escalation_item(
         self,
@@ -365,5 +978,7 @@ class QueueManager:
             "escalation_target": lead_agent_name,
             "source_item_id": failed_item["id"],
         }
-        self.active.append(new_item)
+        self._remove_active(new_item["id"])
+        self._active.add(new_item)
+        self._index_status(new_item)
         return new_item
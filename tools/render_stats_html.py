@@ -5,6 +5,8 @@ import html
 from pathlib import Path
 from typing import Any
 
+from jsonl_log import SegmentedJsonlLog
+from queue_manager import replay_backlog_journal
 from schemas import load_json
 
 
@@ -15,6 +17,8 @@ DEFAULT_OUTPUT = ROOT / "coordination" / "runtime" / "stats-dashboard.html"
 DEFAULT_WORK_ITEMS = ROOT / "coordination" / "backlog" / "work-items.json"
 DEFAULT_COMPLETED_ITEMS = ROOT / "coordination" / "backlog" / "completed-items.json"
 DEFAULT_BLOCKED_ITEMS = ROOT / "coordination" / "backlog" / "blocked-items.json"
+DEFAULT_BACKLOG_JOURNAL = ROOT / "coordination" / "backlog" / "backlog-journal.jsonl"
+DEFAULT_RUN_HISTORY = ROOT / "coordination" / "runtime" / "run-history.jsonl"
 
 
 def _fmt_int(value: Any) -> str:
@@ -208,6 +212,42 @@ def _render_session_panels(model_stats: dict[str, Any]) -> str:
     return "".join(parts)
 
 
+def _render_rollup_panel(model_stats: dict[str, Any]) -> str:
+    rollups = model_stats.get("rollups", {})
+    if not isinstance(rollups, dict):
+        return ""
+    rows: list[list[str]] = []
+    for label, key in (("Daily", "daily"), ("Weekly", "weekly")):
+        periods = rollups.get(key, {})
+        if not isinstance(periods, dict):
+            continue
+        for period in sorted(periods, reverse=True):
+            entry = periods[period]
+            if not isinstance(entry, dict):
+                continue
+            totals = entry.get("totals", {})
+            rows.append(
+                [
+                    label,
+                    str(period),
+                    _fmt_int(entry.get("sessions", 0)),
+                    _fmt_int(totals.get("runs", 0)),
+                    _fmt_int(totals.get("completed", 0)),
+                    _fmt_int(totals.get("blocked", 0)),
+                    _fmt_int(totals.get("failed", 0)),
+                    _fmt_int(int(totals.get("tokens_in", 0)) + int(totals.get("tokens_out", 0))),
+                    _fmt_duration(totals.get("runtime_seconds", 0)),
+                ]
+            )
+    if not rows:
+        return ""
+    table_html = _render_table(
+        ["Rollup", "Period", "Sessions", "Runs", "Completed", "Blocked", "Failed", "Tokens", "Runtime"],
+        rows,
+    )
+    return f"<section class='panel'><h2>Older Sessions (Rolled Up)</h2>{table_html}</section>"
+
+
 def _render_backlog_section(
     *,
     queued_items: list[dict[str, Any]],
@@ -296,6 +336,27 @@ def _render_backlog_section(
     )
 
 
+def _render_recent_runs(recent_runs: list[dict[str, Any]] | None) -> str:
+    if recent_runs is None:
+        return ""
+    if not recent_runs:
+        return "<section class='panel'><h2>Recent Runs</h2><p>No runs recorded.</p></section>"
+    rows = [
+        [
+            str(row.get("ts") or "n/a"),
+            str(row.get("item_id") or "n/a"),
+            str(row.get("result") or "unknown"),
+            str(row.get("agent_id") or "unassigned"),
+            str(row.get("model_used") or row.get("model_requested") or "n/a"),
+            _fmt_duration(row.get("runtime_seconds")),
+            _trim(row.get("summary") or row.get("error") or ""),
+        ]
+        for row in reversed(recent_runs)
+    ]
+    table = _render_table(["Time", "Item", "Result", "Agent", "Model", "Runtime", "Summary"], rows)
+    return f"<section class='panel'><h2>Recent Runs</h2>{table}</section>"
+
+
 def build_html(
     *,
     title: str,
@@ -304,6 +365,7 @@ def build_html(
     queued_items: list[dict[str, Any]],
     completed_items: list[dict[str, Any]],
     blocked_items: list[dict[str, Any]],
+    recent_runs: list[dict[str, Any]] | None = None,
 ) -> str:
     generated_at = model_stats.get("generated_at") or agent_stats.get("generated_at") or "n/a"
     queue_totals = agent_stats.get("totals", {})
@@ -564,6 +626,8 @@ def build_html(
     </section>
     {agent_runs_chart}
     {_render_session_panels(model_stats)}
+    {_render_rollup_panel(model_stats)}
+    {_render_recent_runs(recent_runs)}
     {backlog_section}
   </main>
 </body>
@@ -578,6 +642,19 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--work-items", type=Path, default=DEFAULT_WORK_ITEMS)
     parser.add_argument("--completed-items", type=Path, default=DEFAULT_COMPLETED_ITEMS)
     parser.add_argument("--blocked-items", type=Path, default=DEFAULT_BLOCKED_ITEMS)
+    parser.add_argument(
+        "--backlog-journal",
+        type=Path,
+        default=DEFAULT_BACKLOG_JOURNAL,
+        help="Backlog transition journal replayed over the item snapshots (missing file is ignored)",
+    )
+    parser.add_argument(
+        "--run-history",
+        type=Path,
+        default=DEFAULT_RUN_HISTORY,
+        help="Run-history log; the newest runs are read from its rotated segments via the sidecar index",
+    )
+    parser.add_argument("--recent-runs", type=int, default=25, help="Number of recent runs to list (0 hides the panel)")
     parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
     parser.add_argument("--title", default="RedKeepers Runtime Dashboard")
     return parser.parse_args()
@@ -595,10 +672,20 @@ def main() -> int:
         agent_stats = {}
     if not isinstance(model_stats, dict):
         model_stats = {}
+    queued_items_raw, completed_items_raw, blocked_items_raw = replay_backlog_journal(
+        args.backlog_journal,
+        active=queued_items_raw,
+        completed=completed_items_raw,
+        blocked=blocked_items_raw,
+    )
     queued_items = _coerce_item_list(queued_items_raw)
     completed_items = _coerce_item_list(completed_items_raw)
     blocked_items = _coerce_item_list(blocked_items_raw)
 
+    recent_runs = None
+    if args.recent_runs > 0:
+        recent_runs = SegmentedJsonlLog(args.run_history, kind_field="result").tail(args.recent_runs)
+
     html_text = build_html(
         title=args.title,
         agent_stats=agent_stats,
@@ -606,6 +693,7 @@ def main() -> int:
         queued_items=queued_items,
         completed_items=completed_items,
         blocked_items=blocked_items,
+        recent_runs=recent_runs,
     )
     args.output.parent.mkdir(parents=True, exist_ok=True)
     args.output.write_text(html_text, encoding="utf-8")
@@ -25,6 +25,12 @@ COUNT_STYLE = {
     "done": "1;32",
     "fail": "1;31",
 }
+RESULT_STYLE = {
+    "completed": "1;32",
+    "blocked": "1;33",
+    "failed": "1;31",
+    "failed_infrastructure": "1;31",
+}
 
 
 def _supports_color_output() -> bool:
@@ -81,15 +87,22 @@ def render_status(data: dict[str, Any]) -> str:
     if daemon.get("last_error"):
         lines.append(f"Last error: {daemon.get('last_error')}")
 
-    if active_item:
-        active_role = active_item.get("assigned_role")
-        role_text = str(active_role or "").strip().lower()
-        role_suffix = f" ({_style(role_text, ROLE_STYLE.get(role_text))})" if role_text else ""
-        lines.append(
-            "Active: "
-            f"{active_item.get('id')} | {active_item.get('title')} | "
-            f"{active_item.get('assigned_agent', 'unassigned')}{role_suffix}"
-        )
+    # Worker-pool mode lists every running item; `active_item` stays the first of them.
+    active_items = daemon.get("active_items") if active_item else None
+    if not isinstance(active_items, list) or not active_items:
+        active_items = [active_item] if active_item else []
+    if active_items:
+        for entry in active_items:
+            if not isinstance(entry, dict):
+                continue
+            active_role = entry.get("assigned_role")
+            role_text = str(active_role or "").strip().lower()
+            role_suffix = f" ({_style(role_text, ROLE_STYLE.get(role_text))})" if role_text else ""
+            lines.append(
+                "Active: "
+                f"{entry.get('id')} | {entry.get('title')} | "
+                f"{entry.get('assigned_agent', 'unassigned')}{role_suffix}"
+            )
     else:
         lines.append("Active: none")
 
@@ -157,4 +170,16 @@ def render_status(data: dict[str, Any]) -> str:
     if workload_agents:
         lines.append("Workload Buckets: ready=dependency-ready queued, waiting=queued with unmet dependencies.")
 
+    recent_runs = data.get("recent_runs")
+    if isinstance(recent_runs, list) and recent_runs:
+        lines.append("Recent Runs:")
+        for row in reversed(recent_runs):
+            if not isinstance(row, dict):
+                continue
+            result = str(row.get("result") or "unknown")
+            lines.append(
+                f"  - {row.get('ts', 'n/a')} {row.get('item_id', '?')} {_style(result, RESULT_STYLE.get(result))} "
+                f"by {row.get('agent_id') or 'unassigned'} ({round(_safe_float(row.get('runtime_seconds')), 1)}s)"
+            )
+
     return "\n".join(lines)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from schemas import ensure_parent, load_json
+
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def _fsync_directory(path: Path) -> None:
+    # Persists the rename itself; directories cannot be opened for fsync on Windows.
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class RuntimeStateWriter:
+    """Coalescing writer for the daemon's runtime JSON documents and JSONL logs.
+
+    `save` keeps only the newest version of each document in memory and
+    `append` buffers log lines; both reach disk together at most
+    `flush_interval_seconds` later, from a background timer. `load` reads a
+    pending document back from memory, so load-modify-save callers never see
+    a stale file. `durable=True` flushes everything pending at once and
+    fsyncs it, for writes a crash recovery depends on. An interval of 0
+    writes through on every call.
+    """
+
+    def __init__(self, *, flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        self.flush_interval_seconds = max(0.0, flush_interval_seconds)
+        self._lock = threading.Lock()
+        # Held for a whole flush; logs this writer appends to rotate under it too.
+        self.flush_lock = threading.RLock()
+        self._documents: dict[Path, str] = {}
+        self._appends: dict[Path, list[str]] = {}
+        self._timer: threading.Timer | None = None
+        self.file_writes = 0
+        self.coalesced_writes = 0
+        self.durable_flushes = 0
+
+    def load(self, path: Path, default: Any) -> Any:
+        with self._lock:
+            text = self._documents.get(path)
+        if text is not None:
+            return json.loads(text)
+        return load_json(path, default)
+
+    def save(self, path: Path, data: Any, *, durable: bool = False, compact: bool = False) -> None:
+        # Serialize now: callers keep mutating `data` after handing it over.
+        if compact:
+            text = json.dumps(data, separators=(",", ":"), ensure_ascii=True) + "\n"
+        else:
+            text = json.dumps(data, indent=2, ensure_ascii=True) + "\n"
+        with self._lock:
+            if path in self._documents:
+                self.coalesced_writes += 1
+            self._documents[path] = text
+        self._after_write(durable)
+
+    def append(self, path: Path, record: dict[str, Any], *, durable: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=True) + "\n"
+        with self._lock:
+            self._appends.setdefault(path, []).append(line)
+        self._after_write(durable)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._documents) + sum(len(lines) for lines in self._appends.values())
+
+    def flush(self, *, durable: bool = False) -> int:
+        """Write everything pending; returns the number of files touched."""
+        with self.flush_lock:
+            with self._lock:
+                documents, self._documents = self._documents, {}
+                appends, self._appends = self._appends, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            written = 0
+            directories: set[Path] = set()
+            try:
+                # Log lines first: an event describing a transition should never
+                # be missing while the state it explains is already on disk.
+                while appends:
+                    path, lines = next(iter(appends.items()))
+                    self._append_lines(path, lines, durable=durable)
+                    del appends[path]
+                    written += 1
+                while documents:
+                    path, text = next(iter(documents.items()))
+                    self._write_document(path, text, durable=durable)
+                    del documents[path]
+                    directories.add(path.parent)
+                    written += 1
+            except BaseException:
+                self._requeue(documents, appends)
+                raise
+            if durable:
+                for directory in directories:
+                    _fsync_directory(directory)
+                self.durable_flushes += 1
+            self.file_writes += written
+            return written
+
+    def close(self) -> None:
+        self.flush(durable=True)
+
+    def _after_write(self, durable: bool) -> None:
+        if durable or self.flush_interval_seconds <= 0:
+            self.flush(durable=durable)
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_interval_seconds, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            # Left pending; the next write or explicit flush retries it.
+            pass
+
+    def _requeue(self, documents: dict[Path, str], appends: dict[Path, list[str]]) -> None:
+        with self._lock:
+            for path, text in documents.items():
+                self._documents.setdefault(path, text)
+            for path, lines in appends.items():
+                self._appends[path] = lines + self._appends.get(path, [])
+
+    @staticmethod
+    def _write_document(path: Path, text: str, *, durable: bool) -> None:
+        ensure_parent(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8", newline="\n") as fh:
+            fh.write(text)
+            if durable:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _append_lines(path: Path, lines: list[str], *, durable: bool) -> None:
+        ensure_parent(path)
+        with path.open("a", encoding="utf-8", newline="\n") as fh:
+            fh.write("".join(lines))
+            if durable:
+                fh.flush()
+                os.fsync(fh.fileno())
@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import random
+import statistics
+import tempfile
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from orchestrator import (
+    ROOT,
+    archive_non_actionable_blocked_items,
+    load_agent_catalog,
+    load_policies,
+    revisit_recoverable_blocked_items,
+    run_history_log,
+    select_agent_for_item,
+)
+from queue_manager import QueueManager
+from schemas import default_agent_stats, load_json, save_json_atomic
+from stats_tracker import StatsTracker
+
+
+DEFAULT_RUNTIME_MEDIAN_SECONDS = 600.0
+DEFAULT_RUNTIME_SIGMA = 0.6
+DEFAULT_OUTCOMES = {"completed": 0.85, "blocked": 0.1, "failed": 0.05}
+DEFAULT_BLOCKER_REASON = "Worker timed out"
+# Roles with fewer runs than this borrow the fit over all roles.
+MIN_FIT_SAMPLES = 5
+IN_PROGRESS_STATUSES = {"assigned", "running", "validating"}
+OUTCOMES = ("completed", "blocked", "failed")
+
+
+@dataclass(frozen=True)
+class RoleModel:
+    """Log-normal runtime and outcome mix of one role's runs, fitted from run-history."""
+
+    runtime_mu: float
+    runtime_sigma: float
+    outcomes: dict[str, float]
+    blocker_reasons: tuple[str, ...] = (DEFAULT_BLOCKER_REASON,)
+    samples: int = 0
+
+    def sample(self, rnd: random.Random) -> tuple[float, str, str | None]:
+        runtime = math.exp(rnd.gauss(self.runtime_mu, self.runtime_sigma))
+        draw = rnd.random()
+        outcome = OUTCOMES[-1]
+        for name in OUTCOMES:
+            draw -= self.outcomes.get(name, 0.0)
+            if draw < 0:
+                outcome = name
+                break
+        reason = rnd.choice(self.blocker_reasons) if outcome == "blocked" else None
+        return runtime, outcome, reason
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "runtime_median_seconds": round(math.exp(self.runtime_mu), 1),
+            "runtime_sigma": round(self.runtime_sigma, 3),
+            "outcomes": {name: round(share, 3) for name, share in self.outcomes.items()},
+        }
+
+
+DEFAULT_ROLE_MODEL = RoleModel(math.log(DEFAULT_RUNTIME_MEDIAN_SECONDS), DEFAULT_RUNTIME_SIGMA, dict(DEFAULT_OUTCOMES))
+
+
+def _outcome_name(result: str) -> str | None:
+    if result in {"completed", "blocked"}:
+        return result
+    if result.startswith("failed"):
+        return "failed"
+    return None
+
+
+def _fit(rows: list[dict[str, Any]]) -> RoleModel:
+    runtimes = [float(row["runtime_seconds"]) for row in rows if float(row.get("runtime_seconds") or 0) > 0]
+    if len(runtimes) < MIN_FIT_SAMPLES:
+        return DEFAULT_ROLE_MODEL
+    logs = [math.log(value) for value in runtimes]
+    counts = {name: 0 for name in OUTCOMES}
+    for row in rows:
+        counts[row["outcome"]] += 1
+    total = sum(counts.values())
+    reasons = tuple(sorted({str(row["summary"]) for row in rows if row["outcome"] == "blocked" and row.get("summary")}))
+    return RoleModel(
+        runtime_mu=statistics.fmean(logs),
+        runtime_sigma=statistics.pstdev(logs) if len(logs) > 1 else DEFAULT_RUNTIME_SIGMA,
+        outcomes={name: count / total for name, count in counts.items()},
+        blocker_reasons=reasons or (DEFAULT_BLOCKER_REASON,),
+        samples=len(runtimes),
+    )
+
+
+def fit_role_models(history: Iterable[dict[str, Any]], agents: dict[str, dict[str, Any]]) -> dict[str, RoleModel]:
+    """Per-role models keyed by role, plus "*" fitted over every run."""
+    by_role: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for record in history:
+        outcome = _outcome_name(str(record.get("result", "")))
+        agent = agents.get(str(record.get("agent_id", "")))
+        if outcome is None or agent is None:
+            continue
+        row = {**record, "outcome": outcome}
+        by_role[str(agent.get("role", ""))].append(row)
+        by_role["*"].append(row)
+    overall = _fit(by_role.get("*", []))
+    models = {"*": overall}
+    for role, rows in by_role.items():
+        if role != "*":
+            models[role] = _fit(rows) if len(rows) >= MIN_FIT_SAMPLES else overall
+    return models
+
+
+def _deep_merge(base: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@dataclass
+class PolicyVariant:
+    """Routing/retry overrides (merged onto the live policies) and daemon settings to simulate."""
+
+    name: str
+    routing: dict[str, Any] = field(default_factory=dict)
+    retry: dict[str, Any] = field(default_factory=dict)
+    workers: int = 1
+    # The serial loop only sleeps between cycles when the next item was not prepared during the run.
+    sleep_seconds: float = 0.0
+    cycle_overhead_seconds: float = 2.0
+    idle_wait_seconds: float = 300.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PolicyVariant":
+        known = set(cls.__dataclass_fields__)
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+DEFAULT_VARIANTS = (
+    PolicyVariant("current"),
+    PolicyVariant("no_dependency_unlock", routing={"dependency_unlock_priority": {"enabled": False}}),
+    PolicyVariant("no_role_bias", routing={"fast_cycle_role_priority": {"enabled": False}}),
+    PolicyVariant("fast_revisit", retry={"blocked_revisit": {"cooldown_seconds": 300, "max_items_per_cycle": 5}}),
+    PolicyVariant("workers_3", workers=3),
+)
+
+
+def load_variants(path: Path) -> list[PolicyVariant]:
+    data = load_json(path, {})
+    rows = data.get("variants", []) if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not rows:
+        raise ValueError(f"{path} must contain a non-empty list of variants (or {{\"variants\": [...]}})")
+    return [PolicyVariant.from_dict(row) for row in rows]
+
+
+@dataclass
+class BacklogSnapshot:
+    active: list[dict[str, Any]]
+    completed: list[dict[str, Any]]
+    blocked: list[dict[str, Any]]
+    taken_at: datetime
+
+    @classmethod
+    def load(cls, root: Path) -> "BacklogSnapshot":
+        """The backlog as the daemon would see it after stale-run recovery."""
+        queue = QueueManager(root)
+        queue.load(validate=False)
+        active = json.loads(json.dumps(queue.active))
+        for item in active:
+            if item.get("status") in IN_PROGRESS_STATUSES:
+                item["status"] = "queued"
+        return cls(active, json.loads(json.dumps(queue.completed)), json.loads(json.dumps(queue.blocked)), datetime.now(timezone.utc))
+
+    def write(self, root: Path) -> None:
+        backlog_dir = root / "coordination" / "backlog"
+        save_json_atomic(backlog_dir / "work-items.json", self.active)
+        save_json_atomic(backlog_dir / "completed-items.json", self.completed)
+        save_json_atomic(backlog_dir / "blocked-items.json", self.blocked)
+
+
+@dataclass
+class SimulationResult:
+    variant: str
+    seed: int
+    makespan_seconds: float
+    runs: int
+    completed: int
+    blocked: int
+    archived: int
+    queued_left: int
+    agent_busy_seconds: dict[str, float]
+    critical_path_seconds: float
+
+    @property
+    def items_per_hour(self) -> float:
+        return self.completed / (self.makespan_seconds / 3600) if self.makespan_seconds > 0 else 0.0
+
+    def utilization(self) -> dict[str, float]:
+        if self.makespan_seconds <= 0:
+            return {}
+        return {agent: busy / self.makespan_seconds for agent, busy in sorted(self.agent_busy_seconds.items())}
+
+
+@dataclass(order=True)
+class _Run:
+    finishes_at: float
+    seq: int
+    item_id: str = field(compare=False)
+    agent_id: str = field(compare=False)
+    runtime: float = field(compare=False)
+    outcome: str = field(compare=False)
+    reason: str | None = field(compare=False)
+
+
+class ScheduleSimulator:
+    """Discrete-event replay of the daemon loop over a backlog snapshot.
+
+    Each cycle runs the real blocked archive and revisit passes and
+    `QueueManager.ranked_candidates` on a private copy of the backlog, with a
+    simulated clock in place of agent runs: runtimes and outcomes are drawn
+    from the fitted role models. Draws are keyed on (seed, item, attempt), so
+    every variant sees the same agent behaviour and differences come from the
+    policies alone.
+    """
+
+    def __init__(
+        self,
+        snapshot: BacklogSnapshot,
+        *,
+        agents: dict[str, dict[str, Any]],
+        policies: dict[str, Any],
+        models: dict[str, RoleModel],
+        max_hours: float = 24 * 30,
+    ):
+        self.snapshot = snapshot
+        self.agents = agents
+        self.policies = policies
+        self.models = models
+        self.max_seconds = max_hours * 3600
+
+    def _model_for(self, agent_id: str) -> RoleModel:
+        role = str(self.agents.get(agent_id, {}).get("role", ""))
+        return self.models.get(role) or self.models.get("*") or DEFAULT_ROLE_MODEL
+
+    def run(self, variant: PolicyVariant, *, seed: int) -> SimulationResult:
+        routing = _deep_merge(self.policies.get("routing", {}), variant.routing)
+        retry = _deep_merge(self.policies.get("retry", {}), variant.retry)
+        max_retries = int(retry.get("max_retries_per_item_per_agent", 0))
+        revisit_cfg = retry.get("blocked_revisit", {}) if isinstance(retry.get("blocked_revisit"), dict) else {}
+        idle_wait = max(variant.idle_wait_seconds, float(revisit_cfg.get("cooldown_seconds", 0)) + 1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self.snapshot.write(root)
+            archived_path = root / "coordination" / "backlog" / "blocked-archived-items.json"
+            queue = QueueManager(root)
+            queue.load(validate=False)
+            stats = default_agent_stats(self.agents)
+            tracker = StatsTracker(root, self.agents)
+            now = 0.0
+            seq = 0
+            attempts: dict[str, int] = defaultdict(int)
+            running: list[_Run] = []
+            busy_agents: set[str] = set()
+            busy_seconds: dict[str, float] = defaultdict(float)
+            finished_at: dict[str, float] = {}
+            last_runtime: dict[str, float] = {}
+            archived = 0
+            idle_rounds = 0
+            last_finish = 0.0
+            with queue.deferred_save():
+                while now <= self.max_seconds:
+                    clock = self.snapshot.taken_at + timedelta(seconds=now)
+                    archived += len(archive_non_actionable_blocked_items(queue, retry, archived_path=archived_path))
+                    revisit_recoverable_blocked_items(queue, retry, now=clock)
+                    started = 0
+                    if len(running) < variant.workers:
+                        for item in queue.ranked_candidates(routing, stats):
+                            agent_id, _cfg = select_agent_for_item(item, self.agents, routing)
+                            if agent_id in busy_agents:
+                                continue
+                            item_id = str(item["id"])
+                            attempts[item_id] += 1
+                            rnd = random.Random(f"{seed}:{item_id}:{attempts[item_id]}")
+                            runtime, outcome, reason = self._model_for(agent_id).sample(rnd)
+                            queue.mark_assigned(item_id, agent_id)
+                            queue.mark_running(item_id)
+                            seq += 1
+                            heapq.heappush(
+                                running,
+                                _Run(now + variant.cycle_overhead_seconds + runtime, seq, item_id, agent_id, runtime, outcome, reason),
+                            )
+                            busy_agents.add(agent_id)
+                            busy_seconds[agent_id] += runtime
+                            started += 1
+                            if len(running) >= variant.workers:
+                                break
+                    if not running:
+                        # Idle: the daemon waits, then blocked revisits may reopen work.
+                        idle_rounds += 1
+                        if idle_rounds > 1 or not queue.blocked:
+                            break
+                        now += idle_wait
+                        continue
+                    idle_rounds = 0
+
+                    run = heapq.heappop(running)
+                    now = last_finish = run.finishes_at
+                    busy_agents.discard(run.agent_id)
+                    self._apply_outcome(queue, run, max_retries=max_retries, at=self.snapshot.taken_at + timedelta(seconds=now))
+                    tracker.record_result(stats, agent_id=run.agent_id, outcome=run.outcome, runtime_seconds=run.runtime)
+                    if run.outcome == "completed":
+                        finished_at[run.item_id] = now
+                        last_runtime[run.item_id] = run.runtime
+                    if variant.workers <= 1:
+                        now += variant.sleep_seconds
+            # Runs still in flight at the horizon count towards the makespan but not the results.
+            makespan = max([last_finish, *(run.finishes_at for run in running)])
+            return SimulationResult(
+                variant=variant.name,
+                seed=seed,
+                makespan_seconds=makespan,
+                runs=seq,
+                completed=len(finished_at),
+                blocked=len(queue.blocked),
+                archived=archived,
+                queued_left=len(queue.items_with_status("queued")),
+                agent_busy_seconds=dict(busy_seconds),
+                critical_path_seconds=self._critical_path(queue, last_runtime),
+            )
+
+    @staticmethod
+    def _apply_outcome(queue: QueueManager, run: _Run, *, max_retries: int, at: datetime) -> None:
+        item = queue.get_active_item(run.item_id)
+        if item is None:
+            return
+        if run.outcome == "completed":
+            queue.mark_completed(run.item_id, "simulated", resolved_by_agent=run.agent_id)
+            item["updated_at"] = at.isoformat()
+            return
+        if run.outcome == "failed" and int(item.get("retry_count", 0)) < max_retries:
+            queue.increment_retry(run.item_id, "simulated failure")
+            item["updated_at"] = at.isoformat()
+            return
+        reason = run.reason or "Repeated failure: retry threshold exceeded"
+        queue.mark_blocked(run.item_id, reason)
+        # Revisit cooldowns are measured from updated_at, which must follow the simulated clock.
+        item["updated_at"] = at.isoformat()
+
+    @staticmethod
+    def _critical_path(queue: QueueManager, runtimes: dict[str, float]) -> float:
+        """Longest chain of dependent items completed in the simulation, by their simulated runtimes."""
+        deps = {
+            str(item.get("id")): [str(dep) for dep in item.get("dependencies", []) if str(dep) in runtimes]
+            for item in queue.completed
+            if str(item.get("id")) in runtimes
+        }
+        longest: dict[str, float] = {}
+        for start in deps:
+            stack: list[tuple[str, bool]] = [(start, False)]
+            while stack:
+                item_id, expanded = stack.pop()
+                if item_id in longest:
+                    continue
+                pending = [dep for dep in deps.get(item_id, []) if dep not in longest]
+                if expanded or not pending:
+                    longest[item_id] = runtimes[item_id] + max((longest.get(dep, 0.0) for dep in deps.get(item_id, [])), default=0.0)
+                    continue
+                stack.append((item_id, True))
+                stack.extend((dep, False) for dep in pending)
+        return max(longest.values(), default=0.0)
+
+
+def summarize(results: list[SimulationResult]) -> dict[str, Any]:
+    """Mean (and spread of makespan) over the replications of one variant."""
+    makespans = [result.makespan_seconds / 3600 for result in results]
+    utilization: dict[str, list[float]] = defaultdict(list)
+    for result in results:
+        for agent, share in result.utilization().items():
+            utilization[agent].append(share)
+    return {
+        "variant": results[0].variant,
+        "replications": len(results),
+        "makespan_hours": round(statistics.fmean(makespans), 3),
+        "makespan_hours_min": round(min(makespans), 3),
+        "makespan_hours_max": round(max(makespans), 3),
+        "items_per_hour": round(statistics.fmean(result.items_per_hour for result in results), 3),
+        "completed": round(statistics.fmean(result.completed for result in results), 2),
+        "blocked_at_end": round(statistics.fmean(result.blocked for result in results), 2),
+        "archived": round(statistics.fmean(result.archived for result in results), 2),
+        "queued_left": round(statistics.fmean(result.queued_left for result in results), 2),
+        "critical_path_hours": round(statistics.fmean(result.critical_path_seconds / 3600 for result in results), 3),
+        "agent_utilization": {agent: round(statistics.fmean(shares), 3) for agent, shares in sorted(utilization.items())},
+    }
+
+
+def simulate_variants(
+    root: Path,
+    variants: list[PolicyVariant],
+    *,
+    replications: int,
+    seed: int,
+    max_hours: float,
+) -> dict[str, Any]:
+    agents = load_agent_catalog(root)
+    policies = load_policies(root)
+    models = fit_role_models(run_history_log(root).iter_records(), agents)
+    snapshot = BacklogSnapshot.load(root)
+    simulator = ScheduleSimulator(snapshot, agents=agents, policies=policies, models=models, max_hours=max_hours)
+    rows = []
+    for variant in variants:
+        results = [simulator.run(variant, seed=seed + offset) for offset in range(max(1, replications))]
+        rows.append({**summarize(results), "settings": asdict(variant)})
+    return {
+        "snapshot": {
+            "queued": sum(1 for item in snapshot.active if item.get("status") == "queued"),
+            "completed": len(snapshot.completed),
+            "blocked": len(snapshot.blocked),
+        },
+        "models": {role: model.summary() for role, model in sorted(models.items())},
+        "variants": rows,
+    }
+
+
+def render_report(report: dict[str, Any]) -> str:
+    snapshot = report["snapshot"]
+    lines = [
+        f"Backlog snapshot: {snapshot['queued']} queued, {snapshot['completed']} completed, {snapshot['blocked']} blocked",
+        "Fitted role models (median runtime s / sigma / completed-blocked-failed):",
+    ]
+    for role, model in report["models"].items():
+        mix = "-".join(f"{model['outcomes'].get(name, 0.0):.2f}" for name in OUTCOMES)
+        lines.append(f"- {role}: {model['runtime_median_seconds']} / {model['runtime_sigma']} / {mix} ({model['samples']} runs)")
+    lines.append("")
+    lines.append(f"{'variant':<24} {'makespan h':>11} {'items/h':>8} {'done':>7} {'blocked':>8} {'crit path h':>12} {'mean util':>10}")
+    for row in report["variants"]:
+        util = row["agent_utilization"]
+        mean_util = statistics.fmean(util.values()) if util else 0.0
+        lines.append(
+            f"{row['variant']:<24} {row['makespan_hours']:>11.2f} {row['items_per_hour']:>8.2f} "
+            f"{row['completed']:>7.1f} {row['blocked_at_end']:>8.1f} {row['critical_path_hours']:>12.2f} {mean_util:>10.1%}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simulate daemon throughput for scheduling policy variants")
+    parser.add_argument("--root", type=Path, default=ROOT, help="project root whose backlog, policies and run-history are used")
+    parser.add_argument("--variants", type=Path, help='JSON file with {"variants": [{"name": ..., "routing": {...}, "retry": {...}, "workers": N}]}')
+    parser.add_argument("--replications", type=int, default=20, help="simulated runs per variant (seeds seed..seed+N-1)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-hours", type=float, default=24 * 30, help="simulated-time horizon per run")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    variants = load_variants(args.variants) if args.variants else list(DEFAULT_VARIANTS)
+    report = simulate_variants(
+        args.root,
+        variants,
+        replications=args.replications,
+        seed=args.seed,
+        max_hours=args.max_hours,
+    )
+    print(json.dumps(report, indent=2) if args.json else render_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -61,11 +61,14 @@ def load_json(path: Path, default: Any) -> Any:
         return json.load(fh)
 
 
-def save_json_atomic(path: Path, data: Any) -> None:
+def save_json_atomic(path: Path, data: Any, *, compact: bool = False) -> None:
     ensure_parent(path)
     tmp = path.with_suffix(path.suffix + ".tmp")
     with tmp.open("w", encoding="utf-8", newline="\n") as fh:
-        json.dump(data, fh, indent=2, ensure_ascii=True)
+        if compact:
+            json.dump(data, fh, separators=(",", ":"), ensure_ascii=True)
+        else:
+            json.dump(data, fh, indent=2, ensure_ascii=True)
         fh.write("\n")
     os.replace(tmp, path)
 
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_TILE_SIZE = 64
+# Tile rows decoded and diffed at a time. Working memory is a few copies of
+# one band, not of the whole screenshot (a full-page mobile shot at scale 3
+# is tens of megapixels).
+BAND_TILE_ROWS = 4
+# Per-channel distance under which a pixel still "matches" a neighbour when
+# deciding whether a difference is only an anti-aliased edge shifted by 1px.
+ANTIALIAS_MATCH_TOLERANCE = 16
+_HASH_CHUNK = 1 << 20
+_LUMA = (0.299, 0.587, 0.114)
+
+
+@dataclass(frozen=True)
+class TileScore:
+    x: int
+    y: int
+    width: int
+    height: int
+    percent: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "percent": round(self.percent, 4),
+        }
+
+
+@dataclass
+class ScreenshotDiff:
+    """Result of comparing a screenshot to its baseline.
+
+    `percent` is the mean absolute RGBA channel difference over the whole
+    image (0-100), the metric `--max-diff-percent` has always used.
+    `engine` says how it was computed: `hash` (byte-identical files, nothing
+    decoded), `numpy`, `pil` (no NumPy: no tiles, no anti-aliasing check) or
+    `bytes` (no Pillow: 0 or 100).
+    """
+
+    percent: float
+    engine: str
+    size: tuple[int, int] | None = None
+    # Tiles with any remaining difference, worst first.
+    tiles: list[TileScore] = field(default_factory=list)
+    changed_pixels: int = 0
+    ignored_pixels: int = 0
+    heatmap_path: Path | None = None
+
+    @property
+    def worst_tile(self) -> TileScore | None:
+        return self.tiles[0] if self.tiles else None
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compare_screenshots(
+    baseline: Path,
+    current: Path,
+    *,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    pixel_tolerance: int = 0,
+    ignore_antialiasing: bool = False,
+    heatmap_path: Path | None = None,
+) -> ScreenshotDiff:
+    """Compare two PNG screenshots.
+
+    Identical files short-circuit on size and SHA-256 without decoding.
+    Otherwise pixels whose largest channel difference is at most
+    `pixel_tolerance` count as unchanged, and with `ignore_antialiasing` so do
+    pixels that only moved by one pixel (each image's pixel matches a
+    neighbour in the other). When anything differs and `heatmap_path` is
+    given, a PNG is written there: the current screenshot dimmed, real
+    differences in red and ignored ones in yellow. A stale heatmap from an
+    earlier run is removed either way.
+    """
+    if heatmap_path is not None:
+        heatmap_path.unlink(missing_ok=True)
+    if baseline.stat().st_size == current.stat().st_size and file_digest(baseline) == file_digest(current):
+        return ScreenshotDiff(0.0, "hash")
+
+    try:
+        from PIL import Image  # type: ignore
+    except Exception:
+        return ScreenshotDiff(100.0, "bytes")
+
+    with Image.open(baseline) as lhs, Image.open(current) as rhs:
+        if lhs.size != rhs.size:
+            return ScreenshotDiff(100.0, "pil", size=rhs.size)
+        try:
+            import numpy  # type: ignore
+        except Exception:
+            return _pil_diff(lhs, rhs, pixel_tolerance=pixel_tolerance)
+        lhs.load()
+        rhs.load()
+        return _numpy_diff(
+            lhs,
+            rhs,
+            np=numpy,
+            tile_size=tile_size,
+            pixel_tolerance=pixel_tolerance,
+            ignore_antialiasing=ignore_antialiasing,
+            heatmap_path=heatmap_path,
+        )
+
+
+def _pil_diff(lhs: Any, rhs: Any, *, pixel_tolerance: int) -> ScreenshotDiff:
+    from PIL import ImageChops  # type: ignore
+
+    diff = ImageChops.difference(lhs.convert("RGBA"), rhs.convert("RGBA"))
+    if pixel_tolerance > 0:
+        # Per channel here; the NumPy engine applies the tolerance per pixel.
+        diff = diff.point(lambda value: value if value > pixel_tolerance else 0)
+    histogram = diff.histogram()
+    width, height = rhs.size
+    diff_sum = sum(count * (index % 256) for index, count in enumerate(histogram))
+    percent = diff_sum / (255.0 * width * height * 4) * 100.0 if width and height else 0.0
+    return ScreenshotDiff(max(0.0, min(percent, 100.0)), "pil", size=(width, height))
+
+
+def _band(image: Any, top: int, bottom: int, np: Any) -> Any:
+    return np.asarray(image.crop((0, top, image.size[0], bottom)).convert("RGBA"))
+
+
+def _antialiased(lhs: Any, rhs: Any, rows: slice, candidates: Any, np: Any, *, tolerance: int) -> Any:
+    """Candidates whose pixel in each image matches one of its 8 neighbours in the other."""
+    top_halo = rows.start
+    bottom_halo = len(lhs) - rows.stop
+    pad = ((1 - top_halo, 1 - bottom_halo), (1, 1), (0, 0))
+    padded_lhs = np.pad(lhs, pad, mode="edge")
+    padded_rhs = np.pad(rhs, pad, mode="edge")
+    # Only the candidate pixels are gathered, so the cost follows the size of the change, not the band.
+    ys, xs = np.nonzero(candidates)
+    ys += 1
+    xs += 1
+    centre_lhs = padded_lhs[ys, xs].astype(np.int16)
+    centre_rhs = padded_rhs[ys, xs].astype(np.int16)
+    lhs_in_rhs = np.zeros(len(ys), dtype=bool)
+    rhs_in_lhs = np.zeros(len(ys), dtype=bool)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy == 0 and dx == 0:
+                continue
+            lhs_in_rhs |= np.abs(centre_lhs - padded_rhs[ys + dy, xs + dx]).max(axis=1) <= tolerance
+            rhs_in_lhs |= np.abs(centre_rhs - padded_lhs[ys + dy, xs + dx]).max(axis=1) <= tolerance
+    result = np.zeros(candidates.shape, dtype=bool)
+    result[ys - 1, xs - 1] = lhs_in_rhs & rhs_in_lhs
+    return result
+
+
+def _dimmed(rgba: Any, luma: Any, np: Any) -> Any:
+    gray = (rgba[:, :, :3].astype(np.float32) @ luma).astype(np.uint8)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def _numpy_diff(
+    lhs: Any,
+    rhs: Any,
+    *,
+    np: Any,
+    tile_size: int,
+    pixel_tolerance: int,
+    ignore_antialiasing: bool,
+    heatmap_path: Path | None,
+) -> ScreenshotDiff:
+    from PIL import Image  # type: ignore
+
+    width, height = rhs.size
+    tile = max(1, int(tile_size))
+    tiles_x = -(-width // tile)
+    band_rows = tile * BAND_TILE_ROWS
+    halo = 1 if ignore_antialiasing else 0
+    luma = np.array(_LUMA, dtype=np.float32) * 0.35
+    heatmap = Image.new("RGB", (width, height)) if heatmap_path is not None else None
+    total = 0
+    changed = 0
+    ignored = 0
+    tiles: list[TileScore] = []
+
+    for top in range(0, height, band_rows):
+        bottom = min(height, top + band_rows)
+        lo, hi = max(0, top - halo), min(height, bottom + halo)
+        band_lhs = _band(lhs, lo, hi, np)
+        band_rhs = _band(rhs, lo, hi, np)
+        rows = slice(top - lo, bottom - lo)
+        if np.array_equal(band_lhs[rows], band_rhs[rows]):
+            # Most of a page is unchanged; skip the arithmetic for identical bands.
+            if heatmap is not None:
+                heatmap.paste(Image.fromarray(_dimmed(band_rhs[rows], luma, np), "RGB"), (0, top))
+            continue
+        diff = np.abs(band_lhs[rows].astype(np.int16) - band_rhs[rows].astype(np.int16))
+        # Channel-wise ops: reductions over a length-4 last axis are several times slower.
+        channels = [diff[:, :, index] for index in range(4)]
+        delta = np.maximum(np.maximum(channels[0], channels[1]), np.maximum(channels[2], channels[3]))
+        quiet = delta <= pixel_tolerance
+        if ignore_antialiasing and not quiet.all():
+            quiet |= _antialiased(
+                band_lhs,
+                band_rhs,
+                rows,
+                ~quiet,
+                np,
+                tolerance=max(pixel_tolerance, ANTIALIAS_MATCH_TOLERANCE),
+            )
+        suppressed = quiet & (delta > 0)
+        ignored += int(np.count_nonzero(suppressed))
+        pixel_sum = (channels[0] + channels[1] + channels[2] + channels[3]).astype(np.int32)
+        pixel_sum[quiet] = 0
+        changed += int(np.count_nonzero(pixel_sum))
+        band_total = int(pixel_sum.sum(dtype=np.int64))
+        total += band_total
+
+        if band_total:
+            band_height = bottom - top
+            tiles_y = -(-band_height // tile)
+            padded = np.zeros((tiles_y * tile, tiles_x * tile), dtype=np.int32)
+            padded[:band_height, :width] = pixel_sum
+            sums = padded.reshape(tiles_y, tile, tiles_x, tile).sum(axis=(1, 3), dtype=np.int64)
+            for ty, tx in zip(*np.nonzero(sums)):
+                tile_w = min(tile, width - int(tx) * tile)
+                tile_h = min(tile, band_height - int(ty) * tile)
+                percent = int(sums[ty, tx]) / (255.0 * 4 * tile_w * tile_h) * 100.0
+                tiles.append(TileScore(int(tx) * tile, top + int(ty) * tile, tile_w, tile_h, percent))
+
+        if heatmap is not None:
+            rgb = _dimmed(band_rhs[rows], luma, np)
+            rgb[suppressed] = (200, 170, 0)
+            hot = pixel_sum > 0
+            rgb[hot, 0] = np.clip(128 + delta[hot].astype(np.int32) // 2, 0, 255).astype(np.uint8)
+            rgb[hot, 1:] = 0
+            heatmap.paste(Image.fromarray(rgb, "RGB"), (0, top))
+
+    percent = total / (255.0 * width * height * 4) * 100.0 if width and height else 0.0
+    tiles.sort(key=lambda score: (-score.percent, score.y, score.x))
+    written: Path | None = None
+    if heatmap is not None and heatmap_path is not None and (total or ignored):
+        heatmap_path.parent.mkdir(parents=True, exist_ok=True)
+        heatmap.save(heatmap_path, format="PNG")
+        written = heatmap_path
+    return ScreenshotDiff(
+        max(0.0, min(percent, 100.0)),
+        "numpy",
+        size=(width, height),
+        tiles=tiles,
+        changed_pixels=changed,
+        ignored_pixels=ignored,
+        heatmap_path=written,
+    )
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any
 
 from health_checks import validate_environment
+from queue_manager import replay_backlog_journal
 from schemas import load_json, load_yaml_like, validate_work_items
 
 
@@ -50,10 +51,23 @@ def main() -> int:
     state_dir = ROOT / "coordination" / "state"
     policy_dir = ROOT / "coordination" / "policies"
 
-    active_errs, active = _load_json_list(queue_dir / "work-items.json", "work-items.json", validate_items=True)
-    completed_errs, completed = _load_json_list(queue_dir / "completed-items.json", "completed-items.json", validate_items=True)
-    blocked_errs, blocked = _load_json_list(queue_dir / "blocked-items.json", "blocked-items.json", validate_items=True)
+    active_errs, active = _load_json_list(queue_dir / "work-items.json", "work-items.json")
+    completed_errs, completed = _load_json_list(queue_dir / "completed-items.json", "completed-items.json")
+    blocked_errs, blocked = _load_json_list(queue_dir / "blocked-items.json", "blocked-items.json")
     errors.extend(active_errs + completed_errs + blocked_errs)
+    # Snapshots lag the daemon until the journal is compacted; check the replayed queue.
+    active, completed, blocked = replay_backlog_journal(
+        queue_dir / "backlog-journal.jsonl",
+        active=active,
+        completed=completed,
+        blocked=blocked,
+    )
+    for label, items in (
+        ("work-items.json", active),
+        ("completed-items.json", completed),
+        ("blocked-items.json", blocked),
+    ):
+        errors.extend(f"{label} {err}" for err in validate_work_items(items))
 
     state_files = [
         "daemon-state.json",
@@ -4,22 +4,39 @@ from pathlib import Path
 from time import monotonic
 from typing import Any
 
+from runtime_state import RuntimeStateWriter
 from schemas import default_agent_stats, load_json, save_json_atomic, utc_now_iso
 
 
 class StatsTracker:
-    def __init__(self, root: Path, agents: dict[str, dict[str, Any]]):
+    def __init__(
+        self,
+        root: Path,
+        agents: dict[str, dict[str, Any]],
+        *,
+        writer: RuntimeStateWriter | None = None,
+    ):
         self.root = root
         self.agents_cfg = agents
         self.path = root / "coordination" / "runtime" / "agent-stats.json"
         self.progress_path = root / "coordination" / "runtime" / "progress-summary.json"
+        self.writer = writer
         self._run_started_at: float | None = None
 
+    def _load_json(self, path: Path) -> Any:
+        return self.writer.load(path, None) if self.writer is not None else load_json(path, None)
+
+    def _save_json(self, path: Path, data: Any) -> None:
+        if self.writer is not None:
+            self.writer.save(path, data)
+        else:
+            save_json_atomic(path, data)
+
     def load(self) -> dict[str, Any]:
-        stats = load_json(self.path, None)
+        stats = self._load_json(self.path)
         if not stats:
             stats = default_agent_stats(self.agents_cfg)
-            save_json_atomic(self.path, stats)
+            self._save_json(self.path, stats)
         # Backfill new agents if policy changes later.
         for agent_id, cfg in self.agents_cfg.items():
             stats.setdefault("agents", {})
@@ -30,7 +47,7 @@ class StatsTracker:
 
     def save(self, stats: dict[str, Any]) -> None:
         stats["generated_at"] = utc_now_iso()
-        save_json_atomic(self.path, stats)
+        self._save_json(self.path, stats)
 
     def begin_run(self) -> None:
         self._run_started_at = monotonic()
@@ -48,8 +65,10 @@ class StatsTracker:
         outcome: str,
         tokens_in: int = 0,
         tokens_out: int = 0,
+        runtime_seconds: float | None = None,
     ) -> None:
-        elapsed = self._elapsed()
+        # Callers pass the worker runtime when known; begin_run() covers older call sites.
+        elapsed = self._elapsed() if runtime_seconds is None else max(0.0, float(runtime_seconds))
         agent = stats["agents"][agent_id]
         agent["total_runs"] = int(agent.get("total_runs", 0)) + 1
         agent["total_runtime_seconds"] = float(agent.get("total_runtime_seconds", 0.0)) + elapsed
@@ -97,4 +116,4 @@ class StatsTracker:
             "queue_counts": queue_counts,
             "milestone_progress": milestone_progress,
         }
-        save_json_atomic(self.progress_path, payload)
+        self._save_json(self.progress_path, payload)
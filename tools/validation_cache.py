@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from schemas import load_json, save_json_atomic, utc_now_iso
+
+
+VALIDATION_CACHE_ENV = "REDKEEPERS_VALIDATION_CACHE"
+# Paths the daemon itself rewrites while an item runs (queue snapshots on
+# mark_validating, runtime state and logs); they must not change the tree key.
+DEFAULT_EXCLUDE_PATHS = ["coordination/runtime/", "coordination/backlog/"]
+
+
+def _boolish(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in {"1", "true", "yes", "on"}:
+        return True
+    if text in {"0", "false", "no", "off"}:
+        return False
+    return default
+
+
+def _int_setting(value: Any, default: int) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _string_list(value: Any) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(entry).strip() for entry in value if str(entry).strip()]
+
+
+def _path_matches(path: str, pattern: str) -> bool:
+    pattern = pattern.replace("\\", "/")
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+    if any(ch in pattern for ch in "*?["):
+        return fnmatch.fnmatchcase(path, pattern)
+    prefix = pattern.rstrip("/")
+    return path == prefix or path.startswith(f"{prefix}/")
+
+
+class ValidationCache:
+    """Passing validation results keyed by command + hash of the tree it ran against.
+
+    Only exit-code-0 results are stored, so a flaky failure is always re-run.
+    Entries expire after `max_age_seconds`; beyond `max_entries`/`max_bytes` the
+    least recently used entries are dropped on save.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_entries: int = 500,
+        max_bytes: int = 2_000_000,
+        max_age_seconds: int = 72 * 3600,
+        exclude_paths: list[str] | None = None,
+        command_inputs: dict[str, list[str]] | None = None,
+        exclude_commands: list[str] | None = None,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.exclude_paths = list(DEFAULT_EXCLUDE_PATHS if exclude_paths is None else exclude_paths)
+        self.command_inputs = dict(command_inputs or {})
+        self.exclude_commands = list(exclude_commands or [])
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+
+    @classmethod
+    def from_rules(cls, root: Path, commit_rules: dict[str, Any]) -> ValidationCache | None:
+        """Build the cache from `validation_cache` in commit-guard-rules.yaml.
+
+        Returns None when the cache is disabled by policy or by setting
+        REDKEEPERS_VALIDATION_CACHE=0.
+        """
+        cfg = commit_rules.get("validation_cache", {}) if isinstance(commit_rules, dict) else {}
+        if not isinstance(cfg, dict):
+            cfg = {}
+        enabled = _boolish(cfg.get("enabled"), False)
+        enabled = _boolish(os.environ.get(VALIDATION_CACHE_ENV), enabled)
+        if not enabled:
+            return None
+        command_inputs_raw = cfg.get("command_inputs", {})
+        command_inputs: dict[str, list[str]] = {}
+        if isinstance(command_inputs_raw, dict):
+            for marker, inputs in command_inputs_raw.items():
+                paths = _string_list(inputs)
+                if str(marker).strip() and paths:
+                    command_inputs[str(marker).strip()] = paths
+        exclude_paths = _string_list(cfg.get("exclude_paths")) if "exclude_paths" in cfg else None
+        return cls(
+            root / str(cfg.get("path") or "coordination/runtime/validation-cache.json"),
+            max_entries=_int_setting(cfg.get("max_entries"), 500),
+            max_bytes=_int_setting(cfg.get("max_bytes"), 2_000_000),
+            max_age_seconds=int(float(cfg.get("max_age_hours", 72) or 0) * 3600),
+            exclude_paths=exclude_paths,
+            command_inputs=command_inputs,
+            exclude_commands=_string_list(cfg.get("exclude_commands")),
+        )
+
+    def is_cacheable(self, command: str) -> bool:
+        return not any(marker in command for marker in self.exclude_commands)
+
+    def inputs_for(self, command: str) -> list[str] | None:
+        """Input patterns declared for `command`, or None to key on the whole tree."""
+        for marker, inputs in self.command_inputs.items():
+            if marker in command:
+                return inputs
+        return None
+
+    @staticmethod
+    def fingerprint_entries(entries: dict[str, str], patterns: list[str]) -> str:
+        digest = hashlib.sha256()
+        for path in sorted(entries):
+            if any(_path_matches(path, pattern) for pattern in patterns):
+                digest.update(f"{path}\0{entries[path]}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(command: str, fingerprint: str) -> str:
+        return hashlib.sha256(f"{command}\0{fingerprint}".encode("utf-8")).hexdigest()
+
+    def _load_entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            data = load_json(self.path, {})
+            entries = data.get("entries", {}) if isinstance(data, dict) else {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def lookup(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._load_entries().get(key)
+            if not isinstance(entry, dict):
+                return None
+            now = time.time()
+            if self.max_age_seconds and now - float(entry.get("stored_epoch", 0)) > self.max_age_seconds:
+                return None
+            entry["last_used_epoch"] = now
+            entry["hits"] = int(entry.get("hits", 0)) + 1
+            self._dirty = True
+            return dict(entry["result"])
+
+    def store(self, key: str, result: dict[str, Any]) -> None:
+        if int(result.get("exit_code", 1)) != 0:
+            return
+        kept = {
+            field: result.get(field)
+            for field in ("command", "effective_command", "exit_code", "stdout_tail", "stderr_tail", "duration_seconds")
+        }
+        now = time.time()
+        with self._lock:
+            self._load_entries()[key] = {
+                "result": kept,
+                "stored_at": utc_now_iso(),
+                "stored_epoch": now,
+                "last_used_epoch": now,
+                "hits": 0,
+                "bytes": len(json.dumps(kept, ensure_ascii=True)),
+            }
+            self._dirty = True
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones over the size caps."""
+        with self._lock:
+            entries = self._load_entries()
+            before = len(entries)
+            now = time.time()
+            if self.max_age_seconds:
+                for key in [k for k, v in entries.items() if now - float(v.get("stored_epoch", 0)) > self.max_age_seconds]:
+                    del entries[key]
+            by_recency = sorted(entries, key=lambda k: float(entries[k].get("last_used_epoch", 0)))
+            total_bytes = sum(int(entry.get("bytes", 0)) for entry in entries.values())
+            for key in by_recency:
+                over_count = self.max_entries and len(entries) > self.max_entries
+                over_bytes = self.max_bytes and total_bytes > self.max_bytes
+                if not over_count and not over_bytes:
+                    break
+                total_bytes -= int(entries[key].get("bytes", 0))
+                del entries[key]
+            removed = before - len(entries)
+            if removed:
+                self._dirty = True
+            return removed
+
+    def save(self) -> None:
+        self.evict()
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            save_json_atomic(self.path, {"generated_at": utc_now_iso(), "entries": self._entries})
+            self._dirty = False
@@ -3,14 +3,31 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import shutil
 import threading
+import time
 import zipfile
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 from typing import Any
 from urllib.error import URLError
-from urllib.request import urlopen
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+from precompressed_static import (
+    DEFAULT_ENCODINGS,
+    MIN_PRECOMPRESS_BYTES,
+    VARIANT_SUFFIXES,
+    PrecompressedRequestHandler,
+    available_encodings,
+    compress_file,
+    decompress_bytes,
+    resolve_encodings,
+    should_precompress,
+    variant_suffix,
+)
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -22,6 +39,20 @@ SMOKE_ROOT = RUNTIME_ROOT / "smoke-run"
 ARTIFACT_NAME = "redkeepers-web-vertical-slice.zip"
 ARTIFACT_PATH = ARTIFACTS_ROOT / ARTIFACT_NAME
 ARTIFACT_SHA_PATH = ARTIFACTS_ROOT / f"{ARTIFACT_NAME}.sha256"
+# Outside STAGING_ROOT so it never ends up in the artifact.
+STAGE_CACHE_PATH = RUNTIME_ROOT / "staging-cache.json"
+STAGE_CACHE_SCHEMA_VERSION = 1
+# Bump whenever _build_deterministic_zip changes its output, so cached artifacts are rebuilt.
+ZIP_FORMAT_VERSION = 2
+ZIP_COMPRESS_LEVEL = 9
+# ZipFile.write() takes each entry's mode and timestamp from the file, so staged
+# files are given these (see _pin_for_zip).
+ZIP_FILE_MODE = 0o644
+HASH_CHUNK_BYTES = 1024 * 1024
+STAGE_WORKERS = min(8, os.cpu_count() or 1)
+# A file modified this close to the previous cache write may have changed again
+# within the same mtime tick, so its cache entry is not trusted.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
 METADATA_REL_PATH = Path("release-metadata.placeholder.json")
 MANIFEST_REL_PATH = Path("artifact-manifest.json")
 ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
@@ -51,7 +82,7 @@ class _StaticServer:
         self._thread: threading.Thread | None = None
 
     def __enter__(self) -> "_StaticServer":
-        handler = lambda *args, **kwargs: SimpleHTTPRequestHandler(*args, directory=str(self.directory), **kwargs)
+        handler = lambda *args, **kwargs: PrecompressedRequestHandler(*args, directory=str(self.directory), **kwargs)
         self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
         self.server_port = int(self._httpd.server_port)
         self._thread = threading.Thread(target=self._httpd.serve_forever, name="web-slice-smoke-httpd", daemon=True)
@@ -71,7 +102,73 @@ def _sha256_bytes(data: bytes) -> str:
 
 
 def _sha256_file(path: Path) -> str:
-    return _sha256_bytes(path.read_bytes())
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _zip_mtime_ns() -> int:
+    # Zip timestamps are local DOS times; this mtime reads back as ZIP_TIMESTAMP.
+    return int(time.mktime((*ZIP_TIMESTAMP, 0, 0, -1))) * 1_000_000_000
+
+
+def _pin_for_zip(path: Path) -> None:
+    """Give a staged file the mode and mtime its zip entry must carry."""
+    os.chmod(path, ZIP_FILE_MODE)
+    mtime_ns = _zip_mtime_ns()
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _copy_and_hash(source_path: Path, destination_path: Path) -> tuple[int, str]:
+    """Copy in one streaming pass, hashing the bytes as they are written."""
+    digest = hashlib.sha256()
+    size = 0
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    with source_path.open("rb") as source, destination_path.open("wb") as destination:
+        while chunk := source.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+            destination.write(chunk)
+            size += len(chunk)
+    _pin_for_zip(destination_path)
+    return size, digest.hexdigest()
+
+
+def _load_stage_cache() -> dict[str, Any]:
+    try:
+        cache = json.loads(STAGE_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("schema_version") != STAGE_CACHE_SCHEMA_VERSION:
+        return {}
+    return cache
+
+
+def _save_stage_cache(cache: dict[str, Any]) -> None:
+    cache["schema_version"] = STAGE_CACHE_SCHEMA_VERSION
+    STAGE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STAGE_CACHE_PATH.with_name(f"{STAGE_CACHE_PATH.name}.tmp")
+    tmp_path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, STAGE_CACHE_PATH)
+
+
+def _cache_entry_is_fresh(entry: Any, source_stat: os.stat_result, staged_path: Path, *, trusted_before_ns: int) -> bool:
+    if not isinstance(entry, dict) or not isinstance(entry.get("sha256"), str):
+        return False
+    if entry.get("size") != source_stat.st_size or entry.get("mtime_ns") != source_stat.st_mtime_ns:
+        return False
+    if source_stat.st_mtime_ns >= trusted_before_ns:
+        return False
+    try:
+        staged_stat = staged_path.stat()
+    except OSError:
+        return False
+    return (
+        staged_stat.st_size == source_stat.st_size
+        and staged_stat.st_mtime_ns == entry.get("staged_mtime_ns")
+        and staged_stat.st_mtime_ns == _zip_mtime_ns()
+    )
 
 
 def _sorted_relative_files(root: Path) -> list[Path]:
@@ -102,9 +199,42 @@ def _load_release_metadata(source_root: Path) -> dict[str, Any]:
     return metadata
 
 
-def _stage_client_web(*, clean: bool) -> tuple[Path, dict[str, Any], list[dict[str, Any]]]:
-    if clean and RUNTIME_ROOT.exists():
+def _variant_is_fresh(record: Any, entry: dict[str, Any], staged_path: Path) -> bool:
+    if not isinstance(record, dict) or record.get("source_sha256") != entry.get("sha256"):
+        return False
+    if record.get("skipped"):
+        return True
+    try:
+        staged_stat = staged_path.stat()
+    except OSError:
+        return False
+    return (
+        staged_stat.st_size == record.get("bytes")
+        and staged_stat.st_mtime_ns == record.get("staged_mtime_ns")
+        and staged_stat.st_mtime_ns == _zip_mtime_ns()
+    )
+
+
+def _stage_client_web(
+    *,
+    clean: bool,
+    rebuild: bool = False,
+    encodings: list[str] | tuple[str, ...] = DEFAULT_ENCODINGS,
+) -> tuple[Path, dict[str, Any], list[dict[str, Any]], list[str]]:
+    """Mirror client-web into STAGING_ROOT and write its artifact manifest.
+
+    Files whose (size, mtime) match the staging cache and whose staged copy is
+    untouched are reused with their cached sha256; the rest are copied and
+    hashed in one pass, in parallel. Staged files no longer in the source are
+    removed. Text assets get precompressed variants in `encodings` (ValueError
+    if one cannot be produced). Returns the staging root, manifest, manifest
+    file entries and the paths that were (re)copied.
+    """
+    encodings = resolve_encodings(encodings)
+    if rebuild and RUNTIME_ROOT.exists():
         shutil.rmtree(RUNTIME_ROOT)
+    if clean and SMOKE_ROOT.exists():
+        shutil.rmtree(SMOKE_ROOT)
 
     if not CLIENT_WEB_ROOT.is_dir():
         raise ValueError(f"missing client-web root: {CLIENT_WEB_ROOT}")
@@ -113,21 +243,106 @@ def _stage_client_web(*, clean: bool) -> tuple[Path, dict[str, Any], list[dict[s
     ARTIFACTS_ROOT.mkdir(parents=True, exist_ok=True)
 
     release_metadata = _load_release_metadata(CLIENT_WEB_ROOT)
-    staged_files: list[dict[str, Any]] = []
-
-    for relative_path in _sorted_relative_files(CLIENT_WEB_ROOT):
-        source_path = CLIENT_WEB_ROOT / relative_path
-        destination_path = STAGING_ROOT / relative_path
-        destination_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copyfile(source_path, destination_path)
-        file_bytes = source_path.read_bytes()
-        staged_files.append(
-            {
-                "path": relative_path.as_posix(),
-                "bytes": len(file_bytes),
-                "sha256": _sha256_bytes(file_bytes),
+    cache = _load_stage_cache()
+    cached_files = cache.get("files") if isinstance(cache.get("files"), dict) else {}
+    trusted_before_ns = int(cache.get("written_at_ns", 0)) - RACY_MTIME_WINDOW_NS
+
+    relative_paths = _sorted_relative_files(CLIENT_WEB_ROOT)
+    entries: dict[str, dict[str, Any]] = {}
+    pending: list[tuple[Path, os.stat_result]] = []
+    for relative_path in relative_paths:
+        key = relative_path.as_posix()
+        source_stat = (CLIENT_WEB_ROOT / relative_path).stat()
+        entry = cached_files.get(key)
+        if _cache_entry_is_fresh(entry, source_stat, STAGING_ROOT / relative_path, trusted_before_ns=trusted_before_ns):
+            entries[key] = entry
+        else:
+            pending.append((relative_path, source_stat))
+
+    if pending:
+
+        def _stage(job: tuple[Path, os.stat_result]) -> tuple[int, str]:
+            relative_path, _source_stat = job
+            return _copy_and_hash(CLIENT_WEB_ROOT / relative_path, STAGING_ROOT / relative_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(STAGE_WORKERS, len(pending)))) as pool:
+            for (relative_path, source_stat), (size, sha256) in zip(pending, pool.map(_stage, pending)):
+                entries[relative_path.as_posix()] = {
+                    "size": size,
+                    "mtime_ns": source_stat.st_mtime_ns,
+                    "sha256": sha256,
+                    "staged_mtime_ns": (STAGING_ROOT / relative_path).stat().st_mtime_ns,
+                }
+
+    variant_jobs: list[tuple[str, str]] = []
+    for key in sorted(entries):
+        entry = entries[key]
+        previous = entry.get("variants") if isinstance(entry.get("variants"), dict) else {}
+        entry["variants"] = {}
+        if not should_precompress(Path(key), int(entry["size"])):
+            continue
+        for encoding in encodings:
+            variant_key = key + variant_suffix(encoding)
+            if variant_key in entries:
+                # The source tree ships this file itself.
+                continue
+            record = previous.get(encoding)
+            if _variant_is_fresh(record, entry, STAGING_ROOT / variant_key):
+                entry["variants"][encoding] = record
+            else:
+                variant_jobs.append((key, encoding))
+
+    if variant_jobs:
+
+        def _precompress(job: tuple[str, str]) -> dict[str, Any]:
+            key, encoding = job
+            variant_key = key + variant_suffix(encoding)
+            variant_path = STAGING_ROOT / variant_key
+            size, sha256 = compress_file(encoding, STAGING_ROOT / key, variant_path)
+            _pin_for_zip(variant_path)
+            if size >= int(entries[key]["size"]):
+                # Not worth serving; remember that so it is not recompressed every run.
+                variant_path.unlink()
+                return {"source_sha256": entries[key]["sha256"], "skipped": True}
+            return {
+                "source_sha256": entries[key]["sha256"],
+                "path": variant_key,
+                "bytes": size,
+                "sha256": sha256,
+                "staged_mtime_ns": variant_path.stat().st_mtime_ns,
             }
-        )
+
+        with ThreadPoolExecutor(max_workers=max(1, min(STAGE_WORKERS, len(variant_jobs)))) as pool:
+            for (key, encoding), record in zip(variant_jobs, pool.map(_precompress, variant_jobs)):
+                entries[key]["variants"][encoding] = record
+
+    keep = set(entries) | {MANIFEST_REL_PATH.as_posix()}
+    for entry in entries.values():
+        keep.update(record["path"] for record in entry["variants"].values() if not record.get("skipped"))
+    for relative_path in _sorted_relative_files(STAGING_ROOT):
+        if relative_path.as_posix() not in keep:
+            (STAGING_ROOT / relative_path).unlink()
+
+    cache["files"] = {key: entries[key] for key in sorted(entries)}
+    cache["written_at_ns"] = time.time_ns()
+    _save_stage_cache(cache)
+
+    staged_files: list[dict[str, Any]] = []
+    for relative_path in relative_paths:
+        entry = entries[relative_path.as_posix()]
+        staged_file: dict[str, Any] = {
+            "path": relative_path.as_posix(),
+            "bytes": int(entry["size"]),
+            "sha256": entry["sha256"],
+        }
+        variants = {
+            encoding: {key: entry["variants"][encoding][key] for key in ("path", "bytes", "sha256")}
+            for encoding in encodings
+            if encoding in entry["variants"] and not entry["variants"][encoding].get("skipped")
+        }
+        if variants:
+            staged_file["encodings"] = variants
+        staged_files.append(staged_file)
 
     manifest = {
         "schema_version": 1,
@@ -137,6 +352,8 @@ def _stage_client_web(*, clean: bool) -> tuple[Path, dict[str, Any], list[dict[s
             "file_order": "lexicographic by relative path",
             "zip_entry_timestamp_utc": "1980-01-01T00:00:00Z",
             "hash_algorithm": "sha256",
+            "precompressed_encodings": encodings,
+            "precompressed_min_bytes": MIN_PRECOMPRESS_BYTES,
         },
         "release_metadata_path": METADATA_REL_PATH.as_posix(),
         "release_metadata": {
@@ -152,27 +369,82 @@ def _stage_client_web(*, clean: bool) -> tuple[Path, dict[str, Any], list[dict[s
         json.dumps(manifest, indent=2, ensure_ascii=True) + "\n",
         encoding="utf-8",
     )
+    _pin_for_zip(STAGING_ROOT / MANIFEST_REL_PATH)
 
-    return STAGING_ROOT, manifest, staged_files
+    return STAGING_ROOT, manifest, staged_files, [relative_path.as_posix() for relative_path, _stat in pending]
 
 
-def _build_deterministic_zip(staging_root: Path, artifact_path: Path) -> None:
-    files = _sorted_relative_files(staging_root)
+def _cached_artifact_sha(manifest_sha256: str, *, verify: bool) -> str | None:
+    """The artifact's sha256 if the zip on disk was built from this exact manifest, else None.
+
+    The manifest lists every staged file's hash, so an unchanged manifest means
+    unchanged zip input. `verify` re-hashes the zip instead of trusting its stat.
+    """
+    record = _load_stage_cache().get("artifact")
+    if not isinstance(record, dict):
+        return None
+    if record.get("manifest_sha256") != manifest_sha256 or record.get("zip_format_version") != ZIP_FORMAT_VERSION:
+        return None
+    try:
+        artifact_stat = ARTIFACT_PATH.stat()
+    except OSError:
+        return None
+    if artifact_stat.st_size != record.get("size") or artifact_stat.st_mtime_ns != record.get("mtime_ns"):
+        return None
+    if verify and _sha256_file(ARTIFACT_PATH) != record.get("sha256"):
+        return None
+    return str(record.get("sha256"))
+
+
+def _record_artifact(manifest_sha256: str, artifact_sha256: str) -> None:
+    cache = _load_stage_cache()
+    artifact_stat = ARTIFACT_PATH.stat()
+    cache["artifact"] = {
+        "manifest_sha256": manifest_sha256,
+        "zip_format_version": ZIP_FORMAT_VERSION,
+        "sha256": artifact_sha256,
+        "size": artifact_stat.st_size,
+        "mtime_ns": artifact_stat.st_mtime_ns,
+    }
+    _save_stage_cache(cache)
+
 
-    with zipfile.ZipFile(artifact_path, "w") as archive:
-        for relative_path in files:
+def _build_deterministic_zip(staging_root: Path, artifact_path: Path) -> None:
+    """Stream staged files into the zip in lexicographic order with fixed timestamps.
+
+    ZipFile.write() copies entries in chunks, so memory does not grow with file
+    size; it takes mode and timestamp from the staged file, which staging pins.
+    The zip is written next to `artifact_path` and moved into place at the end.
+    """
+    tmp_path = artifact_path.with_name(f"{artifact_path.name}.tmp")
+    mtime_ns = _zip_mtime_ns()
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as archive:
+        for relative_path in _sorted_relative_files(staging_root):
             source_path = staging_root / relative_path
-            zip_info = zipfile.ZipInfo(filename=relative_path.as_posix(), date_time=ZIP_TIMESTAMP)
-            zip_info.compress_type = zipfile.ZIP_DEFLATED
-            zip_info.external_attr = 0o100644 << 16
-            archive.writestr(zip_info, source_path.read_bytes(), compress_type=zipfile.ZIP_DEFLATED, compresslevel=9)
+            source_stat = source_path.stat()
+            if source_stat.st_mtime_ns != mtime_ns or (source_stat.st_mode & 0o777) != ZIP_FILE_MODE:
+                _pin_for_zip(source_path)
+            # Variants are already compressed; deflating again only costs time.
+            compress_type = zipfile.ZIP_STORED if relative_path.suffix in VARIANT_SUFFIXES else None
+            archive.write(source_path, relative_path.as_posix(), compress_type=compress_type)
+    os.replace(tmp_path, artifact_path)
 
 
 def _package(args: argparse.Namespace) -> int:
     try:
-        staging_root, _manifest, staged_files = _stage_client_web(clean=bool(args.clean))
-        _build_deterministic_zip(staging_root, ARTIFACT_PATH)
-        artifact_sha = _sha256_file(ARTIFACT_PATH)
+        encodings = getattr(args, "encodings", None)
+        staging_root, _manifest, staged_files, copied = _stage_client_web(
+            clean=bool(args.clean),
+            rebuild=bool(getattr(args, "rebuild", False)),
+            encodings=DEFAULT_ENCODINGS if encodings is None else str(encodings).split(","),
+        )
+        manifest_sha = _sha256_file(staging_root / MANIFEST_REL_PATH)
+        artifact_sha = _cached_artifact_sha(manifest_sha, verify=bool(args.clean))
+        artifact_reused = artifact_sha is not None
+        if artifact_sha is None:
+            _build_deterministic_zip(staging_root, ARTIFACT_PATH)
+            artifact_sha = _sha256_file(ARTIFACT_PATH)
+            _record_artifact(manifest_sha, artifact_sha)
         ARTIFACT_SHA_PATH.write_text(f"{artifact_sha}  {ARTIFACT_NAME}\n", encoding="utf-8")
     except ValueError as exc:
         print(f"STATUS: BLOCKED\n{exc}")
@@ -182,7 +454,8 @@ def _package(args: argparse.Namespace) -> int:
         "STATUS: COMPLETED\n"
         f"Packaged web vertical slice artifact: {ARTIFACT_PATH}\n"
         f"Artifact SHA256: {artifact_sha}\n"
-        f"Source files staged: {len(staged_files)}"
+        f"Source files staged: {len(staged_files)} (copied: {len(copied)}, unchanged: {len(staged_files) - len(copied)})\n"
+        f"Artifact rebuilt: {'no (inputs unchanged)' if artifact_reused else 'yes'}"
     )
     return 0
 
@@ -195,6 +468,37 @@ def _http_get_text(url: str) -> str:
         raise RuntimeError(f"failed HTTP request: {url} ({exc})") from exc
 
 
+def _check_precompressed_variants(base_url: str, root: Path) -> tuple[int, str | None]:
+    """Fetch every manifest-listed variant through the server with a matching Accept-Encoding.
+
+    Returns how many were verified and the first problem found. Encodings
+    this interpreter cannot decode (`br` without brotli) are skipped.
+    """
+    manifest = json.loads((root / MANIFEST_REL_PATH).read_text(encoding="utf-8"))
+    decodable = set(available_encodings())
+    verified = 0
+    for entry in manifest.get("files", []):
+        for encoding, variant in (entry.get("encodings") or {}).items():
+            if encoding not in decodable:
+                continue
+            variant_path = root / Path(str(variant.get("path", "")))
+            if not variant_path.is_file() or _sha256_file(variant_path) != variant.get("sha256"):
+                return verified, f"variant {variant.get('path')} is missing or does not match its manifest sha256"
+            request = Request(f"{base_url}/{quote(str(entry['path']))}", headers={"Accept-Encoding": encoding})
+            try:
+                with urlopen(request, timeout=5) as response:
+                    served_encoding = response.headers.get("Content-Encoding")
+                    body = response.read()
+            except URLError as exc:
+                return verified, f"failed HTTP request for {entry['path']} ({exc})"
+            if served_encoding != encoding:
+                return verified, f"{entry['path']} served with Content-Encoding {served_encoding!r}, expected {encoding!r}"
+            if _sha256_bytes(decompress_bytes(encoding, body)) != entry.get("sha256"):
+                return verified, f"{entry['path']} {encoding} variant does not decode to the packaged file"
+            verified += 1
+    return verified, None
+
+
 def _smoke(args: argparse.Namespace) -> int:
     if not ARTIFACT_PATH.is_file():
         print(
@@ -248,11 +552,17 @@ def _smoke(args: argparse.Namespace) -> int:
             print("STATUS: BLOCKED\nSmoke marker check failed for packaged release metadata.")
             return 1
 
+        variants_verified, variant_issue = _check_precompressed_variants(base_url, SMOKE_ROOT)
+        if variant_issue:
+            print(f"STATUS: BLOCKED\nPrecompressed variant check failed: {variant_issue}")
+            return 1
+
     print(
         "STATUS: COMPLETED\n"
         f"Packaged web artifact smoke passed via local server.\n"
         f"Artifact: {ARTIFACT_PATH}\n"
-        f"Smoke root: {SMOKE_ROOT}"
+        f"Smoke root: {SMOKE_ROOT}\n"
+        f"Precompressed variants verified: {variants_verified}"
     )
     return 0
 
@@ -264,7 +574,21 @@ def parse_args() -> argparse.Namespace:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     package_parser = subparsers.add_parser("package", help="Build deterministic web vertical-slice package artifact.")
-    package_parser.add_argument("--clean", action="store_true", help="Delete previous packaging runtime outputs first.")
+    package_parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Drop the previous smoke run and re-hash a reused artifact; unchanged staged files are still reused.",
+    )
+    package_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Delete all packaging runtime outputs, including the staging cache, and stage everything again.",
+    )
+    package_parser.add_argument(
+        "--encodings",
+        default=",".join(DEFAULT_ENCODINGS),
+        help="Comma-separated precompressed variants to stage (gzip, br; empty for none). br needs the brotli package.",
+    )
 
     smoke_parser = subparsers.add_parser("smoke", help="Run local smoke checks against packaged web artifact.")
     smoke_parser.add_argument("--host", default="127.0.0.1")
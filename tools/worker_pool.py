@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any, Iterable
+
+
+# Items that read or rewrite shared daemon state cannot safely overlap with any
+# other worker: the daemon saves the backlog while they run.
+EXCLUSIVE_SCOPE_PREFIXES = (
+    "coordination/backlog/",
+    "coordination/state/",
+    "coordination/policies/",
+)
+
+
+@dataclass(frozen=True)
+class WriteScope:
+    agent_id: str
+    paths: tuple[str, ...]
+    exclusive: bool
+    reason: str | None = None
+
+
+def normalize_scope_path(value: Any) -> str:
+    text = str(value or "").strip().replace("\\", "/")
+    while text.startswith("./"):
+        text = text[2:]
+    text = text.lstrip("/")
+    if not text or text in {".", ".."}:
+        return ""
+    if any(part == ".." for part in text.split("/")):
+        return ""
+    if text.endswith("/"):
+        return text
+    # Entries without a file suffix (`scripts`, `client-web`) are directory scopes.
+    if "." not in PurePosixPath(text).name:
+        return f"{text}/"
+    return text
+
+
+def item_write_scope(item: dict[str, Any], agent_id: str) -> WriteScope:
+    """Approximate the files an item may touch from its declared inputs."""
+    inputs_raw = item.get("inputs", [])
+    inputs = inputs_raw if isinstance(inputs_raw, list) else []
+    paths: list[str] = []
+    for entry in inputs:
+        path = normalize_scope_path(entry)
+        if path and path not in paths:
+            paths.append(path)
+
+    agent_dir = f"agents/{agent_id}/"
+    if not paths:
+        return WriteScope(agent_id=agent_id, paths=(agent_dir,), exclusive=True, reason="no_declared_inputs")
+    for path in paths:
+        if any(path.startswith(prefix) or prefix.startswith(path) for prefix in EXCLUSIVE_SCOPE_PREFIXES):
+            return WriteScope(
+                agent_id=agent_id,
+                paths=tuple([*paths, agent_dir]),
+                exclusive=True,
+                reason=f"shared_state_input:{path}",
+            )
+    return WriteScope(agent_id=agent_id, paths=tuple([*paths, agent_dir]), exclusive=False)
+
+
+def _paths_overlap(left: str, right: str) -> bool:
+    if left == right:
+        return True
+    if left.endswith("/") and right.startswith(left):
+        return True
+    if right.endswith("/") and left.startswith(right):
+        return True
+    return False
+
+
+def scopes_conflict(left: WriteScope, right: WriteScope) -> bool:
+    if left.agent_id == right.agent_id:
+        return True
+    if left.exclusive or right.exclusive:
+        return True
+    return any(_paths_overlap(a, b) for a in left.paths for b in right.paths)
+
+
+def find_scope_conflict(scope: WriteScope, running: Iterable[WriteScope]) -> WriteScope | None:
+    for other in running:
+        if scopes_conflict(scope, other):
+            return other
+    return None
+